@@ -0,0 +1,207 @@
+"""Add identity keys and daily occurrence counts for trial lesson controls
+
+Revision ID: a4b5c6d7e8f9
+Revises: f3a4b5c6d7e8
+Create Date: 2026-04-20 10:00:00.000000
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "a4b5c6d7e8f9"
+down_revision = "f3a4b5c6d7e8"
+branch_labels = None
+depends_on = None
+
+KEYS_TABLE = "trial_lesson_identity_keys"
+COUNTS_TABLE = "trial_lesson_occurrence_daily_counts"
+
+# Mesmo fuso de `_local_tz()` em trial_lessons.py: o dia do contador é o dia local.
+LOCAL_TIMEZONE = "America/Sao_Paulo"
+
+
+def upgrade() -> None:
+    # Mesmo hash de `trial_identity_key_hash` em app/services/trial_occurrence_counters.py.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_trial_identity_key_hash(p_kind text, p_value text)
+        RETURNS text
+        LANGUAGE sql
+        IMMUTABLE
+        AS $$
+          SELECT CASE
+            WHEN p_value IS NULL OR p_value = '' THEN NULL
+            ELSE encode(sha256(convert_to(p_kind || ':' || p_value, 'UTF8')), 'hex')
+          END
+        $$;
+        """
+    )
+
+    op.create_table(
+        KEYS_TABLE,
+        sa.Column("key_hash", sa.Text(), nullable=False),
+        sa.Column("key_kind", sa.Text(), nullable=False),
+        sa.Column("control_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.PrimaryKeyConstraint("key_hash", name="pk_trial_lesson_identity_keys"),
+        sa.ForeignKeyConstraint(
+            ["control_id"],
+            ["trial_lesson_controls.id"],
+            name="fk_trial_lesson_identity_keys_control_id",
+            ondelete="CASCADE",
+        ),
+        sa.CheckConstraint(
+            "key_kind IN ('email', 'whatsapp')",
+            name="ck_trial_lesson_identity_keys_kind",
+        ),
+    )
+    op.create_index("ix_trial_lesson_identity_keys_control_id", KEYS_TABLE, ["control_id"])
+
+    op.create_table(
+        COUNTS_TABLE,
+        sa.Column("control_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("occurrence_type", sa.Text(), nullable=False),
+        sa.Column("occurrence_day", sa.Date(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.PrimaryKeyConstraint(
+            "control_id",
+            "occurrence_type",
+            "occurrence_day",
+            name="pk_trial_lesson_occurrence_daily_counts",
+        ),
+        sa.ForeignKeyConstraint(
+            ["control_id"],
+            ["trial_lesson_controls.id"],
+            name="fk_trial_lesson_occurrence_daily_counts_control_id",
+            ondelete="CASCADE",
+        ),
+    )
+
+    op.create_index(
+        "ix_trial_lesson_controls_email_lower",
+        "trial_lesson_controls",
+        [sa.text("lower(email)")],
+    )
+    op.create_index(
+        "ix_trial_lesson_occurrences_email_lower_created_at",
+        "trial_lesson_occurrences",
+        [sa.text("lower(email)"), "created_at"],
+    )
+    op.create_index(
+        "ix_trial_lesson_occurrences_whatsapp_created_at",
+        "trial_lesson_occurrences",
+        ["whatsapp", "created_at"],
+    )
+
+    # As chaves acompanham email/whatsapp do controle, venham de onde vierem
+    # (portal, admin ou SQL manual). Em colisão (dois controles com o mesmo
+    # email em caixas diferentes) fica o primeiro.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_trial_lesson_identity_keys()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+          DELETE FROM public.trial_lesson_identity_keys
+          WHERE control_id = NEW.id;
+
+          INSERT INTO public.trial_lesson_identity_keys (key_hash, key_kind, control_id)
+          SELECT keys.key_hash, keys.key_kind, NEW.id
+          FROM (
+            VALUES
+              (public.fn_trial_identity_key_hash('email', lower(btrim(NEW.email))), 'email'),
+              (public.fn_trial_identity_key_hash('whatsapp', NEW.whatsapp), 'whatsapp')
+          ) AS keys (key_hash, key_kind)
+          WHERE keys.key_hash IS NOT NULL
+          ON CONFLICT (key_hash) DO NOTHING;
+
+          RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_trial_lesson_identity_keys
+        AFTER INSERT OR UPDATE OF email, whatsapp ON public.trial_lesson_controls
+        FOR EACH ROW
+        EXECUTE FUNCTION public.trg_trial_lesson_identity_keys();
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO public.trial_lesson_identity_keys (key_hash, key_kind, control_id)
+        SELECT keys.key_hash, keys.key_kind, tlc.id
+        FROM public.trial_lesson_controls tlc
+        CROSS JOIN LATERAL (
+          VALUES
+            (public.fn_trial_identity_key_hash('email', lower(btrim(tlc.email))), 'email'),
+            (public.fn_trial_identity_key_hash('whatsapp', tlc.whatsapp), 'whatsapp')
+        ) AS keys (key_hash, key_kind)
+        WHERE keys.key_hash IS NOT NULL
+        ORDER BY tlc.created_at, tlc.id
+        ON CONFLICT (key_hash) DO NOTHING;
+        """
+    )
+
+    # Ocorrências antigas vão para o controle achado por email e, na falta
+    # dele, por whatsapp — a mesma prioridade de `_find_trial_control`.
+    op.execute(
+        f"""
+        INSERT INTO public.trial_lesson_occurrence_daily_counts (
+          control_id,
+          occurrence_type,
+          occurrence_day,
+          total
+        )
+        SELECT
+          owner.control_id,
+          o.occurrence_type,
+          (o.created_at AT TIME ZONE '{LOCAL_TIMEZONE}')::date,
+          COUNT(*)
+        FROM public.trial_lesson_occurrences o
+        CROSS JOIN LATERAL (
+          SELECT k.control_id
+          FROM public.trial_lesson_identity_keys k
+          WHERE k.key_hash IN (
+            public.fn_trial_identity_key_hash('email', lower(btrim(o.email))),
+            public.fn_trial_identity_key_hash('whatsapp', o.whatsapp)
+          )
+          ORDER BY k.key_kind
+          LIMIT 1
+        ) owner
+        GROUP BY 1, 2, 3;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_trial_lesson_identity_keys ON public.trial_lesson_controls;"
+    )
+    op.execute("DROP FUNCTION IF EXISTS public.trg_trial_lesson_identity_keys();")
+
+    op.drop_index(
+        "ix_trial_lesson_occurrences_whatsapp_created_at",
+        table_name="trial_lesson_occurrences",
+    )
+    op.drop_index(
+        "ix_trial_lesson_occurrences_email_lower_created_at",
+        table_name="trial_lesson_occurrences",
+    )
+    op.drop_index("ix_trial_lesson_controls_email_lower", table_name="trial_lesson_controls")
+
+    op.drop_table(COUNTS_TABLE)
+    op.drop_index("ix_trial_lesson_identity_keys_control_id", table_name=KEYS_TABLE)
+    op.drop_table(KEYS_TABLE)
+
+    op.execute("DROP FUNCTION IF EXISTS public.fn_trial_identity_key_hash(text, text);")
@@ -0,0 +1,141 @@
+"""Notify availability changes on events writes
+
+Revision ID: b5c6d7e8f9a0
+Revises: a4b5c6d7e8f9
+Create Date: 2026-04-21 10:00:00.000000
+"""
+
+from alembic import op
+
+revision = "b5c6d7e8f9a0"
+down_revision = "a4b5c6d7e8f9"
+branch_labels = None
+depends_on = None
+
+# Mesmo canal de `AVAILABILITY_CHANNEL` em app/services/availability_snapshot.py.
+CHANNEL = "availability_changed"
+LOCAL_TIMEZONE = "America/Sao_Paulo"
+# Acima disso o payload vira `{"all": true}` (limite de 8000 bytes do NOTIFY).
+MAX_ITEMS = 100
+
+
+def upgrade() -> None:
+    # Um NOTIFY por statement com os pares (quadra|professor, dia local) tocados;
+    # o Postgres só entrega no commit, então rollback não invalida nada.
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION public.trg_events_notify_availability()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+          v_rows jsonb;
+          v_items jsonb;
+        BEGIN
+          IF TG_OP = 'INSERT' THEN
+            SELECT jsonb_agg(to_jsonb(r))
+            INTO v_rows
+            FROM (
+              SELECT n.court_id, n.teacher_id, n.start_at, n.end_at
+              FROM changed_events_new n
+            ) r;
+          ELSIF TG_OP = 'DELETE' THEN
+            SELECT jsonb_agg(to_jsonb(r))
+            INTO v_rows
+            FROM (
+              SELECT o.court_id, o.teacher_id, o.start_at, o.end_at
+              FROM changed_events_old o
+            ) r;
+          ELSE
+            SELECT jsonb_agg(to_jsonb(r))
+            INTO v_rows
+            FROM (
+              SELECT side.court_id, side.teacher_id, side.start_at, side.end_at
+              FROM changed_events_old o
+              JOIN changed_events_new n ON n.id = o.id
+              CROSS JOIN LATERAL (
+                VALUES
+                  (o.court_id, o.teacher_id, o.start_at, o.end_at),
+                  (n.court_id, n.teacher_id, n.start_at, n.end_at)
+              ) AS side (court_id, teacher_id, start_at, end_at)
+              WHERE (o.court_id, o.teacher_id, o.start_at, o.end_at, o.status)
+                IS DISTINCT FROM (n.court_id, n.teacher_id, n.start_at, n.end_at, n.status)
+            ) r;
+          END IF;
+
+          IF v_rows IS NULL THEN
+            RETURN NULL;
+          END IF;
+
+          SELECT jsonb_agg(DISTINCT jsonb_build_array(k.kind, k.owner_id, d.day::date))
+          INTO v_items
+          FROM jsonb_to_recordset(v_rows) AS r (
+            court_id uuid,
+            teacher_id uuid,
+            start_at timestamptz,
+            end_at timestamptz
+          )
+          CROSS JOIN LATERAL generate_series(
+            (r.start_at AT TIME ZONE '{LOCAL_TIMEZONE}')::date,
+            ((r.end_at - interval '1 microsecond') AT TIME ZONE '{LOCAL_TIMEZONE}')::date,
+            interval '1 day'
+          ) AS d (day)
+          CROSS JOIN LATERAL (
+            VALUES ('court', r.court_id), ('teacher', r.teacher_id)
+          ) AS k (kind, owner_id)
+          WHERE k.owner_id IS NOT NULL;
+
+          IF v_items IS NULL THEN
+            RETURN NULL;
+          END IF;
+
+          IF jsonb_array_length(v_items) > {MAX_ITEMS} THEN
+            PERFORM pg_notify('{CHANNEL}', '{{"all": true}}');
+          ELSE
+            PERFORM pg_notify('{CHANNEL}', jsonb_build_object('items', v_items)::text);
+          END IF;
+
+          RETURN NULL;
+        END;
+        $$;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE TRIGGER trg_events_notify_availability_insert
+        AFTER INSERT ON public.events
+        REFERENCING NEW TABLE AS changed_events_new
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION public.trg_events_notify_availability();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_events_notify_availability_update
+        AFTER UPDATE ON public.events
+        REFERENCING OLD TABLE AS changed_events_old NEW TABLE AS changed_events_new
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION public.trg_events_notify_availability();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_events_notify_availability_delete
+        AFTER DELETE ON public.events
+        REFERENCING OLD TABLE AS changed_events_old
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION public.trg_events_notify_availability();
+        """
+    )
+
+
+def downgrade() -> None:
+    for trigger_name in (
+        "trg_events_notify_availability_delete",
+        "trg_events_notify_availability_update",
+        "trg_events_notify_availability_insert",
+    ):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger_name} ON public.events;")
+
+    op.execute("DROP FUNCTION IF EXISTS public.trg_events_notify_availability();")
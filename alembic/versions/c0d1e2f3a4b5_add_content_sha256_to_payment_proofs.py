@@ -0,0 +1,46 @@
+"""Add content_sha256 to court_rental_payment_proofs
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c0d1e2f3a4
+Create Date: 2026-04-17 14:00:00.000000
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "c0d1e2f3a4b5"
+down_revision = "b9c0d1e2f3a4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "court_rental_payment_proofs",
+        sa.Column("content_sha256", sa.Text(), nullable=True),
+    )
+    op.create_index(
+        "ix_court_rental_payment_proofs_content_sha256",
+        "court_rental_payment_proofs",
+        ["content_sha256"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_court_rental_payment_proofs_storage_path",
+        "court_rental_payment_proofs",
+        ["storage_path"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_court_rental_payment_proofs_storage_path",
+        table_name="court_rental_payment_proofs",
+    )
+    op.drop_index(
+        "ix_court_rental_payment_proofs_content_sha256",
+        table_name="court_rental_payment_proofs",
+    )
+    op.drop_column("court_rental_payment_proofs", "content_sha256")
@@ -0,0 +1,247 @@
+"""Upsert agenda_overview_items on refresh instead of delete + insert
+
+Revision ID: c6d7e8f9a0b1
+Revises: b5c6d7e8f9a0
+Create Date: 2026-04-22 10:00:00.000000
+"""
+
+from alembic import op
+
+revision = "c6d7e8f9a0b1"
+down_revision = "b5c6d7e8f9a0"
+branch_labels = None
+depends_on = None
+
+# Tudo menos a chave (event_id, start_at), atualizado no ON CONFLICT.
+_UPDATED_COLUMNS = (
+    "kind",
+    "status",
+    "end_at",
+    "notes",
+    "court_id",
+    "court_name",
+    "teacher_id",
+    "teacher_name",
+    "student_id",
+    "student_name",
+    "created_by_user_id",
+    "created_by_email",
+    "created_at",
+    "updated_at",
+    "class_group_id",
+    "class_group_name",
+    "class_group_student_names",
+    "court_rental_id",
+    "court_rental_origin",
+    "court_rental_pricing_profile",
+    "court_rental_payment_status",
+    "customer_name",
+    "customer_email",
+    "customer_whatsapp",
+    "trial_lesson_id",
+    "trial_user_id",
+    "trial_user_name",
+    "trial_user_email",
+    "trial_user_whatsapp",
+    "event_group",
+    "event_label",
+    "color_key",
+    "participant_label",
+    "is_recurring",
+    "is_long_running",
+    "refreshed_at",
+)
+
+# Mesma projeção da migração e2f3a4b5c6d7.
+_PROJECTION_INSERT = """
+    WITH target AS (
+        SELECT e.*
+        FROM public.events e
+        WHERE e.id = ANY(p_event_ids)
+    ),
+    rosters AS (
+        SELECT
+            g.class_group_id,
+            public.fn_agenda_overview_class_group_student_names(g.class_group_id) AS names
+        FROM (
+            SELECT DISTINCT class_group_id
+            FROM target
+            WHERE class_group_id IS NOT NULL
+        ) g
+    ),
+    base AS (
+        SELECT
+            e.id AS event_id,
+            e.kind,
+            e.status,
+            e.start_at,
+            e.end_at,
+            e.notes,
+            c.id AS court_id,
+            c.name AS court_name,
+            t.id AS teacher_id,
+            t.full_name AS teacher_name,
+            s.id AS student_id,
+            s.full_name AS student_name,
+            creator.id AS created_by_user_id,
+            creator.email AS created_by_email,
+            e.created_at,
+            e.updated_at,
+            cg.id AS class_group_id,
+            cg.name AS class_group_name,
+            r.names AS class_group_student_names,
+            cr.id AS court_rental_id,
+            cr.origin AS court_rental_origin,
+            cr.pricing_profile AS court_rental_pricing_profile,
+            cr.payment_status AS court_rental_payment_status,
+            cr.customer_name,
+            cr.customer_email,
+            cr.customer_whatsapp,
+            tl.id AS trial_lesson_id,
+            trial_user.id AS trial_user_id,
+            trial_user.full_name AS trial_user_full_name,
+            trial_user.email AS trial_user_email,
+            trial_user.whatsapp AS trial_user_whatsapp
+        FROM target e
+        JOIN public.courts c
+          ON c.id = e.court_id
+        LEFT JOIN public.teachers t
+          ON t.id = e.teacher_id
+        LEFT JOIN public.students s
+          ON s.id = e.student_id
+        LEFT JOIN public.users creator
+          ON creator.id = e.created_by
+        LEFT JOIN public.class_groups cg
+          ON cg.id = e.class_group_id
+        LEFT JOIN rosters r
+          ON r.class_group_id = e.class_group_id
+        LEFT JOIN LATERAL (
+            SELECT *
+            FROM public.court_rentals cr
+            WHERE cr.event_id = e.id
+            ORDER BY cr.created_at DESC, cr.id DESC
+            LIMIT 1
+        ) cr ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT *
+            FROM public.trial_lessons tl
+            WHERE tl.event_id = e.id
+            ORDER BY tl.created_at DESC, tl.id DESC
+            LIMIT 1
+        ) tl ON TRUE
+        LEFT JOIN public.users trial_user
+          ON trial_user.id = tl.user_id
+    )
+    INSERT INTO public.agenda_overview_items (
+        event_id, kind, status, start_at, end_at, notes,
+        court_id, court_name, teacher_id, teacher_name,
+        student_id, student_name, created_by_user_id, created_by_email,
+        created_at, updated_at,
+        class_group_id, class_group_name, class_group_student_names,
+        court_rental_id, court_rental_origin, court_rental_pricing_profile,
+        court_rental_payment_status, customer_name, customer_email, customer_whatsapp,
+        trial_lesson_id, trial_user_id, trial_user_name, trial_user_email,
+        trial_user_whatsapp,
+        event_group, event_label, color_key, participant_label,
+        is_recurring, is_long_running, refreshed_at
+    )
+    SELECT
+        b.event_id, b.kind, b.status, b.start_at, b.end_at, b.notes,
+        b.court_id, b.court_name, b.teacher_id, b.teacher_name,
+        b.student_id, b.student_name, b.created_by_user_id, b.created_by_email,
+        b.created_at, b.updated_at,
+        b.class_group_id, b.class_group_name, b.class_group_student_names,
+        b.court_rental_id, b.court_rental_origin, b.court_rental_pricing_profile,
+        b.court_rental_payment_status, b.customer_name, b.customer_email,
+        b.customer_whatsapp,
+        b.trial_lesson_id, b.trial_user_id,
+        COALESCE(b.trial_user_full_name, b.customer_name, b.student_name),
+        b.trial_user_email, b.trial_user_whatsapp,
+        CASE
+            WHEN b.kind = 'primeira_aula' THEN 'trial'
+            WHEN b.kind = 'locacao' THEN 'rental'
+            WHEN b.kind = 'group_lesson' THEN 'group_lesson'
+            WHEN b.student_id IS NOT NULL THEN 'student_lesson'
+            ELSE 'other'
+        END,
+        CASE
+            WHEN b.kind = 'primeira_aula' THEN 'Aula grátis'
+            WHEN b.kind = 'locacao' THEN 'Locação'
+            WHEN b.kind = 'group_lesson' THEN 'Turma'
+            WHEN b.student_id IS NOT NULL THEN 'Aula'
+            ELSE 'Evento'
+        END,
+        CASE
+            WHEN b.kind = 'primeira_aula' THEN 'green'
+            WHEN b.kind = 'locacao' THEN 'red'
+            WHEN b.kind = 'group_lesson' THEN 'yellow'
+            WHEN b.student_id IS NOT NULL THEN 'yellow'
+            ELSE 'gray'
+        END,
+        CASE
+            WHEN b.class_group_id IS NOT NULL THEN b.class_group_name
+            WHEN b.kind = 'locacao' THEN COALESCE(b.customer_name, b.student_name)
+            WHEN b.kind = 'primeira_aula'
+                THEN COALESCE(b.trial_user_full_name, b.student_name, b.customer_name)
+            ELSE b.student_name
+        END,
+        b.class_group_id IS NOT NULL,
+        b.end_at - b.start_at > interval '1 day',
+        now()
+    FROM base b
+"""
+
+
+def _refresh_function(*, upsert: bool) -> str:
+    if upsert:
+        # Só sai a linha cujo start_at mudou (a chave da partição é outra) ou
+        # cujo evento sumiu; o resto é atualizado no lugar, como em
+        # teacher_agenda_items.
+        cleanup = """
+            DELETE FROM public.agenda_overview_items aoi
+            WHERE aoi.event_id = ANY(p_event_ids)
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM public.events e
+                  WHERE e.id = aoi.event_id
+                    AND e.start_at = aoi.start_at
+              );
+        """
+        on_conflict = "ON CONFLICT (event_id, start_at) DO UPDATE SET\n" + ",\n".join(
+            f"    {column} = EXCLUDED.{column}" for column in _UPDATED_COLUMNS
+        )
+    else:
+        cleanup = """
+            DELETE FROM public.agenda_overview_items
+            WHERE event_id = ANY(p_event_ids);
+        """
+        on_conflict = ""
+
+    return f"""
+        CREATE OR REPLACE FUNCTION public.fn_refresh_agenda_overview_items(p_event_ids uuid[])
+        RETURNS integer
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_count integer;
+        BEGIN
+            IF p_event_ids IS NULL OR cardinality(p_event_ids) = 0 THEN
+                RETURN 0;
+            END IF;
+            {cleanup}
+            {_PROJECTION_INSERT}
+            {on_conflict};
+
+            GET DIAGNOSTICS v_count = ROW_COUNT;
+            RETURN v_count;
+        END;
+        $$;
+        """
+
+
+def upgrade() -> None:
+    op.execute(_refresh_function(upsert=True))
+
+
+def downgrade() -> None:
+    op.execute(_refresh_function(upsert=False))
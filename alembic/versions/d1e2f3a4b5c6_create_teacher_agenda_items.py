@@ -0,0 +1,522 @@
+"""Create teacher_agenda_items read model
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d1e2f3a4b5
+Create Date: 2026-04-18 10:00:00.000000
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "d1e2f3a4b5c6"
+down_revision = "c0d1e2f3a4b5"
+branch_labels = None
+depends_on = None
+
+TABLE = "teacher_agenda_items"
+
+
+def upgrade() -> None:
+    op.create_table(
+        TABLE,
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("teacher_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("teacher_name", sa.Text(), nullable=True),
+        sa.Column("kind", sa.Text(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("start_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("event_created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("event_updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("court_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("court_name", sa.Text(), nullable=True),
+        sa.Column("student_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("student_name", sa.Text(), nullable=True),
+        sa.Column("class_group_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("class_group_name", sa.Text(), nullable=True),
+        sa.Column(
+            "class_group_students",
+            postgresql.JSONB(),
+            nullable=False,
+            server_default=sa.text("'[]'::jsonb"),
+        ),
+        sa.Column("teacher_event_report_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("teacher_event_report_status", sa.Text(), nullable=True),
+        sa.Column("teacher_event_issue_type", sa.Text(), nullable=True),
+        sa.Column(
+            "refreshed_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.PrimaryKeyConstraint("event_id", name="pk_teacher_agenda_items"),
+        sa.ForeignKeyConstraint(
+            ["event_id"],
+            ["events.id"],
+            name="fk_teacher_agenda_items_event_id",
+            ondelete="CASCADE",
+        ),
+    )
+    op.create_index(
+        "ix_teacher_agenda_items_teacher_start",
+        TABLE,
+        ["teacher_id", "start_at"],
+        unique=False,
+    )
+    op.create_index("ix_teacher_agenda_items_class_group_id", TABLE, ["class_group_id"])
+    op.create_index("ix_teacher_agenda_items_student_id", TABLE, ["student_id"])
+    op.create_index("ix_teacher_agenda_items_court_id", TABLE, ["court_id"])
+
+    # Lista de alunos ativos da turma, no formato de `class_group_students`.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_teacher_agenda_class_group_students(
+            p_class_group_id uuid
+        )
+        RETURNS jsonb
+        LANGUAGE sql
+        STABLE
+        AS $$
+        SELECT COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'student_id', r.student_id,
+                    'student_name', r.student_name
+                )
+                ORDER BY r.sort_name, r.student_id
+            ),
+            '[]'::jsonb
+        )
+        FROM (
+            SELECT DISTINCT ON (s.id)
+                s.id AS student_id,
+                btrim(s.full_name) AS student_name,
+                s.full_name AS sort_name
+            FROM public.class_group_enrollments cge
+            JOIN public.students s
+              ON s.id = cge.student_id
+            WHERE cge.class_group_id = p_class_group_id
+              AND cge.status = 'active'
+              AND s.is_active = TRUE
+              AND btrim(COALESCE(s.full_name, '')) <> ''
+            ORDER BY s.id
+        ) r
+        $$;
+        """
+    )
+
+    # Reprojeta os eventos informados: apaga os que saíram da agenda de
+    # professor e faz upsert do resto com nomes, reporte e lista da turma.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_refresh_teacher_agenda_items(p_event_ids uuid[])
+        RETURNS integer
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_count integer;
+        BEGIN
+            IF p_event_ids IS NULL OR cardinality(p_event_ids) = 0 THEN
+                RETURN 0;
+            END IF;
+
+            DELETE FROM public.teacher_agenda_items tai
+            WHERE tai.event_id = ANY(p_event_ids)
+              AND NOT EXISTS (
+                SELECT 1
+                FROM public.events ev
+                WHERE ev.id = tai.event_id
+                  AND ev.teacher_id IS NOT NULL
+              );
+
+            WITH target AS (
+                SELECT ev.*
+                FROM public.events ev
+                WHERE ev.id = ANY(p_event_ids)
+                  AND ev.teacher_id IS NOT NULL
+            ),
+            rosters AS (
+                SELECT
+                    g.class_group_id,
+                    public.fn_teacher_agenda_class_group_students(g.class_group_id) AS students
+                FROM (
+                    SELECT DISTINCT class_group_id
+                    FROM target
+                    WHERE class_group_id IS NOT NULL
+                ) g
+            )
+            INSERT INTO public.teacher_agenda_items (
+                event_id,
+                teacher_id,
+                teacher_name,
+                kind,
+                status,
+                start_at,
+                end_at,
+                notes,
+                event_created_at,
+                event_updated_at,
+                court_id,
+                court_name,
+                student_id,
+                student_name,
+                class_group_id,
+                class_group_name,
+                class_group_students,
+                teacher_event_report_id,
+                teacher_event_report_status,
+                teacher_event_issue_type,
+                refreshed_at
+            )
+            SELECT
+                ev.id,
+                ev.teacher_id,
+                t.full_name,
+                ev.kind,
+                ev.status,
+                ev.start_at,
+                ev.end_at,
+                ev.notes,
+                ev.created_at,
+                ev.updated_at,
+                ev.court_id,
+                c.name,
+                ev.student_id,
+                s.full_name,
+                ev.class_group_id,
+                cg.name,
+                COALESCE(r.students, '[]'::jsonb),
+                ter.id,
+                ter.report_status,
+                ter.issue_type,
+                now()
+            FROM target ev
+            LEFT JOIN public.courts c
+              ON c.id = ev.court_id
+            LEFT JOIN public.teachers t
+              ON t.id = ev.teacher_id
+            LEFT JOIN public.students s
+              ON s.id = ev.student_id
+            LEFT JOIN public.class_groups cg
+              ON cg.id = ev.class_group_id
+            LEFT JOIN rosters r
+              ON r.class_group_id = ev.class_group_id
+            LEFT JOIN public.teacher_event_reports ter
+              ON ter.event_id = ev.id
+            ON CONFLICT (event_id) DO UPDATE SET
+                teacher_id = EXCLUDED.teacher_id,
+                teacher_name = EXCLUDED.teacher_name,
+                kind = EXCLUDED.kind,
+                status = EXCLUDED.status,
+                start_at = EXCLUDED.start_at,
+                end_at = EXCLUDED.end_at,
+                notes = EXCLUDED.notes,
+                event_created_at = EXCLUDED.event_created_at,
+                event_updated_at = EXCLUDED.event_updated_at,
+                court_id = EXCLUDED.court_id,
+                court_name = EXCLUDED.court_name,
+                student_id = EXCLUDED.student_id,
+                student_name = EXCLUDED.student_name,
+                class_group_id = EXCLUDED.class_group_id,
+                class_group_name = EXCLUDED.class_group_name,
+                class_group_students = EXCLUDED.class_group_students,
+                teacher_event_report_id = EXCLUDED.teacher_event_report_id,
+                teacher_event_report_status = EXCLUDED.teacher_event_report_status,
+                teacher_event_issue_type = EXCLUDED.teacher_event_issue_type,
+                refreshed_at = EXCLUDED.refreshed_at;
+
+            GET DIAGNOSTICS v_count = ROW_COUNT;
+            RETURN v_count;
+        END;
+        $$;
+        """
+    )
+
+    # Só a lista de alunos muda quando mexem em matrículas: atualiza em bloco
+    # todos os itens das turmas afetadas, com uma consulta de lista por turma.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_refresh_teacher_agenda_rosters(
+            p_class_group_ids uuid[]
+        )
+        RETURNS void
+        LANGUAGE sql
+        AS $$
+        UPDATE public.teacher_agenda_items tai
+        SET class_group_students = r.students,
+            refreshed_at = now()
+        FROM (
+            SELECT
+                g.class_group_id,
+                public.fn_teacher_agenda_class_group_students(g.class_group_id) AS students
+            FROM (
+                SELECT DISTINCT unnest(p_class_group_ids) AS class_group_id
+            ) g
+            WHERE g.class_group_id IS NOT NULL
+        ) r
+        WHERE tai.class_group_id = r.class_group_id
+          AND tai.class_group_students IS DISTINCT FROM r.students;
+        $$;
+        """
+    )
+
+    # events: triggers por comando com tabela de transição, para que o sync
+    # de turmas (centenas de linhas num INSERT) reprojete tudo de uma vez.
+    # DELETE é coberto pelo ON DELETE CASCADE.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_teacher_agenda_items_events()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            PERFORM public.fn_refresh_teacher_agenda_items(
+                ARRAY(SELECT id FROM changed_events)
+            );
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_teacher_agenda_items_events_insert
+        AFTER INSERT ON public.events
+        REFERENCING NEW TABLE AS changed_events
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION public.trg_teacher_agenda_items_events();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_teacher_agenda_items_events_update
+        AFTER UPDATE ON public.events
+        REFERENCING NEW TABLE AS changed_events
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION public.trg_teacher_agenda_items_events();
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_teacher_agenda_items_reports()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM public.fn_refresh_teacher_agenda_items(ARRAY[OLD.event_id]);
+            ELSIF TG_OP = 'UPDATE' AND OLD.event_id IS DISTINCT FROM NEW.event_id THEN
+                PERFORM public.fn_refresh_teacher_agenda_items(ARRAY[OLD.event_id, NEW.event_id]);
+            ELSE
+                PERFORM public.fn_refresh_teacher_agenda_items(ARRAY[NEW.event_id]);
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_teacher_agenda_items_reports
+        AFTER INSERT OR UPDATE OR DELETE ON public.teacher_event_reports
+        FOR EACH ROW
+        EXECUTE FUNCTION public.trg_teacher_agenda_items_reports();
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_teacher_agenda_items_enrollments()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM public.fn_refresh_teacher_agenda_rosters(ARRAY[NEW.class_group_id]);
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM public.fn_refresh_teacher_agenda_rosters(ARRAY[OLD.class_group_id]);
+            ELSE
+                PERFORM public.fn_refresh_teacher_agenda_rosters(
+                    ARRAY[OLD.class_group_id, NEW.class_group_id]
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_teacher_agenda_items_enrollments
+        AFTER INSERT OR DELETE OR UPDATE OF class_group_id, student_id, status
+        ON public.class_group_enrollments
+        FOR EACH ROW
+        EXECUTE FUNCTION public.trg_teacher_agenda_items_enrollments();
+        """
+    )
+
+    # Nomes desnormalizados: só disparam quando o nome (ou, no aluno, o
+    # status que tira ele das listas de turma) realmente muda.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_teacher_agenda_items_students()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE public.teacher_agenda_items
+            SET student_name = NEW.full_name,
+                refreshed_at = now()
+            WHERE student_id = NEW.id
+              AND student_name IS DISTINCT FROM NEW.full_name;
+
+            PERFORM public.fn_refresh_teacher_agenda_rosters(
+                ARRAY(
+                    SELECT cge.class_group_id
+                    FROM public.class_group_enrollments cge
+                    WHERE cge.student_id = NEW.id
+                      AND cge.status = 'active'
+                )
+            );
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_teacher_agenda_items_students
+        AFTER UPDATE OF full_name, is_active ON public.students
+        FOR EACH ROW
+        WHEN (
+            OLD.full_name IS DISTINCT FROM NEW.full_name
+            OR OLD.is_active IS DISTINCT FROM NEW.is_active
+        )
+        EXECUTE FUNCTION public.trg_teacher_agenda_items_students();
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_teacher_agenda_items_teachers()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE public.teacher_agenda_items
+            SET teacher_name = NEW.full_name,
+                refreshed_at = now()
+            WHERE teacher_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_teacher_agenda_items_teachers
+        AFTER UPDATE OF full_name ON public.teachers
+        FOR EACH ROW
+        WHEN (OLD.full_name IS DISTINCT FROM NEW.full_name)
+        EXECUTE FUNCTION public.trg_teacher_agenda_items_teachers();
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_teacher_agenda_items_courts()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE public.teacher_agenda_items
+            SET court_name = NEW.name,
+                refreshed_at = now()
+            WHERE court_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_teacher_agenda_items_courts
+        AFTER UPDATE OF name ON public.courts
+        FOR EACH ROW
+        WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION public.trg_teacher_agenda_items_courts();
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_teacher_agenda_items_class_groups()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE public.teacher_agenda_items
+            SET class_group_name = NEW.name,
+                refreshed_at = now()
+            WHERE class_group_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_teacher_agenda_items_class_groups
+        AFTER UPDATE OF name ON public.class_groups
+        FOR EACH ROW
+        WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION public.trg_teacher_agenda_items_class_groups();
+        """
+    )
+
+    # backfill
+    op.execute(
+        """
+        SELECT public.fn_refresh_teacher_agenda_items(
+            ARRAY(SELECT id FROM public.events WHERE teacher_id IS NOT NULL)
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    for trigger_name, table_name in (
+        ("trg_teacher_agenda_items_class_groups", "class_groups"),
+        ("trg_teacher_agenda_items_courts", "courts"),
+        ("trg_teacher_agenda_items_teachers", "teachers"),
+        ("trg_teacher_agenda_items_students", "students"),
+        ("trg_teacher_agenda_items_enrollments", "class_group_enrollments"),
+        ("trg_teacher_agenda_items_reports", "teacher_event_reports"),
+        ("trg_teacher_agenda_items_events_update", "events"),
+        ("trg_teacher_agenda_items_events_insert", "events"),
+    ):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger_name} ON public.{table_name};")
+
+    for function_signature in (
+        "trg_teacher_agenda_items_class_groups()",
+        "trg_teacher_agenda_items_courts()",
+        "trg_teacher_agenda_items_teachers()",
+        "trg_teacher_agenda_items_students()",
+        "trg_teacher_agenda_items_enrollments()",
+        "trg_teacher_agenda_items_reports()",
+        "trg_teacher_agenda_items_events()",
+        "fn_refresh_teacher_agenda_rosters(uuid[])",
+        "fn_refresh_teacher_agenda_items(uuid[])",
+        "fn_teacher_agenda_class_group_students(uuid)",
+    ):
+        op.execute(f"DROP FUNCTION IF EXISTS public.{function_signature};")
+
+    op.drop_index("ix_teacher_agenda_items_court_id", table_name=TABLE)
+    op.drop_index("ix_teacher_agenda_items_student_id", table_name=TABLE)
+    op.drop_index("ix_teacher_agenda_items_class_group_id", table_name=TABLE)
+    op.drop_index("ix_teacher_agenda_items_teacher_start", table_name=TABLE)
+    op.drop_table(TABLE)
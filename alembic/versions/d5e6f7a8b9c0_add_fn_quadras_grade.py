@@ -0,0 +1,93 @@
+"""add fn_quadras_grade
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d9e8f1a2b3
+Create Date: 2026-04-14 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5e6f7a8b9c0"
+down_revision: str | Sequence[str] | None = "c4d9e8f1a2b3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_quadras_grade(
+            p_from timestamptz,
+            p_to timestamptz,
+            p_slot_minutes integer,
+            p_day_start time,
+            p_day_end time
+        )
+        RETURNS TABLE (
+            slot_start timestamptz,
+            slot_end timestamptz,
+            court_id uuid,
+            court_name text
+        )
+        LANGUAGE sql
+        STABLE
+        AS $$
+        WITH days AS (
+            SELECT generate_series(
+                (p_from AT TIME ZONE 'America/Sao_Paulo')::date,
+                (p_to AT TIME ZONE 'America/Sao_Paulo')::date,
+                interval '1 day'
+            )::date AS day
+        ),
+        slots AS (
+            SELECT
+                s.local_start AT TIME ZONE 'America/Sao_Paulo' AS slot_start,
+                (s.local_start + make_interval(mins => p_slot_minutes))
+                    AT TIME ZONE 'America/Sao_Paulo' AS slot_end
+            FROM days d
+            CROSS JOIN LATERAL generate_series(
+                d.day + p_day_start,
+                d.day + p_day_end - make_interval(mins => p_slot_minutes),
+                make_interval(mins => p_slot_minutes)
+            ) AS s(local_start)
+        )
+        SELECT
+            sl.slot_start,
+            sl.slot_end,
+            c.id AS court_id,
+            c.name AS court_name
+        FROM slots sl
+        CROSS JOIN public.courts c
+        WHERE c.is_active = true
+          AND sl.slot_start >= p_from
+          AND sl.slot_end <= p_to
+          AND NOT EXISTS (
+            SELECT 1
+            FROM public.events e
+            WHERE e.court_id = c.id
+              AND e.status = 'confirmado'
+              AND tstzrange(e.start_at, e.end_at, '[)')
+                  && tstzrange(sl.slot_start, sl.slot_end, '[)')
+          )
+        ORDER BY sl.slot_start, c.name;
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP FUNCTION IF EXISTS public.fn_quadras_grade(
+            timestamptz,
+            timestamptz,
+            integer,
+            time,
+            time
+        );
+        """
+    )
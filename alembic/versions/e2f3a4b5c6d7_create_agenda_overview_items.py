@@ -0,0 +1,678 @@
+"""Create agenda_overview_items projection partitioned by month
+
+Revision ID: e2f3a4b5c6d7
+Revises: d1e2f3a4b5c6
+Create Date: 2026-04-18 15:00:00.000000
+"""
+
+from alembic import op
+
+revision = "e2f3a4b5c6d7"
+down_revision = "d1e2f3a4b5c6"
+branch_labels = None
+depends_on = None
+
+TABLE = "agenda_overview_items"
+
+# Partições mensais criadas na migração: do mês do evento mais antigo até
+# esta quantidade de meses à frente (depois disso, ver `--ensure-partitions`).
+PARTITION_MONTHS_AHEAD = 24
+
+
+def upgrade() -> None:
+    # Mesmo formato de `AgendaItemOut`, com grupo/rótulo/cor já calculados.
+    # Não dá para particionar `events` (FKs de locações, aulas grátis,
+    # reportes e reposições + exclusion constraints sem a chave de partição);
+    # a projeção, que não é referenciada por ninguém, é particionada no lugar.
+    op.execute(
+        """
+        CREATE TABLE public.agenda_overview_items (
+            event_id uuid NOT NULL
+                REFERENCES public.events (id) ON DELETE CASCADE,
+            kind text NOT NULL,
+            status text NOT NULL,
+            start_at timestamptz NOT NULL,
+            end_at timestamptz NOT NULL,
+            notes text,
+            court_id uuid NOT NULL,
+            court_name text NOT NULL,
+            teacher_id uuid,
+            teacher_name text,
+            student_id uuid,
+            student_name text,
+            created_by_user_id uuid,
+            created_by_email text,
+            created_at timestamptz NOT NULL,
+            updated_at timestamptz NOT NULL,
+            class_group_id uuid,
+            class_group_name text,
+            class_group_student_names text[],
+            court_rental_id uuid,
+            court_rental_origin text,
+            court_rental_pricing_profile text,
+            court_rental_payment_status text,
+            customer_name text,
+            customer_email text,
+            customer_whatsapp text,
+            trial_lesson_id uuid,
+            trial_user_id uuid,
+            trial_user_name text,
+            trial_user_email text,
+            trial_user_whatsapp text,
+            event_group text NOT NULL,
+            event_label text NOT NULL,
+            color_key text NOT NULL,
+            participant_label text,
+            is_recurring boolean NOT NULL,
+            is_long_running boolean NOT NULL DEFAULT false,
+            refreshed_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT pk_agenda_overview_items PRIMARY KEY (event_id, start_at)
+        ) PARTITION BY RANGE (start_at);
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE public.agenda_overview_items_default
+        PARTITION OF public.agenda_overview_items DEFAULT;
+        """
+    )
+
+    for index_name, definition in (
+        ("ix_agenda_overview_items_start_at", "(start_at)"),
+        ("ix_agenda_overview_items_event_group_start", "(event_group, start_at)"),
+        ("ix_agenda_overview_items_color_key_start", "(color_key, start_at)"),
+        ("ix_agenda_overview_items_participant_label", "(participant_label)"),
+        ("ix_agenda_overview_items_court_start", "(court_id, start_at)"),
+        ("ix_agenda_overview_items_teacher_start", "(teacher_id, start_at)"),
+        ("ix_agenda_overview_items_student_id", "(student_id)"),
+        ("ix_agenda_overview_items_class_group_id", "(class_group_id)"),
+        ("ix_agenda_overview_items_created_by_user_id", "(created_by_user_id)"),
+        ("ix_agenda_overview_items_trial_user_id", "(trial_user_id)"),
+        ("ix_agenda_overview_items_long_running", "(end_at) WHERE is_long_running"),
+    ):
+        op.execute(f"CREATE INDEX {index_name} ON public.{TABLE} {definition};")
+
+    # Cria as partições mensais (mês local de São Paulo) que faltam no
+    # intervalo. Linhas daquele mês que já caíram na partição default são
+    # movidas para a nova partição na mesma transação.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_ensure_agenda_overview_partitions(
+            p_from date,
+            p_to date
+        )
+        RETURNS integer
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_month date := date_trunc('month', p_from)::date;
+            v_lower timestamptz;
+            v_upper timestamptz;
+            v_name text;
+            v_created integer := 0;
+        BEGIN
+            WHILE v_month < p_to LOOP
+                v_name := format('agenda_overview_items_%s', to_char(v_month, 'YYYY_MM'));
+
+                IF to_regclass(format('public.%I', v_name)) IS NULL THEN
+                    v_lower := v_month::timestamp AT TIME ZONE 'America/Sao_Paulo';
+                    v_upper := (v_month + interval '1 month')::timestamp AT TIME ZONE 'America/Sao_Paulo';
+
+                    CREATE TEMP TABLE IF NOT EXISTS agenda_overview_items_moving
+                        (LIKE public.agenda_overview_items)
+                        ON COMMIT DROP;
+                    TRUNCATE agenda_overview_items_moving;
+
+                    WITH moved AS (
+                        DELETE FROM public.agenda_overview_items_default
+                        WHERE start_at >= v_lower
+                          AND start_at < v_upper
+                        RETURNING *
+                    )
+                    INSERT INTO agenda_overview_items_moving
+                    SELECT * FROM moved;
+
+                    EXECUTE format(
+                        'CREATE TABLE public.%I PARTITION OF public.agenda_overview_items '
+                        'FOR VALUES FROM (%L) TO (%L)',
+                        v_name,
+                        v_lower,
+                        v_upper
+                    );
+
+                    INSERT INTO public.agenda_overview_items
+                    SELECT * FROM agenda_overview_items_moving;
+
+                    v_created := v_created + 1;
+                END IF;
+
+                v_month := (v_month + interval '1 month')::date;
+            END LOOP;
+
+            RETURN v_created;
+        END;
+        $$;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_agenda_overview_class_group_student_names(
+            p_class_group_id uuid
+        )
+        RETURNS text[]
+        LANGUAGE sql
+        STABLE
+        AS $$
+        SELECT array_agg(DISTINCT s.full_name ORDER BY s.full_name)
+            FILTER (WHERE s.full_name IS NOT NULL)
+        FROM public.class_group_enrollments cge
+        JOIN public.students s
+          ON s.id = cge.student_id
+        WHERE cge.class_group_id = p_class_group_id
+          AND COALESCE(cge.status, 'active') = 'active'
+        $$;
+        """
+    )
+
+    # Reprojeta os eventos informados (DELETE + INSERT: o start_at pode ter
+    # mudado de partição). Locação/aula grátis: a mais recente do evento.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_refresh_agenda_overview_items(p_event_ids uuid[])
+        RETURNS integer
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_count integer;
+        BEGIN
+            IF p_event_ids IS NULL OR cardinality(p_event_ids) = 0 THEN
+                RETURN 0;
+            END IF;
+
+            DELETE FROM public.agenda_overview_items
+            WHERE event_id = ANY(p_event_ids);
+
+            WITH target AS (
+                SELECT e.*
+                FROM public.events e
+                WHERE e.id = ANY(p_event_ids)
+            ),
+            rosters AS (
+                SELECT
+                    g.class_group_id,
+                    public.fn_agenda_overview_class_group_student_names(g.class_group_id) AS names
+                FROM (
+                    SELECT DISTINCT class_group_id
+                    FROM target
+                    WHERE class_group_id IS NOT NULL
+                ) g
+            ),
+            base AS (
+                SELECT
+                    e.id AS event_id,
+                    e.kind,
+                    e.status,
+                    e.start_at,
+                    e.end_at,
+                    e.notes,
+                    c.id AS court_id,
+                    c.name AS court_name,
+                    t.id AS teacher_id,
+                    t.full_name AS teacher_name,
+                    s.id AS student_id,
+                    s.full_name AS student_name,
+                    creator.id AS created_by_user_id,
+                    creator.email AS created_by_email,
+                    e.created_at,
+                    e.updated_at,
+                    cg.id AS class_group_id,
+                    cg.name AS class_group_name,
+                    r.names AS class_group_student_names,
+                    cr.id AS court_rental_id,
+                    cr.origin AS court_rental_origin,
+                    cr.pricing_profile AS court_rental_pricing_profile,
+                    cr.payment_status AS court_rental_payment_status,
+                    cr.customer_name,
+                    cr.customer_email,
+                    cr.customer_whatsapp,
+                    tl.id AS trial_lesson_id,
+                    trial_user.id AS trial_user_id,
+                    trial_user.full_name AS trial_user_full_name,
+                    trial_user.email AS trial_user_email,
+                    trial_user.whatsapp AS trial_user_whatsapp
+                FROM target e
+                JOIN public.courts c
+                  ON c.id = e.court_id
+                LEFT JOIN public.teachers t
+                  ON t.id = e.teacher_id
+                LEFT JOIN public.students s
+                  ON s.id = e.student_id
+                LEFT JOIN public.users creator
+                  ON creator.id = e.created_by
+                LEFT JOIN public.class_groups cg
+                  ON cg.id = e.class_group_id
+                LEFT JOIN rosters r
+                  ON r.class_group_id = e.class_group_id
+                LEFT JOIN LATERAL (
+                    SELECT *
+                    FROM public.court_rentals cr
+                    WHERE cr.event_id = e.id
+                    ORDER BY cr.created_at DESC, cr.id DESC
+                    LIMIT 1
+                ) cr ON TRUE
+                LEFT JOIN LATERAL (
+                    SELECT *
+                    FROM public.trial_lessons tl
+                    WHERE tl.event_id = e.id
+                    ORDER BY tl.created_at DESC, tl.id DESC
+                    LIMIT 1
+                ) tl ON TRUE
+                LEFT JOIN public.users trial_user
+                  ON trial_user.id = tl.user_id
+            )
+            INSERT INTO public.agenda_overview_items (
+                event_id, kind, status, start_at, end_at, notes,
+                court_id, court_name, teacher_id, teacher_name,
+                student_id, student_name, created_by_user_id, created_by_email,
+                created_at, updated_at,
+                class_group_id, class_group_name, class_group_student_names,
+                court_rental_id, court_rental_origin, court_rental_pricing_profile,
+                court_rental_payment_status, customer_name, customer_email, customer_whatsapp,
+                trial_lesson_id, trial_user_id, trial_user_name, trial_user_email,
+                trial_user_whatsapp,
+                event_group, event_label, color_key, participant_label,
+                is_recurring, is_long_running, refreshed_at
+            )
+            SELECT
+                b.event_id, b.kind, b.status, b.start_at, b.end_at, b.notes,
+                b.court_id, b.court_name, b.teacher_id, b.teacher_name,
+                b.student_id, b.student_name, b.created_by_user_id, b.created_by_email,
+                b.created_at, b.updated_at,
+                b.class_group_id, b.class_group_name, b.class_group_student_names,
+                b.court_rental_id, b.court_rental_origin, b.court_rental_pricing_profile,
+                b.court_rental_payment_status, b.customer_name, b.customer_email,
+                b.customer_whatsapp,
+                b.trial_lesson_id, b.trial_user_id,
+                COALESCE(b.trial_user_full_name, b.customer_name, b.student_name),
+                b.trial_user_email, b.trial_user_whatsapp,
+                CASE
+                    WHEN b.kind = 'primeira_aula' THEN 'trial'
+                    WHEN b.kind = 'locacao' THEN 'rental'
+                    WHEN b.kind = 'group_lesson' THEN 'group_lesson'
+                    WHEN b.student_id IS NOT NULL THEN 'student_lesson'
+                    ELSE 'other'
+                END,
+                CASE
+                    WHEN b.kind = 'primeira_aula' THEN 'Aula grátis'
+                    WHEN b.kind = 'locacao' THEN 'Locação'
+                    WHEN b.kind = 'group_lesson' THEN 'Turma'
+                    WHEN b.student_id IS NOT NULL THEN 'Aula'
+                    ELSE 'Evento'
+                END,
+                CASE
+                    WHEN b.kind = 'primeira_aula' THEN 'green'
+                    WHEN b.kind = 'locacao' THEN 'red'
+                    WHEN b.kind = 'group_lesson' THEN 'yellow'
+                    WHEN b.student_id IS NOT NULL THEN 'yellow'
+                    ELSE 'gray'
+                END,
+                CASE
+                    WHEN b.class_group_id IS NOT NULL THEN b.class_group_name
+                    WHEN b.kind = 'locacao' THEN COALESCE(b.customer_name, b.student_name)
+                    WHEN b.kind = 'primeira_aula'
+                        THEN COALESCE(b.trial_user_full_name, b.student_name, b.customer_name)
+                    ELSE b.student_name
+                END,
+                b.class_group_id IS NOT NULL,
+                b.end_at - b.start_at > interval '1 day',
+                now()
+            FROM base b;
+
+            GET DIAGNOSTICS v_count = ROW_COUNT;
+            RETURN v_count;
+        END;
+        $$;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_refresh_agenda_overview_rosters(
+            p_class_group_ids uuid[]
+        )
+        RETURNS void
+        LANGUAGE sql
+        AS $$
+        UPDATE public.agenda_overview_items aoi
+        SET class_group_student_names = r.names,
+            refreshed_at = now()
+        FROM (
+            SELECT
+                g.class_group_id,
+                public.fn_agenda_overview_class_group_student_names(g.class_group_id) AS names
+            FROM (
+                SELECT DISTINCT unnest(p_class_group_ids) AS class_group_id
+            ) g
+            WHERE g.class_group_id IS NOT NULL
+        ) r
+        WHERE aoi.class_group_id = r.class_group_id
+          AND aoi.class_group_student_names IS DISTINCT FROM r.names;
+        $$;
+        """
+    )
+
+    # events: por comando, com tabela de transição (DELETE = cascade).
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_agenda_overview_items_events()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            PERFORM public.fn_refresh_agenda_overview_items(
+                ARRAY(SELECT id FROM changed_events)
+            );
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    for operation in ("insert", "update"):
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_agenda_overview_items_events_{operation}
+            AFTER {operation.upper()} ON public.events
+            REFERENCING NEW TABLE AS changed_events
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION public.trg_agenda_overview_items_events();
+            """
+        )
+
+    # Locações e aulas grátis: reprojeta o evento antigo e o novo.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_agenda_overview_items_event_links()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM public.fn_refresh_agenda_overview_items(ARRAY[NEW.event_id]);
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM public.fn_refresh_agenda_overview_items(ARRAY[OLD.event_id]);
+            ELSE
+                PERFORM public.fn_refresh_agenda_overview_items(
+                    ARRAY[OLD.event_id, NEW.event_id]
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_agenda_overview_items_court_rentals
+        AFTER INSERT OR DELETE OR UPDATE OF
+            event_id, origin, pricing_profile, payment_status,
+            customer_name, customer_email, customer_whatsapp
+        ON public.court_rentals
+        FOR EACH ROW
+        EXECUTE FUNCTION public.trg_agenda_overview_items_event_links();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_agenda_overview_items_trial_lessons
+        AFTER INSERT OR DELETE OR UPDATE OF event_id, user_id
+        ON public.trial_lessons
+        FOR EACH ROW
+        EXECUTE FUNCTION public.trg_agenda_overview_items_event_links();
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_agenda_overview_items_enrollments()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM public.fn_refresh_agenda_overview_rosters(ARRAY[NEW.class_group_id]);
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM public.fn_refresh_agenda_overview_rosters(ARRAY[OLD.class_group_id]);
+            ELSE
+                PERFORM public.fn_refresh_agenda_overview_rosters(
+                    ARRAY[OLD.class_group_id, NEW.class_group_id]
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_agenda_overview_items_enrollments
+        AFTER INSERT OR DELETE OR UPDATE OF class_group_id, student_id, status
+        ON public.class_group_enrollments
+        FOR EACH ROW
+        EXECUTE FUNCTION public.trg_agenda_overview_items_enrollments();
+        """
+    )
+
+    # Nome do aluno entra em student_name, trial_user_name, participant_label
+    # e nas listas das turmas: reprojeta os eventos dele e as listas.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_agenda_overview_items_students()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            PERFORM public.fn_refresh_agenda_overview_items(
+                ARRAY(
+                    SELECT event_id
+                    FROM public.agenda_overview_items
+                    WHERE student_id = NEW.id
+                )
+            );
+            PERFORM public.fn_refresh_agenda_overview_rosters(
+                ARRAY(
+                    SELECT cge.class_group_id
+                    FROM public.class_group_enrollments cge
+                    WHERE cge.student_id = NEW.id
+                )
+            );
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_agenda_overview_items_students
+        AFTER UPDATE OF full_name ON public.students
+        FOR EACH ROW
+        WHEN (OLD.full_name IS DISTINCT FROM NEW.full_name)
+        EXECUTE FUNCTION public.trg_agenda_overview_items_students();
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_agenda_overview_items_users()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE public.agenda_overview_items
+            SET created_by_email = NEW.email,
+                refreshed_at = now()
+            WHERE created_by_user_id = NEW.id
+              AND created_by_email IS DISTINCT FROM NEW.email;
+
+            PERFORM public.fn_refresh_agenda_overview_items(
+                ARRAY(
+                    SELECT event_id
+                    FROM public.agenda_overview_items
+                    WHERE trial_user_id = NEW.id
+                )
+            );
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_agenda_overview_items_users
+        AFTER UPDATE OF email, full_name, whatsapp ON public.users
+        FOR EACH ROW
+        WHEN (
+            OLD.email IS DISTINCT FROM NEW.email
+            OR OLD.full_name IS DISTINCT FROM NEW.full_name
+            OR OLD.whatsapp IS DISTINCT FROM NEW.whatsapp
+        )
+        EXECUTE FUNCTION public.trg_agenda_overview_items_users();
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_agenda_overview_items_teachers()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE public.agenda_overview_items
+            SET teacher_name = NEW.full_name,
+                refreshed_at = now()
+            WHERE teacher_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_agenda_overview_items_teachers
+        AFTER UPDATE OF full_name ON public.teachers
+        FOR EACH ROW
+        WHEN (OLD.full_name IS DISTINCT FROM NEW.full_name)
+        EXECUTE FUNCTION public.trg_agenda_overview_items_teachers();
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_agenda_overview_items_courts()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE public.agenda_overview_items
+            SET court_name = NEW.name,
+                refreshed_at = now()
+            WHERE court_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_agenda_overview_items_courts
+        AFTER UPDATE OF name ON public.courts
+        FOR EACH ROW
+        WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION public.trg_agenda_overview_items_courts();
+        """
+    )
+
+    # Com turma, participant_label é o nome da turma.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.trg_agenda_overview_items_class_groups()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE public.agenda_overview_items
+            SET class_group_name = NEW.name,
+                participant_label = NEW.name,
+                refreshed_at = now()
+            WHERE class_group_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_agenda_overview_items_class_groups
+        AFTER UPDATE OF name ON public.class_groups
+        FOR EACH ROW
+        WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION public.trg_agenda_overview_items_class_groups();
+        """
+    )
+
+    op.execute(
+        f"""
+        SELECT public.fn_ensure_agenda_overview_partitions(
+            LEAST(
+                COALESCE(
+                    (SELECT min(start_at AT TIME ZONE 'America/Sao_Paulo')::date FROM public.events),
+                    CURRENT_DATE
+                ),
+                CURRENT_DATE
+            ),
+            (CURRENT_DATE + interval '{PARTITION_MONTHS_AHEAD} months')::date
+        );
+        """
+    )
+
+    # backfill
+    op.execute(
+        """
+        SELECT public.fn_refresh_agenda_overview_items(ARRAY(SELECT id FROM public.events));
+        """
+    )
+
+
+def downgrade() -> None:
+    for trigger_name, table_name in (
+        ("trg_agenda_overview_items_class_groups", "class_groups"),
+        ("trg_agenda_overview_items_courts", "courts"),
+        ("trg_agenda_overview_items_teachers", "teachers"),
+        ("trg_agenda_overview_items_users", "users"),
+        ("trg_agenda_overview_items_students", "students"),
+        ("trg_agenda_overview_items_enrollments", "class_group_enrollments"),
+        ("trg_agenda_overview_items_trial_lessons", "trial_lessons"),
+        ("trg_agenda_overview_items_court_rentals", "court_rentals"),
+        ("trg_agenda_overview_items_events_update", "events"),
+        ("trg_agenda_overview_items_events_insert", "events"),
+    ):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger_name} ON public.{table_name};")
+
+    for function_signature in (
+        "trg_agenda_overview_items_class_groups()",
+        "trg_agenda_overview_items_courts()",
+        "trg_agenda_overview_items_teachers()",
+        "trg_agenda_overview_items_users()",
+        "trg_agenda_overview_items_students()",
+        "trg_agenda_overview_items_enrollments()",
+        "trg_agenda_overview_items_event_links()",
+        "trg_agenda_overview_items_events()",
+        "fn_refresh_agenda_overview_rosters(uuid[])",
+        "fn_refresh_agenda_overview_items(uuid[])",
+        "fn_agenda_overview_class_group_student_names(uuid)",
+        "fn_ensure_agenda_overview_partitions(date, date)",
+    ):
+        op.execute(f"DROP FUNCTION IF EXISTS public.{function_signature};")
+
+    # derruba as partições junto
+    op.execute(f"DROP TABLE IF EXISTS public.{TABLE};")
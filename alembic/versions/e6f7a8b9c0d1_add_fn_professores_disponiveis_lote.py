@@ -0,0 +1,128 @@
+"""add fn_professores_disponiveis_lote
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-04-14 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6f7a8b9c0d1"
+down_revision: str | Sequence[str] | None = "d5e6f7a8b9c0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Mesmas regras de fn_professores_disponiveis_v2, avaliadas para uma lista
+    # de intervalos [p_starts[i], p_ends[i]) em uma única passada.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_professores_disponiveis_lote(
+            p_starts timestamptz[],
+            p_ends timestamptz[],
+            p_modality text DEFAULT NULL,
+            p_court_id uuid DEFAULT NULL
+        )
+        RETURNS TABLE (
+            slot_start timestamptz,
+            slot_end timestamptz,
+            teacher_id uuid,
+            full_name text
+        )
+        LANGUAGE sql
+        STABLE
+        AS $$
+        WITH slots AS (
+            SELECT
+                s.slot_start,
+                s.slot_end,
+                (s.slot_start AT TIME ZONE 'America/Sao_Paulo') AS local_start,
+                (s.slot_end AT TIME ZONE 'America/Sao_Paulo') AS local_end
+            FROM unnest(p_starts, p_ends) AS s(slot_start, slot_end)
+            WHERE s.slot_start < s.slot_end
+        ),
+        candidates AS (
+            SELECT
+                sl.slot_start,
+                sl.slot_end,
+                sl.local_start,
+                sl.local_end,
+                t.id AS teacher_id,
+                t.full_name
+            FROM slots sl
+            CROSS JOIN public.teachers t
+            WHERE t.is_active = true
+        )
+        SELECT
+            c.slot_start,
+            c.slot_end,
+            c.teacher_id,
+            c.full_name
+        FROM candidates c
+        WHERE (
+                EXISTS (
+                    SELECT 1
+                    FROM public.teacher_availability_rules r
+                    WHERE r.teacher_id = c.teacher_id
+                      AND r.is_active = true
+                      AND r.weekday = EXTRACT(ISODOW FROM c.local_start)::smallint
+                      AND c.local_start::date >= r.starts_on
+                      AND (r.ends_on IS NULL OR c.local_end::date <= r.ends_on)
+                      AND r.start_time <= c.local_start::time
+                      AND r.end_time >= c.local_end::time
+                      AND (p_modality IS NULL OR r.modality IS NULL OR r.modality = p_modality)
+                      AND (p_court_id IS NULL OR r.court_id IS NULL OR r.court_id = p_court_id)
+                )
+                OR EXISTS (
+                    SELECT 1
+                    FROM public.teacher_availability_exceptions e
+                    WHERE e.teacher_id = c.teacher_id
+                      AND e.is_active = true
+                      AND e.exception_type = 'available_extra'
+                      AND e.start_at <= c.slot_start
+                      AND e.end_at >= c.slot_end
+                      AND (p_modality IS NULL OR e.modality IS NULL OR e.modality = p_modality)
+                      AND (p_court_id IS NULL OR e.court_id IS NULL OR e.court_id = p_court_id)
+                )
+              )
+          AND NOT EXISTS (
+                SELECT 1
+                FROM public.teacher_availability_exceptions e
+                WHERE e.teacher_id = c.teacher_id
+                  AND e.is_active = true
+                  AND e.exception_type = 'blocked'
+                  AND e.start_at < c.slot_end
+                  AND e.end_at > c.slot_start
+                  AND (p_modality IS NULL OR e.modality IS NULL OR e.modality = p_modality)
+                  AND (p_court_id IS NULL OR e.court_id IS NULL OR e.court_id = p_court_id)
+              )
+          AND NOT EXISTS (
+                SELECT 1
+                FROM public.events ev
+                WHERE ev.teacher_id = c.teacher_id
+                  AND COALESCE(ev.status, '') NOT IN ('cancelled', 'canceled')
+                  AND ev.start_at < c.slot_end
+                  AND ev.end_at > c.slot_start
+              )
+        ORDER BY c.slot_start, c.full_name;
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP FUNCTION IF EXISTS public.fn_professores_disponiveis_lote(
+            timestamptz[],
+            timestamptz[],
+            text,
+            uuid
+        );
+        """
+    )
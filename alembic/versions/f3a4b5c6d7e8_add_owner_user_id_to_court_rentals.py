@@ -0,0 +1,61 @@
+"""Add generated owner_user_id and partial indexes to court_rentals
+
+Revision ID: f3a4b5c6d7e8
+Revises: e2f3a4b5c6d7
+Create Date: 2026-04-19 10:00:00.000000
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "f3a4b5c6d7e8"
+down_revision = "e2f3a4b5c6d7"
+branch_labels = None
+depends_on = None
+
+ACTIVE_STATUSES_PREDICATE = (
+    "status IN ('requested', 'awaiting_payment', 'awaiting_proof', "
+    "'awaiting_admin_review', 'scheduled', 'confirmed')"
+)
+PENDING_PAYMENT_PREDICATE = "status = 'awaiting_payment' AND payment_status = 'pending'"
+
+
+def upgrade() -> None:
+    op.add_column(
+        "court_rentals",
+        sa.Column(
+            "owner_user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.Computed("COALESCE(customer_user_id, user_id)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_court_rentals_owner_user_id",
+        "court_rentals",
+        ["owner_user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_court_rentals_owner_active_status",
+        "court_rentals",
+        ["owner_user_id", "status"],
+        unique=False,
+        postgresql_where=sa.text(ACTIVE_STATUSES_PREDICATE),
+    )
+    op.create_index(
+        "ix_court_rentals_pending_payment_expires_at",
+        "court_rentals",
+        ["payment_expires_at"],
+        unique=False,
+        postgresql_where=sa.text(PENDING_PAYMENT_PREDICATE),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_court_rentals_pending_payment_expires_at", table_name="court_rentals")
+    op.drop_index("ix_court_rentals_owner_active_status", table_name="court_rentals")
+    op.drop_index("ix_court_rentals_owner_user_id", table_name="court_rentals")
+    op.drop_column("court_rentals", "owner_user_id")
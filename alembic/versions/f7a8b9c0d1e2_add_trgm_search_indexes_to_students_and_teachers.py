@@ -0,0 +1,54 @@
+"""add trigram search indexes to students and teachers
+
+Revision ID: f7a8b9c0d1e2
+Revises: e6f7a8b9c0d1
+Create Date: 2026-04-15 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f7a8b9c0d1e2"
+down_revision: str | Sequence[str] | None = "e6f7a8b9c0d1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public")
+
+    # As expressões precisam bater com as buscas ILIKE de /students e /teachers.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_students_full_name_trgm
+        ON public.students USING gin (full_name public.gin_trgm_ops)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_students_email_trgm
+        ON public.students USING gin ((CAST(email AS text)) public.gin_trgm_ops)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_students_phone_trgm
+        ON public.students USING gin (phone public.gin_trgm_ops)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_teachers_full_name_trgm
+        ON public.teachers USING gin (full_name public.gin_trgm_ops)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS public.ix_teachers_full_name_trgm")
+    op.execute("DROP INDEX IF EXISTS public.ix_students_phone_trgm")
+    op.execute("DROP INDEX IF EXISTS public.ix_students_email_trgm")
+    op.execute("DROP INDEX IF EXISTS public.ix_students_full_name_trgm")
@@ -1,10 +1,15 @@
+from collections.abc import Iterator
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
+from sqlalchemy.orm import Session
 
 from app.core.security import decode_access_token
+from app.db.session import get_db
+from app.services.catalog_cache import invalidate_catalogs
+from app.services.user_access import CurrentUser, load_current_user
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
@@ -42,3 +47,66 @@ def get_current_user_id(
         )
 
     return str(user_id)
+
+
+def get_current_user(
+    request: Request,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    db: Annotated[Session, Depends(get_db)],
+) -> CurrentUser:
+    """
+    Usuário autenticado e ativo, carregado uma vez por requisição e guardado
+    em `request.state.current_user`.
+    """
+
+    user = getattr(request.state, "current_user", None)
+    if user is not None:
+        return user
+
+    user = load_current_user(db, user_id)
+    if user is None or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuário inválido",
+        )
+
+    request.state.current_user = user
+    return user
+
+
+def require_admin(user: Annotated[CurrentUser, Depends(get_current_user)]) -> CurrentUser:
+    if not user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso permitido apenas para administradores.",
+        )
+    return user
+
+
+def require_teacher(user: Annotated[CurrentUser, Depends(get_current_user)]) -> CurrentUser:
+    # admin também passa, como nas rotas de professor já existentes
+    if not (user.is_teacher or user.is_admin):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso permitido apenas para professores autenticados.",
+        )
+    return user
+
+
+def invalidate_catalogs_on_write(*catalog_keys: str):
+    """
+    Dependência de router: depois de qualquer requisição de escrita, derruba
+    os catálogos em cache que dependem das tabelas daquele router, aqui e
+    (pelo NOTIFY, numa transação curta) nos outros processos.
+    """
+
+    def dependency(
+        request: Request,
+        db: Annotated[Session, Depends(get_db)],
+    ) -> Iterator[None]:
+        yield
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            invalidate_catalogs(db, *catalog_keys)
+            db.commit()
+
+    return dependency
@@ -2,160 +2,85 @@ from datetime import datetime
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user_id
+from app.api.v1.deps import get_current_user_id, require_admin
 from app.db.session import get_db
 from app.schemas.agenda import AgendaItemOut
+from app.services.agenda_overview import AGENDA_OVERVIEW_SPAN_BOUND
 
 router = APIRouter()
 
 
+# Lê a projeção `agenda_overview_items` (mantida por triggers). O corte por
+# start_at poda partições; eventos mais longos que o limite vêm do índice
+# parcial de `is_long_running`.
 ADMIN_AGENDA_OVERVIEW_SELECT = """
-WITH group_students AS (
-  SELECT
-    cge.class_group_id,
-    array_agg(DISTINCT s.full_name ORDER BY s.full_name)
-      FILTER (WHERE s.full_name IS NOT NULL) AS class_group_student_names
-  FROM public.class_group_enrollments cge
-  JOIN public.students s
-    ON s.id = cge.student_id
-  WHERE COALESCE(cge.status, 'active') = 'active'
-  GROUP BY cge.class_group_id
+WITH window_items AS (
+  SELECT *
+  FROM public.agenda_overview_items
+  WHERE start_at >= :p_scan_from
+    AND start_at < :p_to
+    AND end_at > :p_from
+  UNION ALL
+  SELECT *
+  FROM public.agenda_overview_items
+  WHERE is_long_running
+    AND start_at < :p_scan_from
+    AND end_at > :p_from
 )
 SELECT
-  e.id AS event_id,
-  e.kind,
-  e.status,
-  e.start_at,
-  e.end_at,
-  e.notes,
-  c.id AS court_id,
-  c.name AS court_name,
-  t.id AS teacher_id,
-  t.full_name AS teacher_name,
-  s.id AS student_id,
-  s.full_name AS student_name,
-  creator.id AS created_by_user_id,
-  creator.email AS created_by_email,
-  e.created_at,
-  e.updated_at,
-  cg.id AS class_group_id,
-  cg.name AS class_group_name,
-  gs.class_group_student_names,
-  cr.id AS court_rental_id,
-  cr.origin AS court_rental_origin,
-  cr.pricing_profile AS court_rental_pricing_profile,
-  cr.payment_status AS court_rental_payment_status,
-  cr.customer_name,
-  cr.customer_email,
-  cr.customer_whatsapp,
-  tl.id AS trial_lesson_id,
-  trial_user.id AS trial_user_id,
-  COALESCE(trial_user.full_name, cr.customer_name, s.full_name) AS trial_user_name,
-  trial_user.email AS trial_user_email,
-  trial_user.whatsapp AS trial_user_whatsapp,
-  CASE
-    WHEN e.kind = 'primeira_aula' THEN 'trial'
-    WHEN e.kind = 'locacao' THEN 'rental'
-    WHEN e.kind = 'group_lesson' THEN 'group_lesson'
-    WHEN e.student_id IS NOT NULL THEN 'student_lesson'
-    ELSE 'other'
-  END AS event_group,
-  CASE
-    WHEN e.kind = 'primeira_aula' THEN 'Aula grátis'
-    WHEN e.kind = 'locacao' THEN 'Locação'
-    WHEN e.kind = 'group_lesson' THEN 'Turma'
-    WHEN e.student_id IS NOT NULL THEN 'Aula'
-    ELSE 'Evento'
-  END AS event_label,
-  CASE
-    WHEN e.kind = 'primeira_aula' THEN 'green'
-    WHEN e.kind = 'locacao' THEN 'red'
-    WHEN e.kind = 'group_lesson' THEN 'yellow'
-    WHEN e.student_id IS NOT NULL THEN 'yellow'
-    ELSE 'gray'
-  END AS color_key,
-  CASE
-    WHEN cg.id IS NOT NULL THEN cg.name
-    WHEN e.kind = 'locacao' THEN COALESCE(cr.customer_name, s.full_name)
-    WHEN e.kind = 'primeira_aula' THEN COALESCE(trial_user.full_name, s.full_name, cr.customer_name)
-    ELSE s.full_name
-  END AS participant_label,
-  (e.class_group_id IS NOT NULL) AS is_recurring
-FROM public.events e
-JOIN public.courts c
-  ON c.id = e.court_id
-LEFT JOIN public.teachers t
-  ON t.id = e.teacher_id
-LEFT JOIN public.students s
-  ON s.id = e.student_id
-LEFT JOIN public.users creator
-  ON creator.id = e.created_by
-LEFT JOIN public.class_groups cg
-  ON cg.id = e.class_group_id
-LEFT JOIN group_students gs
-  ON gs.class_group_id = e.class_group_id
-LEFT JOIN public.court_rentals cr
-  ON cr.event_id = e.id
-LEFT JOIN public.trial_lessons tl
-  ON tl.event_id = e.id
-LEFT JOIN public.users trial_user
-  ON trial_user.id = tl.user_id
+  i.event_id,
+  i.kind,
+  i.status,
+  i.start_at,
+  i.end_at,
+  i.notes,
+  i.court_id,
+  i.court_name,
+  i.teacher_id,
+  i.teacher_name,
+  i.student_id,
+  i.student_name,
+  i.created_by_user_id,
+  i.created_by_email,
+  i.created_at,
+  i.updated_at,
+  i.class_group_id,
+  i.class_group_name,
+  i.class_group_student_names,
+  i.court_rental_id,
+  i.court_rental_origin,
+  i.court_rental_pricing_profile,
+  i.court_rental_payment_status,
+  i.customer_name,
+  i.customer_email,
+  i.customer_whatsapp,
+  i.trial_lesson_id,
+  i.trial_user_id,
+  i.trial_user_name,
+  i.trial_user_email,
+  i.trial_user_whatsapp,
+  i.event_group,
+  i.event_label,
+  i.color_key,
+  i.participant_label,
+  i.is_recurring
+FROM window_items i
 """
 
 
 ADMIN_AGENDA_OVERVIEW_ORDER_BY = """
 ORDER BY
-  e.start_at,
-  c.name,
-  COALESCE(t.full_name, ''),
-  COALESCE(
-    CASE
-      WHEN cg.id IS NOT NULL THEN cg.name
-      WHEN e.kind = 'locacao' THEN COALESCE(cr.customer_name, s.full_name)
-      WHEN e.kind = 'primeira_aula' THEN COALESCE(trial_user.full_name, s.full_name, cr.customer_name)
-      ELSE s.full_name
-    END,
-    ''
-  )
+  i.start_at,
+  i.court_name,
+  COALESCE(i.teacher_name, ''),
+  COALESCE(i.participant_label, '')
 """
 
 
-def _get_current_user_row(db: Session, user_id: str):
-    return (
-        db.execute(
-            text(
-                """
-                SELECT id, email, role, is_active
-                FROM public.users
-                WHERE id = :user_id
-                """
-            ),
-            {"user_id": user_id},
-        )
-        .mappings()
-        .first()
-    )
-
-
-def _require_admin(db: Session, user_id: str) -> None:
-    user = _get_current_user_row(db, user_id)
-    if not user or not user["is_active"]:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário inválido",
-        )
-
-    if not str(user["role"]).startswith("admin"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Apenas administradores podem visualizar a visão geral da agenda.",
-        )
-
-
 def _validate_range(from_: datetime, to: datetime, *, max_days: int) -> None:
     if from_ >= to:
         raise HTTPException(status_code=422, detail="'from' precisa ser menor que 'to'")
@@ -178,52 +103,41 @@ def _build_admin_overview_query(
     event_group: str | None,
     only_recurring: bool | None,
 ) -> tuple[str, dict[str, object]]:
-    where_clauses = [
-        "e.start_at < :p_to",
-        "e.end_at > :p_from",
-    ]
+    where_clauses: list[str] = []
     params: dict[str, object] = {
         "p_from": from_,
         "p_to": to,
+        "p_scan_from": from_ - AGENDA_OVERVIEW_SPAN_BOUND,
     }
 
     if status_value is not None:
-        where_clauses.append("e.status = :p_status")
+        where_clauses.append("i.status = :p_status")
         params["p_status"] = status_value
 
     if kind_value is not None:
-        where_clauses.append("e.kind = :p_kind")
+        where_clauses.append("i.kind = :p_kind")
         params["p_kind"] = kind_value
 
     if court_id is not None:
-        where_clauses.append("e.court_id = :p_court")
+        where_clauses.append("i.court_id = :p_court")
         params["p_court"] = court_id
 
     if teacher_id is not None:
-        where_clauses.append("e.teacher_id = :p_teacher")
+        where_clauses.append("i.teacher_id = :p_teacher")
         params["p_teacher"] = teacher_id
 
     if event_group is not None:
-        where_clauses.append(
-            """
-            CASE
-              WHEN e.kind = 'primeira_aula' THEN 'trial'
-              WHEN e.kind = 'locacao' THEN 'rental'
-              WHEN e.kind = 'group_lesson' THEN 'group_lesson'
-              WHEN e.student_id IS NOT NULL THEN 'student_lesson'
-              ELSE 'other'
-            END = :p_event_group
-            """
-        )
+        where_clauses.append("i.event_group = :p_event_group")
         params["p_event_group"] = event_group
 
     if only_recurring is not None:
-        where_clauses.append("(e.class_group_id IS NOT NULL) = :p_only_recurring")
+        where_clauses.append("i.is_recurring = :p_only_recurring")
         params["p_only_recurring"] = only_recurring
 
+    where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
     sql = f"""
     {ADMIN_AGENDA_OVERVIEW_SELECT}
-    WHERE {" AND ".join(where_clauses)}
+    {where_sql}
     {ADMIN_AGENDA_OVERVIEW_ORDER_BY}
     """
 
@@ -275,7 +189,9 @@ def listar_agenda(
     return rows
 
 
-@router.get("/admin-overview", response_model=list[AgendaItemOut])
+@router.get(
+    "/admin-overview", response_model=list[AgendaItemOut], dependencies=[Depends(require_admin)]
+)
 def listar_agenda_admin_overview(
     from_: Annotated[datetime, Query(alias="from")],
     to: Annotated[datetime, Query()],
@@ -286,9 +202,7 @@ def listar_agenda_admin_overview(
     event_group: Annotated[str | None, Query()] = None,
     only_recurring: Annotated[bool | None, Query()] = None,
     db: Annotated[Session, Depends(get_db)] = None,  # type: ignore[assignment]
-    user_id: Annotated[str, Depends(get_current_user_id)] = "",  # type: ignore[assignment]
 ):
-    _require_admin(db, user_id)
     _validate_range(from_, to, max_days=62)
 
     sql, params = _build_admin_overview_query(
@@ -40,10 +40,8 @@ from app.schemas.auth import (
     TokenOut,
 )
 from app.services.email_sender import (
-    ConsoleEmailSender,
     EmailSendError,
-    SmtpConfig,
-    SmtpEmailSender,
+    build_email_sender,
 )
 from app.services.email_verification import (
     EmailVerificationExpired,
@@ -145,20 +143,6 @@ def _normalize_guardian_relationship(s: str | None) -> str | None:
     return v or None
 
 
-def _get_email_sender():
-    if settings.email_sender_backend.lower() == "smtp":
-        cfg = SmtpConfig(
-            host=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_username,
-            password=settings.smtp_password,
-            mail_from=settings.smtp_from,
-            use_tls=settings.smtp_use_tls,
-        )
-        return SmtpEmailSender(cfg)
-    return ConsoleEmailSender()
-
-
 def _raise_register_conflict(code: str, message: str) -> None:
     raise HTTPException(
         status_code=409,
@@ -784,7 +768,7 @@ def register(data: RegisterIn, request: Request, db: DBSession):
 
     verify_link = f"{settings.public_api_url}/api/v1/auth/verify-email?token={issued.token}"
 
-    sender = _get_email_sender()
+    sender = build_email_sender()
     try:
         sender.send_verification_email(user.email, verify_link)
     except EmailSendError as e:
@@ -828,7 +812,7 @@ def resend_verification(data: ResendVerificationIn, request: Request, db: DBSess
 
     verify_link = f"{settings.public_api_url}/api/v1/auth/verify-email?token={issued.token}"
 
-    sender = _get_email_sender()
+    sender = build_email_sender()
     try:
         sender.send_verification_email(user.email, verify_link)
     except EmailSendError as e:
@@ -895,7 +879,7 @@ def forgot_password(data: ForgotPasswordRequestIn, request: Request, db: DBSessi
 
     reset_link = _build_password_reset_link(issued.token)
 
-    sender = _get_email_sender()
+    sender = build_email_sender()
     try:
         sender.send_password_reset_email(user.email, reset_link)
     except EmailSendError as e:
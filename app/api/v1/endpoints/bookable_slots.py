@@ -13,7 +13,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user_id
+from app.api.v1.deps import get_current_user_id, require_admin
 from app.db.session import get_db
 from app.schemas.bookable_slots import (
     BookableSlotBulkCreateIn,
@@ -57,38 +57,6 @@ CSV_HUMAN_HEADERS = [
 ]
 
 
-def _get_current_user_row(db: Session, user_id: str):
-    return (
-        db.execute(
-            text(
-                """
-                SELECT id, email, role, is_active
-                FROM public.users
-                WHERE id = :user_id
-                """
-            ),
-            {"user_id": user_id},
-        )
-        .mappings()
-        .first()
-    )
-
-
-def _require_admin(db: Session, user_id: str) -> None:
-    user = _get_current_user_row(db, user_id)
-    if not user or not user["is_active"]:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário inválido",
-        )
-
-    if user["role"] != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Apenas administradores podem gerenciar horários ofertáveis.",
-        )
-
-
 def _validate_payload(
     payload: BookableSlotCreateIn | BookableSlotUpdateIn | BookableSlotBulkRowIn,
 ) -> None:
@@ -550,13 +518,16 @@ def get_bookable_slot(
     return _get_slot_or_404(db, slot_id)
 
 
-@router.post("/", response_model=BookableSlotOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=BookableSlotOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
+)
 def create_bookable_slot(
     payload: BookableSlotCreateIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _validate_payload(payload)
 
     try:
@@ -632,15 +603,12 @@ def create_bookable_slot(
         raise _integrity_to_http(e) from e
 
 
-@router.patch("/{slot_id}", response_model=BookableSlotOut)
+@router.patch("/{slot_id}", response_model=BookableSlotOut, dependencies=[Depends(require_admin)])
 def update_bookable_slot(
     slot_id: UUID,
     payload: BookableSlotUpdateIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     current = _get_slot_or_404(db, slot_id)
 
     merged = {
@@ -719,13 +687,13 @@ def update_bookable_slot(
         raise _integrity_to_http(e) from e
 
 
-@router.patch("/{slot_id}/deactivate", response_model=BookableSlotOut)
+@router.patch(
+    "/{slot_id}/deactivate", response_model=BookableSlotOut, dependencies=[Depends(require_admin)]
+)
 def deactivate_bookable_slot(
     slot_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_slot_or_404(db, slot_id)
 
     row = (
@@ -764,26 +732,29 @@ def deactivate_bookable_slot(
     return row
 
 
-@router.post("/bulk", response_model=BookableSlotBulkCreateOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/bulk",
+    response_model=BookableSlotBulkCreateOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
+)
 def bulk_create_bookable_slots(
     payload: BookableSlotBulkCreateIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     return _build_bulk_result(db, payload.items)
 
 
 @router.post(
-    "/bulk/csv", response_model=BookableSlotBulkCreateOut, status_code=status.HTTP_201_CREATED
+    "/bulk/csv",
+    response_model=BookableSlotBulkCreateOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
 )
 def bulk_create_bookable_slots_from_csv(
     file: Annotated[UploadFile, File(...)],
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     filename = file.filename or ""
     if not filename.lower().endswith(".csv"):
         raise HTTPException(
@@ -877,15 +848,15 @@ def bulk_create_bookable_slots_from_csv(
 
 
 @router.post(
-    "/bulk/csv-human", response_model=BookableSlotBulkCreateOut, status_code=status.HTTP_201_CREATED
+    "/bulk/csv-human",
+    response_model=BookableSlotBulkCreateOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
 )
 def bulk_create_bookable_slots_from_csv_human(
     file: Annotated[UploadFile, File(...)],
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     filename = file.filename or ""
     if not filename.lower().endswith(".csv"):
         raise HTTPException(
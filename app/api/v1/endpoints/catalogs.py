@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from email.utils import format_datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
@@ -17,6 +18,14 @@ from app.schemas.catalogs import (
     CatalogWeekdayOptionOut,
     ClassGroupCatalogsOut,
 )
+from app.services.catalog_cache import (
+    CATALOG_COURTS,
+    CATALOG_STUDENTS,
+    CATALOG_TEACHERS,
+    CatalogEntry,
+    catalog_cache,
+    combine_etag,
+)
 
 router = APIRouter(prefix="/catalogs")
 
@@ -98,29 +107,92 @@ def _get_weekdays():
     ]
 
 
+def _cached_courts(db: Session) -> CatalogEntry:
+    return catalog_cache.get_or_load(CATALOG_COURTS, lambda: _get_courts(db))
+
+
+def _cached_teachers(db: Session) -> CatalogEntry:
+    return catalog_cache.get_or_load(CATALOG_TEACHERS, lambda: _get_teachers(db))
+
+
+def _cached_students(db: Session) -> CatalogEntry:
+    return catalog_cache.get_or_load(CATALOG_STUDENTS, lambda: _get_students(db))
+
+
+def _not_modified_or_tag(
+    request: Request,
+    response: Response,
+    entries: list[CatalogEntry],
+    *,
+    variant: str = "",
+) -> Response | None:
+    """
+    Aplica ETag/Last-Modified e devolve um 304 pronto quando o cliente já tem
+    a versão atual (If-None-Match tem precedência sobre If-Modified-Since).
+    """
+
+    etag = combine_etag(entries, salt=f"{request.url.path}?{variant}")
+    last_modified = format_datetime(max(entry.last_modified for entry in entries), usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": "private, no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        if etag in candidates or f"W/{etag}" in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get("if-modified-since") == last_modified:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
 @router.get("/courts", response_model=list[CatalogCourtOut])
 def list_courts(
+    request: Request,
+    response: Response,
     db: Annotated[Session, Depends(get_db)],
     _user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    return _get_courts(db)
+    courts = _cached_courts(db)
+    not_modified = _not_modified_or_tag(request, response, [courts])
+    if not_modified is not None:
+        return not_modified
+    return courts.rows
 
 
 @router.get("/teachers", response_model=list[CatalogTeacherOut])
 def list_teachers(
+    request: Request,
+    response: Response,
     db: Annotated[Session, Depends(get_db)],
     _user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    return _get_teachers(db)
+    teachers = _cached_teachers(db)
+    not_modified = _not_modified_or_tag(request, response, [teachers])
+    if not_modified is not None:
+        return not_modified
+    return teachers.rows
 
 
 @router.get("/students", response_model=list[CatalogStudentOut])
 def list_students(
+    request: Request,
+    response: Response,
     db: Annotated[Session, Depends(get_db)],
     _user_id: Annotated[str, Depends(get_current_user_id)],
     is_active: bool | None = None,
 ):
-    rows = _get_students(db)
+    students = _cached_students(db)
+    not_modified = _not_modified_or_tag(request, response, [students], variant=str(is_active))
+    if not_modified is not None:
+        return not_modified
+
+    rows = students.rows
 
     if is_active is None:
         return [CatalogStudentOut(**row) for row in rows]
@@ -158,6 +230,8 @@ def list_weekdays(
 
 @router.get("/bookable-slots", response_model=BookableSlotCatalogsOut)
 def get_bookable_slot_catalogs(
+    request: Request,
+    response: Response,
     db: Annotated[Session, Depends(get_db)],
     _user_id: Annotated[str, Depends(get_current_user_id)],
 ):
@@ -167,19 +241,25 @@ def get_bookable_slot_catalogs(
     ]
 
     weekdays = _get_weekdays()
-    courts = _get_courts(db)
-    teachers = _get_teachers(db)
+    courts = _cached_courts(db)
+    teachers = _cached_teachers(db)
+
+    not_modified = _not_modified_or_tag(request, response, [courts, teachers])
+    if not_modified is not None:
+        return not_modified
 
     return BookableSlotCatalogsOut(
         modalities=modalities,
         weekdays=weekdays,
-        courts=[CatalogCourtOut(**row) for row in courts],
-        teachers=[CatalogTeacherOut(**row) for row in teachers],
+        courts=[CatalogCourtOut(**row) for row in courts.rows],
+        teachers=[CatalogTeacherOut(**row) for row in teachers.rows],
     )
 
 
 @router.get("/class-groups", response_model=ClassGroupCatalogsOut)
 def get_class_group_catalogs(
+    request: Request,
+    response: Response,
     db: Annotated[Session, Depends(get_db)],
     _user_id: Annotated[str, Depends(get_current_user_id)],
 ):
@@ -190,14 +270,18 @@ def get_class_group_catalogs(
     ]
 
     weekdays = _get_weekdays()
-    courts = _get_courts(db)
-    teachers = _get_teachers(db)
-    students = _get_students(db)
+    courts = _cached_courts(db)
+    teachers = _cached_teachers(db)
+    students = _cached_students(db)
+
+    not_modified = _not_modified_or_tag(request, response, [courts, teachers, students])
+    if not_modified is not None:
+        return not_modified
 
     return ClassGroupCatalogsOut(
         levels=levels,
         weekdays=weekdays,
-        courts=[CatalogCourtOut(**row) for row in courts],
-        teachers=[CatalogTeacherOut(**row) for row in teachers],
-        students=[CatalogStudentOut(**row) for row in students],
+        courts=[CatalogCourtOut(**row) for row in courts.rows],
+        teachers=[CatalogTeacherOut(**row) for row in teachers.rows],
+        students=[CatalogStudentOut(**row) for row in students.rows],
     )
@@ -6,11 +6,11 @@ from uuid import UUID
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user_id
+from app.api.v1.deps import get_current_user_id, require_admin
 from app.db.session import get_db
 from app.schemas.class_groups import (
     ClassGroupCreateIn,
@@ -29,42 +29,11 @@ from app.schemas.class_groups import (
     ClassGroupStatusHistoryItemOut,
     ClassGroupUpdateIn,
 )
+from app.services.student_home_cache import invalidate_student_home
 
 router = APIRouter(prefix="/class-groups")
 
 
-def _get_current_user_row(db: Session, user_id: str):
-    return (
-        db.execute(
-            text(
-                """
-                SELECT id, email, role, is_active
-                FROM public.users
-                WHERE id = :user_id
-                """
-            ),
-            {"user_id": user_id},
-        )
-        .mappings()
-        .first()
-    )
-
-
-def _require_admin(db: Session, user_id: str) -> None:
-    user = _get_current_user_row(db, user_id)
-    if not user or not user["is_active"]:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário inválido",
-        )
-
-    if user["role"] != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Apenas administradores podem gerenciar turmas.",
-        )
-
-
 def _validate_class_group_payload(payload: ClassGroupCreateIn | ClassGroupUpdateIn) -> None:
     capacity = getattr(payload, "capacity", None)
     if capacity is not None and capacity <= 0:
@@ -338,66 +307,6 @@ def _iter_schedule_occurrences(
         current += timedelta(days=7)
 
 
-def _resolve_group_teacher_id_for_date(
-    db: Session,
-    *,
-    group_id: UUID,
-    target_date: date,
-) -> UUID | None:
-    assignment = (
-        db.execute(
-            text(
-                """
-                SELECT
-                  teacher_id
-                FROM public.class_group_teacher_assignments
-                WHERE class_group_id = :group_id
-                  AND is_active = TRUE
-                  AND starts_on <= :target_date
-                  AND (
-                    ends_on IS NULL
-                    OR ends_on >= :target_date
-                  )
-                ORDER BY
-                  starts_on DESC,
-                  created_at DESC,
-                  id DESC
-                LIMIT 1
-                """
-            ),
-            {
-                "group_id": group_id,
-                "target_date": target_date,
-            },
-        )
-        .mappings()
-        .first()
-    )
-
-    if assignment:
-        return assignment["teacher_id"]
-
-    legacy = (
-        db.execute(
-            text(
-                """
-                SELECT teacher_id
-                FROM public.class_groups
-                WHERE id = :group_id
-                """
-            ),
-            {"group_id": group_id},
-        )
-        .mappings()
-        .first()
-    )
-
-    if legacy:
-        return legacy["teacher_id"]
-
-    return None
-
-
 def _sync_group_teacher_assignments_from_legacy_teacher_id(
     db: Session,
     *,
@@ -514,50 +423,22 @@ def _sync_group_teacher_assignments_from_legacy_teacher_id(
     )
 
 
-def _sync_group_lesson_events(db: Session, group_id: UUID, user_id: str) -> None:
-    window_start, window_end, window_start_date, window_end_date = _group_lesson_window()
-    tz = _local_tz()
-
-    db.execute(
-        text(
-            """
-            DELETE FROM public.events
-            WHERE class_group_id = :group_id
-              AND kind = 'group_lesson'
-              AND start_at >= :window_start
-              AND start_at <= :window_end
-            """
-        ),
-        {
-            "group_id": group_id,
-            "window_start": window_start,
-            "window_end": window_end,
-        },
-    )
-
-    group = _get_class_group_or_404(db, group_id)
-
-    if not group["is_active"]:
-        return
-
-    if group["court_id"] is None:
-        return
-
-    schedules = (
+def _load_group_teacher_assignments(
+    db: Session,
+    *,
+    group_id: UUID,
+    window_start_date: date,
+    window_end_date: date,
+):
+    return (
         db.execute(
             text(
                 """
                 SELECT
-                  id,
-                  class_group_id,
-                  weekday,
-                  start_time,
-                  end_time,
+                  teacher_id,
                   starts_on,
-                  ends_on,
-                  is_active,
-                  notes
-                FROM public.class_group_schedules
+                  ends_on
+                FROM public.class_group_teacher_assignments
                 WHERE class_group_id = :group_id
                   AND is_active = TRUE
                   AND starts_on <= :window_end_date
@@ -566,10 +447,9 @@ def _sync_group_lesson_events(db: Session, group_id: UUID, user_id: str) -> None
                     OR ends_on >= :window_start_date
                   )
                 ORDER BY
-                  weekday,
-                  start_time,
-                  starts_on,
-                  id
+                  starts_on DESC,
+                  created_at DESC,
+                  id DESC
                 """
             ),
             {
@@ -582,75 +462,245 @@ def _sync_group_lesson_events(db: Session, group_id: UUID, user_id: str) -> None
         .all()
     )
 
-    if not schedules:
-        return
 
-    created_by_uuid = UUID(user_id)
+def _pick_group_teacher_id_for_date(
+    assignments,
+    *,
+    target_date: date,
+    legacy_teacher_id: UUID | None,
+) -> UUID | None:
+    # Atribuição vigente na data (mais recente primeiro) ou o professor legado
+    # da turma. `assignments` já vem ordenado por starts_on/created_at/id desc.
+    for assignment in assignments:
+        if assignment["starts_on"] > target_date:
+            continue
+        if assignment["ends_on"] is not None and assignment["ends_on"] < target_date:
+            continue
+        return assignment["teacher_id"]
 
-    for schedule in schedules:
-        event_notes = schedule["notes"] if schedule["notes"] is not None else group["notes"]
+    return legacy_teacher_id
 
-        for occurrence_date in _iter_schedule_occurrences(
-            weekday=int(schedule["weekday"]),
-            starts_on=schedule["starts_on"],
-            ends_on=schedule["ends_on"],
-            window_start_date=window_start_date,
-            window_end_date=window_end_date,
-        ):
-            start_at = datetime.combine(occurrence_date, schedule["start_time"], tzinfo=tz)
-            end_at = datetime.combine(occurrence_date, schedule["end_time"], tzinfo=tz)
 
-            if start_at < window_start or start_at > window_end:
-                continue
+def _sync_group_lesson_events(db: Session, group_id: UUID, user_id: str) -> None:
+    """
+    Materializa as aulas da turma na janela de 60 dias comparando com os
+    eventos já existentes: aulas inalteradas mantêm o id (e com ele relatórios
+    e reposições vinculados), as alteradas são atualizadas e só o que sobra é
+    removido ou inserido em lote.
+    """
 
-            teacher_id = _resolve_group_teacher_id_for_date(
-                db,
-                group_id=group_id,
-                target_date=occurrence_date,
-            )
+    # horários/turma mudaram: a home de todos os alunos da turma fica velha
+    invalidate_student_home(db, everyone=True)
 
-            if teacher_id is None:
-                continue
+    window_start, window_end, window_start_date, window_end_date = _group_lesson_window()
+    tz = _local_tz()
 
+    existing_events = (
+        db.execute(
+            text(
+                """
+                SELECT
+                  id,
+                  court_id,
+                  teacher_id,
+                  status,
+                  start_at,
+                  end_at,
+                  notes
+                FROM public.events
+                WHERE class_group_id = :group_id
+                  AND kind = 'group_lesson'
+                  AND start_at >= :window_start
+                  AND start_at <= :window_end
+                ORDER BY start_at, created_at, id
+                """
+            ),
+            {
+                "group_id": group_id,
+                "window_start": window_start,
+                "window_end": window_end,
+            },
+        )
+        .mappings()
+        .all()
+    )
+
+    group = _get_class_group_or_404(db, group_id)
+    desired: dict[tuple[datetime, datetime], dict] = {}
+
+    if group["is_active"] and group["court_id"] is not None:
+        schedules = (
             db.execute(
                 text(
                     """
-                    INSERT INTO public.events (
-                      court_id,
-                      teacher_id,
-                      student_id,
-                      created_by,
+                    SELECT
+                      id,
                       class_group_id,
-                      kind,
-                      status,
-                      start_at,
-                      end_at,
+                      weekday,
+                      start_time,
+                      end_time,
+                      starts_on,
+                      ends_on,
+                      is_active,
                       notes
-                    )
-                    VALUES (
-                      :court_id,
-                      :teacher_id,
-                      NULL,
-                      :created_by,
-                      :class_group_id,
-                      'group_lesson',
-                      'confirmado',
-                      :start_at,
-                      :end_at,
-                      :notes
-                    )
+                    FROM public.class_group_schedules
+                    WHERE class_group_id = :group_id
+                      AND is_active = TRUE
+                      AND starts_on <= :window_end_date
+                      AND (
+                        ends_on IS NULL
+                        OR ends_on >= :window_start_date
+                      )
+                    ORDER BY
+                      weekday,
+                      start_time,
+                      starts_on,
+                      id
                     """
                 ),
                 {
-                    "court_id": group["court_id"],
-                    "teacher_id": teacher_id,
-                    "created_by": created_by_uuid,
-                    "class_group_id": group_id,
-                    "start_at": start_at,
-                    "end_at": end_at,
-                    "notes": event_notes,
+                    "group_id": group_id,
+                    "window_start_date": window_start_date,
+                    "window_end_date": window_end_date,
                 },
             )
+            .mappings()
+            .all()
+        )
+
+        assignments = (
+            _load_group_teacher_assignments(
+                db,
+                group_id=group_id,
+                window_start_date=window_start_date,
+                window_end_date=window_end_date,
+            )
+            if schedules
+            else []
+        )
+
+        for schedule in schedules:
+            event_notes = schedule["notes"] if schedule["notes"] is not None else group["notes"]
+
+            for occurrence_date in _iter_schedule_occurrences(
+                weekday=int(schedule["weekday"]),
+                starts_on=schedule["starts_on"],
+                ends_on=schedule["ends_on"],
+                window_start_date=window_start_date,
+                window_end_date=window_end_date,
+            ):
+                start_at = datetime.combine(occurrence_date, schedule["start_time"], tzinfo=tz)
+                end_at = datetime.combine(occurrence_date, schedule["end_time"], tzinfo=tz)
+
+                if start_at < window_start or start_at > window_end:
+                    continue
+
+                teacher_id = _pick_group_teacher_id_for_date(
+                    assignments,
+                    target_date=occurrence_date,
+                    legacy_teacher_id=group["teacher_id"],
+                )
+
+                if teacher_id is None:
+                    continue
+
+                desired.setdefault(
+                    (start_at, end_at),
+                    {
+                        "court_id": group["court_id"],
+                        "teacher_id": teacher_id,
+                        "start_at": start_at,
+                        "end_at": end_at,
+                        "notes": event_notes,
+                    },
+                )
+
+    stale_ids: list[UUID] = []
+    changed: list[dict] = []
+    matched: set[tuple[datetime, datetime]] = set()
+
+    for event in existing_events:
+        key = (event["start_at"], event["end_at"])
+        target = desired.get(key)
+        if target is None or key in matched:
+            stale_ids.append(event["id"])
+            continue
+
+        matched.add(key)
+        if (
+            event["court_id"] != target["court_id"]
+            or event["teacher_id"] != target["teacher_id"]
+            or event["notes"] != target["notes"]
+            or event["status"] != "confirmado"
+        ):
+            changed.append({"event_id": event["id"], **target})
+
+    # Remove primeiro para liberar horários antes de atualizar/inserir e não
+    # esbarrar nas constraints de sobreposição.
+    if stale_ids:
+        db.execute(
+            text("DELETE FROM public.events WHERE id IN :event_ids").bindparams(
+                bindparam("event_ids", expanding=True)
+            ),
+            {"event_ids": stale_ids},
+        )
+
+    if changed:
+        db.execute(
+            text(
+                """
+                UPDATE public.events
+                SET
+                  court_id = :court_id,
+                  teacher_id = :teacher_id,
+                  status = 'confirmado',
+                  notes = :notes,
+                  updated_at = now()
+                WHERE id = :event_id
+                """
+            ),
+            changed,
+        )
+
+    created_by_uuid = UUID(user_id)
+    to_insert = [
+        {**target, "created_by": created_by_uuid, "class_group_id": group_id}
+        for key, target in desired.items()
+        if key not in matched
+    ]
+
+    if to_insert:
+        db.execute(
+            text(
+                """
+                INSERT INTO public.events (
+                  court_id,
+                  teacher_id,
+                  student_id,
+                  created_by,
+                  class_group_id,
+                  kind,
+                  status,
+                  start_at,
+                  end_at,
+                  notes
+                )
+                VALUES (
+                  :court_id,
+                  :teacher_id,
+                  NULL,
+                  :created_by,
+                  :class_group_id,
+                  'group_lesson',
+                  'confirmado',
+                  :start_at,
+                  :end_at,
+                  :notes
+                )
+                """
+            ),
+            to_insert,
+        )
 
 
 def _get_class_group_or_404(db: Session, group_id: UUID):
@@ -852,13 +902,12 @@ def get_class_group(
 @router.get(
     "/{group_id}/status-history",
     response_model=list[ClassGroupStatusHistoryItemOut],
+    dependencies=[Depends(require_admin)],
 )
 def get_class_group_status_history(
     group_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_class_group_or_404(db, group_id)
 
     rows = (
@@ -887,13 +936,17 @@ def get_class_group_status_history(
     return rows
 
 
-@router.post("/", response_model=ClassGroupOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=ClassGroupOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
+)
 def create_class_group(
     payload: ClassGroupCreateIn,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _validate_class_group_payload(payload)
 
     try:
@@ -971,15 +1024,13 @@ def create_class_group(
         raise _integrity_to_http(e) from e
 
 
-@router.patch("/{group_id}", response_model=ClassGroupOut)
+@router.patch("/{group_id}", response_model=ClassGroupOut, dependencies=[Depends(require_admin)])
 def update_class_group(
     group_id: UUID,
     payload: ClassGroupUpdateIn,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     current = _get_class_group_or_404(db, group_id)
 
     if payload.is_active is not None and payload.is_active != current["is_active"]:
@@ -1058,14 +1109,15 @@ def update_class_group(
         raise _integrity_to_http(e) from e
 
 
-@router.patch("/{group_id}/deactivate", response_model=ClassGroupOut)
+@router.patch(
+    "/{group_id}/deactivate", response_model=ClassGroupOut, dependencies=[Depends(require_admin)]
+)
 def deactivate_class_group(
     group_id: UUID,
     payload: ClassGroupStatusChangeIn | None,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     current = _get_class_group_or_404(db, group_id)
 
     if not current["is_active"]:
@@ -1119,14 +1171,15 @@ def deactivate_class_group(
         raise _integrity_to_http(e) from e
 
 
-@router.patch("/{group_id}/reactivate", response_model=ClassGroupOut)
+@router.patch(
+    "/{group_id}/reactivate", response_model=ClassGroupOut, dependencies=[Depends(require_admin)]
+)
 def reactivate_class_group(
     group_id: UUID,
     payload: ClassGroupStatusChangeIn | None,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     current = _get_class_group_or_404(db, group_id)
 
     if current["is_active"]:
@@ -1224,6 +1277,7 @@ def list_class_group_schedules(
     "/{group_id}/schedules",
     response_model=ClassGroupScheduleOut,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
 )
 def create_class_group_schedule(
     group_id: UUID,
@@ -1231,7 +1285,6 @@ def create_class_group_schedule(
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_class_group_or_404(db, group_id)
     _validate_schedule_payload(payload)
 
@@ -1308,7 +1361,11 @@ def get_class_group_schedule(
     return _get_class_group_schedule_or_404(db, group_id, schedule_id)
 
 
-@router.patch("/{group_id}/schedules/{schedule_id}", response_model=ClassGroupScheduleOut)
+@router.patch(
+    "/{group_id}/schedules/{schedule_id}",
+    response_model=ClassGroupScheduleOut,
+    dependencies=[Depends(require_admin)],
+)
 def update_class_group_schedule(
     group_id: UUID,
     schedule_id: UUID,
@@ -1316,7 +1373,6 @@ def update_class_group_schedule(
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_class_group_or_404(db, group_id)
 
     current = _get_class_group_schedule_or_404(db, group_id, schedule_id)
@@ -1387,6 +1443,7 @@ def update_class_group_schedule(
 @router.patch(
     "/{group_id}/schedules/{schedule_id}/deactivate",
     response_model=ClassGroupScheduleOut,
+    dependencies=[Depends(require_admin)],
 )
 def deactivate_class_group_schedule(
     group_id: UUID,
@@ -1394,7 +1451,6 @@ def deactivate_class_group_schedule(
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_class_group_or_404(db, group_id)
     _get_class_group_schedule_or_404(db, group_id, schedule_id)
 
@@ -1482,6 +1538,7 @@ def list_class_group_enrollments(
     "/{group_id}/enrollments",
     response_model=ClassGroupEnrollmentOut,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
 )
 def create_class_group_enrollment(
     group_id: UUID,
@@ -1489,7 +1546,6 @@ def create_class_group_enrollment(
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     group = _get_class_group_or_404(db, group_id)
     _validate_enrollment_payload(payload)
 
@@ -1549,6 +1605,7 @@ def create_class_group_enrollment(
             reason_code="created",
             reason_note="Cadastro inicial da matrícula da turma.",
         )
+        invalidate_student_home(db, everyone=True)
         db.commit()
         return row
 
@@ -1574,14 +1631,13 @@ def get_class_group_enrollment(
 @router.get(
     "/{group_id}/enrollments/{enrollment_id}/status-history",
     response_model=list[ClassGroupEnrollmentStatusHistoryItemOut],
+    dependencies=[Depends(require_admin)],
 )
 def get_class_group_enrollment_status_history(
     group_id: UUID,
     enrollment_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_class_group_or_404(db, group_id)
     _get_class_group_enrollment_or_404(db, group_id, enrollment_id)
 
@@ -1614,15 +1670,14 @@ def get_class_group_enrollment_status_history(
 @router.patch(
     "/{group_id}/enrollments/{enrollment_id}",
     response_model=ClassGroupEnrollmentOut,
+    dependencies=[Depends(require_admin)],
 )
 def update_class_group_enrollment(
     group_id: UUID,
     enrollment_id: UUID,
     payload: ClassGroupEnrollmentUpdateIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_class_group_or_404(db, group_id)
 
     current = _get_class_group_enrollment_or_404(db, group_id, enrollment_id)
@@ -1679,6 +1734,7 @@ def update_class_group_enrollment(
             .mappings()
             .first()
         )
+        invalidate_student_home(db, everyone=True)
         db.commit()
         return row
 
@@ -1690,6 +1746,7 @@ def update_class_group_enrollment(
 @router.patch(
     "/{group_id}/enrollments/{enrollment_id}/deactivate",
     response_model=ClassGroupEnrollmentOut,
+    dependencies=[Depends(require_admin)],
 )
 def deactivate_class_group_enrollment(
     group_id: UUID,
@@ -1698,7 +1755,6 @@ def deactivate_class_group_enrollment(
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_class_group_or_404(db, group_id)
     current = _get_class_group_enrollment_or_404(db, group_id, enrollment_id)
 
@@ -1748,6 +1804,7 @@ def deactivate_class_group_enrollment(
         reason_code=reason_code,
         reason_note=reason_note,
     )
+    invalidate_student_home(db, everyone=True)
     db.commit()
     return row
 
@@ -1755,6 +1812,7 @@ def deactivate_class_group_enrollment(
 @router.patch(
     "/{group_id}/enrollments/{enrollment_id}/reactivate",
     response_model=ClassGroupEnrollmentOut,
+    dependencies=[Depends(require_admin)],
 )
 def reactivate_class_group_enrollment(
     group_id: UUID,
@@ -1763,7 +1821,6 @@ def reactivate_class_group_enrollment(
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     group = _get_class_group_or_404(db, group_id)
     current = _get_class_group_enrollment_or_404(db, group_id, enrollment_id)
 
@@ -1820,6 +1877,7 @@ def reactivate_class_group_enrollment(
         reason_code=reason_code,
         reason_note=reason_note,
     )
+    invalidate_student_home(db, everyone=True)
     db.commit()
     return row
 
@@ -1827,6 +1885,7 @@ def reactivate_class_group_enrollment(
 @router.patch(
     "/{group_id}/enrollments/{enrollment_id}/cancel",
     response_model=ClassGroupEnrollmentOut,
+    dependencies=[Depends(require_admin)],
 )
 def cancel_class_group_enrollment(
     group_id: UUID,
@@ -1835,7 +1894,6 @@ def cancel_class_group_enrollment(
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_class_group_or_404(db, group_id)
     current = _get_class_group_enrollment_or_404(db, group_id, enrollment_id)
 
@@ -1879,5 +1937,6 @@ def cancel_class_group_enrollment(
         reason_code=reason_code,
         reason_note=reason_note,
     )
+    invalidate_student_home(db, everyone=True)
     db.commit()
     return row
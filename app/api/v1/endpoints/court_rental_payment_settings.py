@@ -8,7 +8,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user_id
+from app.api.v1.deps import get_current_user_id, require_admin
 from app.db.session import get_db
 from app.schemas.court_rental_payment_settings import (
     CourtRentalPaymentSettingCreateIn,
@@ -54,38 +54,6 @@ _SUMMARY_COLUMNS = """
 """
 
 
-def _get_current_user_row(db: Session, user_id: str):
-    return (
-        db.execute(
-            text(
-                """
-                SELECT id, email, role, is_active
-                FROM public.users
-                WHERE id = :user_id
-                """
-            ),
-            {"user_id": user_id},
-        )
-        .mappings()
-        .first()
-    )
-
-
-def _require_admin(db: Session, user_id: str) -> None:
-    user = _get_current_user_row(db, user_id)
-    if not user or not user["is_active"]:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário inválido.",
-        )
-
-    if not str(user["role"]).startswith("admin"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Apenas administradores podem gerenciar a configuração Pix da locação.",
-        )
-
-
 def _db_error_to_http(e: IntegrityError | DataError) -> HTTPException:
     orig = getattr(e, "orig", None)
     pgcode = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
@@ -171,13 +139,12 @@ def _get_setting_or_404(db: Session, setting_id: UUID):
     return row
 
 
-@router.get("/current", response_model=CourtRentalPaymentSettingOut)
+@router.get(
+    "/current", response_model=CourtRentalPaymentSettingOut, dependencies=[Depends(require_admin)]
+)
 def get_current_court_rental_payment_setting(
-    user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    _require_admin(db, user_id)
-
     row = (
         db.execute(
             text(
@@ -204,13 +171,14 @@ def get_current_court_rental_payment_setting(
     return _row_to_out(row)
 
 
-@router.get("", response_model=list[CourtRentalPaymentSettingSummaryOut])
+@router.get(
+    "",
+    response_model=list[CourtRentalPaymentSettingSummaryOut],
+    dependencies=[Depends(require_admin)],
+)
 def list_court_rental_payment_settings(
-    user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    _require_admin(db, user_id)
-
     rows = db.execute(
         text(
             f"""
@@ -225,14 +193,17 @@ def list_court_rental_payment_settings(
     return [_row_to_summary(row) for row in rows]
 
 
-@router.post("", response_model=CourtRentalPaymentSettingOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=CourtRentalPaymentSettingOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
+)
 def create_court_rental_payment_setting(
     payload: CourtRentalPaymentSettingCreateIn,
     user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    _require_admin(db, user_id)
-
     data = payload.model_dump()
 
     try:
@@ -305,14 +276,17 @@ def create_court_rental_payment_setting(
     return _row_to_out(row)
 
 
-@router.patch("/{setting_id}", response_model=CourtRentalPaymentSettingOut)
+@router.patch(
+    "/{setting_id}",
+    response_model=CourtRentalPaymentSettingOut,
+    dependencies=[Depends(require_admin)],
+)
 def update_court_rental_payment_setting(
     setting_id: UUID,
     payload: CourtRentalPaymentSettingUpdateIn,
     user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    _require_admin(db, user_id)
     existing = _get_setting_or_404(db, setting_id)
 
     data = payload.model_dump(exclude_unset=True)
@@ -409,13 +383,16 @@ def update_court_rental_payment_setting(
     return _row_to_out(row)
 
 
-@router.post("/{setting_id}/activate", response_model=CourtRentalPaymentSettingOut)
+@router.post(
+    "/{setting_id}/activate",
+    response_model=CourtRentalPaymentSettingOut,
+    dependencies=[Depends(require_admin)],
+)
 def activate_court_rental_payment_setting(
     setting_id: UUID,
     user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    _require_admin(db, user_id)
     _get_setting_or_404(db, setting_id)
 
     try:
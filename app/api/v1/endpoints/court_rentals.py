@@ -8,13 +8,25 @@ from typing import Annotated, Any
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
 from fastapi.responses import FileResponse
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user_id
+from app.api.v1.deps import get_current_user_id, require_admin
+from app.api.v1.file_responses import storage_file_response
+from app.api.v1.pagination import decode_cursor, encode_cursor
 from app.core.config import settings
 from app.db.session import get_db
 from app.models.court_rental import CourtRental
@@ -52,14 +64,31 @@ from app.schemas.court_rentals import (
     CourtRentalUpcomingItemOut,
     CourtRentalUpcomingListOut,
 )
-from app.services.email_sender import (
-    ConsoleEmailSender,
-    EmailSendError,
-    InlineImage,
-    SmtpConfig,
-    SmtpEmailSender,
+from app.services.availability_snapshot import availability_snapshot_cache
+from app.services.booking_coordinator import BookingSlotContended, booking_coordinator
+from app.services.court_availability import compute_free_court_slots
+from app.services.court_rental_expiration import expire_overdue_public_pending_rentals
+from app.services.email_outbox import OUTBOX_COURT_RENTAL_CONFIRMATION, enqueue_email
+from app.services.email_sender import InlineImage
+from app.services.file_storage import (
+    StorageEmptyUpload,
+    StorageLimitExceeded,
+    StoredObject,
+    get_file_storage,
+    iter_upload_chunks,
+    storage_key_from_path,
+)
+from app.services.payment_proof_storage import (
+    payment_proof_storage_path,
+    store_payment_proof_blob,
+)
+from app.services.pix_artifacts import (
+    ensure_rental_pix_qr_png,
+    get_pix_payload,
+    load_rental_pix_qr_png,
 )
-from app.services.pix_payload import PixPayloadError, generate_pix_payload
+from app.services.pix_payload import PixPayloadError
+from app.services.user_access import CurrentUser
 
 router = APIRouter(prefix="/court-rentals", tags=["court-rentals"])
 
@@ -95,6 +124,7 @@ def _integrity_to_http(e: IntegrityError) -> HTTPException:
         constraint = getattr(diag, "constraint_name", None)
 
     if pgcode == "23P01":
+        booking_coordinator.record_integrity_conflict()
         if constraint == "ex_events_no_overlap_court":
             return HTTPException(
                 status_code=409,
@@ -337,53 +367,15 @@ def _ensure_not_student_in_public_rental_route(db: Session, *, user: User) -> No
 def _expire_overdue_public_pending_rentals(
     db: Session, *, owner_user_id: UUID | None = None
 ) -> int:
-    params: dict[str, Any] = {}
-    owner_where = ""
-    if owner_user_id is not None:
-        owner_where = "AND COALESCE(cr.customer_user_id, cr.user_id) = :owner_user_id"
-        params["owner_user_id"] = owner_user_id
-
-    rows = (
-        db.execute(
-            text(
-                f"""
-                SELECT cr.id AS rental_id, cr.event_id AS event_id
-                FROM public.court_rentals cr
-                WHERE cr.status = 'awaiting_payment'
-                  AND cr.payment_status = 'pending'
-                  AND cr.payment_expires_at IS NOT NULL
-                  AND cr.payment_expires_at <= now()
-                  {owner_where}
-                ORDER BY cr.payment_expires_at ASC
-                """
-            ),
-            params,
-        )
-        .mappings()
-        .all()
-    )
-
-    if not rows:
+    # A varredura global fica com o sweeper em background quando ele está ligado;
+    # aqui só expiramos inline o que é do próprio usuário.
+    if owner_user_id is None and settings.rental_expiration_sweep_interval_seconds > 0:
         return 0
 
-    now_local = datetime.now(_local_tz())
-
-    for row in rows:
-        rental = db.get(CourtRental, row["rental_id"])
-        if rental is None:
-            continue
-
-        _cancel_event(db, row["event_id"])
-        rental.status = "cancelled"
-        rental.payment_status = "expired"
-        rental.cancelled_at = now_local
-        rental.notes = _append_system_note(
-            rental.notes,
-            "Reserva pública expirada automaticamente por falta de pagamento dentro do prazo de 15 minutos.",
-        )
-
-    db.commit()
-    return len(rows)
+    expired = expire_overdue_public_pending_rentals(db, owner_user_id=owner_user_id)
+    if expired:
+        db.commit()
+    return expired
 
 
 def _get_blocking_active_public_rental_row(db: Session, owner_user_id: UUID):
@@ -404,7 +396,7 @@ def _get_blocking_active_public_rental_row(db: Session, owner_user_id: UUID):
                   ON e.id = cr.event_id
                 JOIN public.courts c
                   ON c.id = e.court_id
-                WHERE COALESCE(cr.customer_user_id, cr.user_id) = :user_id
+                WHERE cr.owner_user_id = :user_id
                   AND cr.status IN (
                     'awaiting_payment',
                     'awaiting_proof',
@@ -539,38 +531,6 @@ def _get_student_or_404(db: Session, student_id: UUID) -> Student:
     return student
 
 
-def _get_current_user_row(db: Session, user_id: str):
-    return (
-        db.execute(
-            text(
-                """
-                SELECT id, email, role, is_active, full_name, whatsapp
-                FROM public.users
-                WHERE id = :user_id
-                """
-            ),
-            {"user_id": user_id},
-        )
-        .mappings()
-        .first()
-    )
-
-
-def _require_admin(db: Session, user_id: str):
-    user = _get_current_user_row(db, user_id)
-    if not user or not user["is_active"]:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário inválido",
-        )
-    if not str(user["role"]).startswith("admin"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Apenas administradores podem gerenciar locações de quadra.",
-        )
-    return user
-
-
 def _find_student_id_for_user(db: Session, user_id: UUID) -> UUID | None:
     return db.execute(
         text(
@@ -613,6 +573,7 @@ def _list_active_courts(db: Session):
           c.surface_type AS surface_type,
           c.cover_type AS cover_type,
           c.image_url AS image_url,
+          c.image_renditions AS image_renditions,
           c.short_description AS short_description
         FROM public.courts c
         WHERE c.is_active IS TRUE
@@ -632,8 +593,7 @@ def _court_slot_is_still_available(
     return any(item["court_id"] == court_id for item in available_courts)
 
 
-def _build_legacy_rental_slots(
-    db: Session,
+def _build_rental_slot_candidates(
     *,
     start_day: date,
     days: int,
@@ -641,12 +601,11 @@ def _build_legacy_rental_slots(
     day_start_hour: int,
     day_end_hour: int,
     max_allowed_date: date,
-    court_id: UUID | None = None,
-) -> list[CourtRentalSlotOut]:
+) -> list[tuple[datetime, datetime]]:
     tz = _local_tz()
     today = datetime.now(tz).date()
-    slots: list[CourtRentalSlotOut] = []
-    seen: set[tuple[datetime, UUID]] = set()
+    slot_delta = timedelta(minutes=slot_minutes)
+    candidates: list[tuple[datetime, datetime]] = []
 
     for day_offset in range(days):
         current_day = start_day + timedelta(days=day_offset)
@@ -655,7 +614,6 @@ def _build_legacy_rental_slots(
 
         window_start = datetime.combine(current_day, time(hour=day_start_hour), tzinfo=tz)
         window_end = datetime.combine(current_day, time(hour=day_end_hour), tzinfo=tz)
-        slot_delta = timedelta(minutes=slot_minutes)
 
         if current_day == today:
             now_local = datetime.now(tz)
@@ -666,26 +624,10 @@ def _build_legacy_rental_slots(
 
         while slot_start + slot_delta <= window_end:
             slot_end = slot_start + slot_delta
-            available_courts = _list_available_courts(db, slot_start, slot_end)
-            for court in available_courts:
-                if court_id is not None and court["court_id"] != court_id:
-                    continue
-                dedupe_key = (slot_start, court["court_id"])
-                if dedupe_key in seen:
-                    continue
-                seen.add(dedupe_key)
-                slots.append(
-                    CourtRentalSlotOut(
-                        start_at=slot_start,
-                        end_at=slot_end,
-                        court_id=court["court_id"],
-                        court_name=court["court_name"],
-                    )
-                )
+            candidates.append((slot_start, slot_end))
             slot_start = slot_end
 
-    slots.sort(key=lambda item: (item.start_at, item.court_name))
-    return slots
+    return candidates
 
 
 def _get_court_rental_slots_for_range(
@@ -698,17 +640,44 @@ def _get_court_rental_slots_for_range(
     day_end_hour: int,
     max_allowed_date: date,
     court_id: UUID | None = None,
+    active_courts: list[Any] | None = None,
 ) -> list[CourtRentalSlotOut]:
-    return _build_legacy_rental_slots(
-        db,
+    candidates = _build_rental_slot_candidates(
         start_day=start_day,
         days=days,
         slot_minutes=slot_minutes,
         day_start_hour=day_start_hour,
         day_end_hour=day_end_hour,
         max_allowed_date=max_allowed_date,
-        court_id=court_id,
     )
+    if not candidates:
+        return []
+
+    courts = active_courts if active_courts is not None else _list_active_courts(db)
+    if court_id is not None:
+        courts = [court for court in courts if court["court_id"] == court_id]
+
+    busy_by_court = availability_snapshot_cache.busy_intervals(
+        db,
+        kind="court",
+        range_start=candidates[0][0],
+        range_end=candidates[-1][1],
+        owner_ids=[court["court_id"] for court in courts],
+    )
+    free_slots = compute_free_court_slots(
+        courts=courts,
+        candidates=candidates,
+        busy_by_court=busy_by_court,
+    )
+    return [
+        CourtRentalSlotOut(
+            start_at=slot.start_at,
+            end_at=slot.end_at,
+            court_id=slot.court_id,
+            court_name=slot.court_name,
+        )
+        for slot in free_slots
+    ]
 
 
 def _build_court_rental_court_cards(
@@ -722,19 +691,24 @@ def _build_court_rental_court_cards(
     max_allowed_date: date,
 ) -> list[CourtRentalCourtCardOut]:
     active_courts = _list_active_courts(db)
+    all_slots = _get_court_rental_slots_for_range(
+        db,
+        start_day=start_day,
+        days=days,
+        slot_minutes=slot_minutes,
+        day_start_hour=day_start_hour,
+        day_end_hour=day_end_hour,
+        max_allowed_date=max_allowed_date,
+        active_courts=list(active_courts),
+    )
+    slots_by_court: dict[UUID, list[CourtRentalSlotOut]] = {}
+    for slot in all_slots:
+        slots_by_court.setdefault(slot.court_id, []).append(slot)
+
     cards: list[CourtRentalCourtCardOut] = []
 
     for court in active_courts:
-        court_slots = _get_court_rental_slots_for_range(
-            db,
-            start_day=start_day,
-            days=days,
-            slot_minutes=slot_minutes,
-            day_start_hour=day_start_hour,
-            day_end_hour=day_end_hour,
-            max_allowed_date=max_allowed_date,
-            court_id=court["court_id"],
-        )
+        court_slots = slots_by_court.get(court["court_id"], [])
         has_slots = len(court_slots) > 0
         first_slot = court_slots[0] if has_slots else None
         cards.append(
@@ -744,6 +718,7 @@ def _build_court_rental_court_cards(
                 surface_type=court["surface_type"],
                 cover_type=court["cover_type"],
                 image_url=court["image_url"],
+                image_renditions=court["image_renditions"],
                 short_description=court["short_description"],
                 has_slots_in_range=has_slots,
                 available_slots_count=len(court_slots),
@@ -817,20 +792,6 @@ def _get_change_policy(start_at: datetime) -> tuple[bool, bool, datetime | None,
     return can_cancel, can_reschedule, reschedule_deadline, combined_rule, status_message
 
 
-def _get_email_sender():
-    if settings.email_sender_backend.lower() == "smtp":
-        cfg = SmtpConfig(
-            host=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_username,
-            password=settings.smtp_password,
-            mail_from=settings.smtp_from,
-            use_tls=settings.smtp_use_tls,
-        )
-        return SmtpEmailSender(cfg)
-    return ConsoleEmailSender()
-
-
 def _format_when_label(start_at: datetime, end_at: datetime) -> str:
     tz = _local_tz()
     start_local = start_at.astimezone(tz)
@@ -838,27 +799,22 @@ def _format_when_label(start_at: datetime, end_at: datetime) -> str:
     return f"{start_local.strftime('%d/%m/%Y')} das {start_local.strftime('%H:%M')} às {end_local.strftime('%H:%M')}"
 
 
-def _build_pix_qr_inline_image(pix_qr_code_payload: str | None) -> InlineImage | None:
+def _build_pix_qr_inline_image(
+    pix_qr_code_payload: str | None,
+    *,
+    rental_id: UUID | None = None,
+) -> InlineImage | None:
     normalized_payload = _normalize_optional_text(pix_qr_code_payload)
     if not normalized_payload:
         return None
 
-    try:
-        from io import BytesIO
-
-        import qrcode
-    except Exception:
+    png = load_rental_pix_qr_png(rental_id, normalized_payload)
+    if png is None:
         return None
 
-    qr = qrcode.QRCode(border=1, box_size=6)
-    qr.add_data(normalized_payload)
-    qr.make(fit=True)
-    image = qr.make_image(fill_color="black", back_color="white")
-    buffer = BytesIO()
-    image.save(buffer, format="PNG")
     return InlineImage(
         cid="pix-qrcode",
-        data=buffer.getvalue(),
+        data=png,
         content_type="image/png",
         filename="pix-qrcode.png",
     )
@@ -876,12 +832,15 @@ def _build_email_content(
     pix_qr_code_payload: str | None = None,
     proof_whatsapp: str | None = None,
     payment_instructions: str | None = None,
+    rental_id: UUID | None = None,
 ) -> tuple[str, str, str, list[InlineImage]]:
     person_name = recipient_name or "cliente"
     when_label = _format_when_label(start_at, end_at)
     amount_label = f"R$ {total_amount:.2f}" if total_amount is not None else None
     qr_inline_image = (
-        _build_pix_qr_inline_image(pix_qr_code_payload) if action == "payment_pending" else None
+        _build_pix_qr_inline_image(pix_qr_code_payload, rental_id=rental_id)
+        if action == "payment_pending"
+        else None
     )
 
     if action == "scheduled":
@@ -1005,8 +964,10 @@ def _build_email_content(
     return subject, text_body, html_body, inline_images
 
 
-def _send_court_rental_email(
+def _queue_court_rental_email(
+    db: Session,
     *,
+    rental_id: UUID,
     to_email: str | None,
     recipient_name: str | None,
     action: str,
@@ -1033,20 +994,22 @@ def _send_court_rental_email(
         pix_qr_code_payload=pix_qr_code_payload,
         proof_whatsapp=proof_whatsapp,
         payment_instructions=payment_instructions,
+        rental_id=rental_id,
     )
 
-    try:
-        sender = _get_email_sender()
-        sender.send_email(
-            to_email=to_email,
-            subject=subject,
-            text_body=text_body,
-            html_body=html_body,
-            inline_images=inline_images or None,
-        )
-        return True
-    except EmailSendError:
-        return False
+    # Entra no outbox na transação da própria escrita (quem chama faz o commit);
+    # o worker envia e marca `confirmation_email_sent_at` depois.
+    enqueue_email(
+        db,
+        to_email=to_email,
+        subject=subject,
+        text_body=text_body,
+        html_body=html_body,
+        inline_images=inline_images or None,
+        category=OUTBOX_COURT_RENTAL_CONFIRMATION,
+        reference_id=rental_id,
+    )
+    return True
 
 
 def _serialize_rental(rental: CourtRental) -> CourtRentalOut:
@@ -1245,12 +1208,25 @@ def _resolve_payment_state_for_admin_create(
 def _ensure_slot_available_or_409(
     db: Session, *, court_id: UUID, start_at: datetime, end_at: datetime
 ) -> None:
+    try:
+        booking_coordinator.acquire(db, court_id=court_id, start_at=start_at, end_at=end_at)
+    except BookingSlotContended as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "code": "SLOT_BEING_BOOKED",
+                "message": "Esse horário está sendo reservado agora por outra pessoa. Atualize a agenda e tente novamente.",
+            },
+            headers={"Retry-After": "1"},
+        ) from exc
+
     if not _court_slot_is_still_available(
         db=db,
         start_at=start_at,
         end_at=end_at,
         court_id=court_id,
     ):
+        booking_coordinator.record_slot_conflict()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail={
@@ -1351,7 +1327,7 @@ def _resolve_public_pending_payment_context(
     pix_key = str(setting["pix_key"]).strip()
 
     try:
-        pix_qr_code_payload = generate_pix_payload(
+        pix_qr_code_payload = get_pix_payload(
             pix_key=pix_key,
             merchant_name=str(setting["merchant_name"]).strip(),
             merchant_city=str(setting["merchant_city"]).strip(),
@@ -1494,7 +1470,7 @@ def _get_owned_rental_any_status_row(db: Session, owner_user_id: UUID, rental_id
                   ON e.id = cr.event_id
                 LEFT JOIN public.courts c
                   ON c.id = e.court_id
-                WHERE COALESCE(cr.customer_user_id, cr.user_id) = :user_id
+                WHERE cr.owner_user_id = :user_id
                   AND cr.id = :rental_id
                 LIMIT 1
                 """
@@ -1544,7 +1520,7 @@ def _get_upcoming_rental_rows(db: Session, owner_user_id: UUID):
                   ON e.id = cr.event_id
                 JOIN public.courts c
                   ON c.id = e.court_id
-                WHERE COALESCE(cr.customer_user_id, cr.user_id) = :user_id
+                WHERE cr.owner_user_id = :user_id
                   AND cr.status IN ('scheduled', 'confirmed', 'awaiting_payment', 'awaiting_proof', 'awaiting_admin_review')
                   AND e.kind = 'locacao'
                   AND e.status = 'confirmado'
@@ -1592,7 +1568,7 @@ def _get_rental_history_rows(db: Session, owner_user_id: UUID):
                   ON e.id = cr.event_id
                 LEFT JOIN public.courts c
                   ON c.id = e.court_id
-                WHERE COALESCE(cr.customer_user_id, cr.user_id) = :user_id
+                WHERE cr.owner_user_id = :user_id
                 ORDER BY
                   COALESCE(e.start_at, cr.requested_at, cr.created_at) DESC,
                   cr.created_at DESC
@@ -1677,7 +1653,7 @@ def _get_owned_rental_row(db: Session, owner_user_id: UUID, rental_id: UUID):
                   ON e.id = cr.event_id
                 JOIN public.courts c
                   ON c.id = e.court_id
-                WHERE COALESCE(cr.customer_user_id, cr.user_id) = :user_id
+                WHERE cr.owner_user_id = :user_id
                   AND cr.id = :rental_id
                   AND cr.status IN ('scheduled', 'confirmed', 'awaiting_payment', 'awaiting_proof', 'awaiting_admin_review')
                   AND e.kind = 'locacao'
@@ -1737,14 +1713,6 @@ def _get_admin_rental_row(db: Session, rental_id: UUID):
     )
 
 
-def _mark_confirmation_email_if_sent(db: Session, rental: CourtRental, email_sent: bool) -> None:
-    if not email_sent:
-        return
-    rental.confirmation_email_sent_at = datetime.now(_local_tz())
-    db.commit()
-    db.refresh(rental)
-
-
 def _quantize_money(value: Decimal) -> Decimal:
     return value.quantize(Decimal("0.01"))
 
@@ -1771,7 +1739,7 @@ def _build_admin_pix_payload(
     txid = "".join(ch for ch in txid_source if ch.isalnum())[:25] or "***"
 
     try:
-        return generate_pix_payload(
+        return get_pix_payload(
             pix_key=pix_key,
             merchant_name=merchant_name,
             merchant_city=merchant_city,
@@ -2036,6 +2004,7 @@ def court_rental_slots_by_court(
         day_end_hour=day_end_hour,
         max_allowed_date=max_allowed_date,
         court_id=court_id,
+        active_courts=list(active_courts),
     )
 
 
@@ -2099,6 +2068,11 @@ def get_court_rental_payment_instructions(
         total_amount=row["total_amount"],
         pix_key=row["pix_key"],
         pix_qr_code_payload=row["pix_qr_code_payload"],
+        pix_qr_code_url=(
+            f"/api/v1/court-rentals/{row['rental_id']}/payment-instructions/qr-code"
+            if _normalize_optional_text(row["pix_qr_code_payload"])
+            else None
+        ),
         message=(
             _build_pending_payment_message(
                 row["total_amount"],
@@ -2112,6 +2086,33 @@ def get_court_rental_payment_instructions(
     )
 
 
+@router.get("/{rental_id}/payment-instructions/qr-code")
+def get_court_rental_payment_qr_code(
+    rental_id: UUID,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    db: Annotated[Session, Depends(get_db)],
+):
+    current_user = _get_user_or_404(db, UUID(user_id))
+    row = _get_owned_rental_row(db, current_user.id, rental_id)
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Locação não encontrada.")
+
+    payload = _normalize_optional_text(row["pix_qr_code_payload"])
+    qr_path = ensure_rental_pix_qr_png(rental_id, payload) if payload else None
+    if qr_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Esta locação não possui QR Code Pix disponível.",
+        )
+
+    # o arquivo só é gerado uma vez por payload; cache curto porque o admin pode alterar a cobrança
+    return FileResponse(
+        path=qr_path,
+        media_type="image/png",
+        headers={"Cache-Control": "private, max-age=60"},
+    )
+
+
 @router.post(
     "/schedule", response_model=CourtRentalScheduleOut, status_code=status.HTTP_201_CREATED
 )
@@ -2200,36 +2201,38 @@ def schedule_court_rental(
             payment_evidence_recorded_by_user_id=None,
             outcome_status="pending",
         )
+
+        proof_whatsapp, payment_instructions = _get_payment_email_context(db)
+        email_queued = _queue_court_rental_email(
+            db,
+            rental_id=rental.id,
+            to_email=current_user.email,
+            recipient_name=current_user.full_name,
+            action="payment_pending",
+            start_at=event_row["start_at"],
+            end_at=event_row["end_at"],
+            court_name=court_name,
+            total_amount=total_amount,
+            pix_key=pix_key,
+            pix_qr_code_payload=pix_qr_code_payload,
+            proof_whatsapp=proof_whatsapp,
+            payment_instructions=payment_instructions,
+        )
+
         db.commit()
         db.refresh(rental)
     except IntegrityError as e:
         db.rollback()
         raise _integrity_to_http(e) from e
 
-    proof_whatsapp, payment_instructions = _get_payment_email_context(db)
-    email_sent = _send_court_rental_email(
-        to_email=current_user.email,
-        recipient_name=current_user.full_name,
-        action="payment_pending",
-        start_at=event_row["start_at"],
-        end_at=event_row["end_at"],
-        court_name=court_name,
-        total_amount=total_amount,
-        pix_key=pix_key,
-        pix_qr_code_payload=pix_qr_code_payload,
-        proof_whatsapp=proof_whatsapp,
-        payment_instructions=payment_instructions,
-    )
-    _mark_confirmation_email_if_sent(db, rental, email_sent)
-
     message = _build_pending_payment_message(
         total_amount,
         pix_key,
         pix_qr_code_payload,
         rental.payment_expires_at,
     )
-    if email_sent:
-        message = f"{message} Enviamos também um e-mail com as orientações atuais para o cadastro informado."
+    if email_queued:
+        message = f"{message} Também enviaremos um e-mail com as orientações atuais para o cadastro informado."
 
     return CourtRentalScheduleOut(
         rental_id=rental.id,
@@ -2242,12 +2245,40 @@ def schedule_court_rental(
         end_at=event_row["end_at"],
         court_id=event_row["court_id"],
         message=message,
-        email_sent=email_sent,
+        email_sent=email_queued,
     )
 
 
-def _payment_proof_storage_dir() -> Path:
-    return Path(__file__).resolve().parents[4] / "storage" / "court_rental_payment_proofs"
+_PAYMENT_PROOF_CONTENT_TYPES = {
+    "application/pdf",
+    "image/png",
+    "image/jpeg",
+    "image/jpg",
+    "image/webp",
+}
+
+
+async def _store_payment_proof_upload(proof_file: UploadFile) -> StoredObject:
+    """
+    Grava o comprovante em streaming, endereçado pelo SHA-256 do conteúdo,
+    validando o limite de 10 MB durante a cópia.
+    """
+
+    try:
+        return await store_payment_proof_blob(
+            get_file_storage(),
+            iter_upload_chunks(proof_file),
+        )
+    except StorageEmptyUpload as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="O arquivo do comprovante está vazio.",
+        ) from exc
+    except StorageLimitExceeded as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="O comprovante deve ter no máximo 10 MB.",
+        ) from exc
 
 
 def _guess_extension(upload: UploadFile) -> str:
@@ -2276,6 +2307,7 @@ def _serialize_payment_proof(proof: CourtRentalPaymentProof) -> CourtRentalPayme
         storage_path=proof.storage_path,
         mime_type=proof.mime_type,
         file_size_bytes=proof.file_size_bytes,
+        content_sha256=proof.content_sha256,
         notes=proof.notes,
         created_at=proof.created_at,
     )
@@ -2363,10 +2395,9 @@ def submit_court_rental_payment_proof(
         recorded_by_user_id=current_user.id,
     )
 
-    db.commit()
-    db.refresh(rental)
-
-    email_sent = _send_court_rental_email(
+    email_queued = _queue_court_rental_email(
+        db,
+        rental_id=rental.id,
         to_email=rental.customer_email,
         recipient_name=rental.customer_name,
         action="proof_received",
@@ -2377,11 +2408,13 @@ def submit_court_rental_payment_proof(
         pix_key=rental.pix_key,
         pix_qr_code_payload=rental.pix_qr_code_payload,
     )
-    _mark_confirmation_email_if_sent(db, rental, email_sent)
+
+    db.commit()
+    db.refresh(rental)
 
     message = "Recebemos o seu comprovante e a locação agora está aguardando a validação da administração."
-    if email_sent:
-        message = f"{message} Enviamos também um e-mail confirmando o recebimento para o cadastro informado."
+    if email_queued:
+        message = f"{message} Também enviaremos um e-mail confirmando o recebimento para o cadastro informado."
 
     return CourtRentalProofSubmissionOut(
         rental_id=rental.id,
@@ -2391,7 +2424,7 @@ def submit_court_rental_payment_proof(
         payment_proof_submitted_at=rental.payment_proof_submitted_at,
         payment_received_amount=rental.payment_received_amount,
         message=message,
-        email_sent=email_sent,
+        email_sent=email_queued,
     )
 
 
@@ -2436,33 +2469,12 @@ async def upload_court_rental_payment_proof(
         )
 
     content_type = (proof_file.content_type or "").lower()
-    allowed_content_types = {
-        "application/pdf",
-        "image/png",
-        "image/jpeg",
-        "image/jpg",
-        "image/webp",
-    }
-    if content_type not in allowed_content_types:
+    if content_type not in _PAYMENT_PROOF_CONTENT_TYPES:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Envie o comprovante em PDF, PNG, JPG ou WEBP.",
         )
 
-    file_bytes = await proof_file.read()
-    if not file_bytes:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="O arquivo do comprovante está vazio.",
-        )
-
-    max_bytes = 10 * 1024 * 1024
-    if len(file_bytes) > max_bytes:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="O comprovante deve ter no máximo 10 MB.",
-        )
-
     received_amount = None
     if payment_received_amount is not None and str(payment_received_amount).strip():
         try:
@@ -2477,22 +2489,17 @@ async def upload_court_rental_payment_proof(
 
     proof_notes = _normalize_notes(notes)
 
-    storage_dir = _payment_proof_storage_dir() / str(rental.id)
-    storage_dir.mkdir(parents=True, exist_ok=True)
-
-    extension = _guess_extension(proof_file)
-    stored_file_name = f"{datetime.now(_local_tz()):%Y%m%d%H%M%S}_{UUID(user_id).hex}{extension}"
-    absolute_path = storage_dir / stored_file_name
-    absolute_path.write_bytes(file_bytes)
+    stored = await _store_payment_proof_upload(proof_file)
 
     proof = CourtRentalPaymentProof(
         court_rental_id=rental.id,
         uploaded_by_user_id=current_user.id,
-        original_file_name=proof_file.filename or stored_file_name,
-        stored_file_name=stored_file_name,
-        storage_path=str(absolute_path.relative_to(Path(__file__).resolve().parents[4])),
+        original_file_name=proof_file.filename or f"comprovante{_guess_extension(proof_file)}",
+        stored_file_name=stored.sha256,
+        storage_path=payment_proof_storage_path(stored),
         mime_type=content_type,
-        file_size_bytes=len(file_bytes),
+        file_size_bytes=stored.size,
+        content_sha256=stored.sha256,
         notes=proof_notes,
     )
     db.add(proof)
@@ -2508,11 +2515,9 @@ async def upload_court_rental_payment_proof(
         recorded_by_user_id=current_user.id,
     )
 
-    db.commit()
-    db.refresh(rental)
-    db.refresh(proof)
-
-    email_sent = _send_court_rental_email(
+    email_queued = _queue_court_rental_email(
+        db,
+        rental_id=rental.id,
         to_email=rental.customer_email,
         recipient_name=rental.customer_name,
         action="proof_received",
@@ -2523,9 +2528,14 @@ async def upload_court_rental_payment_proof(
         pix_key=rental.pix_key,
         pix_qr_code_payload=rental.pix_qr_code_payload,
     )
-    _mark_confirmation_email_if_sent(db, rental, email_sent)
 
-    message = "Recebemos o seu comprovante e a locação agora está aguardando a validação da administração. Enviamos também um e-mail confirmando o recebimento para o cadastro informado."
+    db.commit()
+    db.refresh(rental)
+    db.refresh(proof)
+
+    message = "Recebemos o seu comprovante e a locação agora está aguardando a validação da administração."
+    if email_queued:
+        message = f"{message} Também enviaremos um e-mail confirmando o recebimento para o cadastro informado."
 
     return CourtRentalPaymentProofUploadOut(
         rental_id=rental.id,
@@ -2537,7 +2547,7 @@ async def upload_court_rental_payment_proof(
         else None,
         proof=_serialize_payment_proof(proof),
         message=message,
-        email_sent=email_sent,
+        email_sent=email_queued,
     )
 
 
@@ -2590,10 +2600,10 @@ def cancel_court_rental(
         deactivated_by_user_id=current_user.id,
         deactivation_reason="Cancelado pelo locatário.",
     )
-    db.commit()
-    db.refresh(rental)
 
-    email_sent = _send_court_rental_email(
+    email_queued = _queue_court_rental_email(
+        db,
+        rental_id=rental.id,
         to_email=row["customer_email"],
         recipient_name=row["customer_name"],
         action="cancelled",
@@ -2601,11 +2611,13 @@ def cancel_court_rental(
         end_at=row["end_at"],
         court_name=row["court_name"],
     )
-    _mark_confirmation_email_if_sent(db, rental, email_sent)
+
+    db.commit()
+    db.refresh(rental)
 
     message = "Sua locação de quadra foi cancelada com sucesso."
-    if email_sent:
-        message = f"{message} Enviamos também um e-mail de confirmação para o cadastro informado."
+    if email_queued:
+        message = f"{message} Também enviaremos um e-mail de confirmação para o cadastro informado."
 
     return CourtRentalCancelOut(
         rental_id=rental.id,
@@ -2614,7 +2626,7 @@ def cancel_court_rental(
         status=rental.status,
         payment_status=rental.payment_status,
         message=message,
-        email_sent=email_sent,
+        email_sent=email_queued,
     )
 
 
@@ -2699,26 +2711,28 @@ def reschedule_court_rental(
             rescheduled_by_user_id=current_user.id,
             reschedule_reason=_normalize_notes(getattr(data, "reschedule_reason", None)),
         )
+
+        court_name = _get_court_name(db, data.court_id)
+        email_queued = _queue_court_rental_email(
+            db,
+            rental_id=rental.id,
+            to_email=rental.customer_email,
+            recipient_name=rental.customer_name,
+            action="rescheduled",
+            start_at=new_event_row["start_at"],
+            end_at=new_event_row["end_at"],
+            court_name=court_name,
+        )
+
         db.commit()
         db.refresh(rental)
     except IntegrityError as e:
         db.rollback()
         raise _integrity_to_http(e) from e
 
-    court_name = _get_court_name(db, data.court_id)
-    email_sent = _send_court_rental_email(
-        to_email=rental.customer_email,
-        recipient_name=rental.customer_name,
-        action="rescheduled",
-        start_at=new_event_row["start_at"],
-        end_at=new_event_row["end_at"],
-        court_name=court_name,
-    )
-    _mark_confirmation_email_if_sent(db, rental, email_sent)
-
     message = "Sua locação de quadra foi remarcada com sucesso."
-    if email_sent:
-        message = f"{message} Enviamos também um e-mail de confirmação para o cadastro informado."
+    if email_queued:
+        message = f"{message} Também enviaremos um e-mail de confirmação para o cadastro informado."
 
     return CourtRentalRescheduleOut(
         rental_id=rental.id,
@@ -2733,7 +2747,7 @@ def reschedule_court_rental(
         court_id=new_event_row["court_id"],
         rescheduled_at=datetime.now(_local_tz()),
         message=message,
-        email_sent=email_sent,
+        email_sent=email_queued,
     )
 
 
@@ -2750,7 +2764,24 @@ def _duplicate_payment_proofs_for_rescheduled_rental(
         .all()
     )
 
+    # só a linha é copiada: o blob em `storage_path` ganha mais uma referência
+    already_linked = set(
+        db.execute(
+            text(
+                """
+                SELECT storage_path
+                FROM public.court_rental_payment_proofs
+                WHERE court_rental_id = :target_rental_id
+                """
+            ),
+            {"target_rental_id": target_rental_id},
+        ).scalars()
+    )
+
     for proof in proofs:
+        if proof.storage_path in already_linked:
+            continue
+        already_linked.add(proof.storage_path)
         db.add(
             CourtRentalPaymentProof(
                 court_rental_id=target_rental_id,
@@ -2760,6 +2791,7 @@ def _duplicate_payment_proofs_for_rescheduled_rental(
                 storage_path=proof.storage_path,
                 mime_type=proof.mime_type,
                 file_size_bytes=proof.file_size_bytes,
+                content_sha256=proof.content_sha256,
                 notes=proof.notes,
             )
         )
@@ -2770,9 +2802,8 @@ def admin_reschedule_court_rental(
     rental_id: UUID,
     data: CourtRentalRescheduleIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    admin_user: Annotated[CurrentUser, Depends(require_admin)],
 ):
-    admin_user = _require_admin(db, user_id)
     _expire_overdue_public_pending_rentals(db)
 
     rental = db.get(CourtRental, rental_id)
@@ -2823,7 +2854,7 @@ def admin_reschedule_court_rental(
             db,
             court_id=data.court_id,
             student_id=rental.customer_student_id,
-            created_by=UUID(str(admin_user["id"])),
+            created_by=admin_user.id,
             start_at=data.start_at,
             end_at=data.end_at,
             notes=new_notes or rental.notes or "Locação de quadra reagendada pelo painel.",
@@ -2852,7 +2883,7 @@ def admin_reschedule_court_rental(
             outcome_recorded_at=rental.outcome_recorded_at,
             rescheduled_from_rental_id=rental.id,
             rescheduled_at=rescheduled_at,
-            rescheduled_by_user_id=UUID(str(admin_user["id"])),
+            rescheduled_by_user_id=admin_user.id,
             reschedule_reason=normalized_reason,
             customer_name=rental.customer_name,
             customer_email=rental.customer_email,
@@ -2884,13 +2915,25 @@ def admin_reschedule_court_rental(
         rental.status = "cancelled"
         rental.cancelled_at = rescheduled_at
         rental.deactivated_at = rescheduled_at
-        rental.deactivated_by_user_id = UUID(str(admin_user["id"]))
+        rental.deactivated_by_user_id = admin_user.id
         rental.deactivation_reason = deactivation_reason
         rental.rescheduled_to_rental_id = new_rental.id
         rental.rescheduled_at = rescheduled_at
-        rental.rescheduled_by_user_id = UUID(str(admin_user["id"]))
+        rental.rescheduled_by_user_id = admin_user.id
         rental.reschedule_reason = normalized_reason
 
+        court_name = _get_court_name(db, data.court_id)
+        email_queued = _queue_court_rental_email(
+            db,
+            rental_id=new_rental.id,
+            to_email=new_rental.customer_email,
+            recipient_name=new_rental.customer_name,
+            action="rescheduled",
+            start_at=new_event_row["start_at"],
+            end_at=new_event_row["end_at"],
+            court_name=court_name,
+        )
+
         db.commit()
         db.refresh(new_rental)
         db.refresh(rental)
@@ -2898,22 +2941,11 @@ def admin_reschedule_court_rental(
         db.rollback()
         raise _integrity_to_http(e) from e
 
-    court_name = _get_court_name(db, data.court_id)
-    email_sent = _send_court_rental_email(
-        to_email=new_rental.customer_email,
-        recipient_name=new_rental.customer_name,
-        action="rescheduled",
-        start_at=new_event_row["start_at"],
-        end_at=new_event_row["end_at"],
-        court_name=court_name,
-    )
-    _mark_confirmation_email_if_sent(db, new_rental, email_sent)
-
     message = (
         "Locação reagendada com sucesso pelo painel. "
         "O horário anterior foi liberado e o vínculo entre a locação original e a nova ocorrência foi registrado."
     )
-    if email_sent:
+    if email_queued:
         message = f"{message} Também enviamos um e-mail de confirmação para o cliente."
 
     return CourtRentalRescheduleOut(
@@ -2929,22 +2961,25 @@ def admin_reschedule_court_rental(
         court_id=new_event_row["court_id"],
         rescheduled_at=rescheduled_at,
         message=message,
-        email_sent=email_sent,
+        email_sent=email_queued,
     )
 
 
-@router.get("/admin/bookings", response_model=CourtRentalAdminListOut)
+@router.get(
+    "/admin/bookings", response_model=CourtRentalAdminListOut, dependencies=[Depends(require_admin)]
+)
 def admin_list_court_rentals(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
     from_date: Annotated[date | None, Query()] = None,
     to_date: Annotated[date | None, Query()] = None,
     status_filter: Annotated[str | None, Query(alias="status")] = None,
     payment_status_filter: Annotated[str | None, Query(alias="payment_status")] = None,
     origin: Annotated[str | None, Query()] = None,
     pricing_profile: Annotated[str | None, Query()] = None,
+    limit: Annotated[int | None, Query(ge=1, le=500)] = None,
+    cursor: Annotated[str | None, Query()] = None,
+    include_totals: Annotated[bool, Query()] = False,
 ):
-    _require_admin(db, user_id)
     _expire_overdue_public_pending_rentals(db)
 
     where_parts = ["1 = 1"]
@@ -2971,6 +3006,23 @@ def admin_list_court_rentals(
         where_parts.append("cr.pricing_profile = :pricing_profile")
         params["pricing_profile"] = _normalize_pricing_profile(pricing_profile)
 
+    filters_sql = " AND ".join(where_parts)
+    page_where = ""
+    page_params = dict(params)
+    if cursor:
+        cursor_sort_at, cursor_id = decode_cursor(cursor, types=(datetime, UUID))
+        page_where = (
+            "AND (COALESCE(e.start_at, cr.created_at), cr.id) < (:cursor_sort_at, :cursor_id)"
+        )
+        page_params["cursor_sort_at"] = cursor_sort_at
+        page_params["cursor_id"] = cursor_id
+
+    # sem limit continua a listagem completa de antes
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT :page_limit"
+        page_params["page_limit"] = limit + 1
+
     rows = (
         db.execute(
             text(
@@ -2993,35 +3045,102 @@ def admin_list_court_rentals(
                   cr.payment_proof_submitted_at,
                   cr.payment_reviewed_at,
                   cr.confirmed_at,
-                  cr.created_at
+                  cr.created_at,
+                  COALESCE(e.start_at, cr.created_at) AS sort_at
                 FROM public.court_rentals cr
                 LEFT JOIN public.events e
                   ON e.id = cr.event_id
                 LEFT JOIN public.courts c
                   ON c.id = e.court_id
-                WHERE {" AND ".join(where_parts)}
-                ORDER BY COALESCE(e.start_at, cr.created_at) DESC, cr.created_at DESC
+                WHERE {filters_sql}
+                  {page_where}
+                ORDER BY COALESCE(e.start_at, cr.created_at) DESC, cr.id DESC
+                {limit_sql}
                 """
             ),
-            params,
+            page_params,
         )
         .mappings()
         .all()
     )
 
-    items = [CourtRentalAdminListItemOut(**row) for row in rows]
+    has_more = limit is not None and len(rows) > limit
+    next_cursor = None
+    if has_more:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["sort_at"], rows[-1]["id"])
+
+    items = [
+        CourtRentalAdminListItemOut(
+            **{key: value for key, value in row.items() if key != "sort_at"}
+        )
+        for row in rows
+    ]
+
+    # listagem completa: o total é o próprio tamanho; paginada, conta os filtros
+    total = len(items)
+    if not include_totals and (limit is not None or cursor):
+        total = db.execute(
+            text(
+                f"""
+                SELECT count(*)
+                FROM public.court_rentals cr
+                LEFT JOIN public.events e
+                  ON e.id = cr.event_id
+                WHERE {filters_sql}
+                """
+            ),
+            params,
+        ).scalar_one()
+
+    totals_by_status: dict[str, int] | None = None
+    totals_by_payment_status: dict[str, int] | None = None
+    if include_totals:
+        totals_by_status = {}
+        totals_by_payment_status = {}
+        total = 0
+        aggregate_rows = db.execute(
+            text(
+                f"""
+                SELECT cr.status, cr.payment_status, count(*) AS total
+                FROM public.court_rentals cr
+                LEFT JOIN public.events e
+                  ON e.id = cr.event_id
+                WHERE {filters_sql}
+                GROUP BY cr.status, cr.payment_status
+                """
+            ),
+            params,
+        ).mappings()
+        for row in aggregate_rows:
+            count = int(row["total"])
+            total += count
+            totals_by_status[row["status"]] = totals_by_status.get(row["status"], 0) + count
+            totals_by_payment_status[row["payment_status"]] = (
+                totals_by_payment_status.get(row["payment_status"], 0) + count
+            )
+
     return CourtRentalAdminListOut(
-        items=items, total=len(items), from_date=from_date, to_date=to_date
+        items=items,
+        total=total,
+        from_date=from_date,
+        to_date=to_date,
+        next_cursor=next_cursor,
+        has_more=has_more,
+        totals_by_status=totals_by_status,
+        totals_by_payment_status=totals_by_payment_status,
     )
 
 
-@router.get("/admin/bookings/{rental_id}", response_model=CourtRentalOut)
+@router.get(
+    "/admin/bookings/{rental_id}",
+    response_model=CourtRentalOut,
+    dependencies=[Depends(require_admin)],
+)
 def admin_get_court_rental(
     rental_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     rental = db.get(CourtRental, rental_id)
     if not rental:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Locação não encontrada.")
@@ -3031,13 +3150,12 @@ def admin_get_court_rental(
 @router.get(
     "/admin/bookings/{rental_id}/proofs",
     response_model=list[CourtRentalPaymentProofListItemOut],
+    dependencies=[Depends(require_admin)],
 )
 def admin_list_court_rental_payment_proofs(
     rental_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     rental = db.get(CourtRental, rental_id)
     if not rental:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Locação não encontrada.")
@@ -3051,14 +3169,15 @@ def admin_list_court_rental_payment_proofs(
     return [_serialize_payment_proof(proof) for proof in proofs]
 
 
-@router.get("/admin/bookings/{rental_id}/proofs/{proof_id}/download")
+@router.get(
+    "/admin/bookings/{rental_id}/proofs/{proof_id}/download", dependencies=[Depends(require_admin)]
+)
 def admin_download_court_rental_payment_proof(
     rental_id: UUID,
     proof_id: UUID,
+    request: Request,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     rental = db.get(CourtRental, rental_id)
     if not rental:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Locação não encontrada.")
@@ -3069,18 +3188,22 @@ def admin_download_court_rental_payment_proof(
             status_code=status.HTTP_404_NOT_FOUND, detail="Comprovante não encontrado."
         )
 
-    absolute_path = Path(__file__).resolve().parents[4] / proof.storage_path
-    if not absolute_path.exists() or not absolute_path.is_file():
+    storage = get_file_storage()
+    key = storage_key_from_path(proof.storage_path)
+    size = storage.size(key)
+    if size is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Arquivo do comprovante não encontrado no storage.",
         )
 
-    media_type = proof.mime_type or "application/octet-stream"
-    return FileResponse(
-        path=absolute_path,
-        media_type=media_type,
+    return storage_file_response(
+        storage,
+        key,
+        size=size,
+        media_type=proof.mime_type or "application/octet-stream",
         filename=proof.original_file_name,
+        range_header=request.headers.get("range"),
     )
 
 
@@ -3090,44 +3213,23 @@ def admin_download_court_rental_payment_proof(
 )
 async def admin_upload_court_rental_payment_proof(
     rental_id: UUID,
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    admin_user: Annotated[CurrentUser, Depends(require_admin)],
     db: Annotated[Session, Depends(get_db)],
     proof_file: Annotated[UploadFile, File(...)],
     payment_received_amount: Annotated[str | None, Form()] = None,
     notes: Annotated[str | None, Form()] = None,
 ):
-    admin_user = _require_admin(db, user_id)
     rental = db.get(CourtRental, rental_id)
     if not rental:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Locação não encontrada.")
 
     content_type = (proof_file.content_type or "").lower()
-    allowed_content_types = {
-        "application/pdf",
-        "image/png",
-        "image/jpeg",
-        "image/jpg",
-        "image/webp",
-    }
-    if content_type not in allowed_content_types:
+    if content_type not in _PAYMENT_PROOF_CONTENT_TYPES:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Envie o comprovante em PDF, PNG, JPG ou WEBP.",
         )
 
-    file_bytes = await proof_file.read()
-    if not file_bytes:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="O arquivo do comprovante está vazio.",
-        )
-
-    if len(file_bytes) > 10 * 1024 * 1024:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="O comprovante deve ter no máximo 10 MB.",
-        )
-
     received_amount = None
     if payment_received_amount is not None and str(payment_received_amount).strip():
         try:
@@ -3141,23 +3243,17 @@ async def admin_upload_court_rental_payment_proof(
             ) from exc
 
     proof_notes = _normalize_notes(notes)
-    storage_dir = _payment_proof_storage_dir() / str(rental.id)
-    storage_dir.mkdir(parents=True, exist_ok=True)
-    extension = _guess_extension(proof_file)
-    stored_file_name = (
-        f"{datetime.now(_local_tz()):%Y%m%d%H%M%S}_{UUID(str(admin_user['id'])).hex}{extension}"
-    )
-    absolute_path = storage_dir / stored_file_name
-    absolute_path.write_bytes(file_bytes)
+    stored = await _store_payment_proof_upload(proof_file)
 
     proof = CourtRentalPaymentProof(
         court_rental_id=rental.id,
-        uploaded_by_user_id=UUID(str(admin_user["id"])),
-        original_file_name=proof_file.filename or stored_file_name,
-        stored_file_name=stored_file_name,
-        storage_path=str(absolute_path.relative_to(Path(__file__).resolve().parents[4])),
+        uploaded_by_user_id=admin_user.id,
+        original_file_name=proof_file.filename or f"comprovante{_guess_extension(proof_file)}",
+        stored_file_name=stored.sha256,
+        storage_path=payment_proof_storage_path(stored),
         mime_type=content_type,
-        file_size_bytes=len(file_bytes),
+        file_size_bytes=stored.size,
+        content_sha256=stored.sha256,
         notes=proof_notes,
     )
     db.add(proof)
@@ -3170,7 +3266,7 @@ async def admin_upload_court_rental_payment_proof(
         else rental.payment_received_amount,
         proof_notes=proof_notes,
         evidence_status="admin_uploaded",
-        recorded_by_user_id=UUID(str(admin_user["id"])),
+        recorded_by_user_id=admin_user.id,
     )
 
     db.commit()
@@ -3195,14 +3291,13 @@ async def admin_upload_court_rental_payment_proof(
 @router.post(
     "/admin/bookings/{rental_id}/payment-definition",
     response_model=CourtRentalAdminPaymentDefinitionOut,
+    dependencies=[Depends(require_admin)],
 )
 def admin_define_court_rental_payment(
     rental_id: UUID,
     data: CourtRentalAdminPaymentDefinitionIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     rental = db.get(CourtRental, rental_id)
     if not rental:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Locação não encontrada.")
@@ -3251,11 +3346,10 @@ def admin_define_court_rental_payment(
             {"notes": rental.notes, "event_id": rental.event_id},
         )
 
-    db.commit()
-    db.refresh(rental)
-
     proof_whatsapp, payment_instructions = _get_payment_email_context(db)
-    email_sent = _send_court_rental_email(
+    email_queued = _queue_court_rental_email(
+        db,
+        rental_id=rental.id,
         to_email=rental.customer_email,
         recipient_name=rental.customer_name,
         action="payment_pending",
@@ -3268,12 +3362,14 @@ def admin_define_court_rental_payment(
         proof_whatsapp=proof_whatsapp,
         payment_instructions=payment_instructions,
     )
-    _mark_confirmation_email_if_sent(db, rental, email_sent)
+
+    db.commit()
+    db.refresh(rental)
 
     message = "Cobrança Pix definida com sucesso para a locação."
-    if email_sent:
+    if email_queued:
         message = (
-            f"{message} Enviamos também um e-mail com as instruções de pagamento para o cliente."
+            f"{message} Também enviaremos um e-mail com as instruções de pagamento para o cliente."
         )
 
     return CourtRentalAdminPaymentDefinitionOut(
@@ -3286,7 +3382,7 @@ def admin_define_court_rental_payment(
         pix_key=rental.pix_key,
         pix_qr_code_payload=rental.pix_qr_code_payload,
         message=message,
-        email_sent=email_sent,
+        email_sent=email_queued,
     )
 
 
@@ -3294,10 +3390,8 @@ def admin_define_court_rental_payment(
 def admin_create_court_rental(
     data: CourtRentalAdminCreateIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    admin_user: Annotated[CurrentUser, Depends(require_admin)],
 ):
-    admin_user = _require_admin(db, user_id)
-
     if data.end_at <= data.start_at:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -3395,14 +3489,14 @@ def admin_create_court_rental(
             db,
             court_id=data.court_id,
             student_id=customer["customer_student_id"],
-            created_by=UUID(str(admin_user["id"])),
+            created_by=admin_user.id,
             start_at=data.start_at,
             end_at=data.end_at,
             notes=_normalize_notes(data.notes) or "Locação criada pelo painel administrativo.",
         )
         rental = CourtRental(
             user_id=customer["user_id"],
-            created_by_user_id=UUID(str(admin_user["id"])),
+            created_by_user_id=admin_user.id,
             customer_user_id=customer["customer_user_id"],
             customer_student_id=customer["customer_student_id"],
             event_id=event_row["id"],
@@ -3435,34 +3529,36 @@ def admin_create_court_rental(
             payment_evidence_recorded_at=datetime.now(_local_tz())
             if payment_evidence_status_value in {"not_applicable", "not_sent"}
             else None,
-            payment_evidence_recorded_by_user_id=UUID(str(admin_user["id"]))
+            payment_evidence_recorded_by_user_id=admin_user.id
             if payment_evidence_status_value in {"not_applicable", "not_sent"}
             else None,
             outcome_status="pending",
         )
+
+        proof_whatsapp, payment_instructions = _get_payment_email_context(db)
+        email_action = "payment_pending" if rental.payment_status == "pending" else "scheduled"
+        _queue_court_rental_email(
+            db,
+            rental_id=rental.id,
+            to_email=rental.customer_email,
+            recipient_name=rental.customer_name,
+            action=email_action,
+            start_at=data.start_at,
+            end_at=data.end_at,
+            court_name=court_name,
+            total_amount=rental.total_amount,
+            pix_key=rental.pix_key,
+            pix_qr_code_payload=rental.pix_qr_code_payload,
+            proof_whatsapp=proof_whatsapp,
+            payment_instructions=payment_instructions,
+        )
+
         db.commit()
         db.refresh(rental)
     except IntegrityError as e:
         db.rollback()
         raise _integrity_to_http(e) from e
 
-    proof_whatsapp, payment_instructions = _get_payment_email_context(db)
-    email_action = "payment_pending" if rental.payment_status == "pending" else "scheduled"
-    email_sent = _send_court_rental_email(
-        to_email=rental.customer_email,
-        recipient_name=rental.customer_name,
-        action=email_action,
-        start_at=data.start_at,
-        end_at=data.end_at,
-        court_name=court_name,
-        total_amount=rental.total_amount,
-        pix_key=rental.pix_key,
-        pix_qr_code_payload=rental.pix_qr_code_payload,
-        proof_whatsapp=proof_whatsapp,
-        payment_instructions=payment_instructions,
-    )
-    _mark_confirmation_email_if_sent(db, rental, email_sent)
-
     return _serialize_rental(rental)
 
 
@@ -3471,9 +3567,8 @@ def admin_update_court_rental(
     rental_id: UUID,
     data: CourtRentalAdminUpdateIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    admin_user: Annotated[CurrentUser, Depends(require_admin)],
 ):
-    admin_user = _require_admin(db, user_id)
     rental = db.get(CourtRental, rental_id)
     if not rental:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Locação não encontrada.")
@@ -3529,7 +3624,7 @@ def admin_update_court_rental(
             payload["payment_evidence_status"]
         )
         business_updates["payment_evidence_recorded_at"] = datetime.now(_local_tz())
-        business_updates["payment_evidence_recorded_by_user_id"] = UUID(str(admin_user["id"]))
+        business_updates["payment_evidence_recorded_by_user_id"] = admin_user.id
     if "payment_evidence_notes" in payload:
         business_updates["payment_evidence_notes"] = _normalize_notes(
             payload["payment_evidence_notes"]
@@ -3543,7 +3638,7 @@ def admin_update_court_rental(
         )
         business_updates["outcome_notes"] = _normalize_notes(payload.get("outcome_notes"))
         business_updates["outcome_recorded_at"] = datetime.now(_local_tz())
-        business_updates["outcome_recorded_by_user_id"] = UUID(str(admin_user["id"]))
+        business_updates["outcome_recorded_by_user_id"] = admin_user.id
 
     if "price_per_hour" in payload:
         rental.price_per_hour = payload["price_per_hour"]
@@ -3571,7 +3666,7 @@ def admin_update_court_rental(
             _cancel_event(db, rental.event_id)
             rental.cancelled_at = datetime.now(_local_tz())
             business_updates["deactivated_at"] = rental.cancelled_at
-            business_updates["deactivated_by_user_id"] = UUID(str(admin_user["id"]))
+            business_updates["deactivated_by_user_id"] = admin_user.id
             business_updates["deactivation_reason"] = _normalize_notes(
                 payload.get("deactivation_reason")
             )
@@ -3593,7 +3688,7 @@ def admin_update_court_rental(
                 {"event_id": rental.event_id},
             )
             business_updates["reactivated_at"] = datetime.now(_local_tz())
-            business_updates["reactivated_by_user_id"] = UUID(str(admin_user["id"]))
+            business_updates["reactivated_by_user_id"] = admin_user.id
             business_updates["reactivation_reason"] = _normalize_notes(
                 payload.get("reactivation_reason")
             )
@@ -3603,8 +3698,6 @@ def admin_update_court_rental(
         rental.status = new_status
 
     _update_rental_business_fields(db, rental.id, **business_updates)
-    db.commit()
-    db.refresh(rental)
 
     event_info = (
         db.execute(
@@ -3619,7 +3712,9 @@ def admin_update_court_rental(
         email_action = "updated"
         if rental.status == "cancelled":
             email_action = "cancelled"
-        email_sent = _send_court_rental_email(
+        _queue_court_rental_email(
+            db,
+            rental_id=rental.id,
             to_email=rental.customer_email,
             recipient_name=rental.customer_name,
             action=email_action,
@@ -3630,7 +3725,9 @@ def admin_update_court_rental(
             pix_key=rental.pix_key,
             pix_qr_code_payload=rental.pix_qr_code_payload,
         )
-        _mark_confirmation_email_if_sent(db, rental, email_sent)
+
+    db.commit()
+    db.refresh(rental)
 
     return _serialize_rental(rental)
 
@@ -3642,9 +3739,8 @@ def admin_review_court_rental_payment(
     rental_id: UUID,
     data: CourtRentalPaymentReviewIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    admin_user: Annotated[CurrentUser, Depends(require_admin)],
 ):
-    admin_user = _require_admin(db, user_id)
     rental = db.get(CourtRental, rental_id)
     if not rental:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Locação não encontrada.")
@@ -3660,7 +3756,7 @@ def admin_review_court_rental_payment(
     rental.payment_status = data.payment_status
     rental.payment_received_amount = received_amount
     rental.payment_reviewed_at = datetime.now(_local_tz())
-    rental.payment_reviewed_by_user_id = UUID(str(admin_user["id"]))
+    rental.payment_reviewed_by_user_id = admin_user.id
     rental.payment_review_notes = _normalize_notes(data.payment_review_notes)
 
     if data.payment_amount_matches_expected is not None:
@@ -3687,18 +3783,18 @@ def admin_review_court_rental_payment(
         business_updates["outcome_issue_type"] = "payment_problem"
         business_updates["outcome_notes"] = rental.payment_review_notes
         business_updates["outcome_recorded_at"] = datetime.now(_local_tz())
-        business_updates["outcome_recorded_by_user_id"] = UUID(str(admin_user["id"]))
+        business_updates["outcome_recorded_by_user_id"] = admin_user.id
         business_updates["deactivated_at"] = rental.cancelled_at
-        business_updates["deactivated_by_user_id"] = UUID(str(admin_user["id"]))
+        business_updates["deactivated_by_user_id"] = admin_user.id
         business_updates["deactivation_reason"] = "Pagamento rejeitado."
         message = "Pagamento rejeitado e locação encerrada."
         email_action = "payment_rejected"
 
     _update_rental_business_fields(db, rental.id, **business_updates)
-    db.commit()
-    db.refresh(rental)
 
-    email_sent = _send_court_rental_email(
+    email_queued = _queue_court_rental_email(
+        db,
+        rental_id=rental.id,
         to_email=rental.customer_email,
         recipient_name=rental.customer_name,
         action=email_action,
@@ -3709,10 +3805,14 @@ def admin_review_court_rental_payment(
         pix_key=rental.pix_key,
         pix_qr_code_payload=rental.pix_qr_code_payload,
     )
-    _mark_confirmation_email_if_sent(db, rental, email_sent)
 
-    if email_sent:
-        message = f"{message} Enviamos também um e-mail com o resultado da análise para o cliente."
+    db.commit()
+    db.refresh(rental)
+
+    if email_queued:
+        message = (
+            f"{message} Também enviaremos um e-mail com o resultado da análise para o cliente."
+        )
 
     return CourtRentalPaymentReviewOut(
         rental_id=rental.id,
@@ -3724,5 +3824,5 @@ def admin_review_court_rental_payment(
         payment_received_amount=rental.payment_received_amount,
         confirmed_at=rental.confirmed_at,
         message=message,
-        email_sent=email_sent,
+        email_sent=email_queued,
     )
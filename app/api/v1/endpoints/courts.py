@@ -1,18 +1,17 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime
-from io import BytesIO
 from pathlib import Path
 from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
-from PIL import Image, ImageOps, UnidentifiedImageError
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user_id
+from app.api.v1.deps import get_current_user_id, require_admin
 from app.db.session import get_db
 from app.schemas.courts import (
     CourtCreateIn,
@@ -22,6 +21,14 @@ from app.schemas.courts import (
     CourtStatusHistoryItemOut,
     CourtUpdateIn,
 )
+from app.services.file_storage import media_storage
+from app.services.image_processing import (
+    COURT_IMAGE_RENDITIONS,
+    ImageProcessingBusy,
+    ImageProcessingError,
+    build_webp_renditions,
+    image_processing_pool,
+)
 
 router = APIRouter(prefix="/courts")
 
@@ -32,6 +39,7 @@ _COURT_SELECT_COLUMNS = """
   surface_type,
   cover_type,
   image_url,
+  image_renditions,
   short_description,
   is_active,
   created_at,
@@ -56,38 +64,6 @@ def _clean_optional_text(value: str | None) -> str | None:
     return cleaned or None
 
 
-def _get_current_user_row(db: Session, user_id: str):
-    return (
-        db.execute(
-            text(
-                """
-                SELECT id, email, role, is_active
-                FROM public.users
-                WHERE id = :user_id
-                """
-            ),
-            {"user_id": user_id},
-        )
-        .mappings()
-        .first()
-    )
-
-
-def _require_admin(db: Session, user_id: str) -> None:
-    user = _get_current_user_row(db, user_id)
-    if not user or not user["is_active"]:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário inválido",
-        )
-
-    if not str(user["role"]).startswith("admin"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Apenas administradores podem gerenciar quadras.",
-        )
-
-
 def _integrity_to_http(e: IntegrityError) -> HTTPException:
     orig = getattr(e, "orig", None)
     pgcode = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
@@ -199,10 +175,6 @@ def _validate_status_change_payload(payload: CourtStatusChangeIn | None) -> None
         )
 
 
-def _court_image_storage_root() -> Path:
-    return Path(__file__).resolve().parents[4] / "storage" / "courts"
-
-
 def _guess_court_image_extension(upload: UploadFile) -> str:
     file_name = upload.filename or "court-image"
     suffix = Path(file_name).suffix.strip().lower()
@@ -232,9 +204,18 @@ def _remove_managed_court_image_if_exists(*, court_id: UUID, image_url: str | No
     if not relative_media_path.startswith(expected_prefix):
         return
 
-    absolute_path = Path(__file__).resolve().parents[4] / "storage" / relative_media_path
-    if absolute_path.is_file():
-        absolute_path.unlink()
+    media_storage.delete(relative_media_path)
+
+
+def _remove_managed_court_images(
+    *,
+    court_id: UUID,
+    image_url: str | None,
+    image_renditions: dict[str, str] | None,
+) -> None:
+    urls = {image_url, *(image_renditions or {}).values()}
+    for url in urls:
+        _remove_managed_court_image_if_exists(court_id=court_id, image_url=url)
 
 
 _ALLOWED_COURT_IMAGE_CONTENT_TYPES = {
@@ -244,55 +225,14 @@ _ALLOWED_COURT_IMAGE_CONTENT_TYPES = {
     "image/webp",
 }
 _COURT_IMAGE_MAX_UPLOAD_BYTES = 10 * 1024 * 1024
-_COURT_IMAGE_MAX_DIMENSION = 1600
-_COURT_IMAGE_OUTPUT_QUALITY = 80
-
-
-def _optimize_court_image(file_bytes: bytes) -> bytes:
-    try:
-        with Image.open(BytesIO(file_bytes)) as image:
-            normalized = ImageOps.exif_transpose(image)
-            if normalized.mode not in {"RGB", "RGBA"}:
-                normalized = normalized.convert("RGBA" if "A" in normalized.getbands() else "RGB")
-
-            normalized.thumbnail(
-                (_COURT_IMAGE_MAX_DIMENSION, _COURT_IMAGE_MAX_DIMENSION),
-                Image.Resampling.LANCZOS,
-            )
 
-            output = BytesIO()
-            if "A" in normalized.getbands():
-                normalized.save(
-                    output,
-                    format="WEBP",
-                    quality=_COURT_IMAGE_OUTPUT_QUALITY,
-                    method=6,
-                )
-            else:
-                normalized.convert("RGB").save(
-                    output,
-                    format="WEBP",
-                    quality=_COURT_IMAGE_OUTPUT_QUALITY,
-                    method=6,
-                )
-
-            return output.getvalue()
-    except (UnidentifiedImageError, OSError, ValueError) as exc:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Não foi possível processar a imagem da quadra enviada.",
-        ) from exc
 
-
-@router.get("/", response_model=list[CourtListItemOut])
+@router.get("/", response_model=list[CourtListItemOut], dependencies=[Depends(require_admin)])
 def list_courts(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
     is_active: bool | None = None,
     q: str | None = Query(default=None, description="Busca por nome da quadra"),
 ):
-    _require_admin(db, user_id)
-
     params: dict[str, object] = {"is_active": is_active}
     where_parts = ["1 = 1"]
 
@@ -327,23 +267,23 @@ def list_courts(
     return rows
 
 
-@router.get("/{court_id}", response_model=CourtOut)
+@router.get("/{court_id}", response_model=CourtOut, dependencies=[Depends(require_admin)])
 def get_court(
     court_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     return _get_court_or_404(db, court_id)
 
 
-@router.get("/{court_id}/status-history", response_model=list[CourtStatusHistoryItemOut])
+@router.get(
+    "/{court_id}/status-history",
+    response_model=list[CourtStatusHistoryItemOut],
+    dependencies=[Depends(require_admin)],
+)
 def get_court_status_history(
     court_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_court_or_404(db, court_id)
 
     rows = (
@@ -372,14 +312,17 @@ def get_court_status_history(
     return rows
 
 
-@router.post("/", response_model=CourtOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=CourtOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
+)
 def create_court(
     payload: CourtCreateIn,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     try:
         row = (
             db.execute(
@@ -435,15 +378,12 @@ def create_court(
         raise _integrity_to_http(e) from e
 
 
-@router.patch("/{court_id}", response_model=CourtOut)
+@router.patch("/{court_id}", response_model=CourtOut, dependencies=[Depends(require_admin)])
 def update_court(
     court_id: UUID,
     payload: CourtUpdateIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     current = _get_court_or_404(db, court_id)
 
     if payload.is_active is not None and bool(payload.is_active) != bool(current["is_active"]):
@@ -475,6 +415,10 @@ def update_court(
             else current["short_description"]
         ),
     }
+    # renditions só valem para a imagem enviada pelo upload
+    image_renditions = (
+        current["image_renditions"] if merged["image_url"] == current["image_url"] else None
+    )
 
     try:
         row = (
@@ -487,6 +431,7 @@ def update_court(
                       surface_type = :surface_type,
                       cover_type = :cover_type,
                       image_url = :image_url,
+                      image_renditions = CAST(:image_renditions AS jsonb),
                       short_description = :short_description,
                       updated_at = now()
                     WHERE id = :court_id
@@ -497,6 +442,9 @@ def update_court(
                 {
                     "court_id": court_id,
                     **merged,
+                    "image_renditions": (
+                        json.dumps(image_renditions) if image_renditions is not None else None
+                    ),
                 },
             )
             .mappings()
@@ -510,7 +458,9 @@ def update_court(
         raise _integrity_to_http(e) from e
 
 
-@router.post("/{court_id}/image-upload", response_model=CourtOut)
+@router.post(
+    "/{court_id}/image-upload", response_model=CourtOut, dependencies=[Depends(require_admin)]
+)
 async def upload_court_image(
     court_id: UUID,
     request: Request,
@@ -518,8 +468,6 @@ async def upload_court_image(
     user_id: Annotated[str, Depends(get_current_user_id)],
     image_file: Annotated[UploadFile, File(...)],
 ):
-    _require_admin(db, user_id)
-
     current = _get_court_or_404(db, court_id)
 
     content_type = (image_file.content_type or "").lower()
@@ -542,17 +490,34 @@ async def upload_court_image(
             detail="A imagem da quadra deve ter no máximo 10 MB antes da otimização.",
         )
 
-    optimized_bytes = _optimize_court_image(file_bytes)
-
-    storage_dir = _court_image_storage_root() / str(court_id)
-    storage_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        # decodificação + WEBP method=6 é CPU pesada: vai para o pool de processos
+        renditions = await image_processing_pool.run(
+            build_webp_renditions, file_bytes, COURT_IMAGE_RENDITIONS
+        )
+    except ImageProcessingBusy as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Muitas imagens em processamento. Tente novamente em instantes.",
+            headers={"Retry-After": "5"},
+        ) from exc
+    except ImageProcessingError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Não foi possível processar a imagem da quadra enviada.",
+        ) from exc
 
-    stored_file_name = f"{datetime.now():%Y%m%d%H%M%S}_{UUID(user_id).hex}.webp"
-    absolute_path = storage_dir / stored_file_name
-    absolute_path.write_bytes(optimized_bytes)
+    base_name = f"{datetime.now():%Y%m%d%H%M%S}_{UUID(user_id).hex}"
+    written_keys: list[str] = []
+    rendition_urls: dict[str, str] = {}
+    for name, data in renditions.items():
+        stored_file_name = f"{base_name}.webp" if name == "full" else f"{base_name}_{name}.webp"
+        key = f"courts/{court_id}/{stored_file_name}"
+        await media_storage.save_bytes(key, data)
+        written_keys.append(key)
+        rendition_urls[name] = str(request.url_for("media", path=key))
 
-    relative_media_path = Path("courts") / str(court_id) / stored_file_name
-    image_url = str(request.url_for("media", path=relative_media_path.as_posix()))
+    image_url = rendition_urls["full"]
 
     try:
         row = (
@@ -562,6 +527,7 @@ async def upload_court_image(
                     UPDATE public.courts
                     SET
                       image_url = :image_url,
+                      image_renditions = CAST(:image_renditions AS jsonb),
                       updated_at = now()
                     WHERE id = :court_id
                     RETURNING
@@ -571,6 +537,7 @@ async def upload_court_image(
                 {
                     "court_id": court_id,
                     "image_url": image_url,
+                    "image_renditions": json.dumps(rendition_urls),
                 },
             )
             .mappings()
@@ -578,23 +545,28 @@ async def upload_court_image(
         )
         db.commit()
     except Exception:
-        if absolute_path.exists():
-            absolute_path.unlink()
+        for written_key in written_keys:
+            media_storage.delete(written_key)
         db.rollback()
         raise
 
-    _remove_managed_court_image_if_exists(court_id=court_id, image_url=current["image_url"])
+    _remove_managed_court_images(
+        court_id=court_id,
+        image_url=current["image_url"],
+        image_renditions=current["image_renditions"],
+    )
     return row
 
 
-@router.patch("/{court_id}/deactivate", response_model=CourtOut)
+@router.patch(
+    "/{court_id}/deactivate", response_model=CourtOut, dependencies=[Depends(require_admin)]
+)
 def deactivate_court(
     court_id: UUID,
     payload: CourtStatusChangeIn | None,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _validate_status_change_payload(payload)
     current = _get_court_or_404(db, court_id)
 
@@ -633,14 +605,15 @@ def deactivate_court(
     return row
 
 
-@router.patch("/{court_id}/reactivate", response_model=CourtOut)
+@router.patch(
+    "/{court_id}/reactivate", response_model=CourtOut, dependencies=[Depends(require_admin)]
+)
 def reactivate_court(
     court_id: UUID,
     payload: CourtStatusChangeIn | None,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _validate_status_change_payload(payload)
     current = _get_court_or_404(db, court_id)
 
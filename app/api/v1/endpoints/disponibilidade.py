@@ -1,5 +1,6 @@
-from datetime import datetime
+from datetime import datetime, time
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import text
@@ -7,34 +8,138 @@ from sqlalchemy.orm import Session
 
 from app.api.v1.deps import get_current_user_id
 from app.db.session import get_db
-from app.schemas.agenda import CourtDisponivelOut, ProfessorDisponivelOut
+from app.schemas.agenda import (
+    CourtDisponivelOut,
+    CourtGradeSlotOut,
+    ProfessorDisponivelOut,
+    ProfessorGradeOut,
+    ProfessorGradeSlotOut,
+    ProfessorGradeTeacherOut,
+)
+from app.services.court_availability import list_free_court_grade
+from app.services.teacher_availability import build_slot_grid, resolve_teacher_availability
 
 router = APIRouter()
 
+MAX_GRID_SLOTS = 2000
 
-@router.get("/quadras", response_model=list[CourtDisponivelOut])
+
+@router.get("/quadras", response_model=list[CourtGradeSlotOut] | list[CourtDisponivelOut])
 def quadras_disponiveis(
     from_: Annotated[datetime, Query(alias="from")],
     to: Annotated[datetime, Query()],
+    slot_minutes: Annotated[int | None, Query(ge=15, le=240)] = None,
+    day_start_hour: Annotated[int, Query(ge=0, le=23)] = 6,
+    day_end_hour: Annotated[int, Query(ge=1, le=23)] = 23,
     db: Annotated[Session, Depends(get_db)] = None,  # type: ignore[assignment]
     _user_id: Annotated[str, Depends(get_current_user_id)] = "",  # type: ignore[assignment]
 ):
     if from_ >= to:
         raise HTTPException(status_code=422, detail="'from' precisa ser menor que 'to'")
 
-    sql = text("SELECT * FROM public.fn_quadras_disponiveis(:p_from, :p_to)")
-    return db.execute(sql, {"p_from": from_, "p_to": to}).mappings().all()
+    if slot_minutes is None:
+        sql = text("SELECT * FROM public.fn_quadras_disponiveis(:p_from, :p_to)")
+        return db.execute(sql, {"p_from": from_, "p_to": to}).mappings().all()
+
+    # Modo grade: todos os slots livres do período em uma única chamada.
+    if day_start_hour >= day_end_hour:
+        raise HTTPException(
+            status_code=422,
+            detail="day_start_hour precisa ser menor que day_end_hour",
+        )
+
+    day_start = time(hour=day_start_hour)
+    day_end = time(hour=day_end_hour)
+    slot_count = len(
+        build_slot_grid(
+            range_start=from_,
+            range_end=to,
+            slot_minutes=slot_minutes,
+            day_start=day_start,
+            day_end=day_end,
+        )
+    )
+    if slot_count > MAX_GRID_SLOTS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"O período solicitado gera mais de {MAX_GRID_SLOTS} slots.",
+        )
+
+    return [
+        CourtGradeSlotOut(
+            slot_start=slot.start_at,
+            slot_end=slot.end_at,
+            court_id=slot.court_id,
+            court_name=slot.court_name,
+        )
+        for slot in list_free_court_grade(
+            db,
+            range_start=from_,
+            range_end=to,
+            slot_minutes=slot_minutes,
+            day_start=day_start,
+            day_end=day_end,
+        )
+    ]
 
 
-@router.get("/professores", response_model=list[ProfessorDisponivelOut])
+@router.get("/professores", response_model=ProfessorGradeOut | list[ProfessorDisponivelOut])
 def professores_disponiveis(
     from_: Annotated[datetime, Query(alias="from")],
     to: Annotated[datetime, Query()],
+    grid: Annotated[bool, Query()] = False,
+    slot_minutes: Annotated[int, Query(ge=15, le=240)] = 60,
+    day_start_hour: Annotated[int, Query(ge=0, le=23)] = 6,
+    day_end_hour: Annotated[int, Query(ge=1, le=23)] = 23,
+    modality: Annotated[str | None, Query()] = None,
+    court_id: Annotated[UUID | None, Query()] = None,
     db: Annotated[Session, Depends(get_db)] = None,  # type: ignore[assignment]
     _user_id: Annotated[str, Depends(get_current_user_id)] = "",  # type: ignore[assignment]
 ):
     if from_ >= to:
         raise HTTPException(status_code=422, detail="'from' precisa ser menor que 'to'")
 
-    sql = text("SELECT * FROM public.fn_professores_disponiveis(:p_from, :p_to)")
-    return db.execute(sql, {"p_from": from_, "p_to": to}).mappings().all()
+    if not grid:
+        sql = text("SELECT * FROM public.fn_professores_disponiveis(:p_from, :p_to)")
+        return db.execute(sql, {"p_from": from_, "p_to": to}).mappings().all()
+
+    # Modo grade: matriz professor × slot para o período inteiro em uma passada.
+    if day_start_hour >= day_end_hour:
+        raise HTTPException(
+            status_code=422,
+            detail="day_start_hour precisa ser menor que day_end_hour",
+        )
+
+    intervals = build_slot_grid(
+        range_start=from_,
+        range_end=to,
+        slot_minutes=slot_minutes,
+        day_start=time(hour=day_start_hour),
+        day_end=time(hour=day_end_hour),
+    )
+    if len(intervals) > MAX_GRID_SLOTS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"O período solicitado gera mais de {MAX_GRID_SLOTS} slots.",
+        )
+
+    result = resolve_teacher_availability(
+        db,
+        intervals=intervals,
+        modality=modality,
+        court_id=court_id,
+    )
+    return ProfessorGradeOut(
+        slots=[
+            ProfessorGradeSlotOut(slot_start=slot_start, slot_end=slot_end)
+            for slot_start, slot_end in result.slots
+        ],
+        teachers=[
+            ProfessorGradeTeacherOut(
+                teacher_id=row.teacher_id,
+                teacher_name=row.teacher_name,
+                available=row.available,
+            )
+            for row in result.teachers
+        ],
+    )
@@ -1,8 +1,25 @@
 from fastapi import APIRouter
 
+from app.services.availability_snapshot import availability_snapshot_cache
+from app.services.booking_coordinator import booking_coordinator
+
 router = APIRouter()
 
 
 @router.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@router.get("/health/booking-locks")
+def booking_locks_health():
+    """Contadores do coordenador de reservas neste processo."""
+
+    return booking_coordinator.snapshot()
+
+
+@router.get("/health/availability-cache")
+def availability_cache_health():
+    """Acerto e tempo de reconstrução dos snapshots de disponibilidade neste processo."""
+
+    return availability_snapshot_cache.snapshot()
@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import or_, select, text
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user_id
+from app.api.v1.deps import get_current_user_id, require_admin
 from app.core.config import settings
 from app.db.session import get_db
 from app.models.student import Student
@@ -26,12 +26,11 @@ from app.schemas.student_signup_requests import (
     StudentSignupRequestReviewOut,
 )
 from app.services.email_sender import (
-    ConsoleEmailSender,
     EmailSendError,
-    SmtpConfig,
-    SmtpEmailSender,
+    build_email_sender,
 )
 from app.services.password_reset import PasswordResetService
+from app.services.user_access import invalidate_user_access
 
 router = APIRouter(prefix="/student-signup-requests")
 
@@ -115,36 +114,6 @@ def _is_minor(birth_date) -> bool:
     return _calculate_age(birth_date) < 18
 
 
-def _require_admin(db: Session, user_id: str) -> None:
-    user = (
-        db.execute(
-            text(
-                """
-                SELECT id, role, is_active
-                FROM public.users
-                WHERE id = :user_id
-                """
-            ),
-            {"user_id": user_id},
-        )
-        .mappings()
-        .first()
-    )
-
-    if not user or not user["is_active"]:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário inválido.",
-        )
-
-    role = str(user["role"] or "").strip().lower()
-    if not role.startswith("admin"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Apenas administradores podem revisar solicitações de alunos.",
-        )
-
-
 def _resolve_email_confirmed_at(
     *,
     request: StudentSignupRequest,
@@ -232,20 +201,6 @@ def _get_approved_user_for_request(
     return db.get(User, request.approved_user_id)
 
 
-def _get_email_sender():
-    if settings.email_sender_backend.lower() == "smtp":
-        cfg = SmtpConfig(
-            host=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_username,
-            password=settings.smtp_password,
-            mail_from=settings.smtp_from,
-            use_tls=settings.smtp_use_tls,
-        )
-        return SmtpEmailSender(cfg)
-    return ConsoleEmailSender()
-
-
 def _build_first_access_link(*, token: str, email: str) -> str:
     query = urlencode({"token": token, "email": email})
     return f"{settings.frontend_url}/primeiro-acesso?{query}"
@@ -326,6 +281,7 @@ def _create_or_update_user_for_approved_request(
     existing_user.is_active = True
     existing_user.role = "student"
     existing_user.updated_at = datetime.now(UTC)
+    invalidate_user_access(db, existing_user.id)
 
     return existing_user
 
@@ -441,7 +397,7 @@ def _issue_first_access_token(db: Session, user: User) -> str | None:
 
 
 def _send_received_email(request: StudentSignupRequest) -> None:
-    sender = _get_email_sender()
+    sender = build_email_sender()
     try:
         sender.send_student_signup_received_email(
             to_email=request.email,
@@ -454,7 +410,7 @@ def _send_received_email(request: StudentSignupRequest) -> None:
 
 
 def _send_approved_email(*, db: Session, request: StudentSignupRequest, user: User) -> None:
-    sender = _get_email_sender()
+    sender = build_email_sender()
     token = _issue_first_access_token(db=db, user=user)
     login_link = (
         _build_first_access_link(token=token, email=user.email)
@@ -475,7 +431,7 @@ def _send_approved_email(*, db: Session, request: StudentSignupRequest, user: Us
 
 
 def _send_rejected_email(request: StudentSignupRequest) -> None:
-    sender = _get_email_sender()
+    sender = build_email_sender()
     contact_email = settings.smtp_from or None
     try:
         sender.send_student_signup_rejected_email(
@@ -610,14 +566,13 @@ def create_student_signup_request(data: StudentSignupRequestCreateIn, db: DBSess
     return StudentSignupRequestCreateOut(request_id=request.id, status="pending")
 
 
-@router.get("", response_model=list[StudentSignupRequestListItemOut])
+@router.get(
+    "", response_model=list[StudentSignupRequestListItemOut], dependencies=[Depends(require_admin)]
+)
 def list_student_signup_requests(
     db: DBSession,
-    user_id: CurrentUserId,
     status_filter: str | None = Query(default=None, alias="status"),
 ):
-    _require_admin(db, user_id)
-
     stmt = select(StudentSignupRequest).order_by(StudentSignupRequest.created_at.desc())
 
     if status_filter:
@@ -648,13 +603,13 @@ def list_student_signup_requests(
     ]
 
 
-@router.get("/{request_id}", response_model=StudentSignupRequestOut)
+@router.get(
+    "/{request_id}", response_model=StudentSignupRequestOut, dependencies=[Depends(require_admin)]
+)
 def get_student_signup_request(
     request_id: UUID,
     db: DBSession,
-    user_id: CurrentUserId,
 ):
-    _require_admin(db, user_id)
     request = _get_request_or_404(db, request_id)
     approved_user = _get_approved_user_for_request(db, request)
     return StudentSignupRequestOut(
@@ -662,14 +617,14 @@ def get_student_signup_request(
     )
 
 
-@router.patch("/{request_id}", response_model=StudentSignupRequestOut)
+@router.patch(
+    "/{request_id}", response_model=StudentSignupRequestOut, dependencies=[Depends(require_admin)]
+)
 def update_student_signup_request(
     request_id: UUID,
     payload: StudentSignupRequestAdminUpdateIn,
     db: DBSession,
-    user_id: CurrentUserId,
 ):
-    _require_admin(db, user_id)
     request = _get_request_or_404(db, request_id)
 
     if request.status == "approved":
@@ -708,13 +663,15 @@ def update_student_signup_request(
     )
 
 
-@router.post("/{request_id}/reopen", response_model=StudentSignupRequestReopenOut)
+@router.post(
+    "/{request_id}/reopen",
+    response_model=StudentSignupRequestReopenOut,
+    dependencies=[Depends(require_admin)],
+)
 def reopen_student_signup_request(
     request_id: UUID,
     db: DBSession,
-    user_id: CurrentUserId,
 ):
-    _require_admin(db, user_id)
     request = _get_request_or_404(db, request_id)
 
     if request.status != "rejected":
@@ -756,15 +713,17 @@ def reopen_student_signup_request(
     )
 
 
-@router.post("/{request_id}/review", response_model=StudentSignupRequestReviewOut)
+@router.post(
+    "/{request_id}/review",
+    response_model=StudentSignupRequestReviewOut,
+    dependencies=[Depends(require_admin)],
+)
 def review_student_signup_request(
     request_id: UUID,
     payload: StudentSignupRequestReviewIn,
     db: DBSession,
     user_id: CurrentUserId,
 ):
-    _require_admin(db, user_id)
-
     request = _get_request_or_404(db, request_id)
     if request.status != "pending":
         raise HTTPException(
@@ -13,8 +13,8 @@ from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user_id
-from app.core.config import settings
+from app.api.v1.deps import get_current_user, get_current_user_id, require_admin
+from app.api.v1.pagination import decode_cursor, encode_cursor
 from app.db.session import get_db
 from app.schemas.student_imports import (
     StudentImportCommitOut,
@@ -25,6 +25,7 @@ from app.schemas.students import (
     StudentCreateIn,
     StudentHomeOut,
     StudentListItemOut,
+    StudentListOut,
     StudentMakeupReplacementLessonOptionOut,
     StudentMakeupRequestAdminCreateIn,
     StudentMakeupRequestCreateIn,
@@ -36,12 +37,9 @@ from app.schemas.students import (
     StudentStatusHistoryItemOut,
     StudentUpdateIn,
 )
-from app.services.email_sender import (
-    ConsoleEmailSender,
-    EmailSendError,
-    SmtpConfig,
-    SmtpEmailSender,
-)
+from app.services.email_outbox import OUTBOX_STUDENT_MAKEUP_REQUEST, OutboxEmailSender
+from app.services.student_home_cache import invalidate_student_home, student_home_cache
+from app.services.user_access import CurrentUser
 
 router = APIRouter(prefix="/students")
 
@@ -71,62 +69,6 @@ _WEEKDAY_LABELS = {
 }
 
 
-def _get_email_sender():
-    if settings.email_sender_backend.lower() == "smtp":
-        cfg = SmtpConfig(
-            host=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_username,
-            password=settings.smtp_password,
-            mail_from=settings.smtp_from,
-            use_tls=settings.smtp_use_tls,
-        )
-        return SmtpEmailSender(cfg)
-    return ConsoleEmailSender()
-
-
-def _get_current_user_row(db: Session, user_id: str):
-    return (
-        db.execute(
-            text(
-                """
-                SELECT id, email, role, is_active
-                FROM public.users
-                WHERE id = :user_id
-                """
-            ),
-            {"user_id": user_id},
-        )
-        .mappings()
-        .first()
-    )
-
-
-def _require_admin(db: Session, user_id: str) -> None:
-    user = _get_current_user_row(db, user_id)
-    if not user or not user["is_active"]:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário inválido",
-        )
-
-    if not str(user["role"]).startswith("admin"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Apenas administradores podem gerenciar alunos.",
-        )
-
-
-def _require_active_user(db: Session, user_id: str):
-    user = _get_current_user_row(db, user_id)
-    if not user or not user["is_active"]:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário inválido",
-        )
-    return user
-
-
 def _find_student_by_user_or_email(
     db: Session,
     *,
@@ -206,360 +148,288 @@ def _find_student_by_user_or_email(
     )
 
 
-def _get_student_home_class_group_rows(db: Session, *, student_id: UUID):
-    return (
-        db.execute(
-            text(
-                """
-                SELECT
-                  cge.id AS enrollment_id,
-                  cg.id AS class_group_id,
-                  cg.name AS class_group_name,
-                  cg.class_type AS class_type,
-                  cg.level AS level,
-                  cge.status AS enrollment_status,
-                  cge.starts_on AS enrollment_starts_on,
-                  cge.ends_on AS enrollment_ends_on,
-                  cg.teacher_id AS teacher_id,
-                  t.full_name AS teacher_name,
-                  cg.court_id AS court_id,
-                  c.name AS court_name
-                FROM public.class_group_enrollments cge
-                JOIN public.class_groups cg
-                  ON cg.id = cge.class_group_id
-                LEFT JOIN public.teachers t
-                  ON t.id = cg.teacher_id
-                LEFT JOIN public.courts c
-                  ON c.id = cg.court_id
-                WHERE cge.student_id = :student_id
-                  AND cge.status = 'active'
-                  AND cg.is_active = TRUE
-                  AND cge.starts_on <= current_date
-                  AND (cge.ends_on IS NULL OR cge.ends_on >= current_date)
-                ORDER BY
-                  cg.name ASC,
-                  cge.starts_on ASC,
-                  cge.created_at ASC
-                """
-            ),
-            {"student_id": student_id},
-        )
-        .mappings()
-        .all()
+# Home do aluno em um único round trip: turmas (com horários e colegas),
+# próximas locações e histórico recente montados pelo Postgres em JSON.
+_STUDENT_HOME_AGGREGATE_SQL = """
+WITH
+  student_groups AS (
+    SELECT
+      cge.id AS enrollment_id,
+      cg.id AS class_group_id,
+      cg.name AS class_group_name,
+      cg.class_type AS class_type,
+      cg.level AS level,
+      cge.status AS enrollment_status,
+      cge.starts_on AS enrollment_starts_on,
+      cge.ends_on AS enrollment_ends_on,
+      cge.created_at AS enrollment_created_at,
+      cg.teacher_id AS teacher_id,
+      t.full_name AS teacher_name,
+      cg.court_id AS court_id,
+      c.name AS court_name
+    FROM public.class_group_enrollments cge
+    JOIN public.class_groups cg
+      ON cg.id = cge.class_group_id
+    LEFT JOIN public.teachers t
+      ON t.id = cg.teacher_id
+    LEFT JOIN public.courts c
+      ON c.id = cg.court_id
+    WHERE cge.student_id = :student_id
+      AND cge.status = 'active'
+      AND cg.is_active = TRUE
+      AND cge.starts_on <= current_date
+      AND (cge.ends_on IS NULL OR cge.ends_on >= current_date)
+  ),
+  upcoming AS (
+    SELECT
+      cr.id AS rental_id,
+      e.court_id AS court_id,
+      c.name AS court_name,
+      e.start_at AS start_at,
+      e.end_at AS end_at,
+      cr.status AS status,
+      cr.payment_status AS payment_status,
+      cr.payment_evidence_status AS payment_evidence_status,
+      cr.pricing_profile AS pricing_profile,
+      cr.billing_mode AS billing_mode,
+      cr.origin AS origin,
+      cr.total_amount AS total_amount,
+      cr.price_per_hour AS price_per_hour,
+      cr.requested_at AS requested_at,
+      cr.scheduled_at AS scheduled_at,
+      cr.confirmed_at AS confirmed_at,
+      cr.cancelled_at AS cancelled_at,
+      cr.payment_expires_at AS payment_expires_at,
+      cr.created_at AS created_at
+    FROM public.court_rentals cr
+    JOIN public.events e
+      ON e.id = cr.event_id
+    LEFT JOIN public.courts c
+      ON c.id = e.court_id
+    WHERE (
+      cr.customer_student_id = :student_id
+      OR cr.owner_user_id = :user_id
     )
-
-
-def _get_student_home_schedule_rows(db: Session, *, class_group_ids: list[UUID]):
-    if not class_group_ids:
-        return []
-
-    return (
-        db.execute(
-            text(
-                """
-                SELECT
-                  cgs.id AS schedule_id,
-                  cgs.class_group_id AS class_group_id,
-                  cgs.weekday AS weekday,
-                  cgs.start_time AS start_time,
-                  cgs.end_time AS end_time,
-                  cgs.starts_on AS starts_on,
-                  cgs.ends_on AS ends_on,
-                  cgs.is_active AS is_active,
-                  cgs.notes AS notes
-                FROM public.class_group_schedules cgs
-                WHERE cgs.class_group_id = ANY(:class_group_ids)
-                  AND cgs.is_active = TRUE
-                  AND (cgs.ends_on IS NULL OR cgs.ends_on >= current_date)
-                ORDER BY
-                  cgs.class_group_id ASC,
-                  cgs.starts_on ASC,
-                  cgs.weekday ASC,
-                  cgs.start_time ASC
-                """
-            ),
-            {"class_group_ids": class_group_ids},
-        )
-        .mappings()
-        .all()
-    )
-
-
-def _get_student_home_classmate_rows(
-    db: Session,
-    *,
-    class_group_ids: list[UUID],
-    student_id: UUID,
-):
-    if not class_group_ids:
-        return []
-
-    return (
-        db.execute(
-            text(
-                """
-                SELECT
-                  cge.class_group_id AS class_group_id,
-                  s.id AS student_id,
-                  COALESCE(NULLIF(TRIM(s.full_name), ''), NULLIF(TRIM(u.full_name), '')) AS full_name,
-                  NULL::text AS avatar_url
-                FROM public.class_group_enrollments cge
-                JOIN public.class_groups cg
-                  ON cg.id = cge.class_group_id
-                JOIN public.students s
-                  ON s.id = cge.student_id
-                LEFT JOIN public.users u
-                  ON u.id = s.user_id
-                WHERE cge.class_group_id = ANY(:class_group_ids)
-                  AND cge.status = 'active'
-                  AND cg.is_active = TRUE
-                  AND cge.starts_on <= current_date
-                  AND (cge.ends_on IS NULL OR cge.ends_on >= current_date)
-                  AND s.id <> :student_id
-                ORDER BY
-                  cge.class_group_id ASC,
-                  full_name ASC
-                """
-            ),
-            {"class_group_ids": class_group_ids, "student_id": student_id},
-        )
-        .mappings()
-        .all()
+      AND e.kind = 'locacao'
+      AND e.end_at > now()
+      AND cr.status IN (
+        'requested',
+        'awaiting_payment',
+        'awaiting_proof',
+        'awaiting_admin_review',
+        'scheduled',
+        'confirmed'
+      )
+  ),
+  history AS (
+    SELECT
+      cr.id AS rental_id,
+      e.court_id AS court_id,
+      c.name AS court_name,
+      e.start_at AS start_at,
+      e.end_at AS end_at,
+      cr.status AS status,
+      cr.payment_status AS payment_status,
+      cr.payment_evidence_status AS payment_evidence_status,
+      cr.pricing_profile AS pricing_profile,
+      cr.billing_mode AS billing_mode,
+      cr.origin AS origin,
+      cr.total_amount AS total_amount,
+      cr.price_per_hour AS price_per_hour,
+      cr.requested_at AS requested_at,
+      cr.scheduled_at AS scheduled_at,
+      cr.confirmed_at AS confirmed_at,
+      cr.cancelled_at AS cancelled_at,
+      cr.payment_expires_at AS payment_expires_at,
+      cr.created_at AS created_at
+    FROM public.court_rentals cr
+    LEFT JOIN public.events e
+      ON e.id = cr.event_id
+    LEFT JOIN public.courts c
+      ON c.id = e.court_id
+    WHERE (
+      cr.customer_student_id = :student_id
+      OR cr.owner_user_id = :user_id
     )
+      AND (
+        cr.status IN ('cancelled', 'completed', 'rejected')
+        OR e.end_at <= now()
+      )
+    ORDER BY
+      COALESCE(e.start_at, cr.requested_at, cr.created_at) DESC,
+      cr.created_at DESC
+    LIMIT 10
+  )
+SELECT
+  COALESCE(
+    (
+      SELECT json_agg(
+        json_build_object(
+          'enrollment_id', g.enrollment_id,
+          'class_group_id', g.class_group_id,
+          'class_group_name', g.class_group_name,
+          'class_type', g.class_type,
+          'level', g.level,
+          'enrollment_status', g.enrollment_status,
+          'enrollment_starts_on', g.enrollment_starts_on,
+          'enrollment_ends_on', g.enrollment_ends_on,
+          'teacher_id', g.teacher_id,
+          'teacher_name', g.teacher_name,
+          'court_id', g.court_id,
+          'court_name', g.court_name,
+          'classmates', COALESCE(mates.items, '[]'::json),
+          'schedules', COALESCE(sched.items, '[]'::json)
+        )
+        ORDER BY g.class_group_name ASC, g.enrollment_starts_on ASC, g.enrollment_created_at ASC
+      )
+      FROM student_groups g
+      LEFT JOIN LATERAL (
+        SELECT json_agg(
+          json_build_object(
+            'schedule_id', cgs.id,
+            'weekday', cgs.weekday,
+            'start_time', cgs.start_time,
+            'end_time', cgs.end_time,
+            'starts_on', cgs.starts_on,
+            'ends_on', cgs.ends_on,
+            'is_active', cgs.is_active,
+            'notes', cgs.notes
+          )
+          ORDER BY cgs.starts_on ASC, cgs.weekday ASC, cgs.start_time ASC
+        ) AS items
+        FROM public.class_group_schedules cgs
+        WHERE cgs.class_group_id = g.class_group_id
+          AND cgs.is_active = TRUE
+          AND (cgs.ends_on IS NULL OR cgs.ends_on >= current_date)
+      ) sched ON TRUE
+      LEFT JOIN LATERAL (
+        SELECT json_agg(
+          json_build_object(
+            'student_id', m.student_id,
+            'full_name', m.full_name,
+            'avatar_url', NULL
+          )
+          ORDER BY m.full_name ASC
+        ) AS items
+        FROM (
+          SELECT
+            s.id AS student_id,
+            COALESCE(NULLIF(TRIM(s.full_name), ''), NULLIF(TRIM(u.full_name), '')) AS full_name
+          FROM public.class_group_enrollments cge
+          JOIN public.students s
+            ON s.id = cge.student_id
+          LEFT JOIN public.users u
+            ON u.id = s.user_id
+          WHERE cge.class_group_id = g.class_group_id
+            AND cge.status = 'active'
+            AND cge.starts_on <= current_date
+            AND (cge.ends_on IS NULL OR cge.ends_on >= current_date)
+            AND s.id <> :student_id
+        ) m
+      ) mates ON TRUE
+    ),
+    '[]'::json
+  ) AS class_groups,
+  COALESCE(
+    (
+      SELECT json_agg(
+        json_build_object(
+          'rental_id', r.rental_id,
+          'court_id', r.court_id,
+          'court_name', r.court_name,
+          'start_at', r.start_at,
+          'end_at', r.end_at,
+          'status', r.status,
+          'payment_status', r.payment_status,
+          'payment_evidence_status', r.payment_evidence_status,
+          'pricing_profile', r.pricing_profile,
+          'billing_mode', r.billing_mode,
+          'origin', r.origin,
+          'total_amount', r.total_amount::text,
+          'price_per_hour', r.price_per_hour::text,
+          'requested_at', r.requested_at,
+          'scheduled_at', r.scheduled_at,
+          'confirmed_at', r.confirmed_at,
+          'cancelled_at', r.cancelled_at,
+          'payment_expires_at', r.payment_expires_at
+        )
+        ORDER BY r.start_at ASC, r.created_at DESC
+      )
+      FROM upcoming r
+    ),
+    '[]'::json
+  ) AS upcoming_rentals,
+  COALESCE(
+    (
+      SELECT json_agg(
+        json_build_object(
+          'rental_id', r.rental_id,
+          'court_id', r.court_id,
+          'court_name', r.court_name,
+          'start_at', r.start_at,
+          'end_at', r.end_at,
+          'status', r.status,
+          'payment_status', r.payment_status,
+          'payment_evidence_status', r.payment_evidence_status,
+          'pricing_profile', r.pricing_profile,
+          'billing_mode', r.billing_mode,
+          'origin', r.origin,
+          'total_amount', r.total_amount::text,
+          'price_per_hour', r.price_per_hour::text,
+          'requested_at', r.requested_at,
+          'scheduled_at', r.scheduled_at,
+          'confirmed_at', r.confirmed_at,
+          'cancelled_at', r.cancelled_at,
+          'payment_expires_at', r.payment_expires_at
+        )
+        ORDER BY COALESCE(r.start_at, r.requested_at, r.created_at) DESC, r.created_at DESC
+      )
+      FROM history r
+    ),
+    '[]'::json
+  ) AS recent_rental_history
+"""
 
 
-def _get_student_home_upcoming_rental_rows(
-    db: Session,
-    *,
-    user_id: str,
-    student_id: UUID,
-):
-    return (
+def _load_student_home_sections(db: Session, *, student_id: UUID, user_id: UUID) -> dict:
+    row = (
         db.execute(
-            text(
-                """
-                SELECT
-                  cr.id AS rental_id,
-                  e.court_id AS court_id,
-                  c.name AS court_name,
-                  e.start_at AS start_at,
-                  e.end_at AS end_at,
-                  cr.status AS status,
-                  cr.payment_status AS payment_status,
-                  cr.payment_evidence_status AS payment_evidence_status,
-                  cr.pricing_profile AS pricing_profile,
-                  cr.billing_mode AS billing_mode,
-                  cr.origin AS origin,
-                  cr.total_amount AS total_amount,
-                  cr.price_per_hour AS price_per_hour,
-                  cr.requested_at AS requested_at,
-                  cr.scheduled_at AS scheduled_at,
-                  cr.confirmed_at AS confirmed_at,
-                  cr.cancelled_at AS cancelled_at,
-                  cr.payment_expires_at AS payment_expires_at
-                FROM public.court_rentals cr
-                JOIN public.events e
-                  ON e.id = cr.event_id
-                LEFT JOIN public.courts c
-                  ON c.id = e.court_id
-                WHERE (
-                  cr.customer_student_id = :student_id
-                  OR COALESCE(cr.customer_user_id, cr.user_id) = :user_id
-                )
-                  AND e.kind = 'locacao'
-                  AND e.end_at > now()
-                  AND cr.status IN (
-                    'requested',
-                    'awaiting_payment',
-                    'awaiting_proof',
-                    'awaiting_admin_review',
-                    'scheduled',
-                    'confirmed'
-                  )
-                ORDER BY
-                  e.start_at ASC,
-                  cr.created_at DESC
-                """
-            ),
-            {"user_id": user_id, "student_id": student_id},
+            text(_STUDENT_HOME_AGGREGATE_SQL),
+            {"student_id": student_id, "user_id": user_id},
         )
         .mappings()
-        .all()
+        .one()
     )
 
+    class_groups = row["class_groups"]
+    for group in class_groups:
+        for schedule in group["schedules"]:
+            schedule["weekday_label"] = _WEEKDAY_LABELS.get(
+                schedule["weekday"], "Dia não informado"
+            )
 
-def _get_student_home_recent_rental_history_rows(
-    db: Session,
-    *,
-    user_id: str,
-    student_id: UUID,
-):
-    return (
-        db.execute(
-            text(
-                """
-                SELECT
-                  cr.id AS rental_id,
-                  e.court_id AS court_id,
-                  c.name AS court_name,
-                  e.start_at AS start_at,
-                  e.end_at AS end_at,
-                  cr.status AS status,
-                  cr.payment_status AS payment_status,
-                  cr.payment_evidence_status AS payment_evidence_status,
-                  cr.pricing_profile AS pricing_profile,
-                  cr.billing_mode AS billing_mode,
-                  cr.origin AS origin,
-                  cr.total_amount AS total_amount,
-                  cr.price_per_hour AS price_per_hour,
-                  cr.requested_at AS requested_at,
-                  cr.scheduled_at AS scheduled_at,
-                  cr.confirmed_at AS confirmed_at,
-                  cr.cancelled_at AS cancelled_at,
-                  cr.payment_expires_at AS payment_expires_at
-                FROM public.court_rentals cr
-                LEFT JOIN public.events e
-                  ON e.id = cr.event_id
-                LEFT JOIN public.courts c
-                  ON c.id = e.court_id
-                WHERE (
-                  cr.customer_student_id = :student_id
-                  OR COALESCE(cr.customer_user_id, cr.user_id) = :user_id
-                )
-                  AND (
-                    cr.status IN ('cancelled', 'completed', 'rejected')
-                    OR e.end_at <= now()
-                  )
-                ORDER BY
-                  COALESCE(e.start_at, cr.requested_at, cr.created_at) DESC,
-                  cr.created_at DESC
-                LIMIT 10
-                """
-            ),
-            {"user_id": user_id, "student_id": student_id},
-        )
-        .mappings()
-        .all()
-    )
+    return {
+        "class_groups": class_groups,
+        "upcoming_rentals": row["upcoming_rentals"],
+        "recent_rental_history": row["recent_rental_history"],
+    }
 
 
 def _build_student_home_payload(
     db: Session,
     *,
-    user: dict,
+    user: CurrentUser,
     student_row: dict,
 ):
-    class_group_rows = _get_student_home_class_group_rows(db, student_id=student_row["id"])
-    class_group_ids = [row["class_group_id"] for row in class_group_rows]
-
-    schedule_rows = _get_student_home_schedule_rows(db, class_group_ids=class_group_ids)
-    classmate_rows = _get_student_home_classmate_rows(
-        db,
-        class_group_ids=class_group_ids,
-        student_id=student_row["id"],
-    )
-
-    schedules_by_group: dict[UUID, list[dict[str, object]]] = {}
-    for row in schedule_rows:
-        schedules_by_group.setdefault(row["class_group_id"], []).append(
-            {
-                "schedule_id": row["schedule_id"],
-                "weekday": row["weekday"],
-                "weekday_label": _WEEKDAY_LABELS.get(row["weekday"], "Dia não informado"),
-                "start_time": row["start_time"],
-                "end_time": row["end_time"],
-                "starts_on": row["starts_on"],
-                "ends_on": row["ends_on"],
-                "is_active": row["is_active"],
-                "notes": row["notes"],
-            }
-        )
-
-    classmates_by_group: dict[UUID, list[dict[str, object]]] = {}
-    for row in classmate_rows:
-        classmates_by_group.setdefault(row["class_group_id"], []).append(
-            {
-                "student_id": row["student_id"],
-                "full_name": row["full_name"],
-                "avatar_url": row["avatar_url"],
-            }
-        )
-
-    class_groups = [
-        {
-            "enrollment_id": row["enrollment_id"],
-            "class_group_id": row["class_group_id"],
-            "class_group_name": row["class_group_name"],
-            "class_type": row["class_type"],
-            "level": row["level"],
-            "enrollment_status": row["enrollment_status"],
-            "enrollment_starts_on": row["enrollment_starts_on"],
-            "enrollment_ends_on": row["enrollment_ends_on"],
-            "teacher_id": row["teacher_id"],
-            "teacher_name": row["teacher_name"],
-            "court_id": row["court_id"],
-            "court_name": row["court_name"],
-            "classmates": classmates_by_group.get(row["class_group_id"], []),
-            "schedules": schedules_by_group.get(row["class_group_id"], []),
-        }
-        for row in class_group_rows
-    ]
-
-    upcoming_rentals = [
-        {
-            "rental_id": row["rental_id"],
-            "court_id": row["court_id"],
-            "court_name": row["court_name"],
-            "start_at": row["start_at"],
-            "end_at": row["end_at"],
-            "status": row["status"],
-            "payment_status": row["payment_status"],
-            "payment_evidence_status": row["payment_evidence_status"],
-            "pricing_profile": row["pricing_profile"],
-            "billing_mode": row["billing_mode"],
-            "origin": row["origin"],
-            "total_amount": row["total_amount"],
-            "price_per_hour": row["price_per_hour"],
-            "requested_at": row["requested_at"],
-            "scheduled_at": row["scheduled_at"],
-            "confirmed_at": row["confirmed_at"],
-            "cancelled_at": row["cancelled_at"],
-            "payment_expires_at": row["payment_expires_at"],
-        }
-        for row in _get_student_home_upcoming_rental_rows(
-            db,
-            user_id=user["id"],
-            student_id=student_row["id"],
-        )
-    ]
-
-    recent_rental_history = [
-        {
-            "rental_id": row["rental_id"],
-            "court_id": row["court_id"],
-            "court_name": row["court_name"],
-            "start_at": row["start_at"],
-            "end_at": row["end_at"],
-            "status": row["status"],
-            "payment_status": row["payment_status"],
-            "payment_evidence_status": row["payment_evidence_status"],
-            "pricing_profile": row["pricing_profile"],
-            "billing_mode": row["billing_mode"],
-            "origin": row["origin"],
-            "total_amount": row["total_amount"],
-            "price_per_hour": row["price_per_hour"],
-            "requested_at": row["requested_at"],
-            "scheduled_at": row["scheduled_at"],
-            "confirmed_at": row["confirmed_at"],
-            "cancelled_at": row["cancelled_at"],
-            "payment_expires_at": row["payment_expires_at"],
-        }
-        for row in _get_student_home_recent_rental_history_rows(
+    sections = student_home_cache.get_or_load(
+        student_row["id"],
+        user.id,
+        lambda: _load_student_home_sections(
             db,
-            user_id=user["id"],
             student_id=student_row["id"],
-        )
-    ]
+            user_id=user.id,
+        ),
+    )
 
     return {
         "profile": {
@@ -575,9 +445,7 @@ def _build_student_home_payload(
             "is_active": student_row["is_active"],
             "avatar_url": student_row["avatar_url"],
         },
-        "class_groups": class_groups,
-        "upcoming_rentals": upcoming_rentals,
-        "recent_rental_history": recent_rental_history,
+        **sections,
     }
 
 
@@ -758,7 +626,15 @@ def _get_student_makeup_request_notification_context(
     )
 
 
-def _send_student_makeup_request_received_email(
+def _get_makeup_request_outbox_sender(db: Session, *, makeup_request_id: UUID) -> OutboxEmailSender:
+    return OutboxEmailSender(
+        db,
+        category=OUTBOX_STUDENT_MAKEUP_REQUEST,
+        reference_id=makeup_request_id,
+    )
+
+
+def _queue_student_makeup_request_received_email(
     db: Session,
     *,
     makeup_request_id: UUID,
@@ -769,21 +645,16 @@ def _send_student_makeup_request_received_email(
     if not context or not context["student_email"]:
         return
 
-    sender = _get_email_sender()
-    try:
-        sender.send_student_makeup_request_received_email(
-            to_email=context["student_email"],
-            student_name=context["student_name"],
-            original_class_group_name=context["original_class_group_name"],
-            original_start_at=context["original_start_at"],
-        )
-    except EmailSendError as exc:
-        print(
-            f"[EMAIL][STUDENT_MAKEUP][RECEIVED][ERROR] to={context['student_email']} request={makeup_request_id} err={exc}"
-        )
+    sender = _get_makeup_request_outbox_sender(db, makeup_request_id=makeup_request_id)
+    sender.send_student_makeup_request_received_email(
+        to_email=context["student_email"],
+        student_name=context["student_name"],
+        original_class_group_name=context["original_class_group_name"],
+        original_start_at=context["original_start_at"],
+    )
 
 
-def _send_student_makeup_request_status_email(
+def _queue_student_makeup_request_status_email(
     db: Session,
     *,
     makeup_request_id: UUID,
@@ -794,34 +665,29 @@ def _send_student_makeup_request_status_email(
     if not context or not context["student_email"]:
         return
 
-    sender = _get_email_sender()
-    try:
-        if context["status"] == "scheduled":
-            sender.send_student_makeup_request_scheduled_email(
-                to_email=context["student_email"],
-                student_name=context["student_name"],
-                original_class_group_name=context["original_class_group_name"],
-                original_start_at=context["original_start_at"],
-                replacement_class_group_name=context["replacement_class_group_name"],
-                replacement_start_at=context["replacement_start_at"],
-            )
-        elif context["status"] == "rejected":
-            sender.send_student_makeup_request_rejected_email(
-                to_email=context["student_email"],
-                student_name=context["student_name"],
-                original_class_group_name=context["original_class_group_name"],
-                original_start_at=context["original_start_at"],
-            )
-        elif context["status"] == "cancelled":
-            sender.send_student_makeup_request_cancelled_email(
-                to_email=context["student_email"],
-                student_name=context["student_name"],
-                original_class_group_name=context["original_class_group_name"],
-                original_start_at=context["original_start_at"],
-            )
-    except EmailSendError as exc:
-        print(
-            f"[EMAIL][STUDENT_MAKEUP][{str(context['status']).upper()}][ERROR] to={context['student_email']} request={makeup_request_id} err={exc}"
+    sender = _get_makeup_request_outbox_sender(db, makeup_request_id=makeup_request_id)
+    if context["status"] == "scheduled":
+        sender.send_student_makeup_request_scheduled_email(
+            to_email=context["student_email"],
+            student_name=context["student_name"],
+            original_class_group_name=context["original_class_group_name"],
+            original_start_at=context["original_start_at"],
+            replacement_class_group_name=context["replacement_class_group_name"],
+            replacement_start_at=context["replacement_start_at"],
+        )
+    elif context["status"] == "rejected":
+        sender.send_student_makeup_request_rejected_email(
+            to_email=context["student_email"],
+            student_name=context["student_name"],
+            original_class_group_name=context["original_class_group_name"],
+            original_start_at=context["original_start_at"],
+        )
+    elif context["status"] == "cancelled":
+        sender.send_student_makeup_request_cancelled_email(
+            to_email=context["student_email"],
+            student_name=context["student_name"],
+            original_class_group_name=context["original_class_group_name"],
+            original_start_at=context["original_start_at"],
         )
 
 
@@ -2006,13 +1872,11 @@ def _build_student_import_preview(
 @router.get(
     "/import/template",
     response_class=Response,
+    dependencies=[Depends(require_admin)],
 )
 def download_student_import_template(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     return Response(
         content=_student_import_template_content(),
         media_type="text/csv; charset=utf-8",
@@ -2020,14 +1884,13 @@ def download_student_import_template(
     )
 
 
-@router.post("/import/preview", response_model=StudentImportPreviewOut)
+@router.post(
+    "/import/preview", response_model=StudentImportPreviewOut, dependencies=[Depends(require_admin)]
+)
 def preview_student_import(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
     uploaded_file: Annotated[UploadFile, File(...)],
 ):
-    _require_admin(db, user_id)
-
     if not uploaded_file.filename or not uploaded_file.filename.lower().endswith(".csv"):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -2042,14 +1905,14 @@ def preview_student_import(
     )
 
 
-@router.post("/import/commit", response_model=StudentImportCommitOut)
+@router.post(
+    "/import/commit", response_model=StudentImportCommitOut, dependencies=[Depends(require_admin)]
+)
 def commit_student_import(
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
     uploaded_file: Annotated[UploadFile, File(...)],
 ):
-    _require_admin(db, user_id)
-
     if not uploaded_file.filename or not uploaded_file.filename.lower().endswith(".csv"):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -2154,10 +2017,9 @@ def commit_student_import(
 def create_student_makeup_request_from_portal(
     payload: StudentMakeupRequestCreateIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    user: Annotated[CurrentUser, Depends(get_current_user)],
 ):
-    user = _require_active_user(db, user_id)
-    student_row = _find_student_by_user_or_email(db, user_id=user_id, email=user["email"])
+    student_row = _find_student_by_user_or_email(db, user_id=str(user.id), email=user.email)
 
     if not student_row:
         raise HTTPException(
@@ -2215,7 +2077,7 @@ def create_student_makeup_request_from_portal(
             db,
             student_id=student_row["id"],
             class_group_enrollment_id=payload.class_group_enrollment_id,
-            requested_by_user_id=user_id,
+            requested_by_user_id=str(user.id),
             source="student_portal",
             original_event_id=payload.original_event_id,
             original_class_group_id=original_lesson["class_group_id"],
@@ -2226,13 +2088,12 @@ def create_student_makeup_request_from_portal(
             original_end_at=original_lesson["end_at"],
             student_note=_normalize_optional_text(payload.student_note),
         )
+        _queue_student_makeup_request_received_email(db, makeup_request_id=created["id"])
         db.commit()
     except IntegrityError as e:
         db.rollback()
         raise _integrity_to_http(e) from e
 
-    _send_student_makeup_request_received_email(db, makeup_request_id=created["id"])
-
     return created
 
 
@@ -2240,14 +2101,13 @@ def create_student_makeup_request_from_portal(
     "/makeup-requests",
     response_model=StudentMakeupRequestOut,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
 )
 def create_student_makeup_request_admin(
     payload: StudentMakeupRequestAdminCreateIn,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     enrollment_context = _get_student_makeup_enrollment_context(
         db,
         student_id=payload.student_id,
@@ -2353,23 +2213,21 @@ def create_student_makeup_request_admin(
             student_note=_normalize_optional_text(payload.student_note),
             admin_note=_normalize_optional_text(payload.admin_note),
         )
+        _queue_student_makeup_request_received_email(db, makeup_request_id=created["id"])
         db.commit()
     except IntegrityError as e:
         db.rollback()
         raise _integrity_to_http(e) from e
 
-    _send_student_makeup_request_received_email(db, makeup_request_id=created["id"])
-
     return created
 
 
 @router.get("/me/home", response_model=StudentHomeOut)
 def get_student_home(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    user: Annotated[CurrentUser, Depends(get_current_user)],
 ):
-    user = _require_active_user(db, user_id)
-    student_row = _find_student_by_user_or_email(db, user_id=user_id, email=user["email"])
+    student_row = _find_student_by_user_or_email(db, user_id=str(user.id), email=user.email)
 
     if not student_row:
         raise HTTPException(
@@ -2392,7 +2250,7 @@ def get_student_home(
 )
 def list_student_makeup_original_lesson_options_from_portal(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    user: Annotated[CurrentUser, Depends(get_current_user)],
     q: Annotated[
         str | None,
         Query(description="Busca por turma, tipo, nível, professor ou quadra"),
@@ -2406,8 +2264,7 @@ def list_student_makeup_original_lesson_options_from_portal(
         Query(ge=1, le=100, description="Quantidade máxima de aulas retornadas"),
     ] = 20,
 ):
-    user = _require_active_user(db, user_id)
-    student_row = _find_student_by_user_or_email(db, user_id=user_id, email=user["email"])
+    student_row = _find_student_by_user_or_email(db, user_id=str(user.id), email=user.email)
 
     if not student_row:
         raise HTTPException(
@@ -2433,10 +2290,9 @@ def list_student_makeup_original_lesson_options_from_portal(
 @router.get("/me/makeup-requests", response_model=list[StudentMakeupRequestListItemOut])
 def list_student_makeup_requests_from_portal(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    user: Annotated[CurrentUser, Depends(get_current_user)],
 ):
-    user = _require_active_user(db, user_id)
-    student_row = _find_student_by_user_or_email(db, user_id=user_id, email=user["email"])
+    student_row = _find_student_by_user_or_email(db, user_id=str(user.id), email=user.email)
 
     if not student_row:
         raise HTTPException(
@@ -2456,10 +2312,10 @@ def list_student_makeup_requests_from_portal(
 @router.get(
     "/makeup-requests",
     response_model=list[StudentMakeupRequestListItemOut],
+    dependencies=[Depends(require_admin)],
 )
 def list_student_makeup_requests_admin(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
     status_filter: Annotated[
         str | None,
         Query(
@@ -2480,8 +2336,6 @@ def list_student_makeup_requests_admin(
         ),
     ] = None,
 ):
-    _require_admin(db, user_id)
-
     return _list_admin_student_makeup_requests(
         db,
         status_filter=status_filter,
@@ -2493,11 +2347,11 @@ def list_student_makeup_requests_admin(
 @router.get(
     "/makeup-requests/{makeup_request_id}/replacement-lessons",
     response_model=list[StudentMakeupReplacementLessonOptionOut],
+    dependencies=[Depends(require_admin)],
 )
 def list_student_makeup_replacement_lesson_options(
     makeup_request_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
     q: Annotated[
         str | None,
         Query(description="Busca por turma, tipo, nível, professor ou quadra"),
@@ -2511,8 +2365,6 @@ def list_student_makeup_replacement_lesson_options(
         Query(ge=1, le=100, description="Quantidade máxima de opções retornadas"),
     ] = 20,
 ):
-    _require_admin(db, user_id)
-
     return _list_student_makeup_replacement_lesson_options(
         db,
         makeup_request_id=makeup_request_id,
@@ -2525,6 +2377,7 @@ def list_student_makeup_replacement_lesson_options(
 @router.patch(
     "/makeup-requests/{makeup_request_id}",
     response_model=StudentMakeupRequestOut,
+    dependencies=[Depends(require_admin)],
 )
 def review_student_makeup_request_admin(
     makeup_request_id: UUID,
@@ -2532,8 +2385,6 @@ def review_student_makeup_request_admin(
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     current_request = _get_student_makeup_request_detail(db, makeup_request_id=makeup_request_id)
     if not current_request:
         raise HTTPException(
@@ -2601,28 +2452,31 @@ def review_student_makeup_request_admin(
             replacement_start_at=replacement_context["start_at"] if replacement_context else None,
             replacement_end_at=replacement_context["end_at"] if replacement_context else None,
         )
+        _queue_student_makeup_request_status_email(db, makeup_request_id=makeup_request_id)
         db.commit()
     except IntegrityError as e:
         db.rollback()
         raise _integrity_to_http(e) from e
 
-    _send_student_makeup_request_status_email(db, makeup_request_id=makeup_request_id)
-
     return reviewed
 
 
-@router.get("/", response_model=list[StudentListItemOut])
+@router.get(
+    "/",
+    response_model=list[StudentListItemOut] | StudentListOut,
+    dependencies=[Depends(require_admin)],
+)
 def list_students(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
     is_active: bool | None = None,
     q: str | None = Query(
         default=None,
         description="Busca por nome, e-mail ou telefone",
     ),
+    limit: Annotated[int | None, Query(ge=1, le=500)] = None,
+    cursor: Annotated[str | None, Query()] = None,
+    include_total: Annotated[bool, Query()] = False,
 ):
-    _require_admin(db, user_id)
-
     params: dict[str, object] = {"is_active": is_active}
     where_parts = ["1 = 1"]
 
@@ -2636,13 +2490,44 @@ def list_students(
             (
               full_name ILIKE :q
               OR CAST(email AS text) ILIKE :q
-              OR COALESCE(phone, '') ILIKE :q
+              OR phone ILIKE :q
             )
             """
         )
 
     where_sql = " AND ".join(where_parts)
 
+    total = None
+    if include_total:
+        total = db.execute(
+            text(f"SELECT count(*) FROM public.students WHERE {where_sql}"),
+            params,
+        ).scalar_one()
+
+    page_sql = ""
+    page_params = dict(params)
+    if cursor:
+        cursor_is_active, cursor_name, cursor_id = decode_cursor(cursor, types=(bool, str, UUID))
+        page_sql = """
+          AND (
+            is_active < :cursor_is_active
+            OR (
+              is_active = :cursor_is_active
+              AND (full_name, id) > (:cursor_name, :cursor_id)
+            )
+          )
+        """
+        page_params.update(
+            cursor_is_active=cursor_is_active,
+            cursor_name=cursor_name,
+            cursor_id=cursor_id,
+        )
+
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT :page_limit"
+        page_params["page_limit"] = limit + 1
+
     rows = (
         db.execute(
             text(
@@ -2663,40 +2548,51 @@ def list_students(
                   updated_at
                 FROM public.students
                 WHERE {where_sql}
+                  {page_sql}
                 ORDER BY
                   is_active DESC,
-                  full_name
+                  full_name,
+                  id
+                {limit_sql}
                 """
             ),
-            params,
+            page_params,
         )
         .mappings()
         .all()
     )
 
-    return rows
+    has_more = limit is not None and len(rows) > limit
+    next_cursor = None
+    if has_more:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last["is_active"], last["full_name"], last["id"])
+
+    # sem limit/cursor/include_total continua a lista completa de antes
+    if limit is None and cursor is None and not include_total:
+        return rows
+
+    return StudentListOut(items=rows, total=total, next_cursor=next_cursor, has_more=has_more)
 
 
-@router.get("/{student_id}", response_model=StudentOut)
+@router.get("/{student_id}", response_model=StudentOut, dependencies=[Depends(require_admin)])
 def get_student(
     student_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     return _get_student_or_404(db, student_id)
 
 
 @router.get(
     "/{student_id}/status-history",
     response_model=list[StudentStatusHistoryItemOut],
+    dependencies=[Depends(require_admin)],
 )
 def get_student_status_history(
     student_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_student_or_404(db, student_id)
 
     rows = (
@@ -2725,14 +2621,17 @@ def get_student_status_history(
     return rows
 
 
-@router.post("/", response_model=StudentOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=StudentOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
+)
 def create_student(
     payload: StudentCreateIn,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     email = _normalize_optional_email(str(payload.email) if payload.email else None)
     _ensure_email_not_used_by_teacher(db, email=email)
 
@@ -2812,15 +2711,12 @@ def create_student(
         raise _integrity_to_http(e) from e
 
 
-@router.patch("/{student_id}", response_model=StudentOut)
+@router.patch("/{student_id}", response_model=StudentOut, dependencies=[Depends(require_admin)])
 def update_student(
     student_id: UUID,
     payload: StudentUpdateIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     current = _get_student_or_404(db, student_id)
 
     merged = {
@@ -2907,6 +2803,8 @@ def update_student(
             .mappings()
             .first()
         )
+        # nome/status aparecem na lista de colegas das turmas
+        invalidate_student_home(db, everyone=True)
         db.commit()
         return row
 
@@ -2915,14 +2813,15 @@ def update_student(
         raise _integrity_to_http(e) from e
 
 
-@router.patch("/{student_id}/deactivate", response_model=StudentOut)
+@router.patch(
+    "/{student_id}/deactivate", response_model=StudentOut, dependencies=[Depends(require_admin)]
+)
 def deactivate_student(
     student_id: UUID,
     payload: StudentStatusChangeIn | None,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     current = _get_student_or_404(db, student_id)
 
     if not current["is_active"]:
@@ -2970,18 +2869,20 @@ def deactivate_student(
         reason_note=reason_note,
     )
 
+    invalidate_student_home(db, everyone=True)
     db.commit()
     return row
 
 
-@router.patch("/{student_id}/reactivate", response_model=StudentOut)
+@router.patch(
+    "/{student_id}/reactivate", response_model=StudentOut, dependencies=[Depends(require_admin)]
+)
 def reactivate_student(
     student_id: UUID,
     payload: StudentStatusChangeIn | None,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     current = _get_student_or_404(db, student_id)
 
     if current["is_active"]:
@@ -3029,5 +2930,6 @@ def reactivate_student(
         reason_note=reason_note,
     )
 
+    invalidate_student_home(db, everyone=True)
     db.commit()
     return row
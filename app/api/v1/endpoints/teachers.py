@@ -13,13 +13,13 @@ from sqlalchemy import select, text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user_id
+from app.api.v1.deps import get_current_user_id, require_admin, require_teacher
+from app.api.v1.pagination import decode_cursor, encode_cursor
 from app.core.config import settings
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.auth import MessageOut
 from app.schemas.teachers import (
-    TeacherAgendaClassGroupStudentOut,
     TeacherAgendaWeekItemOut,
     TeacherAvailabilityExceptionOut,
     TeacherAvailabilityRuleOut,
@@ -27,6 +27,7 @@ from app.schemas.teachers import (
     TeacherEventReportOut,
     TeacherEventReportUpsertIn,
     TeacherListItemOut,
+    TeacherListOut,
     TeacherMakeupRequestItemOut,
     TeacherOut,
     TeacherProfileUpdateRequestCreateIn,
@@ -36,14 +37,15 @@ from app.schemas.teachers import (
     TeacherStatusHistoryItemOut,
     TeacherUpdateIn,
 )
+from app.services.email_outbox import OUTBOX_TEACHER_AGENDA, enqueue_email
 from app.services.email_sender import (
-    ConsoleEmailSender,
     EmailAttachment,
     EmailSendError,
-    SmtpConfig,
-    SmtpEmailSender,
+    build_email_sender,
 )
 from app.services.password_reset import PasswordResetService
+from app.services.teacher_agenda_items import load_teacher_agenda_items
+from app.services.user_access import CurrentUser, invalidate_user_access
 
 router = APIRouter(prefix="/teachers")
 
@@ -54,20 +56,6 @@ def _normalize_role(value: str | None) -> str:
     return (value or "").strip().lower()
 
 
-def _get_email_sender():
-    if settings.email_sender_backend.lower() == "smtp":
-        cfg = SmtpConfig(
-            host=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_username,
-            password=settings.smtp_password,
-            mail_from=settings.smtp_from,
-            use_tls=settings.smtp_use_tls,
-        )
-        return SmtpEmailSender(cfg)
-    return ConsoleEmailSender()
-
-
 def _build_teacher_first_access_link(*, token: str, email: str) -> str:
     query = f"token={token}&email={email}"
     return f"{settings.frontend_url}/primeiro-acesso?{query}"
@@ -188,6 +176,7 @@ def _ensure_teacher_user_account(*, db: Session, teacher_row) -> User:
             linked_user.role = "coach"
         linked_user.is_active = True
         linked_user.full_name = linked_user.full_name or teacher_row["full_name"]
+        invalidate_user_access(db, linked_user.id)
         return linked_user
 
     existing_user = db.scalar(select(User).where(User.email == teacher_email))
@@ -209,6 +198,7 @@ def _ensure_teacher_user_account(*, db: Session, teacher_row) -> User:
             existing_user.role = "coach"
         existing_user.is_active = True
         existing_user.full_name = existing_user.full_name or teacher_row["full_name"]
+        invalidate_user_access(db, existing_user.id)
 
         db.execute(
             text(
@@ -286,7 +276,7 @@ def _send_teacher_access_email(
     </div>
     """
 
-    sender = _get_email_sender()
+    sender = build_email_sender()
     try:
         sender.send_email(
             to_email=to_email,
@@ -324,72 +314,6 @@ def _resolve_teacher_agenda_window(
     return window_start, window_start + timedelta(days=7)
 
 
-def _get_class_group_students_map(
-    db: Session,
-    *,
-    class_group_ids: list[UUID],
-) -> dict[UUID, list[dict]]:
-    normalized_ids = [group_id for group_id in class_group_ids if group_id]
-    if not normalized_ids:
-        return {}
-
-    rows = (
-        db.execute(
-            text(
-                """
-                SELECT
-                  cge.class_group_id,
-                  s.id AS student_id,
-                  s.full_name AS student_name
-                FROM public.class_group_enrollments cge
-                JOIN public.students s
-                  ON s.id = cge.student_id
-                WHERE cge.class_group_id = ANY(:class_group_ids)
-                  AND cge.status = 'active'
-                  AND s.is_active = TRUE
-                ORDER BY
-                  cge.class_group_id,
-                  s.full_name
-                """
-            ),
-            {"class_group_ids": normalized_ids},
-        )
-        .mappings()
-        .all()
-    )
-
-    grouped: dict[UUID, list[dict]] = {}
-    for row in rows:
-        group_id = row["class_group_id"]
-        student_id = row["student_id"]
-        student_name = str(row["student_name"] or "").strip()
-        if not group_id or not student_id or not student_name:
-            continue
-        grouped.setdefault(group_id, [])
-        if all(item["student_id"] != student_id for item in grouped[group_id]):
-            grouped[group_id].append(
-                TeacherAgendaClassGroupStudentOut(
-                    student_id=student_id,
-                    student_name=student_name,
-                ).model_dump()
-            )
-
-    return grouped
-
-
-def _get_class_group_student_names_map(
-    class_group_students: dict[UUID, list[dict]],
-) -> dict[UUID, list[str]]:
-    return {
-        group_id: [
-            str(item.get("student_name") or "").strip()
-            for item in students
-            if str(item.get("student_name") or "").strip()
-        ]
-        for group_id, students in class_group_students.items()
-    }
-
-
 def _get_teacher_event_report_absence_rows(
     db: Session,
     *,
@@ -561,116 +485,14 @@ def _get_teacher_agenda_rows(
     reference_date: date,
 ):
     window_start, window_end = _resolve_teacher_agenda_window(view, reference_date)
-
-    rows = (
-        db.execute(
-            text(
-                """
-                SELECT
-                  ev.id AS event_id,
-                  ev.kind,
-                  ev.status,
-                  ev.start_at,
-                  ev.end_at,
-                  ev.notes,
-                  ev.created_at AS event_created_at,
-                  ev.updated_at AS event_updated_at,
-                  ev.court_id,
-                  c.name AS court_name,
-                  ev.teacher_id,
-                  t.full_name AS teacher_name,
-                  ev.student_id,
-                  s.full_name AS student_name,
-                  ev.class_group_id,
-                  cg.name AS class_group_name,
-                  ter.id AS teacher_event_report_id,
-                  ter.report_status AS teacher_event_report_status,
-                  ter.issue_type AS teacher_event_issue_type
-                FROM public.events ev
-                LEFT JOIN public.courts c
-                  ON c.id = ev.court_id
-                LEFT JOIN public.teachers t
-                  ON t.id = ev.teacher_id
-                LEFT JOIN public.students s
-                  ON s.id = ev.student_id
-                LEFT JOIN public.class_groups cg
-                  ON cg.id = ev.class_group_id
-                LEFT JOIN public.teacher_event_reports ter
-                  ON ter.event_id = ev.id
-                WHERE ev.teacher_id = :teacher_id
-                  AND ev.start_at < :window_end
-                  AND ev.end_at >= :window_start
-                ORDER BY
-                  ev.start_at,
-                  ev.end_at,
-                  ev.id
-                """
-            ),
-            {
-                "teacher_id": teacher_id,
-                "window_start": window_start,
-                "window_end": window_end,
-            },
-        )
-        .mappings()
-        .all()
-    )
-
-    class_group_ids = list({row["class_group_id"] for row in rows if row["class_group_id"]})
-    class_group_students = _get_class_group_students_map(
+    return load_teacher_agenda_items(
         db,
-        class_group_ids=class_group_ids,
-    )
-    class_group_student_names = _get_class_group_student_names_map(class_group_students)
-
-    agenda_items: list[dict] = []
-    for row in rows:
-        class_group_id = row["class_group_id"]
-        event_created_at = row["event_created_at"]
-        event_updated_at = row["event_updated_at"]
-        has_schedule_change = bool(
-            event_created_at and event_updated_at and event_updated_at > event_created_at
-        )
-        agenda_items.append(
-            {
-                **dict(row),
-                "has_schedule_change": has_schedule_change,
-                "schedule_changed_at": event_updated_at if has_schedule_change else None,
-                "class_group_student_names": class_group_student_names.get(class_group_id, []),
-                "class_group_students": class_group_students.get(class_group_id, []),
-            }
-        )
-
-    return agenda_items
-
-
-def _get_current_user_row(db: Session, user_id: str):
-    return (
-        db.execute(
-            text(
-                """
-                SELECT id, email, role, is_active
-                FROM public.users
-                WHERE id = :user_id
-                """
-            ),
-            {"user_id": user_id},
-        )
-        .mappings()
-        .first()
+        teacher_id=teacher_id,
+        window_start=window_start,
+        window_end=window_end,
     )
 
 
-def _require_active_user(db: Session, user_id: str):
-    user = _get_current_user_row(db, user_id)
-    if not user or not user["is_active"]:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário inválido",
-        )
-    return user
-
-
 def _find_teacher_by_user_id(db: Session, *, user_id: str):
     return (
         db.execute(
@@ -725,22 +547,12 @@ def _find_teacher_by_email(db: Session, *, email: str):
     )
 
 
-def _resolve_current_teacher_for_user(db: Session, user_id: str):
-    user = _require_active_user(db, user_id)
-    user_role = _normalize_role(user["role"])
-    is_admin = user_role.startswith("admin")
-
-    if not is_admin and user_role != "coach":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Acesso permitido apenas para professores autenticados.",
-        )
-
-    teacher = _find_teacher_by_user_id(db, user_id=str(user["id"]))
+def _resolve_current_teacher_for_user(db: Session, user: CurrentUser):
+    teacher = _find_teacher_by_user_id(db, user_id=str(user.id))
     if teacher:
         return teacher
 
-    user_email = str(user["email"] or "").strip().lower()
+    user_email = str(user.email or "").strip().lower()
     if not user_email:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -755,9 +567,9 @@ def _resolve_current_teacher_for_user(db: Session, user_id: str):
         )
 
     linked_user_id = teacher["user_id"]
-    current_user_uuid = UUID(str(user["id"]))
+    current_user_uuid = user.id
 
-    if linked_user_id and str(linked_user_id) != str(user["id"]):
+    if linked_user_id and str(linked_user_id) != str(user.id):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Este cadastro de professor está vinculado a outra conta de acesso.",
@@ -786,16 +598,6 @@ def _resolve_current_teacher_for_user(db: Session, user_id: str):
     return teacher
 
 
-def _require_admin(db: Session, user_id: str) -> None:
-    user = _require_active_user(db, user_id)
-
-    if not str(user["role"]).startswith("admin"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Apenas administradores podem gerenciar professores.",
-        )
-
-
 def _integrity_to_http(e: IntegrityError) -> HTTPException:
     orig = getattr(e, "orig", None)
     pgcode = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
@@ -1190,15 +992,19 @@ def _insert_teacher_status_history(
     )
 
 
-@router.get("/", response_model=list[TeacherListItemOut])
+@router.get(
+    "/",
+    response_model=list[TeacherListItemOut] | TeacherListOut,
+    dependencies=[Depends(require_admin)],
+)
 def list_teachers(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
     is_active: bool | None = None,
     q: str | None = Query(default=None, description="Busca por nome do professor"),
+    limit: Annotated[int | None, Query(ge=1, le=500)] = None,
+    cursor: Annotated[str | None, Query()] = None,
+    include_total: Annotated[bool, Query()] = False,
 ):
-    _require_admin(db, user_id)
-
     params: dict[str, object] = {"is_active": is_active}
     where_parts = ["1 = 1"]
 
@@ -1211,6 +1017,37 @@ def list_teachers(
 
     where_sql = " AND ".join(where_parts)
 
+    total = None
+    if include_total:
+        total = db.execute(
+            text(f"SELECT count(*) FROM public.teachers WHERE {where_sql}"),
+            params,
+        ).scalar_one()
+
+    page_sql = ""
+    page_params = dict(params)
+    if cursor:
+        cursor_is_active, cursor_name, cursor_id = decode_cursor(cursor, types=(bool, str, UUID))
+        page_sql = """
+          AND (
+            is_active < :cursor_is_active
+            OR (
+              is_active = :cursor_is_active
+              AND (full_name, id) > (:cursor_name, :cursor_id)
+            )
+          )
+        """
+        page_params.update(
+            cursor_is_active=cursor_is_active,
+            cursor_name=cursor_name,
+            cursor_id=cursor_id,
+        )
+
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT :page_limit"
+        page_params["page_limit"] = limit + 1
+
     rows = (
         db.execute(
             text(
@@ -1227,18 +1064,32 @@ def list_teachers(
                   updated_at
                 FROM public.teachers
                 WHERE {where_sql}
+                  {page_sql}
                 ORDER BY
                   is_active DESC,
-                  full_name
+                  full_name,
+                  id
+                {limit_sql}
                 """
             ),
-            params,
+            page_params,
         )
         .mappings()
         .all()
     )
 
-    return rows
+    has_more = limit is not None and len(rows) > limit
+    next_cursor = None
+    if has_more:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last["is_active"], last["full_name"], last["id"])
+
+    # sem limit/cursor/include_total continua a lista completa de antes
+    if limit is None and cursor is None and not include_total:
+        return rows
+
+    return TeacherListOut(items=rows, total=total, next_cursor=next_cursor, has_more=has_more)
 
 
 def _get_report_status_label(report_status: str | None, issue_type: str | None) -> str:
@@ -1330,8 +1181,10 @@ def _build_teacher_agenda_csv_bytes(
     return output.getvalue().encode("utf-8-sig")
 
 
-def _send_teacher_agenda_csv_email(
+def _queue_teacher_agenda_csv_email(
+    db: Session,
     *,
+    teacher_id: UUID,
     teacher_email: str,
     teacher_name: str,
     view: Literal["day", "week", "month"],
@@ -1362,34 +1215,30 @@ def _send_teacher_agenda_csv_email(
         content_type="text/csv",
     )
 
-    sender = _get_email_sender()
-    try:
-        sender.send_email(
-            to_email=teacher_email,
-            subject=subject,
-            text_body=text_body,
-            html_body=html_body,
-            attachments=[attachment],
-        )
-    except EmailSendError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Não foi possível enviar a agenda por e-mail agora.",
-        ) from exc
+    enqueue_email(
+        db,
+        to_email=teacher_email,
+        subject=subject,
+        text_body=text_body,
+        html_body=html_body,
+        attachments=[attachment],
+        category=OUTBOX_TEACHER_AGENDA,
+        reference_id=teacher_id,
+    )
 
 
 @router.get("/me", response_model=TeacherOut)
 def get_current_teacher_profile(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    user: Annotated[CurrentUser, Depends(require_teacher)],
 ):
-    return _resolve_current_teacher_for_user(db, user_id)
+    return _resolve_current_teacher_for_user(db, user)
 
 
 @router.get("/me/agenda", response_model=list[TeacherAgendaWeekItemOut])
 def get_current_teacher_agenda(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    user: Annotated[CurrentUser, Depends(require_teacher)],
     view: Annotated[
         Literal["day", "week", "month"],
         Query(description="Recorte da agenda: day, week ou month."),
@@ -1399,7 +1248,7 @@ def get_current_teacher_agenda(
         Query(description="Data de referência do recorte no formato YYYY-MM-DD"),
     ] = None,
 ):
-    teacher = _resolve_current_teacher_for_user(db, user_id)
+    teacher = _resolve_current_teacher_for_user(db, user)
     agenda_reference_date = reference_date or datetime.now(BRAZIL_TZ).date()
     return _get_teacher_agenda_rows(
         db,
@@ -1414,9 +1263,9 @@ def upsert_current_teacher_event_report(
     event_id: UUID,
     payload: TeacherEventReportUpsertIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    user: Annotated[CurrentUser, Depends(require_teacher)],
 ):
-    teacher = _resolve_current_teacher_for_user(db, user_id)
+    teacher = _resolve_current_teacher_for_user(db, user)
     event_row = _get_teacher_event_or_404_for_teacher(
         db,
         teacher_id=teacher["id"],
@@ -1508,7 +1357,7 @@ def upsert_current_teacher_event_report(
                     "report_status": payload.report_status,
                     "issue_type": payload.issue_type,
                     "notes": payload.notes.strip() if payload.notes else None,
-                    "created_by_user_id": user_id,
+                    "created_by_user_id": user.id,
                 },
             )
         else:
@@ -1541,7 +1390,7 @@ def upsert_current_teacher_event_report(
                         "report_status": payload.report_status,
                         "issue_type": payload.issue_type,
                         "notes": payload.notes.strip() if payload.notes else None,
-                        "created_by_user_id": user_id,
+                        "created_by_user_id": user.id,
                     },
                 )
                 .mappings()
@@ -1594,9 +1443,9 @@ def upsert_current_teacher_event_report(
 def create_current_teacher_profile_update_request(
     payload: TeacherProfileUpdateRequestCreateIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    user: Annotated[CurrentUser, Depends(require_teacher)],
 ):
-    teacher = _resolve_current_teacher_for_user(db, user_id)
+    teacher = _resolve_current_teacher_for_user(db, user)
 
     existing_pending = (
         db.execute(
@@ -1683,7 +1532,7 @@ def create_current_teacher_profile_update_request(
                 ),
                 {
                     "teacher_id": teacher["id"],
-                    "requested_by_user_id": user_id,
+                    "requested_by_user_id": user.id,
                     "current_values": json.dumps(current_data, ensure_ascii=False),
                     "proposed_values": json.dumps(proposed_data, ensure_ascii=False),
                     "teacher_note": payload.request_note.strip() if payload.request_note else None,
@@ -1702,9 +1551,9 @@ def create_current_teacher_profile_update_request(
 @router.get("/me/profile-update-requests", response_model=list[TeacherProfileUpdateRequestOut])
 def list_current_teacher_profile_update_requests(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    user: Annotated[CurrentUser, Depends(require_teacher)],
 ):
-    teacher = _resolve_current_teacher_for_user(db, user_id)
+    teacher = _resolve_current_teacher_for_user(db, user)
     rows = _list_teacher_profile_update_requests(db, teacher_id=teacher["id"])
     return [_build_teacher_profile_update_request_out(row) for row in rows]
 
@@ -1712,29 +1561,31 @@ def list_current_teacher_profile_update_requests(
 @router.get("/me/makeup-requests", response_model=list[TeacherMakeupRequestItemOut])
 def list_current_teacher_makeup_requests(
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    user: Annotated[CurrentUser, Depends(require_teacher)],
 ):
-    teacher = _resolve_current_teacher_for_user(db, user_id)
+    teacher = _resolve_current_teacher_for_user(db, user)
     rows = _list_teacher_makeup_requests(db, teacher_id=teacher["id"])
     return [_build_teacher_makeup_request_item_out(row) for row in rows]
 
 
 @router.get(
-    "/{teacher_id}/profile-update-requests", response_model=list[TeacherProfileUpdateRequestOut]
+    "/{teacher_id}/profile-update-requests",
+    response_model=list[TeacherProfileUpdateRequestOut],
+    dependencies=[Depends(require_admin)],
 )
 def list_teacher_profile_update_requests(
     teacher_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_teacher_or_404(db, teacher_id)
     rows = _list_teacher_profile_update_requests(db, teacher_id=teacher_id)
     return [_build_teacher_profile_update_request_out(row) for row in rows]
 
 
 @router.post(
-    "/profile-update-requests/{request_id}/review", response_model=TeacherProfileUpdateRequestOut
+    "/profile-update-requests/{request_id}/review",
+    response_model=TeacherProfileUpdateRequestOut,
+    dependencies=[Depends(require_admin)],
 )
 def review_teacher_profile_update_request(
     request_id: UUID,
@@ -1742,7 +1593,6 @@ def review_teacher_profile_update_request(
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     request_row = _get_teacher_profile_update_request_or_404(db, request_id)
 
     if request_row["status"] != "pending":
@@ -1838,23 +1688,23 @@ def review_teacher_profile_update_request(
         raise _integrity_to_http(e) from e
 
 
-@router.get("/{teacher_id}", response_model=TeacherOut)
+@router.get("/{teacher_id}", response_model=TeacherOut, dependencies=[Depends(require_admin)])
 def get_teacher(
     teacher_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     return _get_teacher_or_404(db, teacher_id)
 
 
-@router.get("/{teacher_id}/status-history", response_model=list[TeacherStatusHistoryItemOut])
+@router.get(
+    "/{teacher_id}/status-history",
+    response_model=list[TeacherStatusHistoryItemOut],
+    dependencies=[Depends(require_admin)],
+)
 def get_teacher_status_history(
     teacher_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_teacher_or_404(db, teacher_id)
 
     rows = (
@@ -1883,13 +1733,15 @@ def get_teacher_status_history(
     return rows
 
 
-@router.get("/{teacher_id}/availability-rules", response_model=list[TeacherAvailabilityRuleOut])
+@router.get(
+    "/{teacher_id}/availability-rules",
+    response_model=list[TeacherAvailabilityRuleOut],
+    dependencies=[Depends(require_admin)],
+)
 def get_teacher_availability_rules(
     teacher_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_teacher_or_404(db, teacher_id)
 
     rows = (
@@ -1932,13 +1784,12 @@ def get_teacher_availability_rules(
 @router.get(
     "/{teacher_id}/availability-exceptions",
     response_model=list[TeacherAvailabilityExceptionOut],
+    dependencies=[Depends(require_admin)],
 )
 def get_teacher_availability_exceptions(
     teacher_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     _get_teacher_or_404(db, teacher_id)
 
     rows = (
@@ -1975,11 +1826,14 @@ def get_teacher_availability_exceptions(
     return rows
 
 
-@router.get("/{teacher_id}/agenda", response_model=list[TeacherAgendaWeekItemOut])
+@router.get(
+    "/{teacher_id}/agenda",
+    response_model=list[TeacherAgendaWeekItemOut],
+    dependencies=[Depends(require_admin)],
+)
 def get_teacher_agenda(
     teacher_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
     view: Annotated[
         Literal["day", "week", "month"],
         Query(description="Recorte da agenda: day, week ou month."),
@@ -1989,7 +1843,6 @@ def get_teacher_agenda(
         Query(description="Data de referência do recorte no formato YYYY-MM-DD"),
     ] = None,
 ):
-    _require_admin(db, user_id)
     _get_teacher_or_404(db, teacher_id)
 
     agenda_reference_date = reference_date or datetime.now(BRAZIL_TZ).date()
@@ -2001,11 +1854,14 @@ def get_teacher_agenda(
     )
 
 
-@router.post("/{teacher_id}/agenda/send-email", response_model=MessageOut)
+@router.post(
+    "/{teacher_id}/agenda/send-email",
+    response_model=MessageOut,
+    dependencies=[Depends(require_admin)],
+)
 def send_teacher_agenda_email(
     teacher_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
     view: Annotated[
         Literal["day", "week", "month"],
         Query(description="Recorte da agenda: day, week ou month."),
@@ -2015,7 +1871,6 @@ def send_teacher_agenda_email(
         Query(description="Data de referência do recorte no formato YYYY-MM-DD"),
     ] = None,
 ):
-    _require_admin(db, user_id)
     teacher = _get_teacher_or_404(db, teacher_id)
 
     teacher_email = str(teacher["email"] or "").strip().lower()
@@ -2038,27 +1893,32 @@ def send_teacher_agenda_email(
         reference_date=agenda_reference_date,
         items=agenda_items,
     )
-    _send_teacher_agenda_csv_email(
+    _queue_teacher_agenda_csv_email(
+        db,
+        teacher_id=teacher_id,
         teacher_email=teacher_email,
         teacher_name=str(teacher["full_name"] or "Professor"),
         view=view,
         reference_date=agenda_reference_date,
         csv_bytes=csv_bytes,
     )
-    return MessageOut(message="Agenda enviada por e-mail ao professor com sucesso.")
+    db.commit()
+    return MessageOut(message="Agenda enviada para a fila de e-mails do professor com sucesso.")
 
 
-@router.get("/{teacher_id}/agenda-week", response_model=list[TeacherAgendaWeekItemOut])
+@router.get(
+    "/{teacher_id}/agenda-week",
+    response_model=list[TeacherAgendaWeekItemOut],
+    dependencies=[Depends(require_admin)],
+)
 def get_teacher_agenda_week(
     teacher_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
     date_from: Annotated[
         date | None,
         Query(description="Data inicial da janela semanal no formato YYYY-MM-DD"),
     ] = None,
 ):
-    _require_admin(db, user_id)
     _get_teacher_or_404(db, teacher_id)
 
     reference_date = date_from or datetime.now(BRAZIL_TZ).date()
@@ -2070,13 +1930,13 @@ def get_teacher_agenda_week(
     )
 
 
-@router.post("/{teacher_id}/access-invite", response_model=MessageOut)
+@router.post(
+    "/{teacher_id}/access-invite", response_model=MessageOut, dependencies=[Depends(require_admin)]
+)
 def send_teacher_access_invite(
     teacher_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     teacher = _get_teacher_or_404(db, teacher_id)
 
     if not teacher["is_active"]:
@@ -2130,14 +1990,17 @@ def send_teacher_access_invite(
     return MessageOut(message=message)
 
 
-@router.post("/", response_model=TeacherOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=TeacherOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
+)
 def create_teacher(
     payload: TeacherCreateIn,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     normalized_email = _normalize_optional_teacher_email(
         str(payload.email) if payload.email else None
     )
@@ -2203,15 +2066,12 @@ def create_teacher(
         raise _integrity_to_http(e) from e
 
 
-@router.patch("/{teacher_id}", response_model=TeacherOut)
+@router.patch("/{teacher_id}", response_model=TeacherOut, dependencies=[Depends(require_admin)])
 def update_teacher(
     teacher_id: UUID,
     payload: TeacherUpdateIn,
     db: Annotated[Session, Depends(get_db)],
-    user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
-
     current = _get_teacher_or_404(db, teacher_id)
 
     merged = {
@@ -2270,14 +2130,15 @@ def update_teacher(
         raise _integrity_to_http(e) from e
 
 
-@router.patch("/{teacher_id}/deactivate", response_model=TeacherOut)
+@router.patch(
+    "/{teacher_id}/deactivate", response_model=TeacherOut, dependencies=[Depends(require_admin)]
+)
 def deactivate_teacher(
     teacher_id: UUID,
     payload: TeacherStatusChangeIn | None,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     current = _get_teacher_or_404(db, teacher_id)
 
     if not current["is_active"]:
@@ -2323,14 +2184,15 @@ def deactivate_teacher(
     return row
 
 
-@router.patch("/{teacher_id}/reactivate", response_model=TeacherOut)
+@router.patch(
+    "/{teacher_id}/reactivate", response_model=TeacherOut, dependencies=[Depends(require_admin)]
+)
 def reactivate_teacher(
     teacher_id: UUID,
     payload: TeacherStatusChangeIn | None,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[str, Depends(get_current_user_id)],
 ):
-    _require_admin(db, user_id)
     current = _get_teacher_or_404(db, teacher_id)
 
     if current["is_active"]:
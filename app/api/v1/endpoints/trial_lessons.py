@@ -1,20 +1,20 @@
 from __future__ import annotations
 
 import calendar
+from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
-from typing import Annotated, Literal
+from typing import Annotated, Any, Literal
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, EmailStr, Field
-from sqlalchemy import func, or_, select, text
+from sqlalchemy import func, select, text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user_id
+from app.api.v1.deps import get_current_user_id, require_admin
 from app.db.session import get_db
-from app.models.student import Student
 from app.models.teacher import Teacher
 from app.models.trial_lesson import TrialLesson
 from app.models.trial_lesson_extraordinary_request import TrialLessonExtraordinaryRequest
@@ -31,6 +31,18 @@ from app.schemas.trial_lessons import (
     TrialLessonTeacherWindowOut,
     TrialLessonTeacherWindowUpdateIn,
 )
+from app.services.availability_snapshot import availability_snapshot_cache
+from app.services.booking_coordinator import BookingSlotContended, booking_coordinator
+from app.services.court_availability import (
+    BusyIntervals,
+    interval_is_free,
+)
+from app.services.trial_occurrence_counters import (
+    count_recent_trial_occurrences,
+    increment_trial_occurrence_count,
+    trial_identity_key_hashes,
+)
+from app.services.user_access import CurrentUser, invalidate_user_access
 
 router = APIRouter(prefix="/trial-lessons", tags=["trial-lessons"])
 
@@ -58,6 +70,7 @@ def _integrity_to_http(e: IntegrityError) -> HTTPException:
         constraint = getattr(diag, "constraint_name", None)
 
     if pgcode == "23P01":
+        booking_coordinator.record_integrity_conflict()
         if constraint == "ex_events_no_overlap_court":
             return HTTPException(
                 status_code=409,
@@ -383,45 +396,6 @@ def _get_teacher_or_404(db: Session, teacher_id: UUID) -> Teacher:
     return teacher
 
 
-def _is_active_student(db: Session, user: User) -> bool:
-    conditions = [Student.user_id == user.id]
-
-    if user.email:
-        conditions.append(func.lower(Student.email) == user.email.lower())
-
-    stmt = select(Student).where(
-        Student.is_active.is_(True),
-        or_(*conditions),
-    )
-
-    student = db.scalar(stmt)
-    return student is not None
-
-
-def _get_latest_completed_trial(db: Session, user_id: UUID) -> TrialLesson | None:
-    return db.scalar(
-        select(TrialLesson)
-        .where(
-            TrialLesson.user_id == user_id,
-            TrialLesson.status == "completed",
-        )
-        .order_by(TrialLesson.created_at.desc())
-        .limit(1)
-    )
-
-
-def _get_latest_scheduled_trial(db: Session, user_id: UUID) -> TrialLesson | None:
-    return db.scalar(
-        select(TrialLesson)
-        .where(
-            TrialLesson.user_id == user_id,
-            TrialLesson.status == "scheduled",
-        )
-        .order_by(TrialLesson.created_at.desc())
-        .limit(1)
-    )
-
-
 def _get_latest_requested_trial(db: Session, user_id: UUID) -> TrialLesson | None:
     return db.scalar(
         select(TrialLesson)
@@ -577,19 +551,140 @@ def _teacher_window_allows_slot(
     return row is not None
 
 
-def _list_available_trial_teachers_for_slot(db: Session, start_at: datetime, end_at: datetime):
-    available_teachers = _list_available_teachers(db, start_at, end_at)
+@dataclass(frozen=True)
+class _TrialSlotAvailability:
+    """
+    Estado pré-carregado para resolver candidatos de aula grátis em memória.
+
+    Reproduz as regras de `fn_quadras_disponiveis`, `fn_professores_disponiveis`
+    e `_teacher_window_allows_slot`, mas com um número fixo de consultas por
+    requisição.
+    """
+
+    active_courts: list[Any]
+    active_teachers: list[Any]
+    active_court_ids: frozenset[UUID]
+    active_teacher_ids: frozenset[UUID]
+    windows_by_teacher: dict[UUID, list[Any]]
+    court_busy: BusyIntervals
+    teacher_busy: BusyIntervals
+
+    def court_is_free(self, court_id: UUID, start_at: datetime, end_at: datetime) -> bool:
+        if court_id not in self.active_court_ids:
+            return False
+        return interval_is_free(self.court_busy.get(court_id, []), start_at, end_at)
+
+    def teacher_is_free(self, teacher_id: UUID, start_at: datetime, end_at: datetime) -> bool:
+        if teacher_id not in self.active_teacher_ids:
+            return False
+        return interval_is_free(self.teacher_busy.get(teacher_id, []), start_at, end_at)
+
+    def window_allows_slot(self, teacher_id: UUID, start_at: datetime, end_at: datetime) -> bool:
+        local_start = start_at.astimezone(_local_tz())
+        local_end = end_at.astimezone(_local_tz())
+        weekday = local_start.isoweekday()
+        period = _trial_period_for_datetime(local_start)
+
+        return any(
+            window["weekday"] == weekday
+            and window["period"] == period
+            and window["start_time"] <= local_start.time()
+            and window["end_time"] >= local_end.time()
+            for window in self.windows_by_teacher.get(teacher_id, [])
+        )
+
+    def slot_is_available(
+        self,
+        *,
+        court_id: UUID,
+        teacher_id: UUID,
+        start_at: datetime,
+        end_at: datetime,
+    ) -> bool:
+        return self.court_is_free(court_id, start_at, end_at) and self.teacher_is_free(
+            teacher_id, start_at, end_at
+        )
+
+
+def _load_trial_slot_availability(
+    db: Session,
+    *,
+    range_start: datetime,
+    range_end: datetime,
+) -> _TrialSlotAvailability:
+    active_courts = (
+        db.execute(
+            text(
+                """
+                SELECT c.id AS court_id, c.name AS court_name
+                FROM public.courts c
+                WHERE c.is_active = true
+                ORDER BY c.name
+                """
+            )
+        )
+        .mappings()
+        .all()
+    )
+    active_teachers = (
+        db.execute(
+            text(
+                """
+                SELECT t.id AS teacher_id, t.full_name AS teacher_name
+                FROM public.teachers t
+                WHERE t.is_active = true
+                ORDER BY t.full_name
+                """
+            )
+        )
+        .mappings()
+        .all()
+    )
+    window_rows = (
+        db.execute(
+            text(
+                """
+                SELECT
+                  tw.teacher_id,
+                  tw.weekday,
+                  tw.period,
+                  tw.start_time,
+                  tw.end_time
+                FROM public.trial_lesson_teacher_windows tw
+                JOIN public.teachers t
+                  ON t.id = tw.teacher_id
+                WHERE tw.is_active IS TRUE
+                  AND t.is_active IS TRUE
+                """
+            )
+        )
+        .mappings()
+        .all()
+    )
 
-    return [
-        item
-        for item in available_teachers
-        if _teacher_window_allows_slot(
+    windows_by_teacher: dict[UUID, list[Any]] = {}
+    for window in window_rows:
+        windows_by_teacher.setdefault(window["teacher_id"], []).append(window)
+
+    return _TrialSlotAvailability(
+        active_courts=list(active_courts),
+        active_teachers=list(active_teachers),
+        active_court_ids=frozenset(court["court_id"] for court in active_courts),
+        active_teacher_ids=frozenset(teacher["teacher_id"] for teacher in active_teachers),
+        windows_by_teacher=windows_by_teacher,
+        court_busy=availability_snapshot_cache.busy_intervals(
             db,
-            teacher_id=item["teacher_id"],
-            start_at=start_at,
-            end_at=end_at,
-        )
-    ]
+            kind="court",
+            range_start=range_start,
+            range_end=range_end,
+        ),
+        teacher_busy=availability_snapshot_cache.busy_intervals(
+            db,
+            kind="teacher",
+            range_start=range_start,
+            range_end=range_end,
+        ),
+    )
 
 
 def _list_trial_bookable_slot_templates(
@@ -658,6 +753,7 @@ def _build_trial_slots_from_templates(
 
     slots: list[TrialLessonSlotOut] = []
     seen: set[tuple[datetime, UUID, UUID]] = set()
+    candidates: list[tuple[datetime, datetime, Any]] = []
 
     total_days = (end_day - start_day).days + 1
     for day_offset in range(total_days):
@@ -683,39 +779,45 @@ def _build_trial_slots_from_templates(
             if current_day == today and slot_start <= now_local:
                 continue
 
-            if not _teacher_window_allows_slot(
-                db,
-                teacher_id=row["teacher_id"],
-                start_at=slot_start,
-                end_at=slot_end,
-            ):
-                continue
+            candidates.append((slot_start, slot_end, row))
+
+    if not candidates:
+        return slots
+
+    availability = _load_trial_slot_availability(
+        db,
+        range_start=min(item[0] for item in candidates),
+        range_end=max(item[1] for item in candidates),
+    )
+
+    for slot_start, slot_end, row in candidates:
+        if not availability.window_allows_slot(row["teacher_id"], slot_start, slot_end):
+            continue
 
-            if not _slot_is_still_available(
-                db=db,
+        if not availability.slot_is_available(
+            court_id=row["court_id"],
+            teacher_id=row["teacher_id"],
+            start_at=slot_start,
+            end_at=slot_end,
+        ):
+            continue
+
+        dedupe_key = (slot_start, row["court_id"], row["teacher_id"])
+        if dedupe_key in seen:
+            continue
+
+        seen.add(dedupe_key)
+
+        slots.append(
+            TrialLessonSlotOut(
                 start_at=slot_start,
                 end_at=slot_end,
                 court_id=row["court_id"],
+                court_name=row["court_name"],
                 teacher_id=row["teacher_id"],
-            ):
-                continue
-
-            dedupe_key = (slot_start, row["court_id"], row["teacher_id"])
-            if dedupe_key in seen:
-                continue
-
-            seen.add(dedupe_key)
-
-            slots.append(
-                TrialLessonSlotOut(
-                    start_at=slot_start,
-                    end_at=slot_end,
-                    court_id=row["court_id"],
-                    court_name=row["court_name"],
-                    teacher_id=row["teacher_id"],
-                    teacher_name=row["teacher_name"],
-                )
+                teacher_name=row["teacher_name"],
             )
+        )
 
     slots.sort(key=lambda item: (item.start_at, item.court_name, item.teacher_name))
     return slots
@@ -735,6 +837,7 @@ def _build_legacy_trial_slots(
     today = datetime.now(tz).date()
 
     slots: list[TrialLessonSlotOut] = []
+    candidates: list[tuple[datetime, datetime]] = []
 
     for day_offset in range(days):
         current_day = start_day + timedelta(days=day_offset)
@@ -756,26 +859,48 @@ def _build_legacy_trial_slots(
 
         while slot_start + slot_delta <= window_end:
             slot_end = slot_start + slot_delta
+            candidates.append((slot_start, slot_end))
+            slot_start = slot_end
 
-            available_courts = _list_available_courts(db, slot_start, slot_end)
-            available_teachers = _list_available_trial_teachers_for_slot(db, slot_start, slot_end)
-
-            if available_courts and available_teachers:
-                first_court = available_courts[0]
-                first_teacher = available_teachers[0]
-
-                slots.append(
-                    TrialLessonSlotOut(
-                        start_at=slot_start,
-                        end_at=slot_end,
-                        court_id=first_court["court_id"],
-                        court_name=first_court["court_name"],
-                        teacher_id=first_teacher["teacher_id"],
-                        teacher_name=first_teacher["teacher_name"],
-                    )
-                )
+    if not candidates:
+        return slots
 
-            slot_start = slot_end
+    availability = _load_trial_slot_availability(
+        db,
+        range_start=candidates[0][0],
+        range_end=candidates[-1][1],
+    )
+
+    for slot_start, slot_end in candidates:
+        first_court = next(
+            (
+                court
+                for court in availability.active_courts
+                if availability.court_is_free(court["court_id"], slot_start, slot_end)
+            ),
+            None,
+        )
+        first_teacher = next(
+            (
+                teacher
+                for teacher in availability.active_teachers
+                if availability.teacher_is_free(teacher["teacher_id"], slot_start, slot_end)
+                and availability.window_allows_slot(teacher["teacher_id"], slot_start, slot_end)
+            ),
+            None,
+        )
+
+        if first_court is not None and first_teacher is not None:
+            slots.append(
+                TrialLessonSlotOut(
+                    start_at=slot_start,
+                    end_at=slot_end,
+                    court_id=first_court["court_id"],
+                    court_name=first_court["court_name"],
+                    teacher_id=first_teacher["teacher_id"],
+                    teacher_name=first_teacher["teacher_name"],
+                )
+            )
 
     return slots
 
@@ -796,6 +921,49 @@ def _slot_is_still_available(
     return court_ok and teacher_ok
 
 
+def _ensure_trial_slot_available_or_409(
+    db: Session,
+    *,
+    start_at: datetime,
+    end_at: datetime,
+    court_id: UUID,
+    teacher_id: UUID,
+) -> None:
+    try:
+        booking_coordinator.acquire(
+            db,
+            court_id=court_id,
+            teacher_id=teacher_id,
+            start_at=start_at,
+            end_at=end_at,
+        )
+    except BookingSlotContended as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "code": "SLOT_BEING_BOOKED",
+                "message": "Esse horário está sendo reservado agora por outra pessoa. Atualize a agenda e tente novamente.",
+            },
+            headers={"Retry-After": "1"},
+        ) from exc
+
+    if not _slot_is_still_available(
+        db=db,
+        start_at=start_at,
+        end_at=end_at,
+        court_id=court_id,
+        teacher_id=teacher_id,
+    ):
+        booking_coordinator.record_slot_conflict()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "code": "SLOT_NO_LONGER_AVAILABLE",
+                "message": "O horário selecionado não está mais disponível. Atualize a agenda e escolha outro slot.",
+            },
+        )
+
+
 def _get_change_policy(start_at: datetime) -> tuple[bool, bool, datetime | None, str, str]:
     tz = _local_tz()
     now = datetime.now(tz)
@@ -856,37 +1024,33 @@ def _get_change_policy(start_at: datetime) -> tuple[bool, bool, datetime | None,
     return can_cancel, can_reschedule, reschedule_deadline, combined_rule, status_message
 
 
+_CURRENT_SCHEDULED_TRIAL_SELECT = """
+SELECT
+  tl.id AS trial_lesson_id,
+  tl.event_id AS event_id,
+  tl.status AS status,
+  tl.notes AS notes,
+  ag.start_at AS start_at,
+  ag.end_at AS end_at,
+  ag.court_id AS court_id,
+  ag.court_name AS court_name,
+  ag.teacher_id AS teacher_id,
+  ag.teacher_name AS teacher_name
+FROM public.trial_lessons tl
+JOIN public.vw_agenda ag
+  ON ag.event_id = tl.event_id
+WHERE tl.user_id = :user_id
+  AND tl.status = 'scheduled'
+  AND ag.kind = 'primeira_aula'
+  AND ag.status = 'confirmado'
+ORDER BY tl.scheduled_at DESC NULLS LAST, tl.created_at DESC
+LIMIT 1
+"""
+
+
 def _get_current_scheduled_trial_row(db: Session, user_id: UUID):
     return (
-        db.execute(
-            text(
-                """
-                SELECT
-                  tl.id AS trial_lesson_id,
-                  tl.event_id AS event_id,
-                  tl.status AS status,
-                  tl.notes AS notes,
-                  ag.start_at AS start_at,
-                  ag.end_at AS end_at,
-                  ag.court_id AS court_id,
-                  ag.court_name AS court_name,
-                  ag.teacher_id AS teacher_id,
-                  ag.teacher_name AS teacher_name
-                FROM public.trial_lessons tl
-                JOIN public.vw_agenda ag
-                  ON ag.event_id = tl.event_id
-                WHERE tl.user_id = :user_id
-                  AND tl.status = 'scheduled'
-                  AND ag.kind = 'primeira_aula'
-                  AND ag.status = 'confirmado'
-                ORDER BY tl.scheduled_at DESC NULLS LAST, tl.created_at DESC
-                LIMIT 1
-                """
-            ),
-            {"user_id": user_id},
-        )
-        .mappings()
-        .first()
+        db.execute(text(_CURRENT_SCHEDULED_TRIAL_SELECT), {"user_id": user_id}).mappings().first()
     )
 
 
@@ -1074,68 +1238,29 @@ def _list_admin_pending_attendance_rows(db: Session):
     )
 
 
-def _require_admin_user(db: Session, user_id: UUID) -> User:
-    user = _get_user_or_404(db, user_id)
-
-    if not getattr(user, "is_active", False):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário inativo.",
-        )
-
-    role = str(getattr(user, "role", "") or "")
-    if not role.startswith("admin"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Apenas administradores podem validar aula grátis.",
-        )
-
-    return user
-
-
 def _find_trial_control(db: Session, email: str | None, whatsapp: str | None):
-    if not email and not whatsapp:
+    key_hashes = trial_identity_key_hashes(email, whatsapp)
+    if not key_hashes:
         return None
 
-    if email and whatsapp:
-        sql = text(
-            """
-            SELECT *
-            FROM public.trial_lesson_controls
-            WHERE lower(email) = :email
-               OR whatsapp = :whatsapp
-            ORDER BY
-              CASE WHEN lower(email) = :email THEN 0 ELSE 1 END,
-              CASE WHEN whatsapp = :whatsapp THEN 0 ELSE 1 END
-            LIMIT 1
-            """
-        )
-        params = {
-            "email": email,
-            "whatsapp": whatsapp,
-        }
-    elif email:
-        sql = text(
-            """
-            SELECT *
-            FROM public.trial_lesson_controls
-            WHERE lower(email) = :email
-            LIMIT 1
-            """
-        )
-        params = {"email": email}
-    else:
-        sql = text(
-            """
-            SELECT *
-            FROM public.trial_lesson_controls
-            WHERE whatsapp = :whatsapp
-            LIMIT 1
-            """
+    # email ganha de whatsapp quando cada um aponta para um controle diferente
+    return (
+        db.execute(
+            text(
+                """
+                SELECT tlc.*
+                FROM public.trial_lesson_identity_keys k
+                JOIN public.trial_lesson_controls tlc ON tlc.id = k.control_id
+                WHERE k.key_hash = ANY(:key_hashes)
+                ORDER BY k.key_kind
+                LIMIT 1
+                """
+            ),
+            {"key_hashes": key_hashes},
         )
-        params = {"whatsapp": whatsapp}
-
-    return db.execute(sql, params).mappings().first()
+        .mappings()
+        .first()
+    )
 
 
 def _ensure_trial_control_for_user(db: Session, user: User):
@@ -1200,133 +1325,40 @@ def _ensure_trial_control_for_user(db: Session, user: User):
     )
 
 
-def _count_recent_occurrences(
-    db: Session,
-    email: str | None,
-    whatsapp: str | None,
-    occurrence_types: tuple[str, ...],
-    *,
-    days: int = 60,
-) -> int:
-    if not email and not whatsapp:
-        return 0
-
-    type_list_sql = ", ".join(f"'{item}'" for item in occurrence_types)
-
-    if email and whatsapp:
-        sql = text(
-            f"""
-            SELECT COUNT(*) AS total
-            FROM public.trial_lesson_occurrences
-            WHERE occurrence_type IN ({type_list_sql})
-              AND created_at >= now() - (:days * interval '1 day')
-              AND (
-                lower(email) = :email
-                OR whatsapp = :whatsapp
-              )
-            """
-        )
-        params = {
-            "email": email,
-            "whatsapp": whatsapp,
-            "days": days,
-        }
-    elif email:
-        sql = text(
-            f"""
-            SELECT COUNT(*) AS total
-            FROM public.trial_lesson_occurrences
-            WHERE occurrence_type IN ({type_list_sql})
-              AND created_at >= now() - (:days * interval '1 day')
-              AND lower(email) = :email
-            """
-        )
-        params = {
-            "email": email,
-            "days": days,
-        }
-    else:
-        sql = text(
-            f"""
-            SELECT COUNT(*) AS total
-            FROM public.trial_lesson_occurrences
-            WHERE occurrence_type IN ({type_list_sql})
-              AND created_at >= now() - (:days * interval '1 day')
-              AND whatsapp = :whatsapp
-            """
-        )
-        params = {
-            "whatsapp": whatsapp,
-            "days": days,
-        }
-
-    count_value = db.execute(sql, params).scalar_one()
-    return int(count_value or 0)
-
-
-def _sync_trial_control_requirements(
-    db: Session,
-    control_id: UUID,
-    email: str | None,
-    whatsapp: str | None,
-) -> bool:
-    control = (
-        db.execute(
-            text(
-                """
-                SELECT *
-                FROM public.trial_lesson_controls
-                WHERE id = :id
-                """
-            ),
-            {"id": control_id},
-        )
-        .mappings()
-        .first()
-    )
-
-    if not control:
-        return False
-
-    recent_cancellations = _count_recent_occurrences(
-        db,
-        email,
-        whatsapp,
-        ("cancelled", "cancelled_late"),
-        days=60,
-    )
-
-    recent_reschedules = _count_recent_occurrences(
+def _sync_trial_control_requirements(db: Session, control) -> bool:
+    recent = count_recent_trial_occurrences(
         db,
-        email,
-        whatsapp,
-        ("rescheduled",),
+        control["id"],
+        ("cancelled", "cancelled_late", "rescheduled"),
         days=60,
     )
+    recent_cancellations = recent["cancelled"] + recent["cancelled_late"]
+    recent_reschedules = recent["rescheduled"]
 
     requires_admin_approval = (
         bool(control["requires_admin_approval"])
         or int(control["no_show_count"] or 0) >= 1
         or int(control["late_cancellations"] or 0) >= 2
-        or int(recent_cancellations) >= 3
-        or int(recent_reschedules) >= 2
+        or recent_cancellations >= 3
+        or recent_reschedules >= 2
     )
 
-    db.execute(
-        text(
-            """
-            UPDATE public.trial_lesson_controls
-            SET
-              requires_admin_approval = :requires_admin_approval,
-              updated_at = now()
-            WHERE id = :id
-            """
-        ),
-        {
-            "id": control_id,
-            "requires_admin_approval": requires_admin_approval,
-        },
-    )
+    if requires_admin_approval != bool(control["requires_admin_approval"]):
+        db.execute(
+            text(
+                """
+                UPDATE public.trial_lesson_controls
+                SET
+                  requires_admin_approval = :requires_admin_approval,
+                  updated_at = now()
+                WHERE id = :id
+                """
+            ),
+            {
+                "id": control["id"],
+                "requires_admin_approval": requires_admin_approval,
+            },
+        )
 
     return requires_admin_approval
 
@@ -1411,18 +1443,8 @@ def _record_trial_occurrence(
     if not updated_control:
         return False
 
-    return _sync_trial_control_requirements(
-        db,
-        updated_control["id"],
-        email,
-        whatsapp,
-    )
-
-
-def _get_trial_control_state(db: Session, user: User):
-    email = _normalize_email(user.email)
-    whatsapp = _normalize_whatsapp(getattr(user, "whatsapp", None))
-    return _find_trial_control(db, email, whatsapp)
+    increment_trial_occurrence_count(db, updated_control["id"], occurrence_type)
+    return _sync_trial_control_requirements(db, updated_control)
 
 
 def _resolve_or_create_admin_trial_user(
@@ -1510,26 +1532,157 @@ def _resolve_or_create_admin_trial_user(
     user.is_active = True
     if str(user.role or "").strip().lower() not in {"student", "aluno"}:
         user.role = "student"
+    invalidate_user_access(db, user.id)
 
     return user, False
 
 
-def _get_trial_block_reason(
-    db: Session,
-    user: User,
+_CURRENT_SCHEDULED_TRIAL_COLUMNS = (
+    "trial_lesson_id",
+    "event_id",
+    "status",
+    "notes",
+    "start_at",
+    "end_at",
+    "court_id",
+    "court_name",
+    "teacher_id",
+    "teacher_name",
+)
+
+
+@dataclass(frozen=True)
+class _TrialEligibilityState:
+    """
+    Tudo o que decide se o usuário pode agendar/remarcar a aula grátis,
+    carregado por `_load_trial_eligibility_state` numa única consulta só de
+    leitura (nenhum GET cria ou atualiza `trial_lesson_controls`).
+    """
+
+    is_active_student: bool
+    # última TrialLesson `scheduled`, com ou sem evento ativo
+    scheduled_trial_status: str | None
+    # linha de `_get_current_scheduled_trial_row` (evento confirmado)
+    current_scheduled: dict[str, Any] | None
+    completed_trial_status: str | None
+    control_is_blocked: bool = False
+    control_blocked_until: datetime | None = None
+    control_requires_admin_approval: bool = False
+
+
+def _load_trial_eligibility_state(db: Session, user: User) -> _TrialEligibilityState:
+    row = (
+        db.execute(
+            text(
+                f"""
+                WITH active_student AS (
+                  SELECT EXISTS (
+                    SELECT 1
+                    FROM public.students s
+                    WHERE s.is_active = TRUE
+                      AND (
+                        s.user_id = :user_id
+                        OR (
+                          CAST(:student_email AS text) IS NOT NULL
+                          AND lower(s.email) = :student_email
+                        )
+                      )
+                  ) AS is_active_student
+                ),
+                latest_scheduled AS (
+                  SELECT tl.status
+                  FROM public.trial_lessons tl
+                  WHERE tl.user_id = :user_id
+                    AND tl.status = 'scheduled'
+                  ORDER BY tl.created_at DESC
+                  LIMIT 1
+                ),
+                current_scheduled AS ({_CURRENT_SCHEDULED_TRIAL_SELECT}),
+                latest_completed AS (
+                  SELECT tl.status
+                  FROM public.trial_lessons tl
+                  WHERE tl.user_id = :user_id
+                    AND tl.status = 'completed'
+                  ORDER BY tl.created_at DESC
+                  LIMIT 1
+                ),
+                control AS (
+                  SELECT
+                    tlc.is_blocked,
+                    tlc.blocked_until,
+                    tlc.requires_admin_approval
+                  FROM public.trial_lesson_identity_keys k
+                  JOIN public.trial_lesson_controls tlc ON tlc.id = k.control_id
+                  WHERE k.key_hash = ANY(CAST(:control_key_hashes AS text[]))
+                  ORDER BY k.key_kind
+                  LIMIT 1
+                )
+                SELECT
+                  a.is_active_student,
+                  ls.status AS scheduled_trial_status,
+                  cs.trial_lesson_id,
+                  cs.event_id,
+                  cs.status,
+                  cs.notes,
+                  cs.start_at,
+                  cs.end_at,
+                  cs.court_id,
+                  cs.court_name,
+                  cs.teacher_id,
+                  cs.teacher_name,
+                  lc.status AS completed_trial_status,
+                  ctl.is_blocked AS control_is_blocked,
+                  ctl.blocked_until AS control_blocked_until,
+                  ctl.requires_admin_approval AS control_requires_admin_approval
+                FROM active_student a
+                LEFT JOIN latest_scheduled ls ON TRUE
+                LEFT JOIN current_scheduled cs ON TRUE
+                LEFT JOIN latest_completed lc ON TRUE
+                LEFT JOIN control ctl ON TRUE
+                """
+            ),
+            {
+                "user_id": user.id,
+                "student_email": user.email.lower() if user.email else None,
+                "control_key_hashes": trial_identity_key_hashes(
+                    _normalize_email(user.email),
+                    _normalize_whatsapp(getattr(user, "whatsapp", None)),
+                ),
+            },
+        )
+        .mappings()
+        .one()
+    )
+
+    current_scheduled = None
+    if row["trial_lesson_id"] is not None:
+        current_scheduled = {column: row[column] for column in _CURRENT_SCHEDULED_TRIAL_COLUMNS}
+
+    return _TrialEligibilityState(
+        is_active_student=bool(row["is_active_student"]),
+        scheduled_trial_status=row["scheduled_trial_status"],
+        current_scheduled=current_scheduled,
+        completed_trial_status=row["completed_trial_status"],
+        control_is_blocked=bool(row["control_is_blocked"]),
+        control_blocked_until=row["control_blocked_until"],
+        control_requires_admin_approval=bool(row["control_requires_admin_approval"]),
+    )
+
+
+def _evaluate_trial_block_reason(
+    state: _TrialEligibilityState,
     *,
     allow_scheduled_for_reschedule: bool = False,
 ) -> tuple[str | None, str, str | None]:
-    if _is_active_student(db, user):
+    if state.is_active_student:
         return (
             "ACTIVE_STUDENT_NOT_ELIGIBLE",
             "Alunos ativos da escola não podem solicitar aula grátis.",
             None,
         )
 
-    scheduled_row = _get_current_scheduled_trial_row(db, user.id)
-    scheduled = _get_latest_scheduled_trial(db, user.id)
-    if scheduled:
+    if state.scheduled_trial_status:
+        scheduled_row = state.current_scheduled
         if scheduled_row and scheduled_row["end_at"].astimezone(_local_tz()) <= datetime.now(
             _local_tz()
         ):
@@ -1540,56 +1693,66 @@ def _get_trial_block_reason(
             )
 
         if allow_scheduled_for_reschedule:
-            control = _get_trial_control_state(db, user)
-            if control and bool(control["requires_admin_approval"]):
+            if state.control_requires_admin_approval:
                 return (
                     "TRIAL_ADMIN_APPROVAL_REQUIRED",
                     "Não foi possível concluir uma nova remarcação automática. Entre em contato com a escola para validar o próximo horário.",
-                    scheduled.status,
+                    state.scheduled_trial_status,
                 )
 
             return (
                 None,
                 "Você pode remarcar sua aula grátis dentro da política vigente.",
-                scheduled.status,
+                state.scheduled_trial_status,
             )
 
         return (
             "TRIAL_LESSON_ALREADY_SCHEDULED",
             "Você já possui uma aula grátis agendada.",
-            scheduled.status,
+            state.scheduled_trial_status,
         )
 
-    completed = _get_latest_completed_trial(db, user.id)
-    if completed:
+    if state.completed_trial_status:
         return (
             "TRIAL_LESSON_ALREADY_COMPLETED",
             "Você já utilizou sua aula grátis.",
-            completed.status,
+            state.completed_trial_status,
         )
 
-    control = _get_trial_control_state(db, user)
-    if control:
-        blocked_until = control["blocked_until"]
-
-        if bool(control["is_blocked"]):
-            if blocked_until is None or blocked_until > datetime.now(_local_tz()):
-                return (
-                    "TRIAL_BOOKING_BLOCKED",
-                    "Seu cadastro está temporariamente impedido de novos agendamentos. Entre em contato com a escola.",
-                    None,
-                )
-
-        if bool(control["requires_admin_approval"]):
+    if state.control_is_blocked:
+        blocked_until = state.control_blocked_until
+        if blocked_until is None or blocked_until > datetime.now(_local_tz()):
             return (
-                "TRIAL_ADMIN_APPROVAL_REQUIRED",
-                "Seu cadastro precisa de aprovação da equipe antes de um novo agendamento. Entre em contato com a escola.",
+                "TRIAL_BOOKING_BLOCKED",
+                "Seu cadastro está temporariamente impedido de novos agendamentos. Entre em contato com a escola.",
                 None,
             )
 
+    if state.control_requires_admin_approval:
+        return (
+            "TRIAL_ADMIN_APPROVAL_REQUIRED",
+            "Seu cadastro precisa de aprovação da equipe antes de um novo agendamento. Entre em contato com a escola.",
+            None,
+        )
+
     return (None, "Você pode solicitar sua aula grátis.", None)
 
 
+def _get_trial_block_reason(
+    db: Session,
+    user: User,
+    *,
+    allow_scheduled_for_reschedule: bool = False,
+    state: _TrialEligibilityState | None = None,
+) -> tuple[str | None, str, str | None]:
+    if state is None:
+        state = _load_trial_eligibility_state(db, user)
+    return _evaluate_trial_block_reason(
+        state,
+        allow_scheduled_for_reschedule=allow_scheduled_for_reschedule,
+    )
+
+
 def _compute_trial_slots(
     db: Session,
     *,
@@ -1601,11 +1764,14 @@ def _compute_trial_slots(
     day_end_hour: int,
     mode: str = "schedule",
     desired_period: str | None = None,
+    eligibility_state: _TrialEligibilityState | None = None,
 ) -> list[TrialLessonSlotOut]:
     allow_scheduled_for_reschedule = mode == "reschedule"
+    if eligibility_state is None:
+        eligibility_state = _load_trial_eligibility_state(db, current_user)
 
     if allow_scheduled_for_reschedule:
-        row = _get_current_scheduled_trial_row(db, current_user.id)
+        row = eligibility_state.current_scheduled
         if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1628,9 +1794,8 @@ def _compute_trial_slots(
                 },
             )
 
-    reason_code, message, _current_status = _get_trial_block_reason(
-        db,
-        current_user,
+    reason_code, message, _current_status = _evaluate_trial_block_reason(
+        eligibility_state,
         allow_scheduled_for_reschedule=allow_scheduled_for_reschedule,
     )
     if reason_code is not None:
@@ -1950,20 +2115,13 @@ def _schedule_trial_lesson_for_user(
             },
         )
 
-    if not _slot_is_still_available(
-        db=db,
+    _ensure_trial_slot_available_or_409(
+        db,
         start_at=data.start_at,
         end_at=data.end_at,
         court_id=data.court_id,
         teacher_id=data.teacher_id,
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail={
-                "code": "SLOT_NO_LONGER_AVAILABLE",
-                "message": "O horário selecionado não está mais disponível. Atualize a agenda e escolha outro slot.",
-            },
-        )
+    )
 
     try:
         event_row = (
@@ -2061,10 +2219,10 @@ def schedule_trial_lesson(
 )
 def admin_schedule_trial_lesson(
     data: TrialLessonAdminScheduleIn,
-    user_id: Annotated[str, Depends(get_current_user_id)],
+    admin: Annotated[CurrentUser, Depends(require_admin)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    admin_user = _require_admin_user(db, UUID(user_id))
+    admin_user = _get_user_or_404(db, admin.id)
     target_user, user_created = _resolve_or_create_admin_trial_user(db, data)
 
     scheduled = _schedule_trial_lesson_for_user(
@@ -2180,7 +2338,8 @@ def reschedule_trial_lesson(
 ):
     current_user = _get_user_or_404(db, UUID(user_id))
 
-    row = _get_current_scheduled_trial_row(db, current_user.id)
+    eligibility_state = _load_trial_eligibility_state(db, current_user)
+    row = eligibility_state.current_scheduled
     if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2203,8 +2362,7 @@ def reschedule_trial_lesson(
             },
         )
 
-    control = _get_trial_control_state(db, current_user)
-    if control and bool(control["requires_admin_approval"]):
+    if eligibility_state.control_requires_admin_approval:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail={
@@ -2240,20 +2398,13 @@ def reschedule_trial_lesson(
             },
         )
 
-    if not _slot_is_still_available(
-        db=db,
+    _ensure_trial_slot_available_or_409(
+        db,
         start_at=data.start_at,
         end_at=data.end_at,
         court_id=data.court_id,
         teacher_id=data.teacher_id,
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail={
-                "code": "SLOT_NO_LONGER_AVAILABLE",
-                "message": "O horário selecionado não está mais disponível. Atualize a agenda e escolha outro slot.",
-            },
-        )
+    )
 
     trial = db.get(TrialLesson, row["trial_lesson_id"])
     if not trial:
@@ -2352,15 +2503,16 @@ def reschedule_trial_lesson(
         raise _integrity_to_http(e) from e
 
 
-@router.get("/admin/scheduled", response_model=TrialLessonAdminScheduledListOut)
+@router.get(
+    "/admin/scheduled",
+    response_model=TrialLessonAdminScheduledListOut,
+    dependencies=[Depends(require_admin)],
+)
 def admin_list_scheduled_trial_lessons(
-    user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
     from_date: date | None = ADMIN_SCHEDULED_FROM_DATE_QUERY,
     days: int = ADMIN_SCHEDULED_DAYS_QUERY,
 ):
-    _require_admin_user(db, UUID(user_id))
-
     tz = _local_tz()
     start_day = from_date or datetime.now(tz).date()
     end_day = start_day + timedelta(days=days)
@@ -2414,13 +2566,14 @@ def admin_list_scheduled_trial_lessons(
     )
 
 
-@router.get("/admin/pending-attendance", response_model=TrialLessonAdminPendingListOut)
+@router.get(
+    "/admin/pending-attendance",
+    response_model=TrialLessonAdminPendingListOut,
+    dependencies=[Depends(require_admin)],
+)
 def admin_pending_trial_attendance(
-    user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    _require_admin_user(db, UUID(user_id))
-
     rows = _list_admin_pending_attendance_rows(db)
 
     items = [
@@ -2460,16 +2613,15 @@ def admin_pending_trial_attendance(
 
 
 @router.post(
-    "/admin/{trial_lesson_id}/attendance-review", response_model=TrialLessonAttendanceReviewOut
+    "/admin/{trial_lesson_id}/attendance-review",
+    response_model=TrialLessonAttendanceReviewOut,
+    dependencies=[Depends(require_admin)],
 )
 def admin_review_trial_attendance(
     trial_lesson_id: UUID,
     data: TrialLessonAttendanceReviewIn,
-    user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    _require_admin_user(db, UUID(user_id))
-
     row = _get_trial_attendance_review_row(db, trial_lesson_id)
     if not row:
         raise HTTPException(
@@ -2553,14 +2705,15 @@ def admin_review_trial_attendance(
     )
 
 
-@router.get("/admin/teacher-windows", response_model=TrialLessonTeacherWindowListOut)
+@router.get(
+    "/admin/teacher-windows",
+    response_model=TrialLessonTeacherWindowListOut,
+    dependencies=[Depends(require_admin)],
+)
 def admin_list_trial_teacher_windows(
-    user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
     teacher_id: Annotated[UUID | None, Query()] = None,
 ):
-    _require_admin_user(db, UUID(user_id))
-
     stmt = select(TrialLessonTeacherWindow).order_by(
         TrialLessonTeacherWindow.teacher_id,
         TrialLessonTeacherWindow.weekday,
@@ -2588,14 +2741,12 @@ def admin_list_trial_teacher_windows(
     "/admin/teacher-windows",
     response_model=TrialLessonTeacherWindowOut,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
 )
 def admin_create_trial_teacher_window(
     data: TrialLessonTeacherWindowCreateIn,
-    user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    _require_admin_user(db, UUID(user_id))
-
     _validate_teacher_window_values(
         db,
         teacher_id=data.teacher_id,
@@ -2621,15 +2772,16 @@ def admin_create_trial_teacher_window(
     return _serialize_teacher_window(window)
 
 
-@router.patch("/admin/teacher-windows/{window_id}", response_model=TrialLessonTeacherWindowOut)
+@router.patch(
+    "/admin/teacher-windows/{window_id}",
+    response_model=TrialLessonTeacherWindowOut,
+    dependencies=[Depends(require_admin)],
+)
 def admin_update_trial_teacher_window(
     window_id: UUID,
     data: TrialLessonTeacherWindowUpdateIn,
-    user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    _require_admin_user(db, UUID(user_id))
-
     window = db.get(TrialLessonTeacherWindow, window_id)
     if not window:
         raise HTTPException(
@@ -2672,13 +2824,11 @@ def admin_update_trial_teacher_window(
 @router.get(
     "/admin/extraordinary-requests",
     response_model=TrialLessonExtraordinaryRequestListOut,
+    dependencies=[Depends(require_admin)],
 )
 def admin_list_trial_extraordinary_requests(
-    user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    _require_admin_user(db, UUID(user_id))
-
     requests = list(
         db.scalars(
             select(TrialLessonExtraordinaryRequest).order_by(
@@ -2702,15 +2852,13 @@ def admin_list_trial_extraordinary_requests(
 @router.patch(
     "/admin/extraordinary-requests/{request_id}",
     response_model=TrialLessonExtraordinaryRequestOut,
+    dependencies=[Depends(require_admin)],
 )
 def admin_update_trial_extraordinary_request(
     request_id: UUID,
     data: TrialLessonExtraordinaryRequestUpdateIn,
-    user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
-    _require_admin_user(db, UUID(user_id))
-
     request = db.get(TrialLessonExtraordinaryRequest, request_id)
     if not request:
         raise HTTPException(
@@ -2746,7 +2894,8 @@ def create_trial_lesson_extraordinary_request(
 ):
     current_user = _get_user_or_404(db, UUID(user_id))
 
-    reason_code, message, _current_status = _get_trial_block_reason(db, current_user)
+    eligibility_state = _load_trial_eligibility_state(db, current_user)
+    reason_code, message, _current_status = _evaluate_trial_block_reason(eligibility_state)
     if reason_code is not None:
         _raise_trial_block(reason_code, message)
 
@@ -2772,6 +2921,7 @@ def create_trial_lesson_extraordinary_request(
         day_start_hour=8,
         day_end_hour=20,
         desired_period=data.desired_period,
+        eligibility_state=eligibility_state,
     )
 
     if slots:
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import re
+from urllib.parse import quote
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.services.file_storage import FileStorage
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range_header(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Intervalo `(start, end)` inclusivo de um header `Range` de faixa única.
+    `None` = responder o arquivo inteiro (sem header, múltiplas faixas ou
+    unidade desconhecida); faixa fora do arquivo vira 416.
+    """
+
+    if not range_header:
+        return None
+
+    match = _RANGE_RE.match(range_header.strip())
+    if match is None:
+        return None
+
+    raw_start, raw_end = match.groups()
+    if not raw_start and not raw_end:
+        return None
+
+    if not raw_start:
+        suffix_length = int(raw_end)
+        if suffix_length == 0:
+            raise _range_not_satisfiable(size)
+        return max(size - suffix_length, 0), size - 1
+
+    start = int(raw_start)
+    end = min(int(raw_end), size - 1) if raw_end else size - 1
+    if start >= size or start > end:
+        raise _range_not_satisfiable(size)
+    return start, end
+
+
+def _range_not_satisfiable(size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        detail="Intervalo solicitado fora do arquivo.",
+        headers={"Content-Range": f"bytes */{size}"},
+    )
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def storage_file_response(
+    storage: FileStorage,
+    key: str,
+    *,
+    size: int,
+    media_type: str,
+    filename: str | None = None,
+    range_header: str | None = None,
+) -> StreamingResponse:
+    """Download em streaming do storage, com suporte a `Range` (206)."""
+
+    byte_range = parse_range_header(range_header, size)
+    start, end = byte_range if byte_range is not None else (0, size - 1)
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+    }
+    if filename:
+        headers["Content-Disposition"] = _content_disposition(filename)
+    if byte_range is not None:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return StreamingResponse(
+        storage.iter_range(key, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=media_type,
+        headers=headers,
+    )
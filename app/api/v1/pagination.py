@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values: Any) -> str:
+    """Serializa a chave de ordenação do último item em um cursor opaco."""
+
+    payload = []
+    for value in values:
+        if isinstance(value, datetime):
+            payload.append({"t": "dt", "v": value.isoformat()})
+        elif isinstance(value, UUID):
+            payload.append({"t": "uuid", "v": str(value)})
+        else:
+            payload.append({"t": "raw", "v": value})
+
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *, types: tuple[type, ...]) -> list[Any]:
+    """
+    Inverso de `encode_cursor`. Cada valor precisa ter o tipo esperado na
+    posição (`types`), senão o cursor é forjado/antigo e vira 400 — nunca
+    chega ao SQL com tipo errado.
+    """
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("cursor size mismatch")
+
+        values: list[Any] = []
+        for item, expected in zip(payload, types, strict=True):
+            kind = item["t"]
+            if kind == "dt":
+                value = datetime.fromisoformat(item["v"])
+            elif kind == "uuid":
+                value = UUID(item["v"])
+            elif kind == "raw":
+                value = item["v"]
+            else:
+                raise ValueError(f"unknown cursor value type {kind!r}")
+            # `type is`: bool não passa por int nem o contrário
+            if type(value) is not expected:
+                raise ValueError(f"cursor value is not {expected.__name__}")
+            values.append(value)
+        return values
+    except (ValueError, KeyError, TypeError, AttributeError) as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "INVALID_CURSOR", "message": "Cursor de paginação inválido."},
+        ) from err
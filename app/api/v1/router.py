@@ -1,5 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.api.v1.deps import invalidate_catalogs_on_write
 from app.api.v1.endpoints.agenda import router as agenda_router
 from app.api.v1.endpoints.auth import router as auth_router
 from app.api.v1.endpoints.bookable_slots import router as bookable_slots_router
@@ -20,6 +21,7 @@ from app.api.v1.endpoints.students import router as students_router
 from app.api.v1.endpoints.teachers import router as teachers_router
 from app.api.v1.endpoints.trial_lessons import router as trial_lessons_router
 from app.routes.shorts import router as shorts_router
+from app.services.catalog_cache import CATALOG_COURTS, CATALOG_STUDENTS, CATALOG_TEACHERS
 
 api_router = APIRouter()
 
@@ -64,16 +66,32 @@ api_router.include_router(catalogs_router, tags=["catalogs"])
 api_router.include_router(class_groups_router, tags=["class-groups"])
 
 # Courts -> /api/v1/courts/...
-api_router.include_router(courts_router, tags=["courts"])
+api_router.include_router(
+    courts_router,
+    tags=["courts"],
+    dependencies=[Depends(invalidate_catalogs_on_write(CATALOG_COURTS))],
+)
 
 # Teachers -> /api/v1/teachers/...
-api_router.include_router(teachers_router, tags=["teachers"])
+api_router.include_router(
+    teachers_router,
+    tags=["teachers"],
+    dependencies=[Depends(invalidate_catalogs_on_write(CATALOG_TEACHERS))],
+)
 
 # Students -> /api/v1/students/...
-api_router.include_router(students_router, tags=["students"])
+api_router.include_router(
+    students_router,
+    tags=["students"],
+    dependencies=[Depends(invalidate_catalogs_on_write(CATALOG_STUDENTS))],
+)
 
 # Student Signup Requests -> /api/v1/student-signup-requests/...
-api_router.include_router(student_signup_requests_router, tags=["student-signup-requests"])
+api_router.include_router(
+    student_signup_requests_router,
+    tags=["student-signup-requests"],
+    dependencies=[Depends(invalidate_catalogs_on_write(CATALOG_STUDENTS))],
+)
 
 # Shorts (YouTube) -> /api/v1/shorts/...
 api_router.include_router(shorts_router, tags=["shorts"])
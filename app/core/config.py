@@ -32,6 +32,29 @@ class Settings(BaseSettings):
     frontend_url: str = "http://localhost:5173"
     frontend_verify_redirect_path: str = "/login"
 
+    # Snapshot por dia dos horários ocupados (slots de locação e grade de aula
+    # grátis), invalidado pelo NOTIFY dos triggers de events; o TTL só vale se o
+    # listener cair (0 = desligado)
+    availability_snapshot_ttl_seconds: int = 60
+
+    # Sweeper de locações públicas com pagamento vencido (0 = desligado, expira inline)
+    rental_expiration_sweep_interval_seconds: int = 60
+
+    # Reservas concorrentes: advisory lock por quadra/professor em blocos de N
+    # minutos antes da checagem de disponibilidade (0 = só a exclusion constraint)
+    booking_lock_bucket_minutes: int = 30
+
+    # Cache dos catálogos do admin (0 = desligado), invalidado entre processos por
+    # NOTIFY; o TTL só vale se o listener cair
+    catalog_cache_ttl_seconds: int = 300
+
+    # Cache por processo de papel/ativo do usuário autenticado (0 = desligado)
+    user_access_cache_ttl_seconds: int = 30
+
+    # Cache por processo da home do aluno (0 = desligado), invalidado entre processos
+    # por NOTIFY; o TTL só vale se o listener cair
+    student_home_cache_ttl_seconds: int = 30
+
     # Email verification
     email_verify_ttl_minutes: int = 30
 
@@ -46,6 +69,37 @@ class Settings(BaseSettings):
     smtp_from: str = ""
     smtp_use_tls: bool = True
 
+    # Pool de sessões SMTP autenticadas, compartilhado no processo (0 = uma sessão por e-mail)
+    smtp_pool_size: int = 4
+    smtp_pool_idle_timeout_seconds: int = 60
+
+    # Outbox de e-mails transacionais (0 = worker desligado no processo da API;
+    # rode `python -m app.services.email_outbox` por fora)
+    email_outbox_poll_interval_seconds: int = 5
+    email_outbox_batch_size: int = 20
+    email_outbox_max_attempts: int = 6
+
+    # Processamento de imagens em processos separados (fora do event loop);
+    # acima de `max_pending` uploads simultâneos no processo a API responde 503
+    image_processing_workers: int = 2
+    image_processing_max_pending: int = 4
+
+    # Storage de arquivos enviados (comprovantes): "local" (pasta storage/) ou "s3"
+    # (qualquer endpoint compatível: AWS, MinIO, R2...)
+    file_storage_backend: str = "local"
+    file_storage_s3_endpoint_url: str = ""
+    file_storage_s3_bucket: str = ""
+    file_storage_s3_access_key: str = ""
+    file_storage_s3_secret_key: str = ""
+    file_storage_s3_region: str = "us-east-1"
+    file_storage_s3_key_prefix: str = ""
+
+    # /media: cache do navegador para nomes sem hash (com hash = immutable, 1 ano)
+    # e LRU em memória dos arquivos pequenos mais pedidos (0 = desligado)
+    media_max_age_seconds: int = 300
+    media_hot_cache_max_bytes: int = 32 * 1024 * 1024
+    media_hot_cache_max_file_bytes: int = 256 * 1024
+
     # Google OAuth
     google_client_id: str = ""
     google_client_secret: str = ""
@@ -1,10 +1,10 @@
+import asyncio
 import mimetypes
 from pathlib import Path
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.router import api_router
 
@@ -19,6 +19,7 @@ load_dotenv(ROOT / ".env", override=False)
 # Importa settings somente após carregar o .env
 # Importa router só depois do settings/.env (evita import de DB cedo demais)
 from app.core.config import settings  # noqa: E402
+from app.services.media_files import HotFileCache, MediaFiles  # noqa: E402
 
 app = FastAPI(title=settings.app_name, version=settings.version)
 
@@ -36,9 +37,19 @@ app.add_middleware(
 # Garante MIME correto para arquivos WebP servidos em /media.
 mimetypes.add_type("image/webp", ".webp")
 
-# Publica arquivos de mídia do projeto.
-# Neste checkpoint, tudo que estiver dentro de /storage ficará acessível via /media.
-app.mount("/media", StaticFiles(directory=STORAGE_ROOT), name="media")
+# Publica arquivos de mídia do projeto (exceto comprovantes, servidos só pelo admin).
+app.mount(
+    "/media",
+    MediaFiles(
+        directory=STORAGE_ROOT,
+        max_age_seconds=settings.media_max_age_seconds,
+        hot_cache=HotFileCache(
+            max_bytes=settings.media_hot_cache_max_bytes,
+            max_file_bytes=settings.media_hot_cache_max_file_bytes,
+        ),
+    ),
+    name="media",
+)
 
 
 @app.on_event("startup")
@@ -66,6 +77,100 @@ def on_startup():
             raise
 
 
+_background_stop = asyncio.Event()
+_background_tasks: list[asyncio.Task] = []
+
+
+@app.on_event("startup")
+async def start_background_workers():
+    """
+    Sobe os workers em background do processo:
+    - sweeper de locações públicas vencidas (um por processo, lock no banco);
+    - worker do outbox de e-mails (lotes reservados com SKIP LOCKED);
+    - criação das partições mensais de agenda_overview_items (lock no banco);
+    - listener do NOTIFY de disponibilidade (invalida os snapshots de horários);
+    - listener do NOTIFY de invalidação dos caches por processo (catálogos, home do aluno).
+    """
+    from app.db.session import SessionLocal
+
+    _background_stop.clear()
+
+    sweep_interval = settings.rental_expiration_sweep_interval_seconds
+    if sweep_interval > 0:
+        from app.services.court_rental_expiration import run_expiration_sweeper
+
+        _background_tasks.append(
+            asyncio.create_task(
+                run_expiration_sweeper(
+                    SessionLocal,
+                    interval_seconds=sweep_interval,
+                    stop_event=_background_stop,
+                )
+            )
+        )
+
+    outbox_interval = settings.email_outbox_poll_interval_seconds
+    if outbox_interval > 0:
+        from app.services.email_outbox import run_email_outbox_worker
+        from app.services.email_sender import build_email_sender
+
+        _background_tasks.append(
+            asyncio.create_task(
+                run_email_outbox_worker(
+                    SessionLocal,
+                    build_email_sender,
+                    interval_seconds=outbox_interval,
+                    batch_size=settings.email_outbox_batch_size,
+                    max_attempts=settings.email_outbox_max_attempts,
+                    stop_event=_background_stop,
+                )
+            )
+        )
+
+    from app.services.agenda_overview import run_partition_keeper
+
+    _background_tasks.append(
+        asyncio.create_task(run_partition_keeper(SessionLocal, stop_event=_background_stop))
+    )
+
+    from sqlalchemy.engine import make_url
+
+    # conexão dedicada do psycopg para os LISTEN (sem o driver do SQLAlchemy na URL)
+    conninfo = (
+        make_url(settings.database_url)
+        .set(drivername="postgresql")
+        .render_as_string(hide_password=False)
+    )
+
+    if settings.availability_snapshot_ttl_seconds > 0:
+        from app.services.availability_snapshot import run_availability_listener
+
+        _background_tasks.append(
+            asyncio.create_task(run_availability_listener(conninfo, stop_event=_background_stop))
+        )
+
+    if settings.catalog_cache_ttl_seconds > 0 or settings.student_home_cache_ttl_seconds > 0:
+        from app.services.cache_invalidation import run_cache_invalidation_listener
+
+        _background_tasks.append(
+            asyncio.create_task(
+                run_cache_invalidation_listener(conninfo, stop_event=_background_stop)
+            )
+        )
+
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    _background_stop.set()
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+        _background_tasks.clear()
+
+    from app.services.image_processing import image_processing_pool
+
+    image_processing_pool.shutdown()
+
+
 @app.get("/")
 def root():
     return {
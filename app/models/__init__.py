@@ -1,3 +1,4 @@
+from app.models.agenda_overview_item import AgendaOverviewItem  # noqa: F401
 from app.models.bookable_slot import BookableSlot  # noqa: F401
 from app.models.class_group import ClassGroup  # noqa: F401
 from app.models.class_group_enrollment import ClassGroupEnrollment  # noqa: F401
@@ -12,12 +13,14 @@ from app.models.court_rental import CourtRental  # noqa: F401
 from app.models.court_rental_payment_proof import CourtRentalPaymentProof  # noqa: F401
 from app.models.court_rental_payment_setting import CourtRentalPaymentSetting  # noqa: F401
 from app.models.court_status_history import CourtStatusHistory  # noqa: F401
+from app.models.email_outbox import EmailOutbox  # noqa: F401
 from app.models.event import Event  # noqa: F401
 from app.models.student import Student  # noqa: F401
 from app.models.student_makeup_request import StudentMakeupRequest  # noqa: F401
 from app.models.student_signup_request import StudentSignupRequest  # noqa: F401
 from app.models.student_status_history import StudentStatusHistory  # noqa: F401
 from app.models.teacher import Teacher  # noqa: F401
+from app.models.teacher_agenda_item import TeacherAgendaItem  # noqa: F401
 from app.models.teacher_availability_exception import TeacherAvailabilityException  # noqa: F401
 from app.models.teacher_availability_rule import TeacherAvailabilityRule  # noqa: F401
 from app.models.teacher_event_report import TeacherEventReport  # noqa: F401
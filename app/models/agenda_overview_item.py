@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Text, func, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class AgendaOverviewItem(Base):
+    """
+    Projeção da visão geral da agenda do admin (um item por evento, no
+    formato de `AgendaItemOut`). Mantida por triggers e particionada por mês
+    de `start_at`; as partições vêm da migração e de
+    `python -m app.services.agenda_overview --ensure-partitions`.
+    """
+
+    __tablename__ = "agenda_overview_items"
+    __table_args__ = (
+        Index("ix_agenda_overview_items_start_at", "start_at"),
+        Index("ix_agenda_overview_items_event_group_start", "event_group", "start_at"),
+        Index("ix_agenda_overview_items_color_key_start", "color_key", "start_at"),
+        Index("ix_agenda_overview_items_participant_label", "participant_label"),
+        Index("ix_agenda_overview_items_court_start", "court_id", "start_at"),
+        Index("ix_agenda_overview_items_teacher_start", "teacher_id", "start_at"),
+        Index("ix_agenda_overview_items_student_id", "student_id"),
+        Index("ix_agenda_overview_items_class_group_id", "class_group_id"),
+        Index("ix_agenda_overview_items_created_by_user_id", "created_by_user_id"),
+        Index("ix_agenda_overview_items_trial_user_id", "trial_user_id"),
+        Index(
+            "ix_agenda_overview_items_long_running",
+            "end_at",
+            postgresql_where=text("is_long_running"),
+        ),
+        {"postgresql_partition_by": "RANGE (start_at)"},
+    )
+
+    event_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("events.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    kind: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(Text, nullable=False)
+    notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    court_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), nullable=False)
+    court_name: Mapped[str] = mapped_column(Text, nullable=False)
+    teacher_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    teacher_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+    student_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    student_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_by_user_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    created_by_email: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    class_group_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    class_group_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+    class_group_student_names: Mapped[list[str] | None] = mapped_column(
+        ARRAY(Text),
+        nullable=True,
+    )
+
+    court_rental_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    court_rental_origin: Mapped[str | None] = mapped_column(Text, nullable=True)
+    court_rental_pricing_profile: Mapped[str | None] = mapped_column(Text, nullable=True)
+    court_rental_payment_status: Mapped[str | None] = mapped_column(Text, nullable=True)
+    customer_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+    customer_email: Mapped[str | None] = mapped_column(Text, nullable=True)
+    customer_whatsapp: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    trial_lesson_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    trial_user_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    trial_user_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+    trial_user_email: Mapped[str | None] = mapped_column(Text, nullable=True)
+    trial_user_whatsapp: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # trial | rental | group_lesson | student_lesson | other
+    event_group: Mapped[str] = mapped_column(Text, nullable=False)
+    event_label: Mapped[str] = mapped_column(Text, nullable=False)
+    color_key: Mapped[str] = mapped_column(Text, nullable=False)
+    participant_label: Mapped[str | None] = mapped_column(Text, nullable=True)
+    is_recurring: Mapped[bool] = mapped_column(Boolean, nullable=False)
+
+    # dura mais que `AGENDA_OVERVIEW_SPAN_BOUND`: fica fora do corte por start_at
+    is_long_running: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        server_default=text("false"),
+    )
+
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
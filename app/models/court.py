@@ -4,6 +4,7 @@ from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy import Boolean, DateTime, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -36,6 +37,12 @@ class Court(Base):
         nullable=True,
     )
 
+    # {"thumb": url, "card": url, "full": url} gerado no upload da imagem
+    image_renditions: Mapped[dict[str, str] | None] = mapped_column(
+        JSONB,
+        nullable=True,
+    )
+
     short_description: Mapped[str | None] = mapped_column(
         Text,
         nullable=True,
@@ -4,7 +4,18 @@ from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Numeric, String, Text, func, text
+from sqlalchemy import (
+    Boolean,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -13,6 +24,23 @@ from app.db.base import Base
 
 class CourtRental(Base):
     __tablename__ = "court_rentals"
+    __table_args__ = (
+        Index(
+            "ix_court_rentals_owner_active_status",
+            "owner_user_id",
+            "status",
+            # status em que a locação ainda ocupa o horário
+            postgresql_where=text(
+                "status IN ('requested', 'awaiting_payment', 'awaiting_proof', "
+                "'awaiting_admin_review', 'scheduled', 'confirmed')"
+            ),
+        ),
+        Index(
+            "ix_court_rentals_pending_payment_expires_at",
+            "payment_expires_at",
+            postgresql_where=text("status = 'awaiting_payment' AND payment_status = 'pending'"),
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
@@ -41,6 +69,14 @@ class CourtRental(Base):
         index=True,
     )
 
+    # dono da locação nas telas públicas: o cliente ou, sem cliente, quem reservou
+    owner_user_id: Mapped[UUID | None] = mapped_column(
+        PGUUID(as_uuid=True),
+        Computed("COALESCE(customer_user_id, user_id)", persisted=True),
+        nullable=True,
+        index=True,
+    )
+
     customer_student_id: Mapped[UUID | None] = mapped_column(
         PGUUID(as_uuid=True),
         ForeignKey("students.id", ondelete="SET NULL"),
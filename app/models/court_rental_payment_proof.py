@@ -58,6 +58,13 @@ class CourtRentalPaymentProof(Base):
         nullable=False,
     )
 
+    # SHA-256 do conteúdo; linhas com o mesmo hash compartilham o blob em `storage_path`
+    content_sha256: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        index=True,
+    )
+
     notes: Mapped[str | None] = mapped_column(
         Text,
         nullable=True,
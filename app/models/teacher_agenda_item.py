@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey, Index, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class TeacherAgendaItem(Base):
+    """
+    Projeção desnormalizada de `events` para a agenda do professor. Mantida
+    por triggers (eventos, reportes, matrículas e nomes); nunca é escrita
+    pela aplicação. Reconstrução: `python -m app.services.teacher_agenda_items`.
+    """
+
+    __tablename__ = "teacher_agenda_items"
+    __table_args__ = (
+        Index("ix_teacher_agenda_items_teacher_start", "teacher_id", "start_at"),
+        Index("ix_teacher_agenda_items_class_group_id", "class_group_id"),
+        Index("ix_teacher_agenda_items_student_id", "student_id"),
+        Index("ix_teacher_agenda_items_court_id", "court_id"),
+    )
+
+    event_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("events.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    teacher_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), nullable=False)
+    teacher_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    kind: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(Text, nullable=False)
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    event_created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    event_updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    court_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    court_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    student_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    student_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    class_group_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    class_group_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # [{"student_id": ..., "student_name": ...}] das matrículas ativas da turma
+    class_group_students: Mapped[list[dict[str, Any]]] = mapped_column(
+        JSONB,
+        nullable=False,
+        server_default=text("'[]'::jsonb"),
+    )
+
+    teacher_event_report_id: Mapped[UUID | None] = mapped_column(
+        PGUUID(as_uuid=True),
+        nullable=True,
+    )
+    teacher_event_report_status: Mapped[str | None] = mapped_column(Text, nullable=True)
+    teacher_event_issue_type: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
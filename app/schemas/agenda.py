@@ -57,6 +57,29 @@ class CourtDisponivelOut(BaseModel):
     court_name: str
 
 
+class CourtGradeSlotOut(BaseModel):
+    slot_start: datetime
+    slot_end: datetime
+    court_id: UUID
+    court_name: str
+
+
 class ProfessorDisponivelOut(BaseModel):
     teacher_id: UUID
     teacher_name: str
+
+
+class ProfessorGradeSlotOut(BaseModel):
+    slot_start: datetime
+    slot_end: datetime
+
+
+class ProfessorGradeTeacherOut(BaseModel):
+    teacher_id: UUID
+    teacher_name: str
+    available: list[bool]
+
+
+class ProfessorGradeOut(BaseModel):
+    slots: list[ProfessorGradeSlotOut]
+    teachers: list[ProfessorGradeTeacherOut]
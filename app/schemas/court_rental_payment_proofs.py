@@ -15,6 +15,7 @@ class CourtRentalPaymentProofOut(BaseModel):
     storage_path: str
     mime_type: str
     file_size_bytes: int
+    content_sha256: str | None = None
     notes: str | None = None
     created_at: datetime
 
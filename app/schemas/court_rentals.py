@@ -7,6 +7,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field
 
+from app.schemas.courts import CourtImageRenditionsOut
+
 CourtRentalOrigin = Literal[
     "public_landing",
     "admin_panel",
@@ -88,6 +90,7 @@ class CourtRentalCourtCardOut(BaseModel):
     surface_type: str | None = None
     cover_type: str | None = None
     image_url: str | None = None
+    image_renditions: CourtImageRenditionsOut | None = None
     short_description: str | None = None
     has_slots_in_range: bool
     available_slots_count: int = 0
@@ -371,6 +374,7 @@ class CourtRentalPaymentInstructionOut(BaseModel):
     total_amount: Decimal | None = None
     pix_key: str | None = None
     pix_qr_code_payload: str | None = None
+    pix_qr_code_url: str | None = None
     payment_expires_at: datetime | None = None
     message: str
 
@@ -460,6 +464,11 @@ class CourtRentalAdminListItemOut(BaseModel):
 
 class CourtRentalAdminListOut(BaseModel):
     items: list[CourtRentalAdminListItemOut]
+    # todas as locações dos filtros, não só as da página
     total: int
     from_date: date | None = None
     to_date: date | None = None
+    next_cursor: str | None = None
+    has_more: bool = False
+    totals_by_status: dict[str, int] | None = None
+    totals_by_payment_status: dict[str, int] | None = None
@@ -33,12 +33,19 @@ class CourtStatusChangeIn(BaseModel):
     reason_note: str | None = Field(default=None, max_length=1000)
 
 
+class CourtImageRenditionsOut(BaseModel):
+    thumb: str | None = None
+    card: str | None = None
+    full: str | None = None
+
+
 class CourtOut(BaseModel):
     id: UUID
     name: str
     surface_type: str | None = None
     cover_type: str | None = None
     image_url: str | None = None
+    image_renditions: CourtImageRenditionsOut | None = None
     short_description: str | None = None
     is_active: bool
     created_at: datetime
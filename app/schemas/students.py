@@ -60,6 +60,15 @@ class StudentListItemOut(StudentOut):
     pass
 
 
+# só quando a listagem pede paginação (limit, cursor ou include_total)
+class StudentListOut(BaseModel):
+    items: list[StudentListItemOut]
+    # só com include_total=true
+    total: int | None = None
+    next_cursor: str | None = None
+    has_more: bool = False
+
+
 class StudentStatusHistoryItemOut(BaseModel):
     id: UUID
     student_id: UUID
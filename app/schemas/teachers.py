@@ -54,6 +54,15 @@ class TeacherListItemOut(TeacherOut):
     pass
 
 
+# só quando a listagem pede paginação (limit, cursor ou include_total)
+class TeacherListOut(BaseModel):
+    items: list[TeacherListItemOut]
+    # só com include_total=true
+    total: int | None = None
+    next_cursor: str | None = None
+    has_more: bool = False
+
+
 class TeacherStatusHistoryItemOut(BaseModel):
     id: UUID
     teacher_id: UUID
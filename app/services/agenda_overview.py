@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Eventos mais curtos que isso são achados só pelo corte em start_at
+# (`start_at >= from - bound`), que poda partições e usa o índice; os mais
+# longos (`is_long_running`, mesmo limite do SQL da migração) vêm de um
+# índice parcial à parte.
+AGENDA_OVERVIEW_SPAN_BOUND = timedelta(days=1)
+
+_DEFAULT_MONTHS_AHEAD = 24
+_REBUILD_BATCH_SIZE = 1000
+
+# Chave fixa do advisory lock: só um processo cria partições por vez.
+_PARTITIONS_ADVISORY_LOCK_KEY = 0x46E4_DA0A
+
+# Partições são mensais; conferir uma vez por dia basta.
+_PARTITION_CHECK_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.month - 1 + months
+    return date(value.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def ensure_agenda_overview_partitions(
+    db: Session,
+    *,
+    months_ahead: int = _DEFAULT_MONTHS_AHEAD,
+    today: date | None = None,
+) -> int:
+    """
+    Cria as partições mensais de `agenda_overview_items` do mês atual até
+    `months_ahead` meses à frente. Devolve quantas foram criadas. Não faz commit.
+    """
+
+    start = (today or date.today()).replace(day=1)
+    return int(
+        db.execute(
+            text("SELECT public.fn_ensure_agenda_overview_partitions(:p_from, :p_to)"),
+            {"p_from": start, "p_to": _add_months(start, months_ahead)},
+        ).scalar_one()
+    )
+
+
+def run_partition_maintenance(session_factory: Callable[[], Session]) -> int | None:
+    """
+    Garante as partições dos próximos meses. Retorna quantas foram criadas ou
+    `None` quando outro processo já está com o lock.
+    """
+
+    with session_factory() as db:
+        locked = db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"),
+            {"key": _PARTITIONS_ADVISORY_LOCK_KEY},
+        ).scalar_one()
+        if not locked:
+            db.rollback()
+            return None
+
+        created = ensure_agenda_overview_partitions(db)
+        db.commit()
+    return created
+
+
+async def run_partition_keeper(
+    session_factory: Callable[[], Session],
+    *,
+    stop_event: asyncio.Event,
+    interval_seconds: float = _PARTITION_CHECK_INTERVAL_SECONDS,
+) -> None:
+    """
+    Loop em background: na subida e depois uma vez por dia, cria as partições
+    mensais que faltam, para os eventos novos não irem parar na default.
+    """
+
+    while not stop_event.is_set():
+        try:
+            created = await asyncio.to_thread(run_partition_maintenance, session_factory)
+            if created:
+                print(f"[agenda-overview] {created} partição(ões) criada(s)")
+        except Exception as exc:  # o loop não pode morrer por causa de uma rodada
+            print(f"[agenda-overview] falha ao criar partições: {exc}")
+
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval_seconds)
+        except TimeoutError:
+            pass
+
+
+def rebuild_agenda_overview_items(
+    db: Session,
+    *,
+    batch_size: int = _REBUILD_BATCH_SIZE,
+) -> int:
+    """Reprojeta todos os eventos em `agenda_overview_items`. Não faz commit."""
+
+    event_ids = list(db.execute(text("SELECT id FROM public.events ORDER BY start_at")).scalars())
+
+    batch_size = max(batch_size, 1)
+    refreshed = 0
+    for offset in range(0, len(event_ids), batch_size):
+        refreshed += int(
+            db.execute(
+                text("SELECT public.fn_refresh_agenda_overview_items(CAST(:event_ids AS uuid[]))"),
+                {"event_ids": event_ids[offset : offset + batch_size]},
+            ).scalar_one()
+        )
+    return refreshed
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(
+        description="Manutenção da projeção agenda_overview_items (visão geral do admin)."
+    )
+    parser.add_argument(
+        "--ensure-partitions",
+        action="store_true",
+        help="cria as partições mensais que faltam a partir do mês atual",
+    )
+    parser.add_argument("--months-ahead", type=int, default=_DEFAULT_MONTHS_AHEAD)
+    parser.add_argument("--rebuild", action="store_true", help="reprojeta todos os eventos")
+    args = parser.parse_args()
+
+    if not args.ensure_partitions and not args.rebuild:
+        parser.error("informe --ensure-partitions e/ou --rebuild")
+
+    with SessionLocal() as session:
+        if args.ensure_partitions:
+            created = ensure_agenda_overview_partitions(session, months_ahead=args.months_ahead)
+            session.commit()
+            print(f"[agenda-overview] {created} partição(ões) criada(s)")
+        if args.rebuild:
+            total = rebuild_agenda_overview_items(session)
+            session.commit()
+            print(f"[agenda-overview] {total} evento(s) reprojetado(s)")
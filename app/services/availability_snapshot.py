@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
+from typing import Any
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from cachetools import TTLCache
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.court_availability import (
+    BusyIntervals,
+    load_confirmed_court_intervals,
+    load_confirmed_teacher_intervals,
+    merge_intervals,
+)
+
+# Canal do `pg_notify` disparado pelos triggers de `events` (migração b5c6d7e8f9a0).
+AVAILABILITY_CHANNEL = "availability_changed"
+
+# Os snapshots são por dia local, o mesmo dia usado pelo trigger.
+_LOCAL_TIMEZONE = ZoneInfo("America/Sao_Paulo")
+
+_LISTENER_RETRY_SECONDS = 5.0
+
+_LOADERS = {
+    "court": lambda db, start, end, owner_ids=None: load_confirmed_court_intervals(
+        db, range_start=start, range_end=end, court_ids=owner_ids
+    ),
+    "teacher": lambda db, start, end, owner_ids=None: load_confirmed_teacher_intervals(
+        db, range_start=start, range_end=end, teacher_ids=owner_ids
+    ),
+}
+
+
+@dataclass
+class AvailabilitySnapshotStats:
+    hits: int = 0
+    misses: int = 0
+    rebuilds: int = 0
+    rebuild_seconds_total: float = 0.0
+    rebuild_seconds_max: float = 0.0
+    invalidations: int = 0
+    listener_connected: bool = False
+    last_error: str | None = None
+
+
+def _day_bounds(day: date) -> tuple[datetime, datetime]:
+    start_at = datetime.combine(day, dt_time.min, tzinfo=_LOCAL_TIMEZONE)
+    return start_at, datetime.combine(day + timedelta(days=1), dt_time.min, tzinfo=_LOCAL_TIMEZONE)
+
+
+def _days_between(range_start: datetime, range_end: datetime) -> list[date]:
+    first_day = range_start.astimezone(_LOCAL_TIMEZONE).date()
+    last_day = (range_end - timedelta(microseconds=1)).astimezone(_LOCAL_TIMEZONE).date()
+    return [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+
+
+class AvailabilitySnapshotCache:
+    """
+    Snapshot por processo, por dia local e por tipo (`court` / `teacher`), dos
+    intervalos ocupados por eventos confirmados — a entrada das grades de
+    horários livres de locação e aula grátis. Serve qualquer tamanho de slot.
+
+    As entradas caem pelo NOTIFY dos triggers de `events` (ver
+    `run_availability_listener`) e, se o listener estiver fora, pelo TTL.
+    A confirmação de uma reserva continua checando direto no banco.
+    """
+
+    def __init__(self, *, ttl_seconds: int, maxsize: int = 2048) -> None:
+        self.enabled = ttl_seconds > 0
+        self._entries: TTLCache[tuple[str, date], BusyIntervals] = TTLCache(
+            maxsize=maxsize, ttl=max(ttl_seconds, 1)
+        )
+        self._lock = threading.Lock()
+        # sobe a cada invalidação: snapshot carregado antes dela não é guardado
+        self._generation = 0
+        self.stats = AvailabilitySnapshotStats()
+
+    def busy_intervals(
+        self,
+        db: Session,
+        *,
+        kind: str,
+        range_start: datetime,
+        range_end: datetime,
+        owner_ids: Sequence[UUID] | None = None,
+    ) -> BusyIntervals:
+        """Mesmo resultado de `load_confirmed_<kind>_intervals`, montado dos snapshots diários."""
+
+        loader = _LOADERS[kind]
+        if not self.enabled:
+            return loader(db, range_start, range_end, owner_ids)
+
+        days = _days_between(range_start, range_end)
+        with self._lock:
+            cached = {day: self._entries.get((kind, day)) for day in days}
+            generation = self._generation
+        missing = [day for day, snapshot in cached.items() if snapshot is None]
+
+        with self._lock:
+            self.stats.hits += len(days) - len(missing)
+            self.stats.misses += len(missing)
+
+        if missing:
+            cached.update(self._rebuild(db, kind=kind, days=missing, generation=generation))
+
+        allowed = set(owner_ids) if owner_ids is not None else None
+        combined: dict[UUID, list[tuple[datetime, datetime]]] = {}
+        for snapshot in cached.values():
+            for owner_id, intervals in (snapshot or {}).items():
+                if allowed is None or owner_id in allowed:
+                    combined.setdefault(owner_id, []).extend(intervals)
+
+        # evento que atravessa a meia-noite aparece nos dois dias
+        return {owner_id: merge_intervals(intervals) for owner_id, intervals in combined.items()}
+
+    def _rebuild(
+        self,
+        db: Session,
+        *,
+        kind: str,
+        days: list[date],
+        generation: int,
+    ) -> dict[date, BusyIntervals]:
+        # uma consulta cobrindo do primeiro ao último dia que faltou
+        started = time.perf_counter()
+        range_start = _day_bounds(min(days))[0]
+        range_end = _day_bounds(max(days))[1]
+        busy = _LOADERS[kind](db, range_start, range_end)
+
+        snapshots: dict[date, BusyIntervals] = {}
+        for day in days:
+            day_start, day_end = _day_bounds(day)
+            snapshots[day] = {
+                owner_id: day_intervals
+                for owner_id, intervals in busy.items()
+                if (
+                    day_intervals := [
+                        (start_at, end_at)
+                        for start_at, end_at in intervals
+                        if start_at < day_end and end_at > day_start
+                    ]
+                )
+            }
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.stats.rebuilds += 1
+            self.stats.rebuild_seconds_total += elapsed
+            self.stats.rebuild_seconds_max = max(self.stats.rebuild_seconds_max, elapsed)
+            if generation == self._generation:
+                for day, snapshot in snapshots.items():
+                    self._entries[(kind, day)] = snapshot
+        return snapshots
+
+    def invalidate(self, keys: Iterable[tuple[str, date]]) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.stats.invalidations += 1
+
+    def apply_notification(self, payload: str) -> None:
+        """Payload do trigger: `{"items": [[kind, owner_id, "YYYY-MM-DD"], ...]}` ou `{"all": true}`."""
+
+        try:
+            message = json.loads(payload)
+            if message.get("all"):
+                self.clear()
+                return
+            keys = {(kind, date.fromisoformat(day)) for kind, _owner_id, day in message["items"]}
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self.clear()
+            return
+        self.invalidate(keys)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.stats.hits + self.stats.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hit_ratio": round(self.stats.hits / lookups, 4) if lookups else None,
+                "rebuild_seconds_avg": (
+                    self.stats.rebuild_seconds_total / self.stats.rebuilds
+                    if self.stats.rebuilds
+                    else None
+                ),
+                **asdict(self.stats),
+            }
+
+
+availability_snapshot_cache = AvailabilitySnapshotCache(
+    ttl_seconds=settings.availability_snapshot_ttl_seconds
+)
+
+
+async def run_availability_listener(
+    conninfo: str,
+    *,
+    stop_event: asyncio.Event,
+    cache: AvailabilitySnapshotCache = availability_snapshot_cache,
+) -> None:
+    """
+    Loop em background: `LISTEN` no canal dos triggers de `events` e invalida
+    os snapshots deste processo. A cada (re)conexão o cache é zerado, porque
+    os NOTIFY do período desconectado se perderam.
+    """
+
+    import psycopg
+
+    while not stop_event.is_set():
+        try:
+            async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+                await conn.execute(f"LISTEN {AVAILABILITY_CHANNEL}")
+                cache.clear()
+                cache.stats.listener_connected = True
+                cache.stats.last_error = None
+                while not stop_event.is_set():
+                    async for notify in conn.notifies(timeout=1.0):
+                        cache.apply_notification(notify.payload)
+        except Exception as exc:  # o loop não pode morrer por causa de uma conexão
+            cache.stats.last_error = str(exc)
+            print(f"[availability-snapshot] listener caiu: {exc}")
+        finally:
+            cache.stats.listener_connected = False
+            cache.clear()
+
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=_LISTENER_RETRY_SECONDS)
+        except TimeoutError:
+            pass
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# Primeira metade da chave de dois inteiros do advisory lock: separa estes locks
+# dos de outros módulos (o sweeper de locações usa a forma de um bigint).
+_BOOKING_LOCK_NAMESPACE = 0x0B00_4B11
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+class BookingSlotContended(RuntimeError):
+    """Outra requisição está reservando um bloco do mesmo horário agora."""
+
+
+@dataclass
+class BookingLockStats:
+    attempts: int = 0
+    acquired: int = 0
+    contended: int = 0
+    # disponibilidade já ocupada depois do lock / exclusion constraint disparada mesmo assim
+    slot_conflicts: int = 0
+    integrity_conflicts: int = 0
+    lock_wait_seconds_total: float = 0.0
+    lock_wait_seconds_max: float = 0.0
+
+
+class BookingCoordinator:
+    """
+    Serializa as reservas que disputam a mesma quadra (e o mesmo professor,
+    quando houver) em blocos de `bucket_minutes`, com
+    `pg_try_advisory_xact_lock` antes da checagem de disponibilidade. Quem
+    chega com o bloco ocupado recebe `BookingSlotContended` na hora, em vez
+    de refazer toda a checagem e cair no `IntegrityError` da exclusion
+    constraint. Os locks duram até o commit/rollback da transação.
+    """
+
+    def __init__(self, *, bucket_minutes: int) -> None:
+        self.bucket_minutes = bucket_minutes
+        self.enabled = bucket_minutes > 0
+        self.stats = BookingLockStats()
+        self._stats_lock = threading.Lock()
+
+    def lock_keys(
+        self,
+        *,
+        court_id: UUID,
+        start_at: datetime,
+        end_at: datetime,
+        teacher_id: UUID | None = None,
+    ) -> list[int]:
+        """Chaves dos blocos que `[start_at, end_at)` toca, para a quadra e o professor."""
+
+        bucket = timedelta(minutes=self.bucket_minutes)
+        first_bucket = (start_at - _EPOCH) // bucket
+        last_bucket = -((_EPOCH - end_at) // bucket)  # teto
+
+        resources = [("court", court_id)]
+        if teacher_id is not None:
+            resources.append(("teacher", teacher_id))
+
+        keys = {
+            _lock_key(f"{kind}:{resource_id}:{bucket_index}")
+            for kind, resource_id in resources
+            for bucket_index in range(first_bucket, max(last_bucket, first_bucket + 1))
+        }
+        return sorted(keys)
+
+    def acquire(
+        self,
+        db: Session,
+        *,
+        court_id: UUID,
+        start_at: datetime,
+        end_at: datetime,
+        teacher_id: UUID | None = None,
+    ) -> None:
+        """Pega os locks do horário ou levanta `BookingSlotContended`. Não faz commit."""
+
+        if not self.enabled:
+            return
+
+        keys = self.lock_keys(
+            court_id=court_id,
+            start_at=start_at,
+            end_at=end_at,
+            teacher_id=teacher_id,
+        )
+        started = time.perf_counter()
+        acquired = db.execute(
+            text(
+                """
+                SELECT bool_and(pg_try_advisory_xact_lock(:namespace, k))
+                FROM unnest(CAST(:keys AS integer[])) AS t(k)
+                """
+            ),
+            {"namespace": _BOOKING_LOCK_NAMESPACE, "keys": keys},
+        ).scalar_one()
+        waited = time.perf_counter() - started
+
+        with self._stats_lock:
+            self.stats.attempts += 1
+            self.stats.lock_wait_seconds_total += waited
+            self.stats.lock_wait_seconds_max = max(self.stats.lock_wait_seconds_max, waited)
+            if acquired:
+                self.stats.acquired += 1
+            else:
+                self.stats.contended += 1
+
+        if not acquired:
+            # sem espera não há deadlock; os blocos que chegaram a ser pegos
+            # saem no rollback da requisição
+            raise BookingSlotContended("Horário sendo reservado por outra requisição.")
+
+    def record_slot_conflict(self) -> None:
+        with self._stats_lock:
+            self.stats.slot_conflicts += 1
+
+    def record_integrity_conflict(self) -> None:
+        with self._stats_lock:
+            self.stats.integrity_conflicts += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._stats_lock:
+            return {"enabled": self.enabled, **asdict(self.stats)}
+
+
+def _lock_key(value: str) -> int:
+    # int4 com sinal: segunda metade da chave do advisory lock
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=4).digest(), signed=True)
+
+
+booking_coordinator = BookingCoordinator(bucket_minutes=settings.booking_lock_bucket_minutes)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Canal dos avisos de invalidação entre processos da API (catálogos, home do aluno).
+CACHE_INVALIDATION_CHANNEL = "cache_invalidated"
+
+# Limite do payload do NOTIFY é 8000 bytes; acima disso vai `{"all": true}`.
+_MAX_PAYLOAD_BYTES = 7500
+
+_LISTENER_RETRY_SECONDS = 5.0
+
+# cache -> (aplica a mensagem, zera tudo)
+_caches: dict[str, tuple[Callable[[dict[str, Any]], None], Callable[[], None]]] = {}
+
+
+def register_cache(
+    name: str,
+    *,
+    apply: Callable[[dict[str, Any]], None],
+    clear: Callable[[], None],
+) -> None:
+    _caches[name] = (apply, clear)
+
+
+def publish_cache_invalidation(db: Session, name: str, message: dict[str, Any]) -> None:
+    """
+    `pg_notify` na transação corrente da sessão: os outros processos só
+    recebem no commit, e rollback não avisa ninguém. Não faz commit.
+    """
+
+    # sessão sem engine (testes unitários) não tem outros processos para avisar
+    if db.bind is None:
+        return
+
+    payload = json.dumps({"cache": name, **message}, default=str, separators=(",", ":"))
+    if len(payload.encode("utf-8")) > _MAX_PAYLOAD_BYTES:
+        payload = json.dumps({"cache": name, "all": True})
+
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CACHE_INVALIDATION_CHANNEL, "payload": payload},
+    )
+
+
+def apply_cache_notification(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+        apply, clear = _caches[message["cache"]]
+    except (ValueError, KeyError, TypeError):
+        clear_registered_caches()
+        return
+
+    if message.get("all"):
+        clear()
+        return
+    try:
+        apply(message)
+    except (ValueError, KeyError, TypeError):
+        clear()
+
+
+def clear_registered_caches() -> None:
+    for _apply, clear in _caches.values():
+        clear()
+
+
+async def run_cache_invalidation_listener(conninfo: str, *, stop_event: asyncio.Event) -> None:
+    """
+    Loop em background: `LISTEN` no canal de invalidação e aplica os avisos
+    nos caches registrados deste processo. A cada (re)conexão os caches são
+    zerados, porque os NOTIFY do período desconectado se perderam.
+    """
+
+    import psycopg
+
+    while not stop_event.is_set():
+        try:
+            async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+                await conn.execute(f"LISTEN {CACHE_INVALIDATION_CHANNEL}")
+                clear_registered_caches()
+                while not stop_event.is_set():
+                    async for notify in conn.notifies(timeout=1.0):
+                        apply_cache_notification(notify.payload)
+        except Exception as exc:  # o loop não pode morrer por causa de uma conexão
+            print(f"[cache-invalidation] listener caiu: {exc}")
+        finally:
+            clear_registered_caches()
+
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=_LISTENER_RETRY_SECONDS)
+        except TimeoutError:
+            pass
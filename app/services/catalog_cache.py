@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from cachetools import TTLCache
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.cache_invalidation import publish_cache_invalidation, register_cache
+
+CATALOG_COURTS = "courts"
+CATALOG_TEACHERS = "teachers"
+CATALOG_STUDENTS = "students"
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    rows: list[dict[str, Any]]
+    etag: str
+    last_modified: datetime
+
+
+def _fingerprint(rows: list[dict[str, Any]]) -> str:
+    raw = json.dumps(rows, default=str, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class CatalogCache:
+    """
+    Cache em memória (por processo) dos catálogos do admin.
+
+    - `invalidate_catalogs` derruba a entrada na hora, chamado pelos endpoints de
+      escrita, e avisa os outros processos pelo NOTIFY de `cache_invalidation`;
+    - `ttl_seconds` só limita a defasagem entre processos se o listener cair;
+    - o ETag é derivado do conteúdo, então processos diferentes com os mesmos
+      dados respondem o mesmo ETag.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self._entries: TTLCache[str, CatalogEntry] = TTLCache(maxsize=16, ttl=max(ttl_seconds, 1))
+        self._lock = threading.Lock()
+        self.enabled = ttl_seconds > 0
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Iterable[Any]],
+    ) -> CatalogEntry:
+        if self.enabled:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                return entry
+
+        rows = [dict(row) for row in loader()]
+        entry = CatalogEntry(
+            rows=rows,
+            etag=_fingerprint(rows),
+            last_modified=datetime.now(UTC).replace(microsecond=0),
+        )
+
+        if self.enabled:
+            with self._lock:
+                self._entries[key] = entry
+        return entry
+
+    def invalidate(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def combine_etag(entries: Iterable[CatalogEntry], *, salt: str = "") -> str:
+    digest = hashlib.sha256(salt.encode("utf-8"))
+    for entry in entries:
+        digest.update(entry.etag.encode("ascii"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+catalog_cache = CatalogCache(ttl_seconds=settings.catalog_cache_ttl_seconds)
+
+register_cache(
+    "catalogs",
+    apply=lambda message: catalog_cache.invalidate(*message["keys"]),
+    clear=catalog_cache.clear,
+)
+
+
+def invalidate_catalogs(db: Session, *keys: str) -> None:
+    """Derruba os catálogos neste processo e, no commit de `db`, nos demais."""
+
+    catalog_cache.invalidate(*keys)
+    publish_cache_invalidation(db, "catalogs", {"keys": list(keys)})
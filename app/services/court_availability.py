@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, time
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class CourtFreeSlot:
+    start_at: datetime
+    end_at: datetime
+    court_id: UUID
+    court_name: str
+
+
+BusyIntervals = dict[UUID, list[tuple[datetime, datetime]]]
+
+
+def _load_confirmed_intervals(
+    db: Session,
+    *,
+    owner_column: str,
+    range_start: datetime,
+    range_end: datetime,
+    owner_ids: Sequence[UUID] | None,
+) -> BusyIntervals:
+    params: dict[str, Any] = {"range_start": range_start, "range_end": range_end}
+    owner_where = ""
+    if owner_ids is not None:
+        if not owner_ids:
+            return {}
+        owner_where = f"AND e.{owner_column} IN :owner_ids"
+        params["owner_ids"] = list(owner_ids)
+
+    sql = text(
+        f"""
+        SELECT e.{owner_column} AS owner_id, e.start_at AS start_at, e.end_at AS end_at
+        FROM public.events e
+        WHERE e.status = 'confirmado'
+          AND e.{owner_column} IS NOT NULL
+          AND e.start_at < :range_end
+          AND e.end_at > :range_start
+          {owner_where}
+        ORDER BY e.{owner_column}, e.start_at
+        """
+    )
+    if owner_ids is not None:
+        sql = sql.bindparams(bindparam("owner_ids", expanding=True))
+
+    busy: BusyIntervals = {}
+    for row in db.execute(sql, params).mappings():
+        busy.setdefault(row["owner_id"], []).append((row["start_at"], row["end_at"]))
+
+    return {owner_id: merge_intervals(intervals) for owner_id, intervals in busy.items()}
+
+
+def load_confirmed_court_intervals(
+    db: Session,
+    *,
+    range_start: datetime,
+    range_end: datetime,
+    court_ids: Sequence[UUID] | None = None,
+) -> BusyIntervals:
+    """
+    Carrega, em uma única consulta, todos os eventos confirmados que cruzam
+    `[range_start, range_end)` e devolve os intervalos ocupados por quadra,
+    já ordenados e mesclados.
+
+    Usa o mesmo critério de `fn_quadras_disponiveis`: status `confirmado` e
+    sobreposição `start_at < to AND end_at > from`.
+    """
+
+    return _load_confirmed_intervals(
+        db,
+        owner_column="court_id",
+        range_start=range_start,
+        range_end=range_end,
+        owner_ids=court_ids,
+    )
+
+
+def load_confirmed_teacher_intervals(
+    db: Session,
+    *,
+    range_start: datetime,
+    range_end: datetime,
+    teacher_ids: Sequence[UUID] | None = None,
+) -> BusyIntervals:
+    """Equivalente a `load_confirmed_court_intervals`, agrupando por professor."""
+
+    return _load_confirmed_intervals(
+        db,
+        owner_column="teacher_id",
+        range_start=range_start,
+        range_end=range_end,
+        owner_ids=teacher_ids,
+    )
+
+
+def merge_intervals(
+    intervals: Iterable[tuple[datetime, datetime]],
+) -> list[tuple[datetime, datetime]]:
+    """Ordena e mescla intervalos semiabertos que se sobrepõem."""
+
+    merged: list[tuple[datetime, datetime]] = []
+    for start_at, end_at in sorted(intervals):
+        if merged and start_at < merged[-1][1]:
+            if end_at > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end_at)
+            continue
+        merged.append((start_at, end_at))
+    return merged
+
+
+def free_candidates_for_court(
+    candidates: Sequence[tuple[datetime, datetime]],
+    busy: Sequence[tuple[datetime, datetime]],
+) -> list[tuple[datetime, datetime]]:
+    """
+    Varredura ordenada: percorre candidatos e intervalos ocupados (ambos em
+    ordem crescente) avançando um único ponteiro sobre `busy`.
+
+    `busy` precisa estar ordenado e mesclado (ver `merge_intervals`).
+    """
+
+    free: list[tuple[datetime, datetime]] = []
+    index = 0
+    total_busy = len(busy)
+
+    for slot_start, slot_end in sorted(candidates):
+        while index < total_busy and busy[index][1] <= slot_start:
+            index += 1
+        if index < total_busy and busy[index][0] < slot_end:
+            continue
+        free.append((slot_start, slot_end))
+
+    return free
+
+
+def interval_is_free(
+    busy: Sequence[tuple[datetime, datetime]],
+    start_at: datetime,
+    end_at: datetime,
+) -> bool:
+    """Checa um único intervalo contra uma lista ordenada e mesclada de ocupações."""
+
+    index = bisect_right(busy, (start_at,)) - 1
+    if index >= 0 and busy[index][1] > start_at:
+        return False
+    index += 1
+    return not (index < len(busy) and busy[index][0] < end_at)
+
+
+def compute_free_court_slots(
+    *,
+    courts: Sequence[Mapping[str, Any]],
+    candidates: Sequence[tuple[datetime, datetime]],
+    busy_by_court: BusyIntervals,
+) -> list[CourtFreeSlot]:
+    """
+    Resolve em memória quais quadras estão livres para cada candidato.
+
+    `courts` precisa expor `court_id` e `court_name`. O resultado sai ordenado
+    por `(start_at, court_name)`, igual à ordem produzida pelo fluxo antigo.
+    """
+
+    slots: list[CourtFreeSlot] = []
+    ordered_candidates = sorted(set(candidates))
+
+    for court in courts:
+        court_id = court["court_id"]
+        court_name = court["court_name"]
+        for slot_start, slot_end in free_candidates_for_court(
+            ordered_candidates,
+            busy_by_court.get(court_id, []),
+        ):
+            slots.append(
+                CourtFreeSlot(
+                    start_at=slot_start,
+                    end_at=slot_end,
+                    court_id=court_id,
+                    court_name=court_name,
+                )
+            )
+
+    slots.sort(key=lambda item: (item.start_at, item.court_name))
+    return slots
+
+
+def list_free_court_grade(
+    db: Session,
+    *,
+    range_start: datetime,
+    range_end: datetime,
+    slot_minutes: int,
+    day_start: time,
+    day_end: time,
+    court_ids: Sequence[UUID] | None = None,
+) -> list[CourtFreeSlot]:
+    """
+    Grade completa de horários livres em uma única chamada a `fn_quadras_grade`.
+
+    Os slots são gerados por dia (horário de São Paulo) entre `day_start` e
+    `day_end` e só entram os que cabem inteiros em `[range_start, range_end)`.
+    """
+
+    rows = (
+        db.execute(
+            text(
+                """
+                SELECT slot_start, slot_end, court_id, court_name
+                FROM public.fn_quadras_grade(
+                  :p_from, :p_to, :p_slot_minutes, :p_day_start, :p_day_end
+                )
+                """
+            ),
+            {
+                "p_from": range_start,
+                "p_to": range_end,
+                "p_slot_minutes": slot_minutes,
+                "p_day_start": day_start,
+                "p_day_end": day_end,
+            },
+        )
+        .mappings()
+        .all()
+    )
+
+    allowed = set(court_ids) if court_ids is not None else None
+    return [
+        CourtFreeSlot(
+            start_at=row["slot_start"],
+            end_at=row["slot_end"],
+            court_id=row["court_id"],
+            court_name=row["court_name"],
+        )
+        for row in rows
+        if allowed is None or row["court_id"] in allowed
+    ]
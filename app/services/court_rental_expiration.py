@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+PUBLIC_RENTAL_EXPIRATION_NOTE = (
+    "Reserva pública expirada automaticamente por falta de pagamento dentro do prazo de 15 minutos."
+)
+
+# Chave fixa do advisory lock: só um sweeper roda por vez entre processos uvicorn.
+_SWEEP_ADVISORY_LOCK_KEY = 0x5EC0_2E47A1
+
+
+@dataclass
+class ExpirationSweepStats:
+    runs: int = 0
+    skipped_locked: int = 0
+    total_expired: int = 0
+    last_expired: int = 0
+    last_run_at: datetime | None = None
+    last_error: str | None = None
+
+
+sweep_stats = ExpirationSweepStats()
+
+
+def expire_overdue_public_pending_rentals(
+    db: Session,
+    *,
+    owner_user_id: UUID | None = None,
+) -> int:
+    """
+    Expira, em um único `UPDATE ... RETURNING`, as locações públicas ainda
+    aguardando pagamento cujo prazo já passou e cancela os eventos delas no
+    mesmo statement. Não faz commit.
+    """
+
+    params: dict[str, Any] = {"note": PUBLIC_RENTAL_EXPIRATION_NOTE}
+    owner_where = ""
+    if owner_user_id is not None:
+        owner_where = "AND cr.owner_user_id = :owner_user_id"
+        params["owner_user_id"] = owner_user_id
+
+    expired = db.execute(
+        text(
+            f"""
+            WITH expired AS (
+              UPDATE public.court_rentals cr
+              SET
+                status = 'cancelled',
+                payment_status = 'expired',
+                cancelled_at = now(),
+                updated_at = now(),
+                notes = CASE
+                  WHEN NULLIF(btrim(cr.notes), '') IS NULL THEN :note
+                  ELSE btrim(cr.notes) || E'\\n\\n' || :note
+                END
+              WHERE cr.status = 'awaiting_payment'
+                AND cr.payment_status = 'pending'
+                AND cr.payment_expires_at IS NOT NULL
+                AND cr.payment_expires_at <= now()
+                {owner_where}
+              RETURNING cr.id, cr.event_id
+            ),
+            cancelled_events AS (
+              UPDATE public.events e
+              SET status = 'cancelado'
+              FROM expired
+              WHERE e.id = expired.event_id
+              RETURNING e.id
+            )
+            SELECT count(*) FROM expired
+            """
+        ),
+        params,
+    ).scalar_one()
+
+    return int(expired or 0)
+
+
+def run_expiration_sweep(session_factory: Callable[[], Session]) -> int | None:
+    """
+    Executa uma rodada do sweeper. Retorna quantas locações expiraram ou
+    `None` quando outro processo já está com o lock.
+    """
+
+    with session_factory() as db:
+        locked = db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"),
+            {"key": _SWEEP_ADVISORY_LOCK_KEY},
+        ).scalar_one()
+        if not locked:
+            db.rollback()
+            sweep_stats.skipped_locked += 1
+            return None
+
+        expired = expire_overdue_public_pending_rentals(db)
+        db.commit()
+
+    sweep_stats.runs += 1
+    sweep_stats.last_expired = expired
+    sweep_stats.total_expired += expired
+    sweep_stats.last_run_at = datetime.now(UTC)
+    sweep_stats.last_error = None
+    return expired
+
+
+async def run_expiration_sweeper(
+    session_factory: Callable[[], Session],
+    *,
+    interval_seconds: float,
+    stop_event: asyncio.Event,
+) -> None:
+    """Loop em background: roda o sweep a cada `interval_seconds` até `stop_event`."""
+
+    while not stop_event.is_set():
+        try:
+            expired = await asyncio.to_thread(run_expiration_sweep, session_factory)
+            if expired:
+                print(f"[rental-expiration] {expired} locação(ões) pública(s) expirada(s)")
+        except Exception as exc:  # o loop não pode morrer por causa de uma rodada
+            sweep_stats.last_error = str(exc)
+            print(f"[rental-expiration] falha no sweep: {exc}")
+
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval_seconds)
+        except TimeoutError:
+            pass
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    result = run_expiration_sweep(SessionLocal)
+    if result is None:
+        print("[rental-expiration] outro processo está executando o sweep")
+    else:
+        print(f"[rental-expiration] {result} locação(ões) pública(s) expirada(s)")
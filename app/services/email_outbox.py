@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.email_sender import (
+    BaseEmailSender,
+    EmailAttachment,
+    InlineImage,
+    OutgoingEmail,
+)
+
+OUTBOX_COURT_RENTAL_CONFIRMATION = "court_rental_confirmation"
+OUTBOX_STUDENT_MAKEUP_REQUEST = "student_makeup_request"
+OUTBOX_TEACHER_AGENDA = "teacher_agenda"
+
+# Efeitos colaterais de um envio bem-sucedido, por categoria.
+_ON_SENT_SQL: dict[str, str] = {
+    OUTBOX_COURT_RENTAL_CONFIRMATION: """
+        UPDATE public.court_rentals
+        SET confirmation_email_sent_at = :sent_at
+        WHERE id = :reference_id
+    """,
+}
+
+# Mensagem presa em 'sending' por mais que isso (worker morreu) volta para a fila,
+# ou vai para 'failed' se já gastou todas as tentativas.
+_STALE_CLAIM_SECONDS = 600
+_BACKOFF_BASE_SECONDS = 30
+_BACKOFF_MAX_SECONDS = 3600
+
+
+def _encode_parts(parts: Sequence[InlineImage] | Sequence[EmailAttachment] | None) -> str:
+    encoded: list[dict[str, Any]] = []
+    for part in parts or ():
+        item = {
+            "content_type": part.content_type,
+            "filename": part.filename,
+            "data": base64.b64encode(part.data).decode("ascii"),
+        }
+        if isinstance(part, InlineImage):
+            item["cid"] = part.cid
+        encoded.append(item)
+    return json.dumps(encoded)
+
+
+def _decode_inline_images(raw: list[dict[str, Any]] | None) -> list[InlineImage]:
+    return [
+        InlineImage(
+            cid=item["cid"],
+            data=base64.b64decode(item["data"]),
+            content_type=item["content_type"],
+            filename=item.get("filename"),
+        )
+        for item in raw or ()
+    ]
+
+
+def _decode_attachments(raw: list[dict[str, Any]] | None) -> list[EmailAttachment]:
+    return [
+        EmailAttachment(
+            filename=item["filename"],
+            data=base64.b64decode(item["data"]),
+            content_type=item["content_type"],
+        )
+        for item in raw or ()
+    ]
+
+
+def enqueue_email(
+    db: Session,
+    *,
+    to_email: str,
+    subject: str,
+    text_body: str,
+    html_body: str | None = None,
+    inline_images: Sequence[InlineImage] | None = None,
+    attachments: Sequence[EmailAttachment] | None = None,
+    category: str | None = None,
+    reference_id: UUID | None = None,
+) -> UUID:
+    """Grava a mensagem no outbox dentro da transação corrente. Não faz commit."""
+
+    return db.execute(
+        text(
+            """
+            INSERT INTO public.email_outbox (
+              category, reference_id, to_email, subject, text_body, html_body,
+              inline_images, attachments
+            )
+            VALUES (
+              :category, :reference_id, :to_email, :subject, :text_body, :html_body,
+              CAST(:inline_images AS jsonb), CAST(:attachments AS jsonb)
+            )
+            RETURNING id
+            """
+        ),
+        {
+            "category": category,
+            "reference_id": reference_id,
+            "to_email": to_email,
+            "subject": subject,
+            "text_body": text_body,
+            "html_body": html_body,
+            "inline_images": _encode_parts(inline_images),
+            "attachments": _encode_parts(attachments),
+        },
+    ).scalar_one()
+
+
+class OutboxEmailSender(BaseEmailSender):
+    """
+    Sender que só enfileira: os templates de `BaseEmailSender` continuam
+    montando a mensagem e o `send_email` grava no outbox da sessão.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        *,
+        category: str | None = None,
+        reference_id: UUID | None = None,
+    ) -> None:
+        self.db = db
+        self.category = category
+        self.reference_id = reference_id
+
+    def send_email(
+        self,
+        *,
+        to_email: str,
+        subject: str,
+        text_body: str,
+        html_body: str | None = None,
+        inline_images: Sequence[InlineImage] | None = None,
+        attachments: Sequence[EmailAttachment] | None = None,
+    ) -> None:
+        enqueue_email(
+            self.db,
+            to_email=to_email,
+            subject=subject,
+            text_body=text_body,
+            html_body=html_body,
+            inline_images=inline_images,
+            attachments=attachments,
+            category=self.category,
+            reference_id=self.reference_id,
+        )
+
+
+def backoff_seconds(attempts: int) -> int:
+    """Espera antes da próxima tentativa: 30s, 60s, 120s... até 1h."""
+
+    return min(_BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), _BACKOFF_MAX_SECONDS)
+
+
+@dataclass
+class OutboxStats:
+    rounds: int = 0
+    total_sent: int = 0
+    total_failed: int = 0
+    last_run_at: datetime | None = None
+    last_error: str | None = None
+
+
+outbox_stats = OutboxStats()
+
+
+def _claim_batch(db: Session, *, batch_size: int, max_attempts: int) -> list[dict[str, Any]]:
+    # Preso em 'sending' sem tentativas sobrando (o worker morreu na última):
+    # vai para 'failed' em vez de ser reenviado.
+    db.execute(
+        text(
+            """
+            UPDATE public.email_outbox
+            SET status = 'failed',
+                last_error = 'envio interrompido na última tentativa',
+                updated_at = now()
+            WHERE status = 'sending'
+              AND claimed_at < now() - make_interval(secs => :stale_seconds)
+              AND attempts >= :max_attempts
+            """
+        ),
+        {"stale_seconds": _STALE_CLAIM_SECONDS, "max_attempts": max_attempts},
+    )
+    rows = (
+        db.execute(
+            text(
+                """
+                UPDATE public.email_outbox o
+                SET status = 'sending',
+                    claimed_at = now(),
+                    attempts = o.attempts + 1,
+                    updated_at = now()
+                WHERE o.id IN (
+                  SELECT q.id
+                  FROM public.email_outbox q
+                  WHERE (q.status = 'pending' AND q.next_attempt_at <= now())
+                     OR (
+                       q.status = 'sending'
+                       AND q.claimed_at < now() - make_interval(secs => :stale_seconds)
+                       AND q.attempts < :max_attempts
+                     )
+                  ORDER BY q.next_attempt_at
+                  LIMIT :batch_size
+                  FOR UPDATE SKIP LOCKED
+                )
+                RETURNING o.*
+                """
+            ),
+            {
+                "batch_size": batch_size,
+                "stale_seconds": _STALE_CLAIM_SECONDS,
+                "max_attempts": max_attempts,
+            },
+        )
+        .mappings()
+        .all()
+    )
+    db.commit()
+    return [dict(row) for row in rows]
+
+
+def _to_outgoing(message: dict[str, Any]) -> OutgoingEmail:
+    return OutgoingEmail(
+        to_email=message["to_email"],
+        subject=message["subject"],
+        text_body=message["text_body"],
+        html_body=message["html_body"],
+        inline_images=tuple(_decode_inline_images(message["inline_images"])),
+        attachments=tuple(_decode_attachments(message["attachments"])),
+    )
+
+
+def _record_result(
+    db: Session,
+    message: dict[str, Any],
+    error: str | None,
+    *,
+    max_attempts: int,
+) -> None:
+    if error is None:
+        sent_at = datetime.now(UTC)
+        db.execute(
+            text(
+                """
+                UPDATE public.email_outbox
+                SET status = 'sent', sent_at = :sent_at, last_error = NULL, updated_at = now()
+                WHERE id = :id
+                """
+            ),
+            {"id": message["id"], "sent_at": sent_at},
+        )
+        on_sent_sql = _ON_SENT_SQL.get(message["category"] or "")
+        if on_sent_sql and message["reference_id"] is not None:
+            db.execute(
+                text(on_sent_sql),
+                {"reference_id": message["reference_id"], "sent_at": sent_at},
+            )
+        return
+
+    exhausted = message["attempts"] >= max_attempts
+    db.execute(
+        text(
+            """
+            UPDATE public.email_outbox
+            SET status = :status,
+                last_error = :error,
+                next_attempt_at = now() + make_interval(secs => :delay),
+                updated_at = now()
+            WHERE id = :id
+            """
+        ),
+        {
+            "id": message["id"],
+            "status": "failed" if exhausted else "pending",
+            "error": error[:2000],
+            "delay": backoff_seconds(message["attempts"]),
+        },
+    )
+
+
+def deliver_pending_emails(
+    session_factory: Callable[[], Session],
+    sender: BaseEmailSender,
+    *,
+    batch_size: int,
+    max_attempts: int,
+) -> int:
+    """
+    Reserva um lote do outbox, envia com `sender.send_many` e grava o
+    resultado de cada mensagem. Retorna quantas mensagens foram reservadas.
+    """
+
+    with session_factory() as db:
+        batch = _claim_batch(db, batch_size=batch_size, max_attempts=max_attempts)
+    if not batch:
+        return 0
+
+    # o sender decide o paralelismo (SMTP: uma sessão do pool por thread)
+    errors = [
+        None if error is None else str(error)
+        for error in sender.send_many([_to_outgoing(message) for message in batch])
+    ]
+
+    with session_factory() as db:
+        for message, error in zip(batch, errors, strict=True):
+            _record_result(db, message, error, max_attempts=max_attempts)
+            if error is None:
+                outbox_stats.total_sent += 1
+            else:
+                print(
+                    f"[email-outbox] falha to={message['to_email']} id={message['id']} err={error}"
+                )
+                if message["attempts"] >= max_attempts:
+                    outbox_stats.total_failed += 1
+        db.commit()
+
+    return len(batch)
+
+
+def drain_outbox(
+    session_factory: Callable[[], Session],
+    sender: BaseEmailSender,
+    *,
+    batch_size: int,
+    max_attempts: int,
+) -> int:
+    """Roda lotes até a fila de mensagens prontas esvaziar."""
+
+    total = 0
+    while True:
+        claimed = deliver_pending_emails(
+            session_factory,
+            sender,
+            batch_size=batch_size,
+            max_attempts=max_attempts,
+        )
+        total += claimed
+        if claimed < batch_size:
+            break
+
+    outbox_stats.rounds += 1
+    outbox_stats.last_run_at = datetime.now(UTC)
+    outbox_stats.last_error = None
+    return total
+
+
+async def run_email_outbox_worker(
+    session_factory: Callable[[], Session],
+    sender_factory: Callable[[], BaseEmailSender],
+    *,
+    interval_seconds: float,
+    batch_size: int,
+    max_attempts: int,
+    stop_event: asyncio.Event,
+) -> None:
+    """Loop em background: drena o outbox a cada `interval_seconds` até `stop_event`."""
+
+    sender = sender_factory()
+    while not stop_event.is_set():
+        try:
+            await asyncio.to_thread(
+                drain_outbox,
+                session_factory,
+                sender,
+                batch_size=batch_size,
+                max_attempts=max_attempts,
+            )
+        except Exception as exc:  # o loop não pode morrer por causa de uma rodada
+            outbox_stats.last_error = str(exc)
+            print(f"[email-outbox] falha ao drenar o outbox: {exc}")
+
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval_seconds)
+        except TimeoutError:
+            pass
+
+
+if __name__ == "__main__":
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+    from app.services.email_sender import build_email_sender
+
+    delivered = drain_outbox(
+        SessionLocal,
+        build_email_sender(),
+        batch_size=settings.email_outbox_batch_size,
+        max_attempts=settings.email_outbox_max_attempts,
+    )
+    print(f"[email-outbox] {delivered} mensagem(ns) processada(s)")
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import smtplib
-from collections.abc import Sequence
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime
 from email.message import EmailMessage
@@ -10,6 +12,7 @@ from html import escape
 from typing import Protocol
 
 from app.core.config import settings
+from app.services.smtp_pool import SmtpConnectionPool
 
 
 @dataclass(frozen=True)
@@ -41,6 +44,16 @@ class EmailSendError(RuntimeError):
     pass
 
 
+@dataclass(frozen=True)
+class OutgoingEmail:
+    to_email: str
+    subject: str
+    text_body: str
+    html_body: str | None = None
+    inline_images: tuple[InlineImage, ...] = ()
+    attachments: tuple[EmailAttachment, ...] = ()
+
+
 class EmailSender(Protocol):
     def send_email(
         self,
@@ -125,6 +138,26 @@ class BaseEmailSender:
     ) -> None:
         raise NotImplementedError
 
+    def send_many(self, messages: Sequence[OutgoingEmail]) -> list[EmailSendError | None]:
+        """Envia um lote; devolve, na mesma ordem, o erro de cada mensagem (ou `None`)."""
+
+        results: list[EmailSendError | None] = []
+        for message in messages:
+            try:
+                self.send_email(
+                    to_email=message.to_email,
+                    subject=message.subject,
+                    text_body=message.text_body,
+                    html_body=message.html_body,
+                    inline_images=message.inline_images or None,
+                    attachments=message.attachments or None,
+                )
+            except Exception as exc:
+                results.append(exc if isinstance(exc, EmailSendError) else EmailSendError(str(exc)))
+            else:
+                results.append(None)
+        return results
+
     def send_verification_email(self, to_email: str, verify_link: str) -> None:
         subject = "Sócrates Tênis — Confirme seu e-mail"
         text_body = (
@@ -488,9 +521,11 @@ class ConsoleEmailSender(BaseEmailSender):
                 )
 
 
-class SmtpEmailSender(BaseEmailSender):
-    def __init__(self, cfg: SmtpConfig) -> None:
-        self.cfg = cfg
+class InMemoryEmailSender(BaseEmailSender):
+    """Guarda as mensagens em memória; usado nos testes no lugar do SMTP."""
+
+    def __init__(self) -> None:
+        self.sent: list[OutgoingEmail] = []
 
     def send_email(
         self,
@@ -502,6 +537,70 @@ class SmtpEmailSender(BaseEmailSender):
         inline_images: Sequence[InlineImage] | None = None,
         attachments: Sequence[EmailAttachment] | None = None,
     ) -> None:
+        self.sent.append(
+            OutgoingEmail(
+                to_email=to_email,
+                subject=subject,
+                text_body=text_body,
+                html_body=html_body,
+                inline_images=tuple(inline_images or ()),
+                attachments=tuple(attachments or ()),
+            )
+        )
+
+
+def connect_smtp(cfg: SmtpConfig, *, timeout: float = 20) -> smtplib.SMTP:
+    """Abre uma sessão SMTP já autenticada (STARTTLS ou SSL direto)."""
+
+    if cfg.use_tls:
+        smtp = smtplib.SMTP(cfg.host, cfg.port, timeout=timeout)
+        try:
+            smtp.ehlo()
+            smtp.starttls()
+            smtp.ehlo()
+            smtp.login(cfg.username, cfg.password)
+        except BaseException:
+            smtp.close()
+            raise
+        return smtp
+
+    smtp = smtplib.SMTP_SSL(cfg.host, cfg.port, timeout=timeout)
+    try:
+        smtp.login(cfg.username, cfg.password)
+    except BaseException:
+        smtp.close()
+        raise
+    return smtp
+
+
+class SmtpEmailSender(BaseEmailSender):
+    """
+    Sem `pool`, cada mensagem abre e fecha a própria sessão. Com `pool`, as
+    sessões autenticadas são reaproveitadas e `send_many` envia em paralelo
+    usando até `pool.size` sessões.
+    """
+
+    def __init__(
+        self,
+        cfg: SmtpConfig,
+        *,
+        pool: SmtpConnectionPool | None = None,
+        connect: Callable[[], smtplib.SMTP] | None = None,
+    ) -> None:
+        self.cfg = cfg
+        self.pool = pool
+        self._connect = connect or (lambda: connect_smtp(cfg))
+
+    def _build_message(
+        self,
+        *,
+        to_email: str,
+        subject: str,
+        text_body: str,
+        html_body: str | None = None,
+        inline_images: Sequence[InlineImage] | None = None,
+        attachments: Sequence[EmailAttachment] | None = None,
+    ) -> EmailMessage:
         msg = EmailMessage()
         msg["Subject"] = subject
         msg["From"] = self.cfg.mail_from
@@ -535,21 +634,100 @@ class SmtpEmailSender(BaseEmailSender):
                     filename=attachment.filename,
                 )
 
+        return msg
+
+    def send_email(
+        self,
+        *,
+        to_email: str,
+        subject: str,
+        text_body: str,
+        html_body: str | None = None,
+        inline_images: Sequence[InlineImage] | None = None,
+        attachments: Sequence[EmailAttachment] | None = None,
+    ) -> None:
+        msg = self._build_message(
+            to_email=to_email,
+            subject=subject,
+            text_body=text_body,
+            html_body=html_body,
+            inline_images=inline_images,
+            attachments=attachments,
+        )
+
         try:
-            if self.cfg.use_tls:
-                with smtplib.SMTP(self.cfg.host, self.cfg.port, timeout=20) as smtp:
-                    smtp.ehlo()
-                    smtp.starttls()
-                    smtp.ehlo()
-                    smtp.login(self.cfg.username, self.cfg.password)
-                    smtp.send_message(msg)
+            if self.pool is not None:
+                self.pool.send_message(msg)
             else:
-                with smtplib.SMTP_SSL(self.cfg.host, self.cfg.port, timeout=20) as smtp:
-                    smtp.login(self.cfg.username, self.cfg.password)
+                with self._connect() as smtp:
                     smtp.send_message(msg)
         except Exception as e:
             raise EmailSendError(f"Falha ao enviar e-mail: {e}") from e
 
+    def send_many(self, messages: Sequence[OutgoingEmail]) -> list[EmailSendError | None]:
+        if not messages:
+            return []
+
+        # sem pool compartilhado, o lote ainda reaproveita uma sessão só
+        pool = self.pool or SmtpConnectionPool(self._connect, size=1)
+
+        def send_one(message: OutgoingEmail) -> EmailSendError | None:
+            try:
+                pool.send_message(
+                    self._build_message(
+                        to_email=message.to_email,
+                        subject=message.subject,
+                        text_body=message.text_body,
+                        html_body=message.html_body,
+                        inline_images=message.inline_images,
+                        attachments=message.attachments,
+                    )
+                )
+            except Exception as e:
+                return EmailSendError(f"Falha ao enviar e-mail: {e}")
+            return None
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(pool.size, len(messages))) as executor:
+                return list(executor.map(send_one, messages))
+        finally:
+            if pool is not self.pool:
+                pool.close()
+
+
+_shared_smtp_pool: SmtpConnectionPool | None = None
+_shared_smtp_pool_lock = threading.Lock()
+
+
+def _get_shared_smtp_pool(cfg: SmtpConfig) -> SmtpConnectionPool:
+    global _shared_smtp_pool
+    with _shared_smtp_pool_lock:
+        if _shared_smtp_pool is None:
+            _shared_smtp_pool = SmtpConnectionPool(
+                lambda: connect_smtp(cfg),
+                size=settings.smtp_pool_size,
+                idle_timeout_seconds=settings.smtp_pool_idle_timeout_seconds,
+            )
+        return _shared_smtp_pool
+
+
+def build_email_sender() -> BaseEmailSender:
+    """Sender configurado em `settings.email_sender_backend`."""
+
+    if settings.email_sender_backend.lower() == "smtp":
+        cfg = SmtpConfig(
+            host=settings.smtp_host,
+            port=settings.smtp_port,
+            username=settings.smtp_username,
+            password=settings.smtp_password,
+            mail_from=settings.smtp_from,
+            use_tls=settings.smtp_use_tls,
+        )
+        if settings.smtp_pool_size <= 0:
+            return SmtpEmailSender(cfg)
+        return SmtpEmailSender(cfg, pool=_get_shared_smtp_pool(cfg))
+    return ConsoleEmailSender()
+
 
 def _format_email_datetime(value: datetime | date | None) -> str:
     if value is None:
@@ -0,0 +1,475 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import os
+import tempfile
+import threading
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import IO, Protocol
+from urllib.parse import quote, urlsplit
+
+import httpx
+from fastapi import UploadFile
+
+from app.core.config import settings
+
+STORAGE_ROOT = Path(__file__).resolve().parents[2] / "storage"
+STREAM_CHUNK_SIZE = 64 * 1024
+# uploads em andamento no backend local (limpos pelo GC se ficarem órfãos)
+INCOMING_DIR_NAME = ".incoming"
+
+# Comprovantes antigos gravaram `storage_path` relativo à raiz do projeto.
+_LEGACY_PATH_PREFIX = "storage/"
+
+
+class StorageError(RuntimeError):
+    pass
+
+
+class StorageObjectNotFound(StorageError):
+    pass
+
+
+class StorageLimitExceeded(StorageError):
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(f"Arquivo maior que o limite de {max_bytes} bytes.")
+        self.max_bytes = max_bytes
+
+
+class StorageEmptyUpload(StorageError):
+    pass
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    key: str
+    size: int
+    sha256: str
+    # conteúdo idêntico já existia na chave: nada foi gravado
+    deduplicated: bool = False
+
+
+class _ObjectWriter(Protocol):
+    def write(self, chunk: bytes) -> None: ...
+
+    def commit(self, key: str) -> None: ...
+
+    def abort(self) -> None: ...
+
+
+def content_addressed_key(prefix: str, sha256: str) -> str:
+    return f"{prefix}/{sha256[:2]}/{sha256}"
+
+
+def storage_key_from_path(storage_path: str) -> str:
+    return storage_path.removeprefix(_LEGACY_PATH_PREFIX).lstrip("/")
+
+
+def storage_path_for_key(key: str) -> str:
+    return f"{_LEGACY_PATH_PREFIX}{key}"
+
+
+async def iter_upload_chunks(
+    upload: UploadFile,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+class FileStorage:
+    """
+    Backend de arquivos com escrita em streaming.
+
+    As primitivas (`_open_writer`, `size`, `iter_range`, `delete`) são
+    síncronas; `save_stream`/`save_bytes` as chamam em threads para não
+    bloquear o event loop. O tamanho é validado e o SHA-256 calculado
+    durante a escrita, sem carregar o arquivo inteiro na memória.
+    """
+
+    def _open_writer(self) -> _ObjectWriter:
+        raise NotImplementedError
+
+    def size(self, key: str) -> int | None:
+        raise NotImplementedError
+
+    def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Bytes de `start` até `end` (inclusivo; `None` = até o fim)."""
+
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def touch(self, key: str) -> None:
+        """Marca o objeto como recém-usado (protege blobs reaproveitados do GC)."""
+
+    async def _write_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        *,
+        max_bytes: int | None,
+        key_for: Callable[[str], str],
+        skip_if_exists: bool,
+    ) -> StoredObject:
+        writer = await asyncio.to_thread(self._open_writer)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise StorageLimitExceeded(max_bytes)
+                digest.update(chunk)
+                await asyncio.to_thread(writer.write, chunk)
+
+            if size == 0:
+                raise StorageEmptyUpload("Arquivo vazio.")
+
+            sha256 = digest.hexdigest()
+            key = key_for(sha256)
+            if skip_if_exists and await asyncio.to_thread(self.size, key) is not None:
+                writer.abort()
+                await asyncio.to_thread(self.touch, key)
+                return StoredObject(key=key, size=size, sha256=sha256, deduplicated=True)
+            await asyncio.to_thread(writer.commit, key)
+        except BaseException:
+            writer.abort()
+            raise
+
+        return StoredObject(key=key, size=size, sha256=sha256)
+
+    async def save_stream(
+        self,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        *,
+        max_bytes: int | None = None,
+    ) -> StoredObject:
+        return await self._write_stream(
+            chunks,
+            max_bytes=max_bytes,
+            key_for=lambda _sha256: key,
+            skip_if_exists=False,
+        )
+
+    async def save_content_addressed(
+        self,
+        prefix: str,
+        chunks: AsyncIterable[bytes],
+        *,
+        max_bytes: int | None = None,
+    ) -> StoredObject:
+        """
+        Grava em `<prefix>/<sha[:2]>/<sha>`. Se o blob já existe, o upload é
+        descartado e o objeto existente é reaproveitado.
+        """
+
+        return await self._write_stream(
+            chunks,
+            max_bytes=max_bytes,
+            key_for=lambda sha256: content_addressed_key(prefix, sha256),
+            skip_if_exists=True,
+        )
+
+    async def save_bytes(self, key: str, data: bytes) -> StoredObject:
+        async def _single() -> AsyncIterator[bytes]:
+            yield data
+
+        return await self.save_stream(key, _single())
+
+
+class _LocalWriter:
+    def __init__(self, storage: LocalFileStorage) -> None:
+        self.storage = storage
+        # mesmo sistema de arquivos do destino: o commit é um rename atômico
+        self.tmp_path = storage.root / INCOMING_DIR_NAME / f"{uuid.uuid4().hex}.part"
+        self.tmp_path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle: IO[bytes] | None = self.tmp_path.open("wb")
+
+    def write(self, chunk: bytes) -> None:
+        assert self._handle is not None
+        self._handle.write(chunk)
+
+    def commit(self, key: str) -> None:
+        assert self._handle is not None
+        self._handle.close()
+        self._handle = None
+        path = self.storage.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self.tmp_path, path)
+
+    def abort(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self.tmp_path.unlink(missing_ok=True)
+
+
+class LocalFileStorage(FileStorage):
+    def __init__(self, root: Path = STORAGE_ROOT) -> None:
+        self.root = root.resolve()
+
+    def path_for(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root):
+            raise StorageError(f"Chave fora do storage: {key!r}")
+        return path
+
+    def _open_writer(self) -> _LocalWriter:
+        return _LocalWriter(self)
+
+    def size(self, key: str) -> int | None:
+        path = self.path_for(key)
+        return path.stat().st_size if path.is_file() else None
+
+    def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        path = self.path_for(key)
+        if not path.is_file():
+            raise StorageObjectNotFound(key)
+
+        with path.open("rb") as handle:
+            handle.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = handle.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str) -> None:
+        self.path_for(key).unlink(missing_ok=True)
+
+    def touch(self, key: str) -> None:
+        path = self.path_for(key)
+        if path.is_file():
+            os.utime(path)
+
+
+def _hmac_sha256(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+class _S3Writer:
+    def __init__(self, storage: S3CompatibleStorage) -> None:
+        self.storage = storage
+        # até 1 MB em memória; acima disso o spool vai para disco
+        self._buffer = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        self._size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self._buffer.write(chunk)
+        self._size += len(chunk)
+
+    def commit(self, key: str) -> None:
+        self._buffer.seek(0)
+
+        def _body() -> Iterator[bytes]:
+            while chunk := self._buffer.read(STREAM_CHUNK_SIZE):
+                yield chunk
+
+        try:
+            self.storage._request(
+                "PUT",
+                key,
+                headers={"Content-Length": str(self._size)},
+                content=_body(),
+            )
+        finally:
+            self._buffer.close()
+
+    def abort(self) -> None:
+        self._buffer.close()
+
+
+class S3CompatibleStorage(FileStorage):
+    """
+    Backend S3 (AWS, MinIO, R2...) via `httpx` com assinatura SigV4 e URLs
+    path-style (`/<bucket>/<key>`). O corpo vai como `UNSIGNED-PAYLOAD` para
+    o upload não precisar de uma segunda passada sobre o arquivo.
+    """
+
+    def __init__(
+        self,
+        *,
+        endpoint_url: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str = "us-east-1",
+        key_prefix: str = "",
+        timeout: float = 30.0,
+        client: httpx.Client | None = None,
+    ) -> None:
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.key_prefix = key_prefix.strip("/")
+        self._client = client or httpx.Client(timeout=timeout)
+
+    def _object_path(self, key: str) -> str:
+        full_key = f"{self.key_prefix}/{key}" if self.key_prefix else key
+        return f"/{self.bucket}/{full_key}"
+
+    def _signed_headers(self, method: str, path: str, headers: dict[str, str]) -> dict[str, str]:
+        now = datetime.now(UTC)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = now.strftime("%Y%m%d")
+
+        signed = {
+            **{name.lower(): value.strip() for name, value in headers.items()},
+            "host": urlsplit(self.endpoint_url).netloc,
+            "x-amz-content-sha256": "UNSIGNED-PAYLOAD",
+            "x-amz-date": amz_date,
+        }
+        signed.pop("content-length", None)
+        names = sorted(signed)
+        signed_header_names = ";".join(names)
+        canonical_request = "\n".join(
+            [
+                method,
+                quote(path, safe="/-_.~"),
+                "",
+                "".join(f"{name}:{signed[name]}\n" for name in names),
+                signed_header_names,
+                "UNSIGNED-PAYLOAD",
+            ]
+        )
+        scope = f"{date_stamp}/{self.region}/s3/aws4_request"
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+            ]
+        )
+
+        signing_key = _hmac_sha256(f"AWS4{self.secret_key}".encode(), date_stamp)
+        for part in (self.region, "s3", "aws4_request"):
+            signing_key = _hmac_sha256(signing_key, part)
+        signature = hmac.new(
+            signing_key, string_to_sign.encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+
+        return {
+            **headers,
+            "x-amz-content-sha256": "UNSIGNED-PAYLOAD",
+            "x-amz-date": amz_date,
+            "Authorization": (
+                f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+                f"SignedHeaders={signed_header_names}, Signature={signature}"
+            ),
+        }
+
+    def _request(
+        self,
+        method: str,
+        key: str,
+        *,
+        headers: dict[str, str] | None = None,
+        content: Iterator[bytes] | None = None,
+    ) -> httpx.Response:
+        path = self._object_path(key)
+        response = self._client.request(
+            method,
+            f"{self.endpoint_url}{quote(path, safe='/-_.~')}",
+            headers=self._signed_headers(method, path, headers or {}),
+            content=content,
+        )
+        if response.status_code == 404:
+            raise StorageObjectNotFound(key)
+        if response.status_code >= 300:
+            raise StorageError(f"S3 {method} {key} falhou com HTTP {response.status_code}.")
+        return response
+
+    def _open_writer(self) -> _S3Writer:
+        return _S3Writer(self)
+
+    def size(self, key: str) -> int | None:
+        try:
+            response = self._request("HEAD", key)
+        except StorageObjectNotFound:
+            return None
+        return int(response.headers["Content-Length"])
+
+    def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        path = self._object_path(key)
+        headers = {"Range": f"bytes={start}-{'' if end is None else end}"}
+        with self._client.stream(
+            "GET",
+            f"{self.endpoint_url}{quote(path, safe='/-_.~')}",
+            headers=self._signed_headers("GET", path, headers),
+        ) as response:
+            if response.status_code == 404:
+                raise StorageObjectNotFound(key)
+            if response.status_code >= 300:
+                raise StorageError(f"S3 GET {key} falhou com HTTP {response.status_code}.")
+            yield from response.iter_bytes(chunk_size)
+
+    def delete(self, key: str) -> None:
+        try:
+            self._request("DELETE", key)
+        except StorageObjectNotFound:
+            pass
+
+
+_shared_file_storage: FileStorage | None = None
+_shared_file_storage_lock = threading.Lock()
+
+
+def get_file_storage() -> FileStorage:
+    """Backend configurado em `settings.file_storage_backend` (compartilhado no processo)."""
+
+    global _shared_file_storage
+    with _shared_file_storage_lock:
+        if _shared_file_storage is None:
+            if settings.file_storage_backend.lower() == "s3":
+                _shared_file_storage = S3CompatibleStorage(
+                    endpoint_url=settings.file_storage_s3_endpoint_url,
+                    bucket=settings.file_storage_s3_bucket,
+                    access_key=settings.file_storage_s3_access_key,
+                    secret_key=settings.file_storage_s3_secret_key,
+                    region=settings.file_storage_s3_region,
+                    key_prefix=settings.file_storage_s3_key_prefix,
+                )
+            else:
+                _shared_file_storage = LocalFileStorage()
+        return _shared_file_storage
+
+
+# Imagens servidas por `/media` ficam sempre no disco local.
+media_storage = LocalFileStorage()
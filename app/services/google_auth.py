@@ -11,6 +11,7 @@ from app.models.student import Student
 from app.models.teacher import Teacher
 from app.models.user import User
 from app.models.user_identity import UserIdentity
+from app.services.user_access import invalidate_user_access
 
 GoogleProvider = Literal["google"]
 
@@ -106,6 +107,7 @@ class GoogleAuthService:
 
             if normalized_role != "admin" and user.role != "coach":
                 user.role = "coach"
+                invalidate_user_access(db, user.id)
                 changed = True
 
             if not getattr(user, "full_name", None) and teacher.full_name:
@@ -126,6 +128,7 @@ class GoogleAuthService:
 
             if normalized_role != "admin" and normalized_role != "coach" and user.role != "student":
                 user.role = "student"
+                invalidate_user_access(db, user.id)
                 changed = True
 
             if not getattr(user, "full_name", None) and student.full_name:
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, TypeVar
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Nome -> maior lado em px; da maior para a menor, cada uma sai da anterior.
+COURT_IMAGE_RENDITIONS: dict[str, int] = {
+    "full": 1600,
+    "card": 800,
+    "thumb": 320,
+}
+COURT_IMAGE_OUTPUT_QUALITY = 80
+
+
+class ImageProcessingError(ValueError):
+    """Imagem inválida ou que o Pillow não conseguiu decodificar."""
+
+
+class ImageProcessingBusy(RuntimeError):
+    """Fila de processamento de imagens cheia (ou pool reiniciado após queda de um worker)."""
+
+
+def _encode_webp(image: Image.Image, *, quality: int) -> bytes:
+    output = BytesIO()
+    target = image if "A" in image.getbands() else image.convert("RGB")
+    target.save(output, format="WEBP", quality=quality, method=6)
+    return output.getvalue()
+
+
+def build_webp_renditions(
+    file_bytes: bytes,
+    renditions: dict[str, int],
+    quality: int = COURT_IMAGE_OUTPUT_QUALITY,
+) -> dict[str, bytes]:
+    """
+    Decodifica a imagem uma única vez (com rotação EXIF) e gera um WEBP por
+    rendition. Roda dentro do processo do pool: precisa ficar no nível do
+    módulo e receber/devolver só tipos serializáveis.
+    """
+
+    try:
+        with Image.open(BytesIO(file_bytes)) as image:
+            current = ImageOps.exif_transpose(image)
+            if current.mode not in {"RGB", "RGBA"}:
+                current = current.convert("RGBA" if "A" in current.getbands() else "RGB")
+
+            output: dict[str, bytes] = {}
+            for name, max_dimension in sorted(
+                renditions.items(), key=lambda item: item[1], reverse=True
+            ):
+                current = current.copy()
+                current.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+                output[name] = _encode_webp(current, quality=quality)
+            return output
+    except (UnidentifiedImageError, OSError, ValueError) as exc:
+        raise ImageProcessingError(str(exc)) from exc
+
+
+class ImageProcessingPool:
+    """
+    `ProcessPoolExecutor` limitado para o trabalho de CPU com imagens, fora do
+    event loop. Acima de `max_pending` tarefas em andamento no processo, novas
+    chamadas falham com `ImageProcessingBusy` em vez de enfileirar sem limite.
+    """
+
+    def __init__(self, *, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ImageProcessingBusy("Fila de processamento de imagens cheia.")
+            self._pending += 1
+
+        executor = self._get_executor()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool as exc:
+            # um worker morreu (OOM, imagem hostil): o executor não serve mais;
+            # descarta para a próxima chamada subir outro
+            self._discard_executor(executor)
+            raise ImageProcessingBusy("Processamento de imagens reiniciado.") from exc
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+image_processing_pool = ImageProcessingPool(
+    max_workers=settings.image_processing_workers,
+    max_pending=settings.image_processing_max_pending,
+)
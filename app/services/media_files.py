@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from mimetypes import guess_type
+
+import anyio
+from cachetools import LRUCache
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.services.file_storage import INCOMING_DIR_NAME
+from app.services.payment_proof_storage import PAYMENT_PROOF_PREFIX
+
+# Nome com hash/uuid (≥16 hex) nunca é sobrescrito: pode ficar em cache "para sempre".
+_FINGERPRINT_RE = re.compile(r"[0-9a-f]{16,}", re.IGNORECASE)
+_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Variantes pré-comprimidas, na ordem de preferência.
+_PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Conteúdo privado que mora em storage/ mas só sai por endpoint autenticado.
+_PRIVATE_PREFIXES = (f"{PAYMENT_PROOF_PREFIX}/", f"{INCOMING_DIR_NAME}/")
+
+
+def is_fingerprinted(path: str) -> bool:
+    return bool(_FINGERPRINT_RE.search(os.path.basename(path)))
+
+
+def _may_have_precompressed_variant(path: str) -> bool:
+    # imagens já são comprimidas; SVG é texto e comprime bem
+    media_type = guess_type(path)[0] or ""
+    return not media_type.startswith("image/") or media_type == "image/svg+xml"
+
+
+def _accepted_encodings(request_headers: Headers) -> set[str]:
+    accepted: set[str] = set()
+    for part in request_headers.get("accept-encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in {"q=0", "q=0.0"}:
+            continue
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+class HotFileCache:
+    """LRU em memória (limitado por bytes) dos arquivos pequenos mais pedidos."""
+
+    def __init__(self, *, max_bytes: int, max_file_bytes: int) -> None:
+        self.max_file_bytes = max_file_bytes
+        self.enabled = max_bytes > 0 and max_file_bytes > 0
+        self._entries: LRUCache[tuple[str, int, int], bytes] = LRUCache(
+            maxsize=max(max_bytes, 1), getsizeof=len
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str, stat_result: os.stat_result) -> bytes | None:
+        key = (path, stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self.hits += 1
+            return data
+
+    def load(self, path: str, stat_result: os.stat_result) -> bytes:
+        """Lê do disco e guarda; a chave inclui mtime/tamanho, então arquivo trocado é relido."""
+
+        with open(path, "rb") as handle:
+            data = handle.read()
+        with self._lock:
+            self.misses += 1
+            if len(data) == stat_result.st_size:
+                self._entries[(path, stat_result.st_mtime_ns, stat_result.st_size)] = data
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class MediaFiles(StaticFiles):
+    """
+    `StaticFiles` para `/media` com:
+
+    - `Cache-Control: immutable` (1 ano) para nomes com hash e `max_age_seconds`
+      com revalidação por ETag para o resto;
+    - variantes `.br`/`.gz` geradas no build para o que não é imagem;
+    - LRU em memória para arquivos pequenos (thumbnails dos cards).
+
+    ETag, `If-None-Match` e `Range` continuam vindo do `StaticFiles`/`FileResponse`.
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: str | os.PathLike[str],
+        max_age_seconds: int = 300,
+        hot_cache: HotFileCache | None = None,
+    ) -> None:
+        super().__init__(directory=directory)
+        self.max_age_seconds = max_age_seconds
+        self.hot_cache = hot_cache
+
+    def _cache_control(self, path: str) -> str:
+        if is_fingerprinted(path):
+            return _IMMUTABLE_CACHE_CONTROL
+        return f"public, max-age={self.max_age_seconds}, must-revalidate"
+
+    def _precompressed_variant(
+        self,
+        full_path: str,
+        request_headers: Headers,
+    ) -> tuple[str, str, os.stat_result] | None:
+        accepted = _accepted_encodings(request_headers)
+        for encoding, suffix in _PRECOMPRESSED_ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            return full_path + suffix, encoding, variant_stat
+        return None
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        normalized = path.replace("\\", "/").lstrip("/")
+        if normalized.startswith(_PRIVATE_PREFIXES) or normalized.endswith(".part"):
+            raise HTTPException(status_code=404)
+
+        response = await super().get_response(path, scope)
+        response.headers.setdefault("cache-control", self._cache_control(path))
+
+        if (
+            self.hot_cache is None
+            or not self.hot_cache.enabled
+            or not isinstance(response, FileResponse)
+            or response.status_code != 200
+            or response.stat_result is None
+            or scope["method"] != "GET"
+            or "range" in Headers(scope=scope)
+            or response.stat_result.st_size > self.hot_cache.max_file_bytes
+        ):
+            return response
+
+        full_path = os.fspath(response.path)
+        data = self.hot_cache.get(full_path, response.stat_result)
+        if data is None:
+            data = await anyio.to_thread.run_sync(
+                self.hot_cache.load, full_path, response.stat_result
+            )
+
+        headers = {
+            name: value for name, value in response.headers.items() if name != "content-length"
+        }
+        return Response(data, status_code=200, headers=headers, media_type=response.media_type)
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        if not _may_have_precompressed_variant(os.fspath(full_path)):
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        variant = self._precompressed_variant(os.fspath(full_path), request_headers)
+        if variant is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers.setdefault("vary", "Accept-Encoding")
+            return response
+
+        variant_path, encoding, variant_stat = variant
+        response = FileResponse(
+            variant_path,
+            status_code=status_code,
+            stat_result=variant_stat,
+            media_type=guess_type(os.fspath(full_path))[0] or "application/octet-stream",
+            headers={"content-encoding": encoding, "vary": "Accept-Encoding"},
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
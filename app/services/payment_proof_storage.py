@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import AsyncIterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.file_storage import (
+    INCOMING_DIR_NAME,
+    FileStorage,
+    LocalFileStorage,
+    StoredObject,
+    storage_key_from_path,
+    storage_path_for_key,
+)
+
+PAYMENT_PROOF_PREFIX = "court_rental_payment_proofs"
+PAYMENT_PROOF_BLOB_PREFIX = f"{PAYMENT_PROOF_PREFIX}/blobs"
+PAYMENT_PROOF_MAX_BYTES = 10 * 1024 * 1024
+
+# Arquivo mais novo que isso pode ser de um upload cuja linha ainda não commitou.
+_GC_DEFAULT_MIN_AGE_SECONDS = 24 * 3600
+
+
+async def store_payment_proof_blob(
+    storage: FileStorage,
+    chunks: AsyncIterable[bytes],
+) -> StoredObject:
+    """
+    Grava o comprovante endereçado pelo SHA-256 do conteúdo. O mesmo recibo
+    enviado de novo (ou copiado para a locação remarcada) reaproveita o blob.
+    """
+
+    return await storage.save_content_addressed(
+        PAYMENT_PROOF_BLOB_PREFIX,
+        chunks,
+        max_bytes=PAYMENT_PROOF_MAX_BYTES,
+    )
+
+
+def payment_proof_storage_path(stored: StoredObject) -> str:
+    return storage_path_for_key(stored.key)
+
+
+@dataclass
+class PaymentProofGcResult:
+    scanned: int = 0
+    referenced: int = 0
+    removed: list[str] = field(default_factory=list)
+    skipped_recent: int = 0
+    freed_bytes: int = 0
+
+
+def collect_orphan_payment_proofs(
+    db: Session,
+    storage: LocalFileStorage,
+    *,
+    min_age_seconds: float = _GC_DEFAULT_MIN_AGE_SECONDS,
+    dry_run: bool = False,
+    now: float | None = None,
+) -> PaymentProofGcResult:
+    """
+    Remove de `storage/` os arquivos de comprovante sem nenhuma linha em
+    `court_rental_payment_proofs` (referência zero) e uploads interrompidos
+    em `.incoming/`. Só apaga arquivos mais velhos que `min_age_seconds`.
+    """
+
+    referenced_keys = {
+        storage_key_from_path(storage_path)
+        for storage_path in db.execute(
+            text("SELECT DISTINCT storage_path FROM public.court_rental_payment_proofs")
+        ).scalars()
+    }
+
+    now = time.time() if now is None else now
+    result = PaymentProofGcResult()
+    candidates = [
+        *(storage.root / PAYMENT_PROOF_PREFIX).rglob("*"),
+        *(storage.root / INCOMING_DIR_NAME).glob("*.part"),
+    ]
+
+    for path in candidates:
+        if not path.is_file():
+            continue
+        result.scanned += 1
+
+        key = path.relative_to(storage.root).as_posix()
+        if key in referenced_keys:
+            result.referenced += 1
+            continue
+
+        stat = path.stat()
+        if now - stat.st_mtime < min_age_seconds:
+            result.skipped_recent += 1
+            continue
+
+        result.removed.append(key)
+        result.freed_bytes += stat.st_size
+        if not dry_run:
+            path.unlink(missing_ok=True)
+
+    return result
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(
+        description="Remove comprovantes órfãos e QR Codes Pix sem uso do storage local."
+    )
+    parser.add_argument("--dry-run", action="store_true", help="só lista o que seria removido")
+    parser.add_argument(
+        "--min-age-hours",
+        type=float,
+        default=_GC_DEFAULT_MIN_AGE_SECONDS / 3600,
+        help="ignora arquivos mais novos que isso (padrão: 24)",
+    )
+    args = parser.parse_args()
+
+    from app.services.pix_artifacts import collect_stale_rental_pix_qr_pngs
+
+    with SessionLocal() as session:
+        gc_result = collect_orphan_payment_proofs(
+            session,
+            LocalFileStorage(),
+            min_age_seconds=args.min_age_hours * 3600,
+            dry_run=args.dry_run,
+        )
+        # QR Codes Pix de locações sem cobrança em aberto vão junto
+        qr_result = collect_stale_rental_pix_qr_pngs(session, dry_run=args.dry_run)
+
+    for removed_key in gc_result.removed:
+        print(f"[payment-proof-gc] {'removeria' if args.dry_run else 'removido'} {removed_key}")
+    print(
+        f"[payment-proof-gc] {gc_result.scanned} arquivo(s), {gc_result.referenced} referenciado(s), "
+        f"{len(gc_result.removed)} órfão(s), {gc_result.freed_bytes} bytes"
+    )
+    for removed_name in qr_result.removed:
+        print(f"[pix-qr-gc] {'removeria' if args.dry_run else 'removido'} {removed_name}")
+    print(
+        f"[pix-qr-gc] {qr_result.scanned} arquivo(s), {qr_result.kept} em uso, "
+        f"{len(qr_result.removed)} removível(is), {qr_result.freed_bytes} bytes"
+    )
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.pix_payload import generate_pix_payload
+
+PIX_QR_STORAGE_DIR = Path(__file__).resolve().parents[2] / "storage" / "court_rental_pix_qr"
+
+# PNG mais novo que isso pode ser de uma locação cuja linha ainda não commitou.
+_QR_GC_DEFAULT_MIN_AGE_SECONDS = 3600
+
+
+@lru_cache(maxsize=512)
+def _cached_pix_payload(
+    pix_key: str,
+    merchant_name: str,
+    merchant_city: str,
+    amount: Decimal | None,
+    txid: str | None,
+) -> str:
+    return generate_pix_payload(
+        pix_key=pix_key,
+        merchant_name=merchant_name,
+        merchant_city=merchant_city,
+        amount=amount,
+        txid=txid,
+    )
+
+
+def get_pix_payload(
+    *,
+    pix_key: str,
+    merchant_name: str,
+    merchant_city: str,
+    amount: Decimal | float | int | str | None = None,
+    txid: str | None = None,
+) -> str:
+    """
+    `generate_pix_payload` com LRU por (chave, valor, txid, recebedor).
+    Erros de validação (`PixPayloadError`) não ficam em cache.
+    """
+
+    normalized_amount = None if amount is None else Decimal(str(amount))
+    return _cached_pix_payload(pix_key, merchant_name, merchant_city, normalized_amount, txid)
+
+
+@lru_cache(maxsize=128)
+def render_pix_qr_png(payload: str) -> bytes | None:
+    """PNG do QR Code do payload; `None` quando o `qrcode` não está instalado."""
+
+    try:
+        import qrcode
+    except Exception:
+        return None
+
+    qr = qrcode.QRCode(border=1, box_size=6)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    image = qr.make_image(fill_color="black", back_color="white")
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def rental_pix_qr_path(rental_id: UUID, payload: str) -> Path:
+    # o hash do payload no nome invalida o arquivo quando valor/chave mudam
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    return PIX_QR_STORAGE_DIR / f"{rental_id}-{digest}.png"
+
+
+def ensure_rental_pix_qr_png(rental_id: UUID, payload: str) -> Path | None:
+    """
+    Garante o PNG do QR Code salvo ao lado da locação e devolve o caminho.
+    Gera só na primeira vez; e-mails reenviados e a rota de instruções
+    reaproveitam o arquivo.
+    """
+
+    path = rental_pix_qr_path(rental_id, payload)
+    if path.is_file():
+        return path
+
+    png = render_pix_qr_png(payload)
+    if png is None:
+        return None
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(png)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_rental_pix_qr_png(rental_id: UUID | None, payload: str) -> bytes | None:
+    if rental_id is None:
+        return render_pix_qr_png(payload)
+
+    path = ensure_rental_pix_qr_png(rental_id, payload)
+    return path.read_bytes() if path is not None else None
+
+
+@dataclass
+class PixQrGcResult:
+    scanned: int = 0
+    kept: int = 0
+    removed: list[str] = field(default_factory=list)
+    skipped_recent: int = 0
+    freed_bytes: int = 0
+
+
+def collect_stale_rental_pix_qr_pngs(
+    db: Session,
+    *,
+    min_age_seconds: float = _QR_GC_DEFAULT_MIN_AGE_SECONDS,
+    dry_run: bool = False,
+    now: float | None = None,
+) -> PixQrGcResult:
+    """
+    Remove os PNGs de QR Code de locações sem cobrança Pix em aberto
+    (canceladas, expiradas, pagas) e os de payloads antigos da mesma locação.
+    Se a rota de instruções pedir o QR de novo, o arquivo é gerado outra vez.
+    """
+
+    expected = {
+        rental_pix_qr_path(row["id"], row["pix_qr_code_payload"].strip()).name
+        for row in db.execute(
+            text(
+                """
+                SELECT id, pix_qr_code_payload
+                FROM public.court_rentals
+                WHERE payment_status IN ('pending', 'proof_sent', 'under_review')
+                  AND status NOT IN ('cancelled', 'rejected')
+                  AND NULLIF(btrim(pix_qr_code_payload), '') IS NOT NULL
+                """
+            )
+        ).mappings()
+    }
+
+    now = time.time() if now is None else now
+    result = PixQrGcResult()
+    candidates = sorted(PIX_QR_STORAGE_DIR.glob("*")) if PIX_QR_STORAGE_DIR.is_dir() else []
+
+    for path in candidates:
+        if not path.is_file():
+            continue
+        result.scanned += 1
+
+        if path.name in expected:
+            result.kept += 1
+            continue
+
+        stat = path.stat()
+        if now - stat.st_mtime < min_age_seconds:
+            result.skipped_recent += 1
+            continue
+
+        result.removed.append(path.name)
+        result.freed_bytes += stat.st_size
+        if not dry_run:
+            path.unlink(missing_ok=True)
+
+    return result
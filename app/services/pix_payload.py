@@ -91,15 +91,28 @@ def _additional_data_field(*, txid: str) -> str:
     return _field("62", _field("05", txid))
 
 
-def _crc16_ccitt_false(data: str) -> str:
-    crc = _CRC_INIT
-    for byte in data.encode("utf-8"):
-        crc ^= byte << 8
+def _build_crc16_table() -> tuple[int, ...]:
+    table: list[int] = []
+    for byte in range(256):
+        crc = byte << 8
         for _ in range(8):
             if crc & 0x8000:
                 crc = ((crc << 1) ^ _CRC_POLY) & 0xFFFF
             else:
                 crc = (crc << 1) & 0xFFFF
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_TABLE = _build_crc16_table()
+
+
+def _crc16_ccitt_false(data: str) -> str:
+    # Tabela de 256 entradas: um lookup por byte em vez de 8 deslocamentos.
+    crc = _CRC_INIT
+    table = _CRC16_TABLE
+    for byte in data.encode("utf-8"):
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
     return f"{crc:04X}"
 
 
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import smtplib
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.message import EmailMessage
+
+
+@dataclass
+class SmtpPoolStats:
+    opened: int = 0
+    reused: int = 0
+    discarded: int = 0
+    reconnects: int = 0
+
+
+@dataclass
+class _PooledConnection:
+    smtp: smtplib.SMTP
+    last_used_at: float
+
+
+def _is_dropped_session(exc: BaseException) -> bool:
+    if isinstance(exc, smtplib.SMTPServerDisconnected | ConnectionError):
+        return True
+    # 421: o servidor está encerrando o canal (timeout/limite de sessão)
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code == 421
+
+
+class SmtpConnectionPool:
+    """
+    Mantém até `size` sessões SMTP já autenticadas para reaproveitar entre envios.
+
+    - sessão ociosa há mais de `idle_timeout_seconds` é fechada e reaberta;
+    - sessão ociosa há mais de `health_check_after_seconds` passa por um `NOOP`
+      antes de ser entregue;
+    - se o servidor derrubar a sessão no meio do envio, a mensagem é reenviada
+      uma vez em uma sessão nova.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], smtplib.SMTP],
+        *,
+        size: int = 4,
+        idle_timeout_seconds: float = 60.0,
+        health_check_after_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.size = max(1, size)
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.health_check_after_seconds = health_check_after_seconds
+        self.stats = SmtpPoolStats()
+        self._connect = connect
+        self._clock = clock
+        self._idle: deque[_PooledConnection] = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _open(self) -> _PooledConnection:
+        smtp = self._connect()
+        with self._lock:
+            self.stats.opened += 1
+        return _PooledConnection(smtp=smtp, last_used_at=self._clock())
+
+    def _discard(self, conn: _PooledConnection) -> None:
+        with self._lock:
+            self.stats.discarded += 1
+        try:
+            conn.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.smtp.close()
+
+    def _is_alive(self, conn: _PooledConnection) -> bool:
+        try:
+            code, _ = conn.smtp.noop()
+        except (smtplib.SMTPException, OSError):
+            return False
+        return code == 250
+
+    def _checkout(self) -> _PooledConnection:
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._open()
+
+            idle_for = self._clock() - conn.last_used_at
+            if idle_for > self.idle_timeout_seconds:
+                self._discard(conn)
+                continue
+            if idle_for > self.health_check_after_seconds and not self._is_alive(conn):
+                self._discard(conn)
+                continue
+
+            with self._lock:
+                self.stats.reused += 1
+            return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        self._slots.acquire()
+        conn: _PooledConnection | None = None
+        try:
+            conn = self._checkout()
+            yield conn.smtp
+        except BaseException:
+            # estado da sessão desconhecido depois de uma falha: não volta ao pool
+            if conn is not None:
+                self._discard(conn)
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                conn.last_used_at = self._clock()
+                with self._lock:
+                    self._idle.append(conn)
+            self._slots.release()
+
+    def send_message(self, msg: EmailMessage) -> None:
+        try:
+            with self.connection() as smtp:
+                smtp.send_message(msg)
+        except Exception as exc:
+            if not _is_dropped_session(exc):
+                raise
+            with self._lock:
+                self.stats.reconnects += 1
+            with self.connection() as smtp:
+                smtp.send_message(msg)
+
+    def close(self) -> None:
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn in idle:
+            self._discard(conn)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+from uuid import UUID
+
+from cachetools import TTLCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.court_rental import CourtRental
+from app.services.cache_invalidation import publish_cache_invalidation, register_cache
+
+_SESSION_PENDING_KEY = "student_home_invalidations"
+_ALL = "*"
+
+
+class StudentHomeCache:
+    """
+    Cache por processo das seções da home do aluno (turmas, locações).
+
+    - chave = (aluno, usuário): as locações também são buscadas pelo usuário;
+    - escritas em matrícula/horário/turma derrubam tudo (colegas e horários
+      aparecem na home de todos da turma); locações derrubam só os donos;
+    - os demais processos recebem a invalidação pelo NOTIFY de `cache_invalidation`;
+      `ttl_seconds` só limita a defasagem se o listener cair.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self._entries: TTLCache[tuple[str, str], dict[str, Any]] = TTLCache(
+            maxsize=2048, ttl=max(ttl_seconds, 1)
+        )
+        self._lock = threading.Lock()
+        self.enabled = ttl_seconds > 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(
+        self,
+        student_id: UUID | str,
+        user_id: UUID | str,
+        loader: Callable[[], dict[str, Any]],
+    ) -> dict[str, Any]:
+        key = (str(student_id), str(user_id))
+        if self.enabled:
+            with self._lock:
+                sections = self._entries.get(key)
+                if sections is not None:
+                    self.hits += 1
+                    return sections
+
+        sections = loader()
+        if self.enabled:
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = sections
+        return sections
+
+    def invalidate(
+        self,
+        *,
+        student_ids: Iterable[UUID | str | None] = (),
+        user_ids: Iterable[UUID | str | None] = (),
+    ) -> None:
+        students = {str(value) for value in student_ids if value is not None}
+        users = {str(value) for value in user_ids if value is not None}
+        if not students and not users:
+            return
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in students or k[1] in users]:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+student_home_cache = StudentHomeCache(ttl_seconds=settings.student_home_cache_ttl_seconds)
+
+register_cache(
+    "student_home",
+    apply=lambda message: student_home_cache.invalidate(
+        student_ids=message["students"], user_ids=message["users"]
+    ),
+    clear=student_home_cache.clear,
+)
+
+
+def invalidate_student_home(
+    db: Session | None,
+    *,
+    student_ids: Iterable[UUID | str | None] = (),
+    user_ids: Iterable[UUID | str | None] = (),
+    everyone: bool = False,
+) -> None:
+    """
+    Derruba a home em cache dos alunos afetados. Com sessão, a invalidação
+    só é aplicada depois do commit (antes disso outra requisição ainda
+    recarregaria os dados antigos) e vai para os outros processos pelo
+    NOTIFY da mesma transação; sem sessão, é imediata e só neste processo.
+    """
+
+    if db is None:
+        if everyone:
+            student_home_cache.clear()
+        else:
+            student_home_cache.invalidate(student_ids=student_ids, user_ids=user_ids)
+        return
+
+    pending: dict[str, set[str]] = db.info.setdefault(
+        _SESSION_PENDING_KEY, {"students": set(), "users": set()}
+    )
+    if everyone:
+        pending["students"].add(_ALL)
+    pending["students"].update(str(value) for value in student_ids if value is not None)
+    pending["users"].update(str(value) for value in user_ids if value is not None)
+
+
+@event.listens_for(Session, "before_commit")
+def _publish_pending_invalidations(session: Session) -> None:
+    pending = session.info.get(_SESSION_PENDING_KEY)
+    if not pending:
+        return
+    if _ALL in pending["students"]:
+        publish_cache_invalidation(session, "student_home", {"all": True})
+        return
+    publish_cache_invalidation(
+        session,
+        "student_home",
+        {"students": sorted(pending["students"]), "users": sorted(pending["users"])},
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_invalidations(session: Session) -> None:
+    pending = session.info.pop(_SESSION_PENDING_KEY, None)
+    if not pending:
+        return
+    if _ALL in pending["students"]:
+        student_home_cache.clear()
+        return
+    student_home_cache.invalidate(student_ids=pending["students"], user_ids=pending["users"])
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_invalidations(session: Session, previous_transaction) -> None:
+    # rollback de savepoint não desfaz o que veio antes dele na transação
+    if previous_transaction.parent is None:
+        session.info.pop(_SESSION_PENDING_KEY, None)
+
+
+@event.listens_for(CourtRental, "after_insert")
+@event.listens_for(CourtRental, "after_update")
+def _court_rental_written(_mapper, _connection, rental: CourtRental) -> None:
+    # toda escrita de locação pelo ORM (agendar, pagar, cancelar, remarcar...)
+    invalidate_student_home(
+        object_session(rental),
+        student_ids=[rental.customer_student_id],
+        user_ids=[rental.customer_user_id, rental.user_id],
+    )
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Eventos reprojetados por chamada de `fn_refresh_teacher_agenda_items` no rebuild.
+_REBUILD_BATCH_SIZE = 1000
+
+
+def build_teacher_agenda_item(row: Mapping[str, Any]) -> dict[str, Any]:
+    """Linha de `teacher_agenda_items` -> item de `TeacherAgendaWeekItemOut`."""
+
+    item = dict(row)
+    item.pop("refreshed_at", None)
+
+    event_created_at = item.get("event_created_at")
+    event_updated_at = item.get("event_updated_at")
+    has_schedule_change = bool(
+        event_created_at and event_updated_at and event_updated_at > event_created_at
+    )
+
+    class_group_students = [
+        {
+            "student_id": UUID(str(student["student_id"])),
+            "student_name": str(student.get("student_name") or "").strip(),
+        }
+        for student in item.get("class_group_students") or []
+        if student.get("student_id") and str(student.get("student_name") or "").strip()
+    ]
+
+    item.update(
+        has_schedule_change=has_schedule_change,
+        schedule_changed_at=event_updated_at if has_schedule_change else None,
+        class_group_students=class_group_students,
+        class_group_student_names=[student["student_name"] for student in class_group_students],
+    )
+    return item
+
+
+def load_teacher_agenda_items(
+    db: Session,
+    *,
+    teacher_id: UUID,
+    window_start: datetime,
+    window_end: datetime,
+) -> list[dict[str, Any]]:
+    """Agenda do professor na janela: um range scan em `(teacher_id, start_at)`."""
+
+    rows = (
+        db.execute(
+            text(
+                """
+                SELECT
+                  event_id,
+                  kind,
+                  status,
+                  start_at,
+                  end_at,
+                  notes,
+                  event_created_at,
+                  event_updated_at,
+                  court_id,
+                  court_name,
+                  teacher_id,
+                  teacher_name,
+                  student_id,
+                  student_name,
+                  class_group_id,
+                  class_group_name,
+                  class_group_students,
+                  teacher_event_report_id,
+                  teacher_event_report_status,
+                  teacher_event_issue_type
+                FROM public.teacher_agenda_items
+                WHERE teacher_id = :teacher_id
+                  AND start_at < :window_end
+                  AND end_at >= :window_start
+                ORDER BY
+                  start_at,
+                  end_at,
+                  event_id
+                """
+            ),
+            {
+                "teacher_id": teacher_id,
+                "window_start": window_start,
+                "window_end": window_end,
+            },
+        )
+        .mappings()
+        .all()
+    )
+    return [build_teacher_agenda_item(row) for row in rows]
+
+
+def rebuild_teacher_agenda_items(
+    db: Session,
+    *,
+    teacher_id: UUID | None = None,
+    batch_size: int = _REBUILD_BATCH_SIZE,
+) -> int:
+    """
+    Reprojeta `teacher_agenda_items` a partir de `events` (backfill ou
+    correção depois de escrita feita com os triggers desligados). Inclui os
+    itens já projetados, para que eventos sem professor saiam da tabela.
+    Não faz commit.
+    """
+
+    event_ids = list(
+        db.execute(
+            text(
+                """
+                SELECT id
+                FROM public.events
+                WHERE teacher_id IS NOT NULL
+                  AND (CAST(:teacher_id AS uuid) IS NULL OR teacher_id = :teacher_id)
+                UNION
+                SELECT event_id
+                FROM public.teacher_agenda_items
+                WHERE CAST(:teacher_id AS uuid) IS NULL OR teacher_id = :teacher_id
+                """
+            ),
+            {"teacher_id": teacher_id},
+        ).scalars()
+    )
+
+    batch_size = max(batch_size, 1)
+    refreshed = 0
+    for offset in range(0, len(event_ids), batch_size):
+        refreshed += int(
+            db.execute(
+                text("SELECT public.fn_refresh_teacher_agenda_items(CAST(:event_ids AS uuid[]))"),
+                {"event_ids": event_ids[offset : offset + batch_size]},
+            ).scalar_one()
+        )
+    return refreshed
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(
+        description="Reconstrói a projeção teacher_agenda_items a partir de events."
+    )
+    parser.add_argument("--teacher-id", type=UUID, default=None, help="só um professor")
+    parser.add_argument("--batch-size", type=int, default=_REBUILD_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        total = rebuild_teacher_agenda_items(
+            session,
+            teacher_id=args.teacher_id,
+            batch_size=args.batch_size,
+        )
+        session.commit()
+
+    print(f"[teacher-agenda-items] {total} item(ns) reprojetado(s)")
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+_LOCAL_TZ = ZoneInfo("America/Sao_Paulo")
+
+
+@dataclass(frozen=True)
+class TeacherAvailabilityRow:
+    teacher_id: UUID
+    teacher_name: str
+    available: list[bool]
+
+
+@dataclass(frozen=True)
+class TeacherAvailabilityGrid:
+    slots: list[tuple[datetime, datetime]]
+    teachers: list[TeacherAvailabilityRow]
+
+
+def build_slot_grid(
+    *,
+    range_start: datetime,
+    range_end: datetime,
+    slot_minutes: int,
+    day_start: time,
+    day_end: time,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Gera os intervalos diários (horário de São Paulo) entre `day_start` e
+    `day_end`, mantendo apenas os que cabem inteiros em `[range_start, range_end)`.
+    """
+
+    slot_delta = timedelta(minutes=slot_minutes)
+    first_day = range_start.astimezone(_LOCAL_TZ).date()
+    last_day = range_end.astimezone(_LOCAL_TZ).date()
+
+    intervals: list[tuple[datetime, datetime]] = []
+    current_day = first_day
+    while current_day <= last_day:
+        slot_start = datetime.combine(current_day, day_start, tzinfo=_LOCAL_TZ)
+        window_end = datetime.combine(current_day, day_end, tzinfo=_LOCAL_TZ)
+        while slot_start + slot_delta <= window_end:
+            slot_end = slot_start + slot_delta
+            if slot_start >= range_start and slot_end <= range_end:
+                intervals.append((slot_start, slot_end))
+            slot_start = slot_end
+        current_day += timedelta(days=1)
+
+    return intervals
+
+
+def resolve_teacher_availability(
+    db: Session,
+    *,
+    intervals: Sequence[tuple[datetime, datetime]],
+    modality: str | None = None,
+    court_id: UUID | None = None,
+) -> TeacherAvailabilityGrid:
+    """
+    Matriz professor × intervalo com as regras de `fn_professores_disponiveis_v2`,
+    resolvida por `fn_professores_disponiveis_lote` em uma única chamada.
+
+    Todos os professores ativos aparecem na matriz, mesmo sem nenhum horário livre.
+    """
+
+    slots = sorted(set(intervals))
+    teacher_rows = (
+        db.execute(
+            text(
+                """
+                SELECT t.id AS teacher_id, t.full_name AS teacher_name
+                FROM public.teachers t
+                WHERE t.is_active = true
+                ORDER BY t.full_name
+                """
+            )
+        )
+        .mappings()
+        .all()
+    )
+
+    if not slots or not teacher_rows:
+        return TeacherAvailabilityGrid(
+            slots=slots,
+            teachers=[
+                TeacherAvailabilityRow(
+                    teacher_id=row["teacher_id"],
+                    teacher_name=row["teacher_name"],
+                    available=[False] * len(slots),
+                )
+                for row in teacher_rows
+            ],
+        )
+
+    available_rows = db.execute(
+        text(
+            """
+            SELECT slot_start, slot_end, teacher_id
+            FROM public.fn_professores_disponiveis_lote(
+              CAST(:p_starts AS timestamptz[]),
+              CAST(:p_ends AS timestamptz[]),
+              :p_modality,
+              :p_court_id
+            )
+            """
+        ),
+        {
+            "p_starts": [slot_start for slot_start, _ in slots],
+            "p_ends": [slot_end for _, slot_end in slots],
+            "p_modality": modality,
+            "p_court_id": court_id,
+        },
+    ).mappings()
+
+    slot_index = {slot: index for index, slot in enumerate(slots)}
+    matrix: dict[UUID, list[bool]] = {
+        row["teacher_id"]: [False] * len(slots) for row in teacher_rows
+    }
+    for row in available_rows:
+        index = slot_index.get((row["slot_start"], row["slot_end"]))
+        teacher_slots = matrix.get(row["teacher_id"])
+        if index is None or teacher_slots is None:
+            continue
+        teacher_slots[index] = True
+
+    return TeacherAvailabilityGrid(
+        slots=slots,
+        teachers=[
+            TeacherAvailabilityRow(
+                teacher_id=row["teacher_id"],
+                teacher_name=row["teacher_name"],
+                available=matrix[row["teacher_id"]],
+            )
+            for row in teacher_rows
+        ],
+    )
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# O dia do contador é o dia local, como na migração que criou a tabela.
+_LOCAL_TIMEZONE = ZoneInfo("America/Sao_Paulo")
+
+
+def trial_identity_key_hash(kind: str, value: str | None) -> str | None:
+    """Mesmo hash de `fn_trial_identity_key_hash` no banco (valor já normalizado)."""
+
+    if not value:
+        return None
+    return hashlib.sha256(f"{kind}:{value}".encode()).hexdigest()
+
+
+def trial_identity_key_hashes(email: str | None, whatsapp: str | None) -> list[str]:
+    """Chaves de `trial_lesson_identity_keys` para email (minúsculo) e whatsapp (dígitos)."""
+
+    return [
+        key_hash
+        for key_hash in (
+            trial_identity_key_hash("email", email),
+            trial_identity_key_hash("whatsapp", whatsapp),
+        )
+        if key_hash
+    ]
+
+
+def increment_trial_occurrence_count(
+    db: Session,
+    control_id: UUID,
+    occurrence_type: str,
+    *,
+    occurred_at: datetime | None = None,
+) -> None:
+    """Soma 1 no contador diário do controle. Não faz commit."""
+
+    occurred_at = occurred_at or datetime.now(_LOCAL_TIMEZONE)
+    db.execute(
+        text(
+            """
+            INSERT INTO public.trial_lesson_occurrence_daily_counts (
+              control_id,
+              occurrence_type,
+              occurrence_day,
+              total
+            )
+            VALUES (
+              :control_id,
+              :occurrence_type,
+              :occurrence_day,
+              1
+            )
+            ON CONFLICT (control_id, occurrence_type, occurrence_day)
+            DO UPDATE SET total = public.trial_lesson_occurrence_daily_counts.total + 1
+            """
+        ),
+        {
+            "control_id": control_id,
+            "occurrence_type": occurrence_type,
+            "occurrence_day": occurred_at.astimezone(_LOCAL_TIMEZONE).date(),
+        },
+    )
+
+
+def count_recent_trial_occurrences(
+    db: Session,
+    control_id: UUID,
+    occurrence_types: Iterable[str],
+    *,
+    days: int,
+    today: date | None = None,
+) -> dict[str, int]:
+    """
+    Ocorrências do controle por tipo nos últimos `days` dias (em dias
+    locais inteiros): no máximo `days + 1` linhas por tipo, lidas pela PK.
+    """
+
+    occurrence_types = list(occurrence_types)
+    today = today or datetime.now(_LOCAL_TIMEZONE).date()
+    rows = db.execute(
+        text(
+            """
+            SELECT occurrence_type, SUM(total) AS total
+            FROM public.trial_lesson_occurrence_daily_counts
+            WHERE control_id = :control_id
+              AND occurrence_type = ANY(:occurrence_types)
+              AND occurrence_day >= :since_day
+            GROUP BY occurrence_type
+            """
+        ),
+        {
+            "control_id": control_id,
+            "occurrence_types": occurrence_types,
+            "since_day": today - timedelta(days=days),
+        },
+    ).all()
+
+    counts = dict.fromkeys(occurrence_types, 0)
+    for occurrence_type, total in rows:
+        counts[occurrence_type] = int(total or 0)
+    return counts
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from uuid import UUID
+
+from cachetools import TTLCache
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+_SESSION_MEMO_KEY = "current_user_access"
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    id: UUID
+    email: str | None
+    role: str
+    is_active: bool
+
+    @property
+    def normalized_role(self) -> str:
+        return (self.role or "").strip().lower()
+
+    @property
+    def is_admin(self) -> bool:
+        return self.normalized_role.startswith("admin")
+
+    @property
+    def is_teacher(self) -> bool:
+        return self.normalized_role == "coach"
+
+    @property
+    def is_student(self) -> bool:
+        return self.normalized_role in {"student", "aluno"}
+
+
+class UserAccessCache:
+    """
+    Cache por processo do acesso (papel/ativo) dos usuários autenticados.
+
+    - só usuários ativos entram no cache: ativar uma conta vale na hora;
+    - desativação/troca de papel chamam `invalidate`; nos demais processos a
+      defasagem fica limitada a `ttl_seconds`.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self._entries: TTLCache[str, CurrentUser] = TTLCache(maxsize=4096, ttl=max(ttl_seconds, 1))
+        self._lock = threading.Lock()
+        self.enabled = ttl_seconds > 0
+
+    def get(self, user_id: str) -> CurrentUser | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._entries.get(user_id)
+
+    def put(self, user: CurrentUser) -> None:
+        if not self.enabled or not user.is_active:
+            return
+        with self._lock:
+            self._entries[str(user.id)] = user
+
+    def invalidate(self, *user_ids: UUID | str) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_access_cache = UserAccessCache(ttl_seconds=settings.user_access_cache_ttl_seconds)
+
+
+def load_current_user(db: Session, user_id: UUID | str) -> CurrentUser | None:
+    """
+    Carrega o usuário autenticado uma única vez por sessão (= por requisição),
+    passando antes pelo cache de processo.
+    """
+
+    key = str(user_id)
+    memo: dict[str, CurrentUser | None] = db.info.setdefault(_SESSION_MEMO_KEY, {})
+    if key in memo:
+        return memo[key]
+
+    user = user_access_cache.get(key)
+    if user is None:
+        row = (
+            db.execute(
+                text(
+                    """
+                    SELECT id, email, role, is_active
+                    FROM public.users
+                    WHERE id = :user_id
+                    """
+                ),
+                {"user_id": key},
+            )
+            .mappings()
+            .first()
+        )
+        if row is not None:
+            user = CurrentUser(
+                id=UUID(str(row["id"])),
+                email=row["email"],
+                role=str(row["role"] or ""),
+                is_active=bool(row["is_active"]),
+            )
+            user_access_cache.put(user)
+
+    memo[key] = user
+    return user
+
+
+def invalidate_user_access(db: Session | None, *user_ids: UUID | str) -> None:
+    """Derruba o acesso em cache depois de ativar/desativar ou trocar o papel."""
+
+    user_access_cache.invalidate(*user_ids)
+    if db is not None:
+        memo = db.info.get(_SESSION_MEMO_KEY)
+        if memo:
+            for user_id in user_ids:
+                memo.pop(str(user_id), None)
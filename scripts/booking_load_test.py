@@ -0,0 +1,163 @@
+"""
+Carga de reservas concorrentes contra o Postgres configurado em DATABASE_URL.
+
+N clientes disputam M slots de uma quadra, refazendo o caminho do endpoint
+(checagem em `fn_quadras_disponiveis` -> trabalho do handler -> INSERT em
+events -> commit), com e sem o `BookingCoordinator`. Os eventos criados são
+apagados no fim.
+
+    python scripts/booking_load_test.py --court-id <uuid> --clients 100 --slots 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import UUID, uuid4
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.exc import IntegrityError  # noqa: E402
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.booking_coordinator import (  # noqa: E402
+    BookingCoordinator,
+    BookingSlotContended,
+)
+
+
+def _book(
+    coordinator: BookingCoordinator | None,
+    *,
+    court_id: UUID,
+    start_at: datetime,
+    end_at: datetime,
+    marker: str,
+    work_seconds: float,
+) -> str:
+    with SessionLocal() as db:
+        try:
+            if coordinator is not None:
+                coordinator.acquire(db, court_id=court_id, start_at=start_at, end_at=end_at)
+
+            available = db.execute(
+                text("SELECT court_id FROM public.fn_quadras_disponiveis(:p_from, :p_to)"),
+                {"p_from": start_at, "p_to": end_at},
+            ).scalars()
+            if court_id not in set(available):
+                return "slot_conflict"
+
+            # resto do handler: cliente, preço, Pix...
+            time.sleep(work_seconds)
+
+            db.execute(
+                text(
+                    """
+                    INSERT INTO public.events (court_id, kind, status, start_at, end_at, notes)
+                    VALUES (:court_id, 'locacao', 'confirmado', :start_at, :end_at, :notes)
+                    """
+                ),
+                {"court_id": court_id, "start_at": start_at, "end_at": end_at, "notes": marker},
+            )
+            db.commit()
+            return "booked"
+        except BookingSlotContended:
+            return "contended"
+        except IntegrityError:
+            db.rollback()
+            return "integrity_conflict"
+
+
+def _run(
+    label: str,
+    coordinator: BookingCoordinator | None,
+    *,
+    court_id: UUID,
+    slots: list[tuple[datetime, datetime]],
+    clients: int,
+    work_seconds: float,
+) -> None:
+    marker = f"booking-load-test:{uuid4()}"
+    outcomes: Counter[str] = Counter()
+    latencies: list[float] = []
+    results_lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client(index: int) -> None:
+        start_at, end_at = slots[index % len(slots)]
+        barrier.wait()
+        started = time.perf_counter()
+        outcome = _book(
+            coordinator,
+            court_id=court_id,
+            start_at=start_at,
+            end_at=end_at,
+            marker=marker,
+            work_seconds=work_seconds,
+        )
+        elapsed = time.perf_counter() - started
+        with results_lock:
+            outcomes[outcome] += 1
+            latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    wall_started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall_started
+
+    with SessionLocal() as db:
+        db.execute(text("DELETE FROM public.events WHERE notes = :marker"), {"marker": marker})
+        db.commit()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"[{label}] {dict(sorted(outcomes.items()))} "
+        f"wall={wall:.2f}s p50={statistics.median(latencies) * 1000:.0f}ms p95={p95 * 1000:.0f}ms"
+    )
+    if coordinator is not None:
+        print(f"[{label}] {coordinator.snapshot()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--court-id", type=UUID, required=True)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--slots", type=int, default=10)
+    parser.add_argument("--days-ahead", type=int, default=30, help="dia dos slots disputados")
+    parser.add_argument("--work-ms", type=int, default=50, help="trabalho simulado do handler")
+    parser.add_argument("--bucket-minutes", type=int, default=30)
+    args = parser.parse_args()
+
+    tz = ZoneInfo("America/Sao_Paulo")
+    day_start = (datetime.now(tz) + timedelta(days=args.days_ahead)).replace(
+        hour=7, minute=0, second=0, microsecond=0
+    )
+    slots = [
+        (day_start + timedelta(hours=index), day_start + timedelta(hours=index + 1))
+        for index in range(args.slots)
+    ]
+
+    common = {
+        "court_id": args.court_id,
+        "slots": slots,
+        "clients": args.clients,
+        "work_seconds": args.work_ms / 1000,
+    }
+    _run("sem-lock", None, **common)
+    _run("advisory-lock", BookingCoordinator(bucket_minutes=args.bucket_minutes), **common)
+
+
+if __name__ == "__main__":
+    main()
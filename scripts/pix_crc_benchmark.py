@@ -0,0 +1,68 @@
+"""
+Micro-benchmark do CRC16 do payload Pix: tabela de 256 entradas (a usada em
+`generate_pix_payload`) contra a versão bit a bit. Só mede e imprime; não
+falha por tempo, porque máquina carregada distorce a comparação.
+
+    python scripts/pix_crc_benchmark.py --number 2000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.pix_payload import (  # noqa: E402
+    _CRC_INIT,
+    _CRC_POLY,
+    _crc16_ccitt_false,
+    generate_pix_payload,
+)
+
+
+def _crc16_bitwise(data: str) -> str:
+    crc = _CRC_INIT
+    for byte in data.encode("utf-8"):
+        crc ^= byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ _CRC_POLY) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return f"{crc:04X}"
+
+
+def _best_us_per_op(func, data: str, *, number: int, repeat: int) -> float:
+    best = min(timeit.repeat(lambda: func(data), number=number, repeat=repeat))
+    return best / number * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara o CRC16 por tabela com o bit a bit.")
+    parser.add_argument("--number", type=int, default=2000, help="chamadas por medição")
+    parser.add_argument("--repeat", type=int, default=5, help="medições (vale a melhor)")
+    args = parser.parse_args()
+
+    data = generate_pix_payload(
+        pix_key="financeiro@socratestenis.com.br",
+        merchant_name="Socrates Tenis",
+        merchant_city="Sao Paulo",
+        amount=Decimal("120.00"),
+        txid="CTR202604161800",
+    )[:-4]
+    if _crc16_ccitt_false(data) != _crc16_bitwise(data):
+        sys.exit("[pix-bench] CRC da tabela diverge da referência bit a bit")
+
+    bitwise = _best_us_per_op(_crc16_bitwise, data, number=args.number, repeat=args.repeat)
+    table = _best_us_per_op(_crc16_ccitt_false, data, number=args.number, repeat=args.repeat)
+    print(f"[pix-bench] payload de {len(data)} bytes")
+    print(f"[pix-bench] crc16 bit a bit: {bitwise:.2f} µs/op")
+    print(f"[pix-bench] crc16 tabela:    {table:.2f} µs/op ({bitwise / table:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import pytest
+
+
+class RecordedResult:
+    """Resultado de `execute` com as linhas configuradas na sessão (sem linhas, escalar `None`)."""
+
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def mappings(self):
+        return self
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def all(self):
+        return list(self._rows)
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+    def scalars(self):
+        return iter(self._rows)
+
+    def scalar_one(self):
+        return self._rows[0] if self._rows else None
+
+
+class RecordingSession:
+    """
+    Sessão falsa: guarda `(sql, params)` de cada `execute` e devolve `rows`.
+    Com `results`, cada `execute` consome o próximo conjunto de linhas, na
+    ordem; esgotada a lista, volta a devolver `rows`.
+    """
+
+    def __init__(self, rows=(), *, results=()):
+        self.rows = list(rows)
+        self.results = [list(result) for result in results]
+        self.info = {}
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        # executemany chega como lista de dicts
+        recorded = (
+            [dict(item) for item in params] if isinstance(params, list) else dict(params or {})
+        )
+        self.statements.append((str(statement), recorded))
+        if self.results:
+            return RecordedResult(self.results.pop(0))
+        return RecordedResult(self.rows)
+
+
+@pytest.fixture
+def recording_session():
+    """Fábrica de `RecordingSession`: `recording_session(rows)` por sessão simulada."""
+
+    return RecordingSession
@@ -0,0 +1,117 @@
+"""Servidor S3 mínimo (path-style, estilo MinIO) para testar o storage sem rede externa."""
+
+from __future__ import annotations
+
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+
+class _S3Handler(BaseHTTPRequestHandler):
+    server: StubS3Server
+
+    def log_message(self, *_args) -> None:
+        pass
+
+    def _key(self) -> str | None:
+        prefix = f"/{self.server.bucket}/"
+        if not self.path.startswith(prefix):
+            return None
+        return unquote(self.path[len(prefix) :])
+
+    def _authorized(self) -> bool:
+        auth = self.headers.get("Authorization", "")
+        with self.server.lock:
+            self.server.auth_headers.append(auth)
+        return auth.startswith("AWS4-HMAC-SHA256 Credential=") and bool(
+            self.headers.get("x-amz-date")
+        )
+
+    def _send(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_PUT(self) -> None:
+        key = self._key()
+        if key is None or not self._authorized():
+            self._send(403)
+            return
+        length = int(self.headers.get("Content-Length", "0"))
+        data = self.rfile.read(length)
+        with self.server.lock:
+            self.server.objects[key] = data
+        self._send(200)
+
+    def do_HEAD(self) -> None:
+        key = self._key()
+        if key is None or not self._authorized():
+            self._send(403)
+            return
+        data = self.server.objects.get(key)
+        if data is None:
+            self._send(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        key = self._key()
+        if key is None or not self._authorized():
+            self._send(403)
+            return
+        data = self.server.objects.get(key)
+        if data is None:
+            self._send(404)
+            return
+
+        match = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+        if match is None:
+            self._send(200, data)
+            return
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else len(data) - 1
+        self._send(
+            206,
+            data[start : end + 1],
+            {"Content-Range": f"bytes {start}-{end}/{len(data)}"},
+        )
+
+    def do_DELETE(self) -> None:
+        key = self._key()
+        if key is None or not self._authorized():
+            self._send(403)
+            return
+        with self.server.lock:
+            self.server.objects.pop(key, None)
+        self._send(204)
+
+
+class StubS3Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *, bucket: str = "uploads") -> None:
+        super().__init__(("127.0.0.1", 0), _S3Handler)
+        self.bucket = bucket
+        self.lock = threading.Lock()
+        self.objects: dict[str, bytes] = {}
+        self.auth_headers: list[str] = []
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def endpoint_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self) -> StubS3Server:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,82 @@
+"""Servidor SMTP mínimo (sem TLS/AUTH) para testar o envio sem rede externa."""
+
+from __future__ import annotations
+
+import socketserver
+import threading
+import time
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    server: StubSmtpServer
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        stub = self.server
+        with stub.lock:
+            stub.connections += 1
+        if stub.handshake_delay:
+            time.sleep(stub.handshake_delay)
+        self._reply("220 stub ESMTP")
+
+        delivered_here = 0
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode("ascii", "replace").strip().upper()
+
+            if command.startswith(("EHLO", "HELO")):
+                self._reply("250-stub")
+                self._reply("250 8BITMIME")
+            elif command.startswith(("MAIL", "RCPT", "RSET")):
+                self._reply("250 OK")
+            elif command == "NOOP":
+                with stub.lock:
+                    stub.noops += 1
+                self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with stub.lock:
+                    stub.messages += 1
+                delivered_here += 1
+                self._reply("250 queued")
+                if stub.drop_after and delivered_here >= stub.drop_after:
+                    return
+            elif command == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("502 not implemented")
+
+
+class StubSmtpServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, *, handshake_delay: float = 0.0, drop_after: int = 0) -> None:
+        super().__init__(("127.0.0.1", 0), _SmtpHandler)
+        self.handshake_delay = handshake_delay
+        self.drop_after = drop_after
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        self.noops = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self) -> StubSmtpServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.shutdown()
+        self.server_close()
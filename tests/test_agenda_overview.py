@@ -0,0 +1,28 @@
+from datetime import UTC, date, datetime
+
+from app.api.v1.endpoints.agenda import _build_admin_overview_query
+from app.services.agenda_overview import AGENDA_OVERVIEW_SPAN_BOUND, _add_months
+
+
+def test_admin_overview_filters_use_projection_columns():
+    from_ = datetime(2026, 4, 1, 3, tzinfo=UTC)
+    sql, params = _build_admin_overview_query(
+        from_=from_,
+        to=datetime(2026, 5, 1, 3, tzinfo=UTC),
+        status_value=None,
+        kind_value=None,
+        court_id=None,
+        teacher_id=None,
+        event_group="rental",
+        only_recurring=True,
+    )
+
+    assert "i.event_group = :p_event_group" in sql
+    assert "i.is_recurring = :p_only_recurring" in sql
+    assert "CASE" not in sql
+    assert params["p_scan_from"] == from_ - AGENDA_OVERVIEW_SPAN_BOUND
+
+
+def test_add_months_rolls_over_the_year():
+    assert _add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert _add_months(date(2026, 1, 1), 24) == date(2028, 1, 1)
@@ -0,0 +1,96 @@
+import json
+from datetime import datetime
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from app.services.availability_snapshot import AvailabilitySnapshotCache
+
+TZ = ZoneInfo("America/Sao_Paulo")
+COURT_A = uuid4()
+COURT_B = uuid4()
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return iter(self._rows)
+
+
+class _EventsSession:
+    """Devolve os eventos que cruzam o range pedido, como a consulta real."""
+
+    def __init__(self, events, on_execute=None):
+        self.events = events
+        self.queries = 0
+        self.on_execute = on_execute
+
+    def execute(self, statement, params=None):
+        self.queries += 1
+        if self.on_execute:
+            self.on_execute()
+        return _Result(
+            [
+                {"owner_id": owner_id, "start_at": start_at, "end_at": end_at}
+                for owner_id, start_at, end_at in self.events
+                if start_at < params["range_end"] and end_at > params["range_start"]
+            ]
+        )
+
+
+def _at(day, hour):
+    return datetime(2026, 5, day, hour, tzinfo=TZ)
+
+
+EVENTS = [
+    (COURT_A, _at(4, 10), _at(4, 11)),
+    (COURT_A, _at(4, 23), _at(5, 1)),
+    (COURT_B, _at(5, 9), _at(5, 10)),
+]
+
+
+def test_days_are_loaded_once_and_reassembled():
+    cache = AvailabilitySnapshotCache(ttl_seconds=60)
+    db = _EventsSession(EVENTS)
+
+    first = cache.busy_intervals(db, kind="court", range_start=_at(4, 8), range_end=_at(5, 22))
+    second = cache.busy_intervals(db, kind="court", range_start=_at(4, 8), range_end=_at(5, 22))
+    only_b = cache.busy_intervals(
+        db, kind="court", range_start=_at(5, 8), range_end=_at(5, 22), owner_ids=[COURT_B]
+    )
+
+    assert db.queries == 1
+    assert first == second
+    assert first[COURT_A] == [(_at(4, 10), _at(4, 11)), (_at(4, 23), _at(5, 1))]
+    assert only_b == {COURT_B: [(_at(5, 9), _at(5, 10))]}
+
+    stats = cache.snapshot()
+    assert (stats["hits"], stats["misses"], stats["rebuilds"]) == (3, 2, 1)
+
+
+def test_notification_drops_only_the_touched_day():
+    cache = AvailabilitySnapshotCache(ttl_seconds=60)
+    db = _EventsSession(EVENTS)
+    cache.busy_intervals(db, kind="court", range_start=_at(4, 0), range_end=_at(6, 0))
+
+    cache.apply_notification(json.dumps({"items": [["court", str(COURT_B), "2026-05-05"]]}))
+    cache.busy_intervals(db, kind="court", range_start=_at(4, 0), range_end=_at(5, 0))
+    assert db.queries == 1
+
+    cache.busy_intervals(db, kind="court", range_start=_at(5, 0), range_end=_at(6, 0))
+    assert db.queries == 2
+
+    cache.apply_notification('{"all": true}')
+    cache.busy_intervals(db, kind="court", range_start=_at(4, 0), range_end=_at(5, 0))
+    assert db.queries == 3
+
+
+def test_snapshot_loaded_across_an_invalidation_is_not_kept():
+    cache = AvailabilitySnapshotCache(ttl_seconds=60)
+    db = _EventsSession(EVENTS, on_execute=lambda: cache.clear())
+
+    cache.busy_intervals(db, kind="court", range_start=_at(4, 0), range_end=_at(5, 0))
+    cache.busy_intervals(db, kind="court", range_start=_at(4, 0), range_end=_at(5, 0))
+
+    assert db.queries == 2
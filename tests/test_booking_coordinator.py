@@ -0,0 +1,76 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.services.booking_coordinator import BookingCoordinator, BookingSlotContended
+
+
+class _ScalarResult:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one(self):
+        return self._value
+
+
+class _LockSession:
+    def __init__(self, acquired):
+        self.acquired = acquired
+        self.params = []
+
+    def execute(self, statement, params=None):
+        self.params.append(dict(params or {}))
+        return _ScalarResult(self.acquired)
+
+
+def test_lock_keys_cover_every_bucket_the_slot_touches():
+    coordinator = BookingCoordinator(bucket_minutes=30)
+    court_id = uuid4()
+    start_at = datetime(2026, 5, 4, 10, 0, tzinfo=UTC)
+
+    one_hour = coordinator.lock_keys(
+        court_id=court_id, start_at=start_at, end_at=start_at + timedelta(hours=1)
+    )
+    first_half = coordinator.lock_keys(
+        court_id=court_id, start_at=start_at, end_at=start_at + timedelta(minutes=30)
+    )
+    second_half = coordinator.lock_keys(
+        court_id=court_id,
+        start_at=start_at + timedelta(minutes=30),
+        end_at=start_at + timedelta(hours=1),
+    )
+    with_teacher = coordinator.lock_keys(
+        court_id=court_id,
+        teacher_id=uuid4(),
+        start_at=start_at,
+        end_at=start_at + timedelta(minutes=30),
+    )
+
+    assert len(one_hour) == 2
+    assert set(one_hour) == set(first_half) | set(second_half)
+    assert set(first_half) < set(with_teacher)
+    assert all(-(2**31) <= key < 2**31 for key in one_hour + with_teacher)
+
+
+def test_contended_slot_raises_and_counts():
+    coordinator = BookingCoordinator(bucket_minutes=30)
+    start_at = datetime(2026, 5, 4, 10, 0, tzinfo=UTC)
+    slot = {"court_id": uuid4(), "start_at": start_at, "end_at": start_at + timedelta(hours=1)}
+
+    coordinator.acquire(_LockSession(True), **slot)
+    with pytest.raises(BookingSlotContended):
+        coordinator.acquire(_LockSession(False), **slot)
+
+    snapshot = coordinator.snapshot()
+    assert (snapshot["attempts"], snapshot["acquired"], snapshot["contended"]) == (2, 1, 1)
+
+
+def test_disabled_coordinator_skips_the_database():
+    db = _LockSession(False)
+    start_at = datetime(2026, 5, 4, 10, 0, tzinfo=UTC)
+
+    BookingCoordinator(bucket_minutes=0).acquire(
+        db, court_id=uuid4(), start_at=start_at, end_at=start_at + timedelta(hours=1)
+    )
+    assert db.params == []
@@ -0,0 +1,64 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.api.v1.deps import get_current_user_id
+from app.db.session import get_db
+from app.main import app
+from app.services.cache_invalidation import apply_cache_notification
+from app.services.catalog_cache import CATALOG_COURTS, CATALOG_TEACHERS, catalog_cache
+
+
+def _override_db():
+    yield None
+
+
+def test_catalog_courts_revalidates_with_etag():
+    catalog_cache.clear()
+    catalog_cache.get_or_load(
+        CATALOG_COURTS,
+        lambda: [{"id": uuid4(), "name": "Quadra 1", "is_active": True}],
+    )
+    app.dependency_overrides[get_db] = _override_db
+    app.dependency_overrides[get_current_user_id] = lambda: "admin"
+
+    try:
+        client = TestClient(app)
+        first = client.get("/api/v1/catalogs/courts")
+        assert first.status_code == 200
+        assert first.json()[0]["name"] == "Quadra 1"
+        etag = first.headers["etag"]
+
+        second = client.get("/api/v1/catalogs/courts", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+
+        catalog_cache.invalidate(CATALOG_COURTS)
+        catalog_cache.get_or_load(
+            CATALOG_COURTS,
+            lambda: [{"id": uuid4(), "name": "Quadra 2", "is_active": True}],
+        )
+        third = client.get("/api/v1/catalogs/courts", headers={"If-None-Match": etag})
+        assert third.status_code == 200
+        assert third.headers["etag"] != etag
+    finally:
+        app.dependency_overrides.clear()
+        catalog_cache.clear()
+
+
+def test_notification_from_other_process_drops_catalog():
+    catalog_cache.clear()
+    catalog_cache.get_or_load(CATALOG_COURTS, lambda: [{"name": "Quadra 1"}])
+    catalog_cache.get_or_load(CATALOG_TEACHERS, lambda: [{"name": "Prof 1"}])
+
+    apply_cache_notification('{"cache": "catalogs", "keys": ["courts"]}')
+
+    reloaded = catalog_cache.get_or_load(CATALOG_COURTS, lambda: [{"name": "Quadra 2"}])
+    kept = catalog_cache.get_or_load(CATALOG_TEACHERS, lambda: [{"name": "Prof 2"}])
+    assert reloaded.rows == [{"name": "Quadra 2"}]
+    assert kept.rows == [{"name": "Prof 1"}]
+
+    apply_cache_notification("não é json")
+    assert catalog_cache.get_or_load(CATALOG_TEACHERS, lambda: [{"name": "Prof 2"}]).rows == [
+        {"name": "Prof 2"}
+    ]
+    catalog_cache.clear()
@@ -0,0 +1,139 @@
+from datetime import date, datetime, time
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.api.v1.endpoints import class_groups
+
+_TZ = ZoneInfo("America/Sao_Paulo")
+# segunda-feira; a janela cobre duas semanas
+_WINDOW_START = datetime(2026, 3, 2, tzinfo=_TZ)
+_WINDOW_END = datetime(2026, 3, 16, tzinfo=_TZ)
+
+_MONDAY = 1
+_WEDNESDAY = 3
+
+
+@pytest.fixture(autouse=True)
+def _fixed_window(monkeypatch):
+    monkeypatch.setattr(
+        class_groups,
+        "_group_lesson_window",
+        lambda: (_WINDOW_START, _WINDOW_END, _WINDOW_START.date(), _WINDOW_END.date()),
+    )
+
+
+def _at(day: int, hour: int) -> datetime:
+    return datetime(2026, 3, day, hour, tzinfo=_TZ)
+
+
+def _schedule(weekday: int) -> dict:
+    return {
+        "id": uuid4(),
+        "weekday": weekday,
+        "start_time": time(19),
+        "end_time": time(20),
+        "starts_on": date(2026, 1, 1),
+        "ends_on": None,
+        "notes": None,
+    }
+
+
+def _event(day: int, *, court_id, teacher_id) -> dict:
+    return {
+        "id": uuid4(),
+        "court_id": court_id,
+        "teacher_id": teacher_id,
+        "status": "confirmado",
+        "start_at": _at(day, 19),
+        "end_at": _at(day, 20),
+        "notes": None,
+    }
+
+
+def _sync(recording_session, *, existing, schedules, teacher_id, court_id):
+    group = {"is_active": True, "court_id": court_id, "teacher_id": teacher_id, "notes": None}
+    db = recording_session(results=[existing, [group], schedules, []])
+    class_groups._sync_group_lesson_events(db, uuid4(), str(uuid4()))
+    # eventos existentes, turma, horários e atribuições de professor
+    return db.statements[4:]
+
+
+def _writes(statements, verb: str):
+    return [params for sql, params in statements if sql.lstrip().startswith(verb)]
+
+
+def test_unchanged_occurrences_keep_their_events(recording_session):
+    court_id, teacher_id = uuid4(), uuid4()
+    existing = [_event(day, court_id=court_id, teacher_id=teacher_id) for day in (2, 4, 9, 11)]
+
+    writes = _sync(
+        recording_session,
+        existing=existing,
+        schedules=[_schedule(_MONDAY), _schedule(_WEDNESDAY)],
+        teacher_id=teacher_id,
+        court_id=court_id,
+    )
+
+    assert writes == []
+
+
+def test_removed_schedule_deletes_only_its_events(recording_session):
+    court_id, teacher_id = uuid4(), uuid4()
+    mondays = [_event(day, court_id=court_id, teacher_id=teacher_id) for day in (2, 9)]
+    wednesdays = [_event(day, court_id=court_id, teacher_id=teacher_id) for day in (4, 11)]
+
+    writes = _sync(
+        recording_session,
+        existing=mondays + wednesdays,
+        schedules=[_schedule(_MONDAY)],
+        teacher_id=teacher_id,
+        court_id=court_id,
+    )
+
+    assert _writes(writes, "DELETE") == [{"event_ids": [event["id"] for event in wednesdays]}]
+    assert _writes(writes, "UPDATE") == []
+    assert _writes(writes, "INSERT") == []
+
+
+def test_teacher_change_updates_events_in_place(recording_session):
+    court_id, old_teacher, new_teacher = uuid4(), uuid4(), uuid4()
+    existing = [_event(day, court_id=court_id, teacher_id=old_teacher) for day in (2, 9)]
+
+    writes = _sync(
+        recording_session,
+        existing=existing,
+        schedules=[_schedule(_MONDAY)],
+        teacher_id=new_teacher,
+        court_id=court_id,
+    )
+
+    assert _writes(writes, "DELETE") == []
+    assert _writes(writes, "INSERT") == []
+    [updated] = _writes(writes, "UPDATE")
+    assert [(row["event_id"], row["teacher_id"]) for row in updated] == [
+        (existing[0]["id"], new_teacher),
+        (existing[1]["id"], new_teacher),
+    ]
+
+
+def test_new_dates_are_inserted_in_one_batch(recording_session):
+    court_id, teacher_id = uuid4(), uuid4()
+    existing = [_event(2, court_id=court_id, teacher_id=teacher_id)]
+
+    writes = _sync(
+        recording_session,
+        existing=existing,
+        schedules=[_schedule(_MONDAY), _schedule(_WEDNESDAY)],
+        teacher_id=teacher_id,
+        court_id=court_id,
+    )
+
+    assert len(writes) == 1
+    [inserted] = _writes(writes, "INSERT")
+    assert sorted(row["start_at"] for row in inserted) == [
+        _at(4, 19),
+        _at(9, 19),
+        _at(11, 19),
+    ]
@@ -0,0 +1,137 @@
+from datetime import UTC, datetime, time, timedelta
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.court_availability import (
+    compute_free_court_slots,
+    list_free_court_grade,
+    load_confirmed_court_intervals,
+    merge_intervals,
+)
+from app.services.teacher_availability import build_slot_grid
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 3, 2, hour, minute, tzinfo=UTC)
+
+
+def _hourly_candidates(first_hour: int, last_hour: int) -> list[tuple[datetime, datetime]]:
+    return [(_at(h), _at(h) + timedelta(hours=1)) for h in range(first_hour, last_hour)]
+
+
+def test_merge_intervals_joins_overlaps_only():
+    merged = merge_intervals([(_at(10), _at(11)), (_at(8), _at(9, 30)), (_at(9), _at(10))])
+    assert merged == [(_at(8), _at(10)), (_at(10), _at(11))]
+
+
+def test_compute_free_court_slots_matches_overlap_rule():
+    court_a = {"court_id": uuid4(), "court_name": "A"}
+    court_b = {"court_id": uuid4(), "court_name": "B"}
+    busy = {
+        court_a["court_id"]: merge_intervals([(_at(8, 30), _at(9, 30)), (_at(11), _at(12))]),
+    }
+
+    slots = compute_free_court_slots(
+        courts=[court_b, court_a],
+        candidates=_hourly_candidates(8, 12),
+        busy_by_court=busy,
+    )
+
+    a_starts = [s.start_at for s in slots if s.court_id == court_a["court_id"]]
+    b_starts = [s.start_at for s in slots if s.court_id == court_b["court_id"]]
+    assert a_starts == [_at(10)]
+    assert b_starts == [_at(8), _at(9), _at(10), _at(11)]
+    assert [(s.start_at, s.court_name) for s in slots][:2] == [(_at(8), "B"), (_at(9), "B")]
+
+
+def test_list_free_court_grade_binds_the_window_and_filters_courts(recording_session):
+    kept, dropped = uuid4(), uuid4()
+    rows = [
+        {"slot_start": _at(8), "slot_end": _at(9), "court_id": kept, "court_name": "Quadra 1"},
+        {"slot_start": _at(8), "slot_end": _at(9), "court_id": dropped, "court_name": "Quadra 2"},
+    ]
+    db = recording_session(rows)
+
+    slots = list_free_court_grade(
+        db,
+        range_start=_at(8),
+        range_end=_at(12),
+        slot_minutes=60,
+        day_start=time(6),
+        day_end=time(23),
+        court_ids=[kept],
+    )
+
+    assert [(slot.court_id, slot.start_at, slot.end_at) for slot in slots] == [
+        (kept, _at(8), _at(9))
+    ]
+    assert len(db.statements) == 1
+    sql, params = db.statements[0]
+    assert "fn_quadras_grade" in sql
+    assert params == {
+        "p_from": _at(8),
+        "p_to": _at(12),
+        "p_slot_minutes": 60,
+        "p_day_start": time(6),
+        "p_day_end": time(23),
+    }
+
+
+@pytest.fixture(scope="module")
+def pg_session():
+    engine = create_engine(settings.database_url)
+    try:
+        connection = engine.connect()
+    except SQLAlchemyError:
+        pytest.skip("Postgres indisponível")
+
+    has_function = connection.execute(
+        text("SELECT 1 FROM pg_proc WHERE proname = 'fn_quadras_grade'")
+    ).first()
+    if not has_function:
+        connection.close()
+        pytest.skip("migração de fn_quadras_grade não aplicada")
+
+    session = Session(bind=connection)
+    yield session
+    session.close()
+    connection.close()
+    engine.dispose()
+
+
+def test_fn_quadras_grade_matches_the_in_memory_engine(pg_session):
+    local_tz = ZoneInfo("America/Sao_Paulo")
+    range_start = datetime.now(local_tz).replace(hour=0, minute=0, second=0, microsecond=0)
+    range_end = range_start + timedelta(days=3)
+    grid = dict(slot_minutes=60, day_start=time(6), day_end=time(23))
+
+    from_sql = list_free_court_grade(
+        pg_session, range_start=range_start, range_end=range_end, **grid
+    )
+
+    courts = (
+        pg_session.execute(
+            text(
+                "SELECT id AS court_id, name AS court_name FROM public.courts WHERE is_active = true"
+            )
+        )
+        .mappings()
+        .all()
+    )
+    in_memory = compute_free_court_slots(
+        courts=courts,
+        candidates=build_slot_grid(range_start=range_start, range_end=range_end, **grid),
+        busy_by_court=load_confirmed_court_intervals(
+            pg_session, range_start=range_start, range_end=range_end
+        ),
+    )
+
+    assert {(s.start_at, s.end_at, s.court_id) for s in from_sql} == {
+        (s.start_at, s.end_at, s.court_id) for s in in_memory
+    }
@@ -0,0 +1,87 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.deps import require_admin
+from app.db.session import get_db
+from app.main import app
+
+
+def _rental(hours_ago: int) -> dict:
+    created_at = datetime(2026, 3, 2, 12, tzinfo=UTC) - timedelta(hours=hours_ago)
+    return {
+        "id": uuid4(),
+        "origin": "admin",
+        "pricing_profile": "third_party",
+        "status": "confirmed",
+        "payment_status": "approved",
+        "court_id": None,
+        "court_name": None,
+        "start_at": None,
+        "end_at": None,
+        "customer_name": "Ana",
+        "customer_email": None,
+        "customer_whatsapp": None,
+        "total_amount": None,
+        "payment_amount_matches_expected": None,
+        "payment_proof_submitted_at": None,
+        "payment_reviewed_at": None,
+        "confirmed_at": None,
+        "created_at": created_at,
+        "sort_at": created_at,
+    }
+
+
+@pytest.fixture
+def admin_bookings(recording_session, monkeypatch):
+    # o sweeper em background cuida da expiração global
+    monkeypatch.setattr(
+        "app.api.v1.endpoints.court_rentals.settings.rental_expiration_sweep_interval_seconds", 60
+    )
+    state = {}
+
+    def _get(*results, **params):
+        state["db"] = recording_session(results=results)
+        response = TestClient(app).get("/api/v1/court-rentals/admin/bookings", params=params)
+        assert response.status_code == 200, response.text
+        return response.json(), state["db"]
+
+    app.dependency_overrides[get_db] = lambda: state["db"]
+    app.dependency_overrides[require_admin] = lambda: None
+    try:
+        yield _get
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_default_listing_is_complete_and_keeps_the_total(admin_bookings):
+    rows = [_rental(hours) for hours in range(150)]
+
+    body, db = admin_bookings(rows)
+
+    assert len(body["items"]) == 150
+    assert body["total"] == 150
+    assert body["has_more"] is False
+    assert body["next_cursor"] is None
+    [(sql, params)] = db.statements
+    assert "LIMIT" not in sql
+    assert "page_limit" not in params
+
+
+def test_paginated_listing_counts_every_filtered_rental(admin_bookings):
+    rows = [_rental(hours) for hours in range(3)]
+
+    body, db = admin_bookings(rows, [7], limit=2, status="confirmed")
+
+    assert len(body["items"]) == 2
+    assert body["total"] == 7
+    assert body["has_more"] is True
+    assert body["next_cursor"]
+    page_sql, page_params = db.statements[0]
+    assert "LIMIT :page_limit" in page_sql
+    assert page_params["page_limit"] == 3
+    count_sql, count_params = db.statements[1]
+    assert "count(*)" in count_sql
+    assert count_params == {"status_filter": "confirmed"}
@@ -0,0 +1,101 @@
+from uuid import uuid4
+
+from app.api.v1.endpoints import court_rentals
+from app.services import court_rental_expiration
+from app.services.court_rental_expiration import (
+    expire_overdue_public_pending_rentals,
+    run_expiration_sweep,
+    sweep_stats,
+)
+from tests.conftest import RecordingSession
+
+
+class _SweepSession(RecordingSession):
+    def __init__(self, rows=(), *, results=()):
+        super().__init__(rows, results=results)
+        self.commits = 0
+        self.rollbacks = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_expire_returns_the_count_and_binds_the_owner():
+    owner_user_id = uuid4()
+    db = _SweepSession([3])
+
+    assert expire_overdue_public_pending_rentals(db, owner_user_id=owner_user_id) == 3
+
+    [(sql, params)] = db.statements
+    assert "AND cr.owner_user_id = :owner_user_id" in sql
+    assert params["owner_user_id"] == owner_user_id
+    assert db.commits == 0
+
+
+def test_global_expire_has_no_owner_filter():
+    db = _SweepSession([None])
+
+    assert expire_overdue_public_pending_rentals(db) == 0
+
+    [(sql, params)] = db.statements
+    assert "owner_user_id" not in sql
+    assert "owner_user_id" not in params
+
+
+def test_sweep_skips_when_another_process_holds_the_lock(monkeypatch):
+    monkeypatch.setattr(court_rental_expiration, "sweep_stats", type(sweep_stats)())
+    db = _SweepSession([False])
+
+    assert run_expiration_sweep(lambda: db) is None
+
+    assert len(db.statements) == 1
+    assert "pg_try_advisory_xact_lock" in db.statements[0][0]
+    assert db.rollbacks == 1
+    assert db.commits == 0
+    assert court_rental_expiration.sweep_stats.skipped_locked == 1
+    assert court_rental_expiration.sweep_stats.runs == 0
+
+
+def test_sweep_expires_and_commits_under_the_lock(monkeypatch):
+    monkeypatch.setattr(court_rental_expiration, "sweep_stats", type(sweep_stats)())
+    db = _SweepSession(results=[[True], [2]])
+
+    assert run_expiration_sweep(lambda: db) == 2
+
+    assert "owner_user_id" not in db.statements[1][0]
+    assert db.commits == 1
+    stats = court_rental_expiration.sweep_stats
+    assert (stats.runs, stats.last_expired, stats.total_expired) == (1, 2, 2)
+
+
+def test_inline_expiry_leaves_the_global_sweep_to_the_sweeper(monkeypatch):
+    monkeypatch.setattr(court_rentals.settings, "rental_expiration_sweep_interval_seconds", 60)
+    db = _SweepSession([1])
+
+    assert court_rentals._expire_overdue_public_pending_rentals(db) == 0
+    assert db.statements == []
+
+    owner_user_id = uuid4()
+    assert (
+        court_rentals._expire_overdue_public_pending_rentals(db, owner_user_id=owner_user_id) == 1
+    )
+    assert db.statements[0][1]["owner_user_id"] == owner_user_id
+    assert db.commits == 1
+
+
+def test_inline_expiry_runs_globally_when_the_sweeper_is_off(monkeypatch):
+    monkeypatch.setattr(court_rentals.settings, "rental_expiration_sweep_interval_seconds", 0)
+    db = _SweepSession([0])
+
+    assert court_rentals._expire_overdue_public_pending_rentals(db) == 0
+    assert len(db.statements) == 1
+    assert db.commits == 0
@@ -0,0 +1,105 @@
+import json
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.api.v1.endpoints import court_rentals
+from app.core.config import settings
+from app.services.court_rental_expiration import expire_overdue_public_pending_rentals
+
+
+def _recorded_sql(db, call):
+    # guarda o SQL que o helper mandaria, para rodar EXPLAIN no banco real
+    call(db)
+    assert len(db.statements) == 1
+    return db.statements[0]
+
+
+def test_owner_lookups_filter_on_generated_column(recording_session):
+    owner_user_id = uuid4()
+    helpers = [
+        lambda db: court_rentals._get_blocking_active_public_rental_row(db, owner_user_id),
+        lambda db: court_rentals._get_upcoming_rental_rows(db, owner_user_id),
+        lambda db: court_rentals._get_rental_history_rows(db, owner_user_id),
+        lambda db: court_rentals._get_owned_rental_row(db, owner_user_id, uuid4()),
+        lambda db: expire_overdue_public_pending_rentals(db, owner_user_id=owner_user_id),
+    ]
+
+    for call in helpers:
+        sql, _params = _recorded_sql(recording_session(), call)
+        assert "owner_user_id = :" in sql
+        assert "COALESCE(cr.customer_user_id" not in sql
+
+
+@pytest.fixture(scope="module")
+def pg_connection():
+    engine = create_engine(settings.database_url)
+    try:
+        connection = engine.connect()
+    except SQLAlchemyError:
+        pytest.skip("Postgres indisponível")
+
+    has_column = connection.execute(
+        text(
+            """
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_name = 'court_rentals' AND column_name = 'owner_user_id'
+            """
+        )
+    ).first()
+    if not has_column:
+        connection.close()
+        pytest.skip("migração de owner_user_id não aplicada")
+
+    yield connection
+    connection.close()
+    engine.dispose()
+
+
+def _plan_index_names(connection, sql, params):
+    # Tabelas pequenas de dev levariam a seq scan; aqui interessa se o índice serve.
+    transaction = connection.begin()
+    try:
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar_one()
+    finally:
+        transaction.rollback()
+
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    names = set()
+    stack = [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if node.get("Index Name"):
+            names.add(node["Index Name"])
+        stack.extend(node.get("Plans", []))
+    return names
+
+
+@pytest.mark.parametrize(
+    ("call", "expected_index"),
+    [
+        (
+            lambda db: court_rentals._get_blocking_active_public_rental_row(db, uuid4()),
+            "ix_court_rentals_owner_active_status",
+        ),
+        (
+            lambda db: court_rentals._get_upcoming_rental_rows(db, uuid4()),
+            "ix_court_rentals_owner_active_status",
+        ),
+        (
+            lambda db: court_rentals._get_rental_history_rows(db, uuid4()),
+            "ix_court_rentals_owner_user_id",
+        ),
+        (
+            lambda db: expire_overdue_public_pending_rentals(db),
+            "ix_court_rentals_pending_payment_expires_at",
+        ),
+    ],
+)
+def test_owner_queries_use_partial_indexes(pg_connection, recording_session, call, expected_index):
+    sql, params = _recorded_sql(recording_session(), call)
+    assert expected_index in _plan_index_names(pg_connection, sql, params)
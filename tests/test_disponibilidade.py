@@ -0,0 +1,139 @@
+from datetime import UTC, datetime, time, timedelta
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.disponibilidade import (
+    MAX_GRID_SLOTS,
+    professores_disponiveis,
+    quadras_disponiveis,
+)
+from app.services.teacher_availability import build_slot_grid, resolve_teacher_availability
+
+
+def _at(day: int, hour: int) -> datetime:
+    return datetime(2026, 3, day, hour, tzinfo=UTC)
+
+
+def test_quadras_grid_maps_fn_quadras_grade_rows(recording_session):
+    court_id = uuid4()
+    db = recording_session(
+        [
+            {
+                "slot_start": _at(2, 12),
+                "slot_end": _at(2, 13),
+                "court_id": court_id,
+                "court_name": "Q1",
+            }
+        ]
+    )
+
+    slots = quadras_disponiveis(from_=_at(2, 0), to=_at(3, 0), slot_minutes=60, db=db)
+
+    assert [(slot.court_id, slot.slot_start, slot.slot_end) for slot in slots] == [
+        (court_id, _at(2, 12), _at(2, 13))
+    ]
+    assert "fn_quadras_grade" in db.statements[0][0]
+
+
+def test_quadras_grid_rejects_windows_above_max_grid_slots(recording_session):
+    db = recording_session()
+
+    # 17 slots de 60 min por dia (6h às 23h)
+    to = _at(1, 0) + timedelta(days=MAX_GRID_SLOTS // 17 + 2)
+    with pytest.raises(HTTPException) as exc_info:
+        quadras_disponiveis(from_=_at(1, 0), to=to, slot_minutes=60, db=db)
+
+    assert exc_info.value.status_code == 422
+    assert db.statements == []
+
+
+def test_build_slot_grid_keeps_daily_window_inside_the_range():
+    local_tz = ZoneInfo("America/Sao_Paulo")
+    range_start = datetime(2026, 3, 2, 8, 30, tzinfo=local_tz)
+    range_end = datetime(2026, 3, 3, 8, 0, tzinfo=local_tz)
+
+    grid = build_slot_grid(
+        range_start=range_start,
+        range_end=range_end,
+        slot_minutes=60,
+        day_start=time(6),
+        day_end=time(10),
+    )
+
+    assert grid == [
+        (datetime(2026, 3, 2, 9, tzinfo=local_tz), datetime(2026, 3, 2, 10, tzinfo=local_tz)),
+        (datetime(2026, 3, 3, 6, tzinfo=local_tz), datetime(2026, 3, 3, 7, tzinfo=local_tz)),
+        (datetime(2026, 3, 3, 7, tzinfo=local_tz), datetime(2026, 3, 3, 8, tzinfo=local_tz)),
+    ]
+
+
+def test_resolve_teacher_availability_maps_lote_rows_into_the_matrix(recording_session):
+    ana, bruno = uuid4(), uuid4()
+    slots = [(_at(2, 12), _at(2, 13)), (_at(2, 13), _at(2, 14))]
+    db = recording_session(
+        results=[
+            [
+                {"teacher_id": ana, "teacher_name": "Ana"},
+                {"teacher_id": bruno, "teacher_name": "Bruno"},
+            ],
+            [
+                {"slot_start": _at(2, 13), "slot_end": _at(2, 14), "teacher_id": ana},
+                {"slot_start": _at(2, 12), "slot_end": _at(2, 13), "teacher_id": bruno},
+                # professor inativo e slot fora da grade são ignorados
+                {"slot_start": _at(2, 12), "slot_end": _at(2, 13), "teacher_id": uuid4()},
+                {"slot_start": _at(2, 15), "slot_end": _at(2, 16), "teacher_id": ana},
+            ],
+        ]
+    )
+
+    result = resolve_teacher_availability(db, intervals=list(reversed(slots)), modality="tenis")
+
+    assert result.slots == slots
+    assert [(row.teacher_id, row.available) for row in result.teachers] == [
+        (ana, [False, True]),
+        (bruno, [True, False]),
+    ]
+    assert len(db.statements) == 2
+    sql, params = db.statements[1]
+    assert "fn_professores_disponiveis_lote" in sql
+    assert params["p_starts"] == [_at(2, 12), _at(2, 13)]
+    assert params["p_ends"] == [_at(2, 13), _at(2, 14)]
+    assert params["p_modality"] == "tenis"
+    assert params["p_court_id"] is None
+
+
+def test_professores_grid_builds_the_response(recording_session):
+    teacher_id = uuid4()
+    db = recording_session(
+        results=[
+            [{"teacher_id": teacher_id, "teacher_name": "Ana"}],
+            [{"slot_start": _at(2, 16), "slot_end": _at(2, 17), "teacher_id": teacher_id}],
+        ]
+    )
+
+    response = professores_disponiveis(
+        from_=_at(2, 15), to=_at(2, 17), grid=True, slot_minutes=60, db=db
+    )
+
+    # 12h e 13h em São Paulo
+    assert [(slot.slot_start, slot.slot_end) for slot in response.slots] == [
+        (_at(2, 15), _at(2, 16)),
+        (_at(2, 16), _at(2, 17)),
+    ]
+    assert [(row.teacher_id, row.available) for row in response.teachers] == [
+        (teacher_id, [False, True])
+    ]
+
+
+def test_professores_grid_rejects_windows_above_max_grid_slots(recording_session):
+    db = recording_session()
+
+    to = _at(1, 0) + timedelta(days=MAX_GRID_SLOTS // 17 + 2)
+    with pytest.raises(HTTPException) as exc_info:
+        professores_disponiveis(from_=_at(1, 0), to=to, grid=True, slot_minutes=60, db=db)
+
+    assert exc_info.value.status_code == 422
+    assert db.statements == []
@@ -0,0 +1,159 @@
+import json
+from uuid import uuid4
+
+from app.services.email_outbox import (
+    OUTBOX_COURT_RENTAL_CONFIRMATION,
+    OUTBOX_STUDENT_MAKEUP_REQUEST,
+    OutboxEmailSender,
+    _claim_batch,
+    _to_outgoing,
+    backoff_seconds,
+    deliver_pending_emails,
+)
+from app.services.email_sender import EmailAttachment, InlineImage, InMemoryEmailSender
+from tests.conftest import RecordingSession
+
+
+def test_outbox_sender_enqueues_rendered_template_and_the_row_decodes_back(recording_session):
+    db = recording_session([uuid4()])
+    reference_id = uuid4()
+    sender = OutboxEmailSender(
+        db, category=OUTBOX_STUDENT_MAKEUP_REQUEST, reference_id=reference_id
+    )
+
+    sender.send_student_signup_received_email("aluno@example.com", "Ana")
+    sender.send_email(
+        to_email="prof@example.com",
+        subject="Agenda",
+        text_body="Segue a agenda",
+        inline_images=[InlineImage(cid="logo", data=b"\x89PNG")],
+        attachments=[EmailAttachment(filename="agenda.csv", data=b"a;b", content_type="text/csv")],
+    )
+
+    inserted = [params for _sql, params in db.statements]
+    assert [row["to_email"] for row in inserted] == ["aluno@example.com", "prof@example.com"]
+    assert all(row["reference_id"] == reference_id for row in inserted)
+
+    outbox_row = {
+        **inserted[1],
+        "inline_images": json.loads(inserted[1]["inline_images"]),
+        "attachments": json.loads(inserted[1]["attachments"]),
+    }
+    delivered = InMemoryEmailSender()
+    assert delivered.send_many([_to_outgoing(outbox_row)]) == [None]
+
+    message = delivered.sent[0]
+    assert message.subject == "Agenda"
+    assert message.inline_images[0].data == b"\x89PNG"
+    assert message.attachments[0].filename == "agenda.csv"
+    assert message.attachments[0].data == b"a;b"
+
+
+def test_send_failures_are_reported_and_backoff_is_capped():
+    class _BrokenSender(InMemoryEmailSender):
+        def send_email(self, **_kwargs):
+            raise RuntimeError("smtp fora do ar")
+
+    row = {
+        "to_email": "x@example.com",
+        "subject": "s",
+        "text_body": "t",
+        "html_body": None,
+        "inline_images": [],
+        "attachments": [],
+    }
+    [error] = _BrokenSender().send_many([_to_outgoing(row)])
+    assert str(error) == "smtp fora do ar"
+    assert [backoff_seconds(n) for n in (1, 2, 3)] == [30, 60, 120]
+    assert backoff_seconds(20) == 3600
+
+
+class _WorkerSession(RecordingSession):
+    def __init__(self, rows=()):
+        super().__init__(rows)
+        self.commits = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def commit(self):
+        self.commits += 1
+
+
+def _outbox_row(attempts: int, **extra) -> dict:
+    return {
+        "id": uuid4(),
+        "category": None,
+        "reference_id": None,
+        "to_email": f"{attempts}@example.com",
+        "subject": "s",
+        "text_body": "t",
+        "html_body": None,
+        "inline_images": [],
+        "attachments": [],
+        "attempts": attempts,
+        **extra,
+    }
+
+
+def test_claim_batch_fails_exhausted_stale_claims_instead_of_resending():
+    db = _WorkerSession()
+
+    _claim_batch(db, batch_size=10, max_attempts=5)
+
+    (fail_sql, fail_params), (claim_sql, claim_params) = db.statements
+    assert "SET status = 'failed'" in fail_sql
+    assert "attempts >= :max_attempts" in fail_sql
+    assert fail_params["max_attempts"] == 5
+    assert "q.attempts < :max_attempts" in claim_sql
+    assert claim_params == {"batch_size": 10, "stale_seconds": 600, "max_attempts": 5}
+    assert db.commits == 1
+
+
+def test_deliver_pending_emails_records_sent_retry_and_exhausted_rows():
+    rental_id = uuid4()
+    sent = _outbox_row(1, category=OUTBOX_COURT_RENTAL_CONFIRMATION, reference_id=rental_id)
+    retry = _outbox_row(2)
+    exhausted = _outbox_row(3)
+    claim_db = _WorkerSession([sent, retry, exhausted])
+    record_db = _WorkerSession()
+    sessions = iter([claim_db, record_db])
+
+    class _PartialSender(InMemoryEmailSender):
+        def send_email(self, *, to_email, **kwargs):
+            if to_email != sent["to_email"]:
+                raise RuntimeError("smtp fora do ar")
+            super().send_email(to_email=to_email, **kwargs)
+
+    sender = _PartialSender()
+    claimed = deliver_pending_emails(lambda: next(sessions), sender, batch_size=10, max_attempts=3)
+
+    assert claimed == 3
+    assert [message.to_email for message in sender.sent] == [sent["to_email"]]
+    assert record_db.commits == 1
+
+    [sent_update, on_sent, retry_update, failed_update] = [
+        params for _sql, params in record_db.statements
+    ]
+    assert sent_update["id"] == sent["id"]
+    assert on_sent["reference_id"] == rental_id
+    assert retry_update["id"] == retry["id"]
+    assert retry_update["status"] == "pending"
+    assert retry_update["delay"] == backoff_seconds(2) == 60
+    assert retry_update["error"] == "smtp fora do ar"
+    assert failed_update["id"] == exhausted["id"]
+    assert failed_update["status"] == "failed"
+
+
+def test_deliver_pending_emails_stops_on_an_empty_claim():
+    claim_db = _WorkerSession()
+
+    claimed = deliver_pending_emails(
+        lambda: claim_db, InMemoryEmailSender(), batch_size=10, max_attempts=3
+    )
+
+    assert claimed == 0
+    assert len(claim_db.statements) == 2
@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+import tracemalloc
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.file_responses import parse_range_header
+from app.services.file_storage import (
+    LocalFileStorage,
+    S3CompatibleStorage,
+    StorageEmptyUpload,
+    StorageLimitExceeded,
+)
+from tests.s3_stub import StubS3Server
+
+
+async def _chunks(total: int, chunk_size: int = 64 * 1024):
+    sent = 0
+    while sent < total:
+        size = min(chunk_size, total - sent)
+        yield bytes([sent % 251]) * size
+        sent += size
+
+
+def _expected_sha256(total: int, chunk_size: int = 64 * 1024) -> str:
+    digest = hashlib.sha256()
+    sent = 0
+    while sent < total:
+        size = min(chunk_size, total - sent)
+        digest.update(bytes([sent % 251]) * size)
+        sent += size
+    return digest.hexdigest()
+
+
+def test_local_stream_hashes_on_the_fly_and_serves_ranges(tmp_path):
+    storage = LocalFileStorage(tmp_path)
+    total = 300_000
+
+    stored = asyncio.run(storage.save_stream("proofs/r1/a.pdf", _chunks(total)))
+
+    assert stored.size == total
+    assert stored.sha256 == _expected_sha256(total)
+    assert storage.size("proofs/r1/a.pdf") == total
+    assert b"".join(storage.iter_range("proofs/r1/a.pdf", 10, 19)) == bytes([0]) * 10
+    assert list(tmp_path.rglob("*.part")) == []
+
+
+def test_local_stream_enforces_limit_without_leaving_partial_file(tmp_path):
+    storage = LocalFileStorage(tmp_path)
+
+    with pytest.raises(StorageLimitExceeded):
+        asyncio.run(storage.save_stream("big.bin", _chunks(2_000_000), max_bytes=1_000_000))
+    with pytest.raises(StorageEmptyUpload):
+        asyncio.run(storage.save_stream("empty.bin", _chunks(0)))
+
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+def test_local_upload_memory_stays_constant(tmp_path):
+    storage = LocalFileStorage(tmp_path)
+
+    tracemalloc.start()
+    asyncio.run(storage.save_stream("large.bin", _chunks(8 * 1024 * 1024)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert storage.size("large.bin") == 8 * 1024 * 1024
+    assert peak < 1024 * 1024
+
+
+def test_local_storage_rejects_keys_outside_root(tmp_path):
+    storage = LocalFileStorage(tmp_path / "root")
+
+    with pytest.raises(Exception, match="fora do storage"):
+        storage.size("../escape.txt")
+
+
+def test_s3_backend_roundtrip_against_stub():
+    with StubS3Server() as server:
+        storage = S3CompatibleStorage(
+            endpoint_url=server.endpoint_url,
+            bucket=server.bucket,
+            access_key="minio",
+            secret_key="minio-secret",
+            key_prefix="app",
+        )
+        total = 200_000
+
+        stored = asyncio.run(storage.save_stream("proofs/r1/a.png", _chunks(total)))
+
+        assert stored.sha256 == _expected_sha256(total)
+        uploaded = server.objects["app/proofs/r1/a.png"]
+        assert hashlib.sha256(uploaded).hexdigest() == stored.sha256
+        assert storage.size("proofs/r1/a.png") == total
+        assert len(b"".join(storage.iter_range("proofs/r1/a.png", 100, 199))) == 100
+
+        storage.delete("proofs/r1/a.png")
+        assert storage.size("proofs/r1/a.png") is None
+        assert all("SignedHeaders=" in header for header in server.auth_headers)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=900-", (900, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=950-5000", (950, 999)),
+        ("bytes=0-1,5-6", None),
+    ],
+)
+def test_parse_range_header(header, expected):
+    assert parse_range_header(header, 1000) == expected
+
+
+def test_parse_range_header_unsatisfiable():
+    with pytest.raises(HTTPException) as exc_info:
+        parse_range_header("bytes=1000-", 1000)
+
+    assert exc_info.value.status_code == 416
+    assert exc_info.value.headers == {"Content-Range": "bytes */1000"}
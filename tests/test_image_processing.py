@@ -0,0 +1,94 @@
+import asyncio
+import os
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.services.image_processing import (
+    COURT_IMAGE_RENDITIONS,
+    ImageProcessingBusy,
+    ImageProcessingError,
+    ImageProcessingPool,
+    build_webp_renditions,
+)
+
+
+def _jpeg_bytes(width: int, height: int, *, orientation: int | None = None) -> bytes:
+    image = Image.new("RGB", (width, height), color=(200, 80, 20))
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[0x0112] = orientation
+    output = BytesIO()
+    image.save(output, format="JPEG", exif=exif.tobytes())
+    return output.getvalue()
+
+
+def _crash_worker() -> None:
+    os._exit(1)
+
+
+def _size(data: bytes) -> tuple[int, int]:
+    with Image.open(BytesIO(data)) as image:
+        assert image.format == "WEBP"
+        return image.size
+
+
+def test_renditions_from_single_decode_respect_max_dimension():
+    renditions = build_webp_renditions(_jpeg_bytes(2400, 1200), COURT_IMAGE_RENDITIONS)
+
+    assert set(renditions) == {"full", "card", "thumb"}
+    assert _size(renditions["full"]) == (1600, 800)
+    assert _size(renditions["card"]) == (800, 400)
+    assert _size(renditions["thumb"]) == (320, 160)
+
+
+def test_renditions_apply_exif_rotation_and_never_upscale():
+    # orientação 6 = girar 90°: a imagem "deitada" vira "em pé"
+    renditions = build_webp_renditions(_jpeg_bytes(600, 300, orientation=6), COURT_IMAGE_RENDITIONS)
+
+    assert _size(renditions["full"]) == (300, 600)
+    assert _size(renditions["thumb"]) == (160, 320)
+
+
+def test_invalid_image_raises_processing_error():
+    with pytest.raises(ImageProcessingError):
+        build_webp_renditions(b"not an image", COURT_IMAGE_RENDITIONS)
+
+
+def test_pool_runs_in_worker_process_and_rejects_when_full():
+    pool = ImageProcessingPool(max_workers=1, max_pending=1)
+
+    async def scenario():
+        first = asyncio.ensure_future(
+            pool.run(build_webp_renditions, _jpeg_bytes(400, 400), {"thumb": 100})
+        )
+        await asyncio.sleep(0)
+        with pytest.raises(ImageProcessingBusy):
+            await pool.run(build_webp_renditions, _jpeg_bytes(10, 10), {"thumb": 5})
+        return await first
+
+    try:
+        result = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert _size(result["thumb"]) == (100, 100)
+    assert pool.pending == 0
+
+
+def test_pool_recovers_after_worker_crash():
+    pool = ImageProcessingPool(max_workers=1, max_pending=2)
+
+    async def scenario():
+        with pytest.raises(ImageProcessingBusy):
+            await pool.run(_crash_worker)
+        return await pool.run(build_webp_renditions, _jpeg_bytes(40, 40), {"thumb": 20})
+
+    try:
+        result = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert _size(result["thumb"]) == (20, 20)
+    assert pool.pending == 0
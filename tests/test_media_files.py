@@ -0,0 +1,87 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.media_files import HotFileCache, MediaFiles
+
+
+def _client(tmp_path, **kwargs) -> TestClient:
+    app = FastAPI()
+    app.mount("/media", MediaFiles(directory=tmp_path, **kwargs), name="media")
+    return TestClient(app)
+
+
+def test_fingerprinted_names_are_immutable_and_revalidate_with_etag(tmp_path):
+    (tmp_path / "courts").mkdir()
+    (tmp_path / "courts" / "20260417_0123456789abcdef0123456789abcdef_thumb.webp").write_bytes(
+        b"RIFF....WEBP"
+    )
+    (tmp_path / "logo.webp").write_bytes(b"RIFF....WEBP")
+    client = _client(tmp_path, max_age_seconds=120)
+
+    response = client.get("/media/courts/20260417_0123456789abcdef0123456789abcdef_thumb.webp")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+    revalidated = client.get(
+        "/media/courts/20260417_0123456789abcdef0123456789abcdef_thumb.webp",
+        headers={"If-None-Match": response.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+
+    plain = client.get("/media/logo.webp")
+    assert plain.headers["cache-control"] == "public, max-age=120, must-revalidate"
+
+
+def test_range_requests_are_served_partially(tmp_path):
+    (tmp_path / "video.bin").write_bytes(bytes(range(200)))
+    client = _client(tmp_path)
+
+    response = client.get("/media/video.bin", headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.content == bytes(range(10, 20))
+
+
+def test_precompressed_variant_for_text_assets(tmp_path):
+    css = b"body { color: #123456; }" * 50
+    (tmp_path / "app.css").write_bytes(css)
+    (tmp_path / "app.css.gz").write_bytes(gzip.compress(css))
+    client = _client(tmp_path)
+
+    compressed = client.get("/media/app.css", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["content-type"].startswith("text/css")
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.content == css
+
+    identity = client.get("/media/app.css", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.content == css
+
+
+def test_hot_cache_serves_small_files_from_memory(tmp_path):
+    (tmp_path / "thumb.webp").write_bytes(b"v1-thumb")
+    cache = HotFileCache(max_bytes=1024, max_file_bytes=512)
+    client = _client(tmp_path, hot_cache=cache)
+
+    assert client.get("/media/thumb.webp").content == b"v1-thumb"
+    assert client.get("/media/thumb.webp").content == b"v1-thumb"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    (tmp_path / "thumb.webp").write_bytes(b"v2-thumb-new")
+    assert client.get("/media/thumb.webp").content == b"v2-thumb-new"
+
+
+def test_payment_proofs_are_not_public(tmp_path):
+    blob = tmp_path / "court_rental_payment_proofs" / "blobs" / "ab" / ("ab" * 32)
+    blob.parent.mkdir(parents=True)
+    blob.write_bytes(b"%PDF")
+    client = _client(tmp_path)
+
+    assert client.get(f"/media/court_rental_payment_proofs/blobs/ab/{'ab' * 32}").status_code == 404
+    assert (
+        client.get(f"/media/courts/../court_rental_payment_proofs/blobs/ab/{'ab' * 32}").status_code
+        == 404
+    )
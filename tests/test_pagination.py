@@ -0,0 +1,38 @@
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    sort_at = datetime(2026, 3, 2, 18, 30, tzinfo=UTC)
+    rental_id = uuid4()
+
+    cursor = encode_cursor(sort_at, rental_id)
+
+    assert decode_cursor(cursor, types=(datetime, UUID)) == [sort_at, rental_id]
+    assert decode_cursor(encode_cursor(True, "Ana", rental_id), types=(bool, str, UUID)) == [
+        True,
+        "Ana",
+        rental_id,
+    ]
+
+
+@pytest.mark.parametrize(
+    ("cursor", "types"),
+    [
+        ("not-a-cursor", (datetime, UUID)),
+        # valor "raw" onde o SQL espera timestamp/uuid
+        (encode_cursor("2026-03-02", "abc"), (datetime, UUID)),
+        (encode_cursor(1, "Ana", uuid4()), (bool, str, UUID)),
+        (encode_cursor(datetime.now(UTC)), (datetime, UUID)),
+    ],
+)
+def test_invalid_cursor_is_rejected(cursor, types):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, types=types)
+
+    assert exc_info.value.status_code == 400
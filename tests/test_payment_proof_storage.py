@@ -0,0 +1,66 @@
+import asyncio
+import os
+
+from app.services.file_storage import LocalFileStorage
+from app.services.payment_proof_storage import (
+    collect_orphan_payment_proofs,
+    payment_proof_storage_path,
+    store_payment_proof_blob,
+)
+
+
+async def _single(data: bytes):
+    yield data
+
+
+def test_same_receipt_shares_one_blob(tmp_path):
+    storage = LocalFileStorage(tmp_path)
+
+    first = asyncio.run(store_payment_proof_blob(storage, _single(b"%PDF recibo pix")))
+    second = asyncio.run(store_payment_proof_blob(storage, _single(b"%PDF recibo pix")))
+    other = asyncio.run(store_payment_proof_blob(storage, _single(b"%PDF outro recibo")))
+
+    assert first.key == second.key != other.key
+    assert not first.deduplicated
+    assert second.deduplicated
+    assert first.key.endswith(f"/{first.sha256[:2]}/{first.sha256}")
+    assert payment_proof_storage_path(first) == f"storage/{first.key}"
+    blobs = [p for p in (tmp_path / "court_rental_payment_proofs").rglob("*") if p.is_file()]
+    assert len(blobs) == 2
+
+
+def test_gc_removes_only_old_unreferenced_files(tmp_path, recording_session):
+    storage = LocalFileStorage(tmp_path)
+    kept = asyncio.run(store_payment_proof_blob(storage, _single(b"referenciado")))
+    orphan = asyncio.run(store_payment_proof_blob(storage, _single(b"orfao")))
+    recent_orphan = asyncio.run(store_payment_proof_blob(storage, _single(b"orfao recente")))
+    legacy = tmp_path / "court_rental_payment_proofs" / "rental-1" / "20260101_abc.pdf"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_bytes(b"legado")
+    stale_part = tmp_path / ".incoming" / "deadbeef.part"
+    stale_part.parent.mkdir(exist_ok=True)
+    stale_part.write_bytes(b"upload interrompido")
+
+    now = 10_000_000.0
+    for path in (storage.path_for(kept.key), storage.path_for(orphan.key), legacy, stale_part):
+        os.utime(path, (now - 3 * 86400, now - 3 * 86400))
+    os.utime(storage.path_for(recent_orphan.key), (now - 60, now - 60))
+
+    db = recording_session(
+        [
+            payment_proof_storage_path(kept),
+            "storage/court_rental_payment_proofs/rental-1/20260101_abc.pdf",
+        ]
+    )
+
+    dry = collect_orphan_payment_proofs(db, storage, dry_run=True, now=now)
+    assert sorted(dry.removed) == sorted([orphan.key, ".incoming/deadbeef.part"])
+    assert storage.size(orphan.key) is not None
+
+    result = collect_orphan_payment_proofs(db, storage, now=now)
+    assert result.referenced == 2
+    assert result.skipped_recent == 1
+    assert storage.size(orphan.key) is None
+    assert not stale_part.exists()
+    assert storage.size(kept.key) is not None
+    assert legacy.exists()
@@ -0,0 +1,118 @@
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.deps import require_admin
+from app.api.v1.pagination import decode_cursor
+from app.db.session import get_db
+from app.main import app
+
+
+def _person(name: str, **extra) -> dict:
+    now = datetime(2026, 3, 2, tzinfo=UTC)
+    return {
+        "id": uuid4(),
+        "user_id": None,
+        "full_name": name,
+        "email": f"{name.lower()}@example.com",
+        "phone": None,
+        "notes": None,
+        "profession": None,
+        "instagram_handle": None,
+        "share_profession": False,
+        "share_instagram": False,
+        "is_active": True,
+        "created_at": now,
+        "updated_at": now,
+        **extra,
+    }
+
+
+@pytest.fixture
+def listing(recording_session):
+    state = {}
+
+    def _client(rows):
+        state["db"] = recording_session(rows)
+        return TestClient(app), state["db"]
+
+    app.dependency_overrides[get_db] = lambda: state["db"]
+    app.dependency_overrides[require_admin] = lambda: None
+    try:
+        yield _client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("path", ["/api/v1/students/", "/api/v1/teachers/"])
+def test_listing_without_pagination_keeps_the_plain_list(listing, path):
+    client, db = listing([_person("Ana"), _person("Bruno")])
+
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert [item["full_name"] for item in response.json()] == ["Ana", "Bruno"]
+    [(sql, _params)] = db.statements
+    assert "LIMIT" not in sql
+
+
+@pytest.mark.parametrize("path", ["/api/v1/students/", "/api/v1/teachers/"])
+def test_cursor_round_trip(listing, path):
+    ana, bruno = _person("Ana"), _person("Bruno")
+    client, db = listing([ana, bruno])
+
+    first = client.get(path, params={"limit": 1}).json()
+
+    assert [item["full_name"] for item in first["items"]] == ["Ana"]
+    assert first["has_more"] is True
+    assert first["total"] is None
+    assert decode_cursor(first["next_cursor"], types=(bool, str, UUID)) == [
+        True,
+        "Ana",
+        ana["id"],
+    ]
+    assert db.statements[0][1]["page_limit"] == 2
+
+    client, db = listing([bruno])
+    second = client.get(path, params={"limit": 1, "cursor": first["next_cursor"]}).json()
+
+    assert [item["full_name"] for item in second["items"]] == ["Bruno"]
+    assert second["has_more"] is False
+    assert second["next_cursor"] is None
+    sql, params = db.statements[0]
+    assert "(full_name, id) > (:cursor_name, :cursor_id)" in sql
+    assert (params["cursor_is_active"], params["cursor_name"], params["cursor_id"]) == (
+        True,
+        "Ana",
+        ana["id"],
+    )
+
+
+def test_student_search_matches_name_email_and_phone(listing):
+    client, db = listing([])
+
+    response = client.get("/api/v1/students/", params={"q": "  ana ", "include_total": True})
+
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+    count_sql, count_params = db.statements[0]
+    assert count_sql.startswith("SELECT count(*) FROM public.students")
+    assert count_params["q"] == "%ana%"
+    sql, params = db.statements[1]
+    assert "full_name ILIKE :q" in sql
+    assert "CAST(email AS text) ILIKE :q" in sql
+    assert "phone ILIKE :q" in sql
+    assert params["q"] == "%ana%"
+
+
+def test_teacher_search_matches_name_only(listing):
+    client, db = listing([])
+
+    client.get("/api/v1/teachers/", params={"q": "bru"})
+
+    [(sql, params)] = db.statements
+    assert "full_name ILIKE :q" in sql
+    assert "email" not in sql.split("WHERE", 1)[1]
+    assert params["q"] == "%bru%"
@@ -0,0 +1,80 @@
+import os
+from decimal import Decimal
+from uuid import uuid4
+
+from app.services import pix_artifacts
+from app.services.pix_payload import _CRC_INIT, _CRC_POLY, _crc16_ccitt_false, generate_pix_payload
+
+
+def _crc16_bitwise(data: str) -> str:
+    crc = _CRC_INIT
+    for byte in data.encode("utf-8"):
+        crc ^= byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ _CRC_POLY) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return f"{crc:04X}"
+
+
+_PAYLOAD_ARGS = {
+    "pix_key": "financeiro@socratestenis.com.br",
+    "merchant_name": "Socrates Tenis",
+    "merchant_city": "Sao Paulo",
+    "amount": Decimal("120.00"),
+    "txid": "CTR202604161800",
+}
+
+
+def test_table_crc16_matches_bitwise_reference():
+    assert _crc16_ccitt_false("123456789") == "29B1"
+    assert _crc16_ccitt_false("") == "FFFF"
+    payload = generate_pix_payload(**_PAYLOAD_ARGS)
+    assert payload[-4:] == _crc16_bitwise(payload[:-4])
+    for sample in ("", "000201", payload[:-4] * 3):
+        assert _crc16_ccitt_false(sample) == _crc16_bitwise(sample)
+
+
+def test_payload_is_memoized_and_qr_png_is_persisted_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(pix_artifacts, "PIX_QR_STORAGE_DIR", tmp_path)
+    pix_artifacts.render_pix_qr_png.cache_clear()
+
+    first = pix_artifacts.get_pix_payload(**_PAYLOAD_ARGS)
+    hits_before = pix_artifacts._cached_pix_payload.cache_info().hits
+    assert pix_artifacts.get_pix_payload(**{**_PAYLOAD_ARGS, "amount": "120.00"}) == first
+    assert pix_artifacts._cached_pix_payload.cache_info().hits == hits_before + 1
+
+    rental_id = uuid4()
+    path = pix_artifacts.ensure_rental_pix_qr_png(rental_id, first)
+    assert path is not None and path.parent == tmp_path
+    assert path.read_bytes().startswith(b"\x89PNG")
+
+    pix_artifacts.render_pix_qr_png.cache_clear()
+    assert pix_artifacts.load_rental_pix_qr_png(rental_id, first) == path.read_bytes()
+    assert pix_artifacts.render_pix_qr_png.cache_info().misses == 0
+
+
+def test_qr_gc_keeps_only_pngs_of_open_pix_charges(tmp_path, monkeypatch, recording_session):
+    monkeypatch.setattr(pix_artifacts, "PIX_QR_STORAGE_DIR", tmp_path)
+    open_id, closed_id = uuid4(), uuid4()
+    payload = generate_pix_payload(**_PAYLOAD_ARGS)
+
+    in_use = pix_artifacts.rental_pix_qr_path(open_id, payload)
+    old_payload = pix_artifacts.rental_pix_qr_path(open_id, payload + "antigo")
+    cancelled = pix_artifacts.rental_pix_qr_path(closed_id, payload)
+    recent = pix_artifacts.rental_pix_qr_path(uuid4(), payload)
+    now = 10_000_000.0
+    for path in (in_use, old_payload, cancelled, recent):
+        path.write_bytes(b"\x89PNG")
+        os.utime(path, (now - 86400, now - 86400))
+    os.utime(recent, (now - 60, now - 60))
+
+    db = recording_session([{"id": open_id, "pix_qr_code_payload": f" {payload} "}])
+    result = pix_artifacts.collect_stale_rental_pix_qr_pngs(db, now=now)
+
+    assert sorted(result.removed) == sorted([old_payload.name, cancelled.name])
+    assert result.kept == 1
+    assert result.skipped_recent == 1
+    assert in_use.exists() and recent.exists()
+    assert not cancelled.exists()
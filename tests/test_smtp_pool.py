@@ -0,0 +1,107 @@
+import smtplib
+import time
+
+from app.services.email_sender import OutgoingEmail, SmtpConfig, SmtpEmailSender
+from app.services.smtp_pool import SmtpConnectionPool
+from tests.smtp_stub import StubSmtpServer
+
+_CFG = SmtpConfig(
+    host="127.0.0.1",
+    port=0,
+    username="",
+    password="",
+    mail_from="escola@example.com",
+)
+
+
+def _plain_connect(server: StubSmtpServer):
+    def connect() -> smtplib.SMTP:
+        smtp = smtplib.SMTP("127.0.0.1", server.port, timeout=5)
+        smtp.ehlo()
+        return smtp
+
+    return connect
+
+
+def _batch(size: int) -> list[OutgoingEmail]:
+    return [
+        OutgoingEmail(
+            to_email=f"aluno{i}@example.com",
+            subject=f"Mensagem {i}",
+            text_body="Olá!",
+        )
+        for i in range(size)
+    ]
+
+
+def test_pool_reuses_sessions_and_health_checks_idle_ones():
+    now = [0.0]
+    with StubSmtpServer() as server:
+        pool = SmtpConnectionPool(
+            _plain_connect(server),
+            size=2,
+            idle_timeout_seconds=60,
+            health_check_after_seconds=5,
+            clock=lambda: now[0],
+        )
+        sender = SmtpEmailSender(_CFG, pool=pool)
+
+        for message in _batch(3):
+            sender.send_email(to_email=message.to_email, subject=message.subject, text_body="oi")
+        assert server.connections == 1
+        assert pool.stats.reused == 2
+
+        now[0] += 10
+        sender.send_email(to_email="x@example.com", subject="após pausa", text_body="oi")
+        assert server.noops == 1
+        assert server.connections == 1
+
+        now[0] += 120
+        sender.send_email(to_email="y@example.com", subject="após timeout", text_body="oi")
+        assert server.connections == 2
+        pool.close()
+
+    assert server.messages == 5
+
+
+def test_pool_reconnects_when_server_drops_the_session():
+    with StubSmtpServer(drop_after=2) as server:
+        pool = SmtpConnectionPool(_plain_connect(server), size=1, health_check_after_seconds=60)
+        sender = SmtpEmailSender(_CFG, pool=pool)
+
+        assert sender.send_many(_batch(5)) == [None] * 5
+        pool.close()
+
+    assert server.messages == 5
+    assert pool.stats.reconnects >= 1
+
+
+def test_benchmark_pooled_send_many_vs_per_message():
+    # o atraso no handshake faz o papel de EHLO/STARTTLS/LOGIN de um servidor real
+    messages = _batch(40)
+
+    with StubSmtpServer(handshake_delay=0.005) as server:
+        per_message = SmtpEmailSender(_CFG, connect=_plain_connect(server))
+        started = time.perf_counter()
+        for message in messages:
+            per_message.send_email(
+                to_email=message.to_email, subject=message.subject, text_body=message.text_body
+            )
+        per_message_rate = len(messages) / (time.perf_counter() - started)
+        per_message_connections = server.connections
+
+        pool = SmtpConnectionPool(_plain_connect(server), size=4)
+        pooled = SmtpEmailSender(_CFG, pool=pool)
+        started = time.perf_counter()
+        assert pooled.send_many(messages) == [None] * len(messages)
+        pooled_rate = len(messages) / (time.perf_counter() - started)
+        pool.close()
+        pooled_connections = server.connections - per_message_connections
+
+    print(
+        f"\n[smtp-bench] por mensagem: {per_message_rate:.0f} msg/s "
+        f"({per_message_connections} conexões) | pool: {pooled_rate:.0f} msg/s "
+        f"({pooled_connections} conexões)"
+    )
+    assert per_message_connections == len(messages)
+    assert pooled_connections <= pool.size
@@ -0,0 +1,83 @@
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from app.models.court_rental import CourtRental
+from app.services.cache_invalidation import apply_cache_notification
+from app.services.student_home_cache import (
+    StudentHomeCache,
+    _court_rental_written,
+    invalidate_student_home,
+    student_home_cache,
+)
+
+
+def test_cache_loads_once_per_student_and_user():
+    cache = StudentHomeCache(ttl_seconds=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"class_groups": []}
+
+    cache.get_or_load("s1", "u1", loader)
+    cache.get_or_load("s1", "u1", loader)
+    cache.get_or_load("s2", "u2", loader)
+
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.invalidate(user_ids=["u2"])
+    cache.get_or_load("s2", "u2", loader)
+    cache.get_or_load("s1", "u1", loader)
+    assert len(calls) == 3
+
+
+def test_session_invalidation_waits_for_commit_and_drops_on_rollback():
+    student_home_cache.clear()
+    student_home_cache.get_or_load("s1", "u1", lambda: {"v": 1})
+    student_home_cache.get_or_load("s2", "u2", lambda: {"v": 2})
+
+    db = Session()
+    db.begin()
+    invalidate_student_home(db, student_ids=["s1"])
+    assert student_home_cache.get_or_load("s1", "u1", lambda: {"v": "novo"}) == {"v": 1}
+    db.rollback()
+    db.commit()
+    assert student_home_cache.get_or_load("s1", "u1", lambda: {"v": "novo"}) == {"v": 1}
+
+    invalidate_student_home(db, everyone=True)
+    db.commit()
+    assert student_home_cache.get_or_load("s2", "u2", lambda: {"v": "novo"}) == {"v": "novo"}
+    student_home_cache.clear()
+
+
+def test_rental_writes_invalidate_owner_homes_after_commit():
+    student_id, customer_user_id = uuid4(), uuid4()
+    student_home_cache.clear()
+    student_home_cache.get_or_load(student_id, uuid4(), lambda: {"v": "aluno"})
+    student_home_cache.get_or_load(uuid4(), customer_user_id, lambda: {"v": "cliente"})
+    student_home_cache.get_or_load("outro", "outro", lambda: {"v": "outro"})
+
+    db = Session()
+    rental = CourtRental(customer_student_id=student_id, customer_user_id=customer_user_id)
+    db.add(rental)
+    _court_rental_written(None, None, rental)
+    db.expunge(rental)
+    db.commit()
+
+    assert [key[0] for key in student_home_cache._entries] == ["outro"]
+    student_home_cache.clear()
+
+
+def test_notification_from_other_process_drops_homes():
+    student_home_cache.clear()
+    student_home_cache.get_or_load("s1", "u1", lambda: {"v": 1})
+    student_home_cache.get_or_load("s2", "u2", lambda: {"v": 2})
+    student_home_cache.get_or_load("s3", "u3", lambda: {"v": 3})
+
+    apply_cache_notification('{"cache": "student_home", "students": ["s1"], "users": ["u2"]}')
+    assert sorted(key[0] for key in student_home_cache._entries) == ["s3"]
+
+    apply_cache_notification('{"cache": "student_home", "all": true}')
+    assert not student_home_cache._entries
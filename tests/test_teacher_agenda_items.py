@@ -0,0 +1,60 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from app.schemas.teachers import TeacherAgendaWeekItemOut
+from app.services.teacher_agenda_items import build_teacher_agenda_item
+
+
+def _row(**overrides):
+    created_at = datetime(2026, 4, 1, 12, tzinfo=UTC)
+    row = {
+        "event_id": uuid4(),
+        "kind": "group_lesson",
+        "status": "confirmado",
+        "start_at": datetime(2026, 4, 20, 18, tzinfo=UTC),
+        "end_at": datetime(2026, 4, 20, 19, tzinfo=UTC),
+        "notes": None,
+        "event_created_at": created_at,
+        "event_updated_at": created_at,
+        "court_id": uuid4(),
+        "court_name": "Quadra 1",
+        "teacher_id": uuid4(),
+        "teacher_name": "Prof",
+        "student_id": None,
+        "student_name": None,
+        "class_group_id": uuid4(),
+        "class_group_name": "Turma A",
+        "class_group_students": [],
+        "teacher_event_report_id": None,
+        "teacher_event_report_status": None,
+        "teacher_event_issue_type": None,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_roster_from_jsonb_feeds_names_and_schema():
+    first, second = uuid4(), uuid4()
+    item = build_teacher_agenda_item(
+        _row(
+            class_group_students=[
+                {"student_id": str(first), "student_name": " Ana "},
+                {"student_id": str(second), "student_name": "Bruno"},
+                {"student_id": str(uuid4()), "student_name": "  "},
+            ]
+        )
+    )
+
+    assert item["class_group_student_names"] == ["Ana", "Bruno"]
+    assert [student["student_id"] for student in item["class_group_students"]] == [first, second]
+    assert item["has_schedule_change"] is False
+    TeacherAgendaWeekItemOut.model_validate(item)
+
+
+def test_schedule_change_comes_from_event_timestamps():
+    row = _row()
+    changed_at = row["event_created_at"] + timedelta(hours=2)
+    item = build_teacher_agenda_item({**row, "event_updated_at": changed_at})
+
+    assert item["has_schedule_change"] is True
+    assert item["schedule_changed_at"] == changed_at
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+from app.api.v1.endpoints.trial_lessons import (
+    _evaluate_trial_block_reason,
+    _local_tz,
+    _TrialEligibilityState,
+)
+
+
+def _state(**overrides):
+    values = {
+        "is_active_student": False,
+        "scheduled_trial_status": None,
+        "current_scheduled": None,
+        "completed_trial_status": None,
+    }
+    values.update(overrides)
+    return _TrialEligibilityState(**values)
+
+
+def test_block_reasons_follow_priority():
+    now = datetime.now(_local_tz())
+
+    assert _evaluate_trial_block_reason(_state())[0] is None
+    assert (
+        _evaluate_trial_block_reason(
+            _state(is_active_student=True, completed_trial_status="completed")
+        )[0]
+        == "ACTIVE_STUDENT_NOT_ELIGIBLE"
+    )
+    assert (
+        _evaluate_trial_block_reason(
+            _state(
+                scheduled_trial_status="scheduled",
+                current_scheduled={"end_at": now - timedelta(minutes=1)},
+            )
+        )[0]
+        == "TRIAL_ATTENDANCE_VALIDATION_PENDING"
+    )
+    assert (
+        _evaluate_trial_block_reason(_state(completed_trial_status="completed"))[0]
+        == "TRIAL_LESSON_ALREADY_COMPLETED"
+    )
+    assert (
+        _evaluate_trial_block_reason(
+            _state(control_is_blocked=True, control_blocked_until=now + timedelta(days=1))
+        )[0]
+        == "TRIAL_BOOKING_BLOCKED"
+    )
+    assert (
+        _evaluate_trial_block_reason(
+            _state(control_is_blocked=True, control_blocked_until=now - timedelta(days=1))
+        )[0]
+        is None
+    )
+
+
+def test_scheduled_trial_can_only_be_rescheduled():
+    now = datetime.now(_local_tz())
+    scheduled = _state(
+        scheduled_trial_status="scheduled",
+        current_scheduled={"end_at": now + timedelta(days=2)},
+    )
+
+    assert _evaluate_trial_block_reason(scheduled)[0] == "TRIAL_LESSON_ALREADY_SCHEDULED"
+    assert _evaluate_trial_block_reason(scheduled, allow_scheduled_for_reschedule=True)[0] is None
+
+    needs_approval = _state(
+        scheduled_trial_status="scheduled",
+        current_scheduled={"end_at": now + timedelta(days=2)},
+        control_requires_admin_approval=True,
+    )
+    assert (
+        _evaluate_trial_block_reason(needs_approval, allow_scheduled_for_reschedule=True)[0]
+        == "TRIAL_ADMIN_APPROVAL_REQUIRED"
+    )
@@ -0,0 +1,34 @@
+import hashlib
+from datetime import date
+from uuid import uuid4
+
+from app.services.trial_occurrence_counters import (
+    count_recent_trial_occurrences,
+    trial_identity_key_hashes,
+)
+
+
+def test_identity_key_hashes_match_sql_format():
+    assert trial_identity_key_hashes(None, None) == []
+    assert trial_identity_key_hashes("ana@example.com", "11999990000") == [
+        hashlib.sha256(b"email:ana@example.com").hexdigest(),
+        hashlib.sha256(b"whatsapp:11999990000").hexdigest(),
+    ]
+
+
+def test_recent_counts_bind_types_and_fill_missing(recording_session):
+    db = recording_session([("cancelled", 2), ("rescheduled", 1)])
+
+    counts = count_recent_trial_occurrences(
+        db,
+        uuid4(),
+        ("cancelled", "cancelled_late", "rescheduled"),
+        days=60,
+        today=date(2026, 4, 20),
+    )
+
+    assert counts == {"cancelled": 2, "cancelled_late": 0, "rescheduled": 1}
+    sql, params = db.statements[0]
+    assert "'cancelled'" not in sql
+    assert params["occurrence_types"] == ["cancelled", "cancelled_late", "rescheduled"]
+    assert params["since_day"] == date(2026, 2, 19)
@@ -0,0 +1,88 @@
+from datetime import datetime, time
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from app.api.v1.endpoints import trial_lessons
+
+_TZ = ZoneInfo("America/Sao_Paulo")
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    # segunda-feira
+    return datetime(2026, 3, 2, hour, minute, tzinfo=_TZ)
+
+
+class _SnapshotStub:
+    def __init__(self, busy):
+        self.busy = busy
+        self.calls = []
+
+    def busy_intervals(self, db, *, kind, range_start, range_end):
+        self.calls.append((kind, range_start, range_end))
+        return self.busy[kind]
+
+
+def test_trial_slots_resolve_against_preloaded_windows_and_busy_intervals(
+    monkeypatch, recording_session
+):
+    court, other_court, inactive_court = uuid4(), uuid4(), uuid4()
+    teacher, busy_teacher, inactive_teacher = uuid4(), uuid4(), uuid4()
+    snapshot = _SnapshotStub(
+        {
+            "court": {other_court: [(_at(9), _at(10))]},
+            "teacher": {busy_teacher: [(_at(8, 30), _at(9, 30))]},
+        }
+    )
+    monkeypatch.setattr(trial_lessons, "availability_snapshot_cache", snapshot)
+
+    window = {"weekday": 1, "period": "morning", "start_time": time(8), "end_time": time(11)}
+    db = recording_session(
+        results=[
+            [
+                {"court_id": court, "court_name": "Quadra 1"},
+                {"court_id": other_court, "court_name": "Quadra 2"},
+            ],
+            [
+                {"teacher_id": teacher, "teacher_name": "Ana"},
+                {"teacher_id": busy_teacher, "teacher_name": "Bruno"},
+            ],
+            [
+                {"teacher_id": teacher, **window},
+                {"teacher_id": busy_teacher, **window},
+            ],
+        ]
+    )
+
+    availability = trial_lessons._load_trial_slot_availability(
+        db, range_start=_at(0), range_end=_at(23)
+    )
+
+    # três consultas fixas + os dois snapshots, não importa quantos candidatos
+    assert len(db.statements) == 3
+    assert [kind for kind, _start, _end in snapshot.calls] == ["court", "teacher"]
+
+    def available(court_id, teacher_id, start_hour):
+        return availability.slot_is_available(
+            court_id=court_id,
+            teacher_id=teacher_id,
+            start_at=_at(start_hour),
+            end_at=_at(start_hour + 1),
+        )
+
+    assert available(court, teacher, 9)
+    # quadra ocupada
+    assert not available(other_court, teacher, 9)
+    assert available(other_court, teacher, 10)
+    # professor ocupado das 8h30 às 9h30
+    assert not available(court, busy_teacher, 8)
+    assert not available(court, busy_teacher, 9)
+    assert available(court, busy_teacher, 10)
+    # quadra e professor inativos nunca estão livres
+    assert not available(inactive_court, teacher, 9)
+    assert not available(court, inactive_teacher, 9)
+
+    assert availability.window_allows_slot(teacher, _at(8), _at(9))
+    assert availability.window_allows_slot(teacher, _at(10), _at(11))
+    assert not availability.window_allows_slot(teacher, _at(10, 30), _at(11, 30))
+    assert not availability.window_allows_slot(teacher, _at(14), _at(15))
+    assert not availability.window_allows_slot(inactive_teacher, _at(8), _at(9))
@@ -0,0 +1,69 @@
+from typing import Annotated
+from uuid import uuid4
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.deps import get_current_user_id, require_admin, require_teacher
+from app.db.session import get_db
+from app.services.user_access import (
+    CurrentUser,
+    invalidate_user_access,
+    load_current_user,
+    user_access_cache,
+)
+
+
+def test_load_current_user_queries_once_and_reuses_process_cache(recording_session):
+    user_access_cache.clear()
+    user_id = uuid4()
+    row = {"id": user_id, "email": "admin@example.com", "role": "admin", "is_active": True}
+
+    db = recording_session([row])
+    first = load_current_user(db, str(user_id))
+    second = load_current_user(db, str(user_id))
+    assert first is second
+    assert first.is_admin
+    assert len(db.statements) == 1
+
+    other_request = recording_session([row])
+    assert load_current_user(other_request, str(user_id)) == first
+    assert len(other_request.statements) == 0
+
+    invalidate_user_access(None, user_id)
+    third_request = recording_session([{**row, "role": "coach"}])
+    assert load_current_user(third_request, str(user_id)).is_teacher
+    assert len(third_request.statements) == 1
+
+
+def test_inactive_users_are_not_cached(recording_session):
+    user_access_cache.clear()
+    user_id = uuid4()
+    row = {"id": user_id, "email": "aluno@example.com", "role": "student", "is_active": False}
+
+    load_current_user(recording_session([row]), str(user_id))
+    db = recording_session([{**row, "is_active": True}])
+    assert load_current_user(db, str(user_id)).is_active
+    assert len(db.statements) == 1
+
+
+def test_guards_on_the_same_request_load_the_user_once(recording_session):
+    user_access_cache.clear()
+    user_id = uuid4()
+    db = recording_session(
+        [{"id": user_id, "email": "admin@example.com", "role": "admin", "is_active": True}]
+    )
+
+    app = FastAPI()
+
+    @app.get("/guarded", dependencies=[Depends(require_admin)])
+    def guarded(user: Annotated[CurrentUser, Depends(require_teacher)]):
+        return {"email": user.email}
+
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user_id] = lambda: str(user_id)
+
+    response = TestClient(app).get("/guarded")
+    assert response.status_code == 200
+    assert response.json() == {"email": "admin@example.com"}
+    assert len(db.statements) == 1